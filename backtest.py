@@ -6,6 +6,7 @@ This engine simulates the exact live trading architecture for realistic results.
 
 Usage:
     python backtest.py
+    python backtest.py --resume    # Continue an interrupted run from its last checkpoint
 
 Configuration:
     Edit the CONFIGURATION section below to customize:
@@ -90,6 +91,14 @@ END_DATE = datetime(2025, 1, 2, tzinfo=timezone.utc)  # DEBUG: Test with 1 day o
 
 STREAM_TICKS_FROM_DISK = True
 
+# Shared tick store: decode the daily tick files for START_DATE..END_DATE once into
+# memory-mapped .npy columns under TICK_STORE_DIR (recompiled when a source file changes).
+# Later runs - and concurrent runs by other users on the same machine - attach to the
+# same files without decoding or copying. Takes precedence over STREAM_TICKS_FROM_DISK.
+# Compile ahead of time with: python -m src.backtesting.engine.tick_store --help
+USE_TICK_STORE = False
+TICK_STORE_DIR = "data/tick_store"
+
 PARALLEL_TICK_DAYS = 1
 
 INITIAL_BALANCE = 1000.0
@@ -107,6 +116,15 @@ TICK_TYPE = "INFO"
 
 USE_SEQUENTIAL_MODE = True
 
+# Build candles lazily from buffered ticks only when strategies read them
+# (bit-identical to eager building, skips per-tick OHLC updates)
+LAZY_CANDLE_BUILDING = True
+
+# Sequential mode only: jump between ticks that can call a strategy or hit SL/TP
+# and fast-forward candle/tick state over the rest (same results as the full tick loop).
+# Symbols whose strategy needs every tick (e.g. HFT) are never skipped.
+USE_EVENT_SKIPPING = False
+
 HISTORICAL_BUFFER_DAYS = 10
 
 USE_CACHE = True
@@ -114,6 +132,10 @@ CACHE_DIR = "data/cache"
 CACHE_TTL_DAYS = 7
 FORCE_REFRESH = False
 
+# Write newly downloaded tick days in the compact integer encoding (prices in points,
+# delta-packed time, zstd). Decodes losslessly; plain and compact files can be mixed.
+COMPACT_TICK_ENCODING = False
+
 USE_INCREMENTAL_LOADING = True
 
 DEBUG_DATA_LOADING = False
@@ -123,6 +145,51 @@ SLIPPAGE_POINTS = 0.5
 
 LEVERAGE = 2000
 
+# Parameter sweep: run every parameter set below (in parallel worker processes)
+# instead of a single backtest, and write a ranked leaderboard (parquet + CSV).
+# Keys are "<section>.<field>" with section fakeout (FakeoutConfig),
+# true_breakout (TrueBreakoutConfig), hft_momentum (HFTMomentumConfig) or risk (RiskConfig).
+# Lists are choices; (low, high) tuples are ranges (random sampling only).
+RUN_PARAMETER_SWEEP = False
+SWEEP_PARAMETERS = {
+    "fakeout.risk_reward_ratio": [1.5, 2.0, 3.0],
+    "true_breakout.risk_reward_ratio": [1.5, 2.0, 3.0],
+    "risk.risk_percent_per_trade": [0.5, 1.0],
+}
+SWEEP_RANDOM_SAMPLES = 0  # 0 = full grid, N = N random parameter sets
+SWEEP_SEED = 42
+SWEEP_MAX_WORKERS = None  # None = one worker per CPU core, 1 = run in this process
+SWEEP_SORT_BY = "total_profit"
+SWEEP_OUTPUT_DIR = "data/sweeps"
+
+# Sharded backtest: run symbol groups in parallel processes (one SimulatedBroker each)
+# and merge trades and equity curves. Requires ENABLE_PORTFOLIO_RISK=false (symbols are
+# only independent without cross-symbol risk limits); each shard sizes positions from
+# its own sub-account balance.
+RUN_SHARDED = False
+SHARD_COUNT = None  # None = one shard per CPU core (at most one per symbol), 1 = run in this process
+SHARD_OUTPUT_DIR = "data/shards"
+
+# Mid-run checkpoints (sequential mode): save the run state every N ticks and/or every
+# M minutes of wall time. "python backtest.py --resume" continues an interrupted run
+# (same dates, symbols and configuration) from its last checkpoint with identical results.
+CHECKPOINT_EVERY_TICKS = 0  # 0 = disabled
+CHECKPOINT_EVERY_MINUTES = 15  # 0 = disabled
+CHECKPOINT_DIR = "data/backtest/checkpoints"
+
+# Equity curve and trade log: snapshot balance/equity every N seconds of simulated time
+# (sequential mode) and spill snapshots and closed trades to equity.parquet / trades.parquet
+# in the log directory. Only a per-minute curve is kept in memory.
+EQUITY_SNAPSHOT_SECONDS = 10
+SPILL_EQUITY_CURVE = True
+
+# Stage profiling (sequential mode): time every Nth processed tick per engine stage (tick
+# decode, candle building, SL/TP checks, strategy on_tick, order execution, logging) and
+# write stage_profile.txt and stage_profile.speedscope.json (https://www.speedscope.app)
+# to the log directory. Sampling keeps the overhead low, unlike tools/profile_backtest.py.
+PROFILE_STAGES = False
+PROFILE_SAMPLE_EVERY = 1000
+
 
 def get_memory_usage() -> float:
     """Get current memory usage in MB."""
@@ -392,8 +459,133 @@ def progress_print(message: str, logger=None):
     print(message)
     if logger:
         logger.info(message)
-def main():
-    """Run the backtest."""
+def run_parameter_sweep(broker, symbols: List[str], symbol_data: dict, symbol_info: dict, logger) -> bool:
+    """
+    Run SWEEP_PARAMETERS over the loaded data and print the leaderboard.
+
+    The tick timeline already loaded into the broker is written once as
+    memory-mapped columns and shared by all worker processes.
+
+    Args:
+        broker: SimulatedBroker with the global tick timeline loaded
+        symbols: Symbols to backtest
+        symbol_data: (symbol, timeframe) -> OHLC DataFrame passed to the broker
+        symbol_info: Symbol -> symbol info dict (tick_value converted to USD)
+        logger: Logger instance
+
+    Returns:
+        True if at least one run succeeded
+    """
+    from src.backtesting.engine.parameter_sweep import ParameterSpace, ParameterSweepRunner, SweepSettings
+
+    space = ParameterSpace(SWEEP_PARAMETERS)
+    if SWEEP_RANDOM_SAMPLES > 0:
+        parameter_sets = space.sample(SWEEP_RANDOM_SAMPLES, seed=SWEEP_SEED)
+    else:
+        parameter_sets = space.grid()
+
+    output_dir = Path(SWEEP_OUTPUT_DIR) / datetime.now(timezone.utc).strftime('%Y%m%d_%H%M%S')
+    settings = SweepSettings(
+        start_date=START_DATE,
+        initial_balance=INITIAL_BALANCE,
+        stop_loss_threshold=STOP_LOSS_THRESHOLD,
+        leverage=LEVERAGE,
+        enable_slippage=ENABLE_SLIPPAGE,
+        slippage_points=SLIPPAGE_POINTS,
+        lazy_candles=LAZY_CANDLE_BUILDING,
+        event_skipping=USE_EVENT_SKIPPING
+    )
+    runner = ParameterSweepRunner(str(output_dir), settings, max_workers=SWEEP_MAX_WORKERS, sort_by=SWEEP_SORT_BY)
+
+    progress_print("=" * 80, logger)
+    progress_print(f"PARAMETER SWEEP: {len(parameter_sets)} runs on {runner.max_workers} worker(s)", logger)
+    progress_print("=" * 80, logger)
+    progress_print(f"  Output directory: {output_dir.absolute()}", logger)
+
+    # Same data the single backtest loaded into the broker (trading symbols + conversion pairs)
+    sweep_symbol_data = {
+        (symbol, timeframe): df for (symbol, timeframe), df in symbol_data.items()
+        if symbol in symbols or (symbol in symbol_info and timeframe == 'M1')
+    }
+    runner.prepare(broker.global_tick_timeline, symbols, sweep_symbol_data, symbol_info)
+
+    def on_run_complete(done, total, row):
+        status = f"profit ${row.get('total_profit', 0):,.2f}" if row['status'] == 'ok' else f"FAILED ({row['error']})"
+        progress_print(f"  [{done}/{total}] {row['run_id']}: {status} ({row.get('wall_time_sec', 0):.0f}s)", logger)
+
+    leaderboard = runner.run(parameter_sets, progress_callback=on_run_complete)
+    if leaderboard.empty or not (leaderboard['status'] == 'ok').any():
+        progress_print("ERROR: No sweep run completed successfully", logger)
+        return False
+
+    columns = ['rank', 'run_id'] + list(SWEEP_PARAMETERS) + [
+        c for c in ('total_profit', 'max_drawdown', 'win_rate', 'profit_factor', 'total_trades') if c in leaderboard
+    ]
+    progress_print("", logger)
+    progress_print(leaderboard[columns].head(20).to_string(index=False), logger)
+    progress_print("", logger)
+    progress_print(f"Leaderboard saved to: {output_dir.absolute()}/leaderboard.parquet (and .csv)", logger)
+    return True
+
+
+def run_sharded_backtest(broker, symbols: List[str], symbol_data: dict, symbol_info: dict, logger) -> dict:
+    """
+    Run the backtest as parallel per-symbol shards and merge the results.
+
+    Args:
+        broker: SimulatedBroker with the global tick timeline loaded
+        symbols: Symbols to backtest
+        symbol_data: (symbol, timeframe) -> OHLC DataFrame passed to the broker
+        symbol_info: Symbol -> symbol info dict (tick_value converted to USD)
+        logger: Logger instance
+
+    Returns:
+        Combined results dictionary (same keys as BacktestController.get_results())
+    """
+    from src.backtesting.engine.parameter_sweep import SweepSettings
+    from src.backtesting.engine.sharded_backtest import ShardedBacktestRunner
+
+    output_dir = Path(SHARD_OUTPUT_DIR) / datetime.now(timezone.utc).strftime('%Y%m%d_%H%M%S')
+    settings = SweepSettings(
+        start_date=START_DATE,
+        initial_balance=INITIAL_BALANCE,
+        stop_loss_threshold=STOP_LOSS_THRESHOLD,
+        leverage=LEVERAGE,
+        enable_slippage=ENABLE_SLIPPAGE,
+        slippage_points=SLIPPAGE_POINTS,
+        lazy_candles=LAZY_CANDLE_BUILDING,
+        event_skipping=USE_EVENT_SKIPPING
+    )
+    runner = ShardedBacktestRunner(str(output_dir), settings, shard_count=SHARD_COUNT)
+
+    progress_print(f"  Sharded mode: up to {runner.shard_count} process(es), output {output_dir.absolute()}", logger)
+    progress_print("  NOTE: Each shard trades its own sub-account with the full initial balance - the merged", logger)
+    progress_print("        balance and equity curve are an APPROXIMATION of a single-account backtest", logger)
+
+    # Same data the single backtest loaded into the broker (trading symbols + conversion pairs)
+    shard_symbol_data = {
+        (symbol, timeframe): df for (symbol, timeframe), df in symbol_data.items()
+        if symbol in symbols or (symbol in symbol_info and timeframe == 'M1')
+    }
+    runner.prepare(broker.global_tick_timeline, symbols, shard_symbol_data, symbol_info)
+
+    def on_shard_complete(done, total, shard):
+        status = "done" if shard['status'] == 'ok' else f"FAILED ({shard['error']})"
+        progress_print(f"  [{done}/{total}] {shard['shard_id']} ({', '.join(shard['symbols'])}): "
+                       f"{status} ({shard.get('wall_time_sec', 0):.0f}s)", logger)
+
+    results = runner.run(progress_callback=on_shard_complete)
+    progress_print("  Sharded results merged (equity curve is an approximation - see NOTE above)", logger)
+    return results
+
+
+def main(resume: bool = False):
+    """
+    Run the backtest.
+
+    Args:
+        resume: Continue from the last checkpoint of this run (see CHECKPOINT_DIR)
+    """
     import cProfile
     import pstats
     from pathlib import Path
@@ -535,8 +727,26 @@ def main():
     data_loader = BacktestDataLoader(
         use_cache=USE_CACHE,
         cache_dir=CACHE_DIR,
-        cache_ttl_days=CACHE_TTL_DAYS
+        cache_ttl_days=CACHE_TTL_DAYS,
+        compact_tick_encoding=COMPACT_TICK_ENCODING
     )
+
+    # Validate cache coverage of all symbols/timeframes in one parallel footer pass
+    if USE_CACHE and not FORCE_REFRESH:
+        import time
+        from src.backtesting.engine.cache_coverage import summarize_coverage
+        coverage_start = time.time()
+        coverage = data_loader.check_cache_coverage(symbols, TIMEFRAMES, data_load_start, END_DATE)
+        totals = {'ok': 0, 'stale': 0, 'missing': 0}
+        for counts in summarize_coverage(coverage).values():
+            for status, count in counts.items():
+                totals[status] += count
+        logger.info(
+            f"Cache coverage: {totals['ok']} ok, {totals['stale']} stale, {totals['missing']} missing "
+            f"symbol-days ({time.time() - coverage_start:.2f}s)"
+        )
+        logger.info("")
+
     symbol_data = {}
     symbol_info = {}
     symbols_with_all_timeframes = []
@@ -807,7 +1017,7 @@ def main():
                     executor,
                     partial(data_loader.load_from_mt5, symbol, timeframe, data_load_start, END_DATE,
                            force_refresh=FORCE_REFRESH, preloaded_ticks=preloaded_ticks,
-                           use_incremental_loading=USE_INCREMENTAL_LOADING)
+                           use_incremental_loading=USE_INCREMENTAL_LOADING, tick_type=tick_type_flag)
                 ),
                 timeout=300.0
             )
@@ -1213,7 +1423,8 @@ def main():
         persistence=backtest_persistence,
         enable_slippage=ENABLE_SLIPPAGE,
         slippage_points=SLIPPAGE_POINTS,
-        leverage=LEVERAGE
+        leverage=LEVERAGE,
+        lazy_candles=LAZY_CANDLE_BUILDING
     )
 
     logger.info("Converting tick_value to USD for all symbols...")
@@ -1401,6 +1612,17 @@ def main():
     )
     logger.info("  ✓ TradeManager initialized (early)")
 
+    from src.backtesting.engine.equity_recorder import EquityRecorder
+    equity_recorder = EquityRecorder(
+        str(log_dir) if SPILL_EQUITY_CURVE else None,
+        interval_seconds=EQUITY_SNAPSHOT_SECONDS
+    )
+
+    stage_profiler = None
+    if PROFILE_STAGES:
+        from src.backtesting.engine.stage_profiler import StageProfiler
+        stage_profiler = StageProfiler(sample_every=PROFILE_SAMPLE_EVERY)
+
     backtest_controller = BacktestController(
         simulated_broker=broker,
         time_controller=time_controller,
@@ -1408,9 +1630,13 @@ def main():
         risk_manager=risk_manager,
         trade_manager=trade_manager,
         indicators=indicators,
-        stop_loss_threshold=STOP_LOSS_THRESHOLD
+        stop_loss_threshold=STOP_LOSS_THRESHOLD,
+        equity_recorder=equity_recorder,
+        profiler=stage_profiler
     )
 
+    backtest_controller.event_skipping = USE_EVENT_SKIPPING
+
     if not backtest_controller.initialize(symbols):
         logger.error("Failed to initialize BacktestController")
         logger.error("Check your .env configuration and strategy settings")
@@ -1467,7 +1693,27 @@ def main():
     log_memory(logger, "before timeline loading")
     logger.info("")
 
-    if STREAM_TICKS_FROM_DISK:
+    tick_type_name = {
+        mt5.COPY_TICKS_INFO: "INFO",
+        mt5.COPY_TICKS_ALL: "ALL",
+        mt5.COPY_TICKS_TRADE: "TRADE"
+    }.get(tick_type_flag, "INFO")
+
+    if USE_TICK_STORE:
+        console.print("[yellow]Using TICK STORE mode (shared memory-mapped ticks)[/yellow]")
+        logger.info("Using TICK STORE mode (shared memory-mapped ticks)")
+        logger.info(f"  Store directory: {Path(TICK_STORE_DIR).absolute()}")
+        logger.info("")
+
+        from src.backtesting.engine.tick_store import TickStore
+
+        # Same days the streaming timeline simulates (START_DATE..END_DATE)
+        tick_store = TickStore.open_or_compile(TICK_STORE_DIR, str(tick_cache_dir), symbols,
+                                               START_DATE, END_DATE, tick_type_name)
+        console.print(f"[dim]  {tick_store.directory.name}: {tick_store.tick_count:,} ticks[/dim]\n")
+        broker.load_ticks_from_cache_files({symbol: None for symbol in symbols},
+                                           required_timeframes=required_timeframes, tick_store=tick_store)
+    elif STREAM_TICKS_FROM_DISK:
         console.print("[yellow]Using STREAMING mode (ticks read from disk on-demand)[/yellow]")
         console.print("[dim]  Memory usage: ~2-3 GB (vs ~20-30 GB for loading all ticks)[/dim]\n")
 
@@ -1475,12 +1721,6 @@ def main():
         logger.info("  Memory usage: ~2-3 GB (vs ~20-30 GB for loading all ticks)")
         logger.info("")
 
-        tick_type_name = {
-            mt5.COPY_TICKS_INFO: "INFO",
-            mt5.COPY_TICKS_ALL: "ALL",
-            mt5.COPY_TICKS_TRADE: "TRADE"
-        }.get(tick_type_flag, "INFO")
-
         # Load tick data from data_load_start (includes HISTORICAL_BUFFER_DAYS) for candle building
         # But filter timeline to only simulate ticks >= START_DATE
         # This ensures indicators have historical context while trades only execute from START_DATE
@@ -1587,6 +1827,14 @@ def main():
     log_memory(logger, "after timeline loading")
     logger.info("")
 
+    if RUN_PARAMETER_SWEEP:
+        success = run_parameter_sweep(broker, symbols, symbol_data, converted_symbol_info, logger)
+
+        from src.utils.logging import set_live_mode
+        set_live_mode()
+        logger.shutdown()
+        return success
+
     # Candle mode initialization removed - tick-only mode now
     logger.info("=" * 80)
     logger.info("STEP 5-6: Components Already Initialized (in Step 4.5)")
@@ -1600,6 +1848,43 @@ def main():
     logger.info("=" * 80)
     logger.info("")
 
+    checkpoint = None
+    if USE_SEQUENTIAL_MODE and not RUN_SHARDED and (CHECKPOINT_EVERY_TICKS or CHECKPOINT_EVERY_MINUTES or resume):
+        from src.backtesting.engine.checkpoint import BacktestCheckpoint
+
+        run_key = BacktestCheckpoint.run_key(
+            symbols, START_DATE, END_DATE, total_ticks,
+            initial_balance=INITIAL_BALANCE, event_skipping=USE_EVENT_SKIPPING,
+            lazy_candles=LAZY_CANDLE_BUILDING, enable_slippage=ENABLE_SLIPPAGE,
+            slippage_points=SLIPPAGE_POINTS, leverage=LEVERAGE, stop_loss_threshold=STOP_LOSS_THRESHOLD
+        )
+        checkpoint = BacktestCheckpoint(
+            str(Path(CHECKPOINT_DIR) / f"{run_key}.ckpt"), run_key,
+            every_ticks=CHECKPOINT_EVERY_TICKS, every_minutes=CHECKPOINT_EVERY_MINUTES
+        )
+        trading_controller = backtest_controller.trading_controller
+        checkpoint.attach(
+            broker=broker,
+            trading_controller=trading_controller,
+            order_manager=order_manager,
+            risk_manager=risk_manager,
+            trade_manager=trade_manager,
+            indicators=indicators,
+            persistence=backtest_persistence,
+            symbol_persistence=trading_controller.symbol_persistence,
+            time_controller=time_controller
+        )
+        if resume:
+            backtest_controller.resume_tick_index = checkpoint.restore()
+            # Trades closed before the checkpoint belong in the spilled trade log too
+            for trade in broker.closed_trades:
+                equity_recorder.record_trade(trade)
+        backtest_controller.checkpoint = checkpoint
+        logger.info(f"  ✓ Checkpoints: every {CHECKPOINT_EVERY_TICKS or '-'} ticks / "
+                    f"{CHECKPOINT_EVERY_MINUTES or '-'} min -> {checkpoint.path}")
+    elif resume:
+        logger.warning("--resume requires sequential mode without sharding - starting from the first tick")
+
     progress_print("=" * 80, logger)
     progress_print("STEP 7: Running Backtest", logger)
     progress_print("=" * 80, logger)
@@ -1619,12 +1904,23 @@ def main():
     progress_print("=" * 80, logger)
     progress_print("", logger)
 
+    use_sharding = RUN_SHARDED
+    if RUN_SHARDED and config.risk.enable_portfolio_risk:
+        logger.warning("RUN_SHARDED requires ENABLE_PORTFOLIO_RISK=false (cross-symbol risk limits "
+                       "need all positions in one broker) - running a single backtest instead")
+        use_sharding = False
+    sharded_results = None
+
     profiler = cProfile.Profile()
     profiler.enable()
 
     try:
-        if USE_SEQUENTIAL_MODE:
+        if use_sharding:
+            sharded_results = run_sharded_backtest(broker, symbols, symbol_data, converted_symbol_info, logger)
+        elif USE_SEQUENTIAL_MODE:
             backtest_controller.run_sequential(backtest_start_time=START_DATE)
+            if checkpoint is not None:
+                checkpoint.remove()  # Run completed - nothing to resume
         else:
             backtest_controller.run(backtest_start_time=START_DATE)
 
@@ -1662,16 +1958,24 @@ def main():
     progress_print("", logger)
 
     try:
-        results = backtest_controller.get_results()
+        results = sharded_results if sharded_results is not None else backtest_controller.get_results()
         analyzer = ResultsAnalyzer()
         metrics = analyzer.analyze(results)
 
         import pickle
-        trades = broker.get_closed_trades()
+        trades = results['trade_log']
         pickle_file = "backtest_trades.pkl"
         with open(pickle_file, 'wb') as f:
             pickle.dump(trades, f)
         logger.info(f"  ✓ Saved {len(trades)} trades to {pickle_file} for detailed analysis")
+        if results.get('equity_curve_path'):
+            logger.info(f"  ✓ Equity curve: {results['equity_curve_path']}")
+        if results.get('trade_log_path'):
+            logger.info(f"  ✓ Trade log: {results['trade_log_path']}")
+        if stage_profiler is not None and stage_profiler.samples:
+            report_path = stage_profiler.write_report(str(log_dir / "stage_profile.txt"))
+            speedscope_path = stage_profiler.write_speedscope(str(log_dir / "stage_profile.speedscope.json"))
+            logger.info(f"  ✓ Stage profile: {report_path} (speedscope: {speedscope_path})")
 
     except Exception as e:
         progress_print(f"ERROR: Failed to analyze results: {e}", logger)
@@ -1763,5 +2067,12 @@ def main():
 
     return True
 if __name__ == "__main__":
-    success = main()
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run the backtest configured in backtest.py")
+    parser.add_argument("--resume", action="store_true",
+                        help="continue an interrupted run from its last checkpoint")
+    args = parser.parse_args()
+
+    success = main(resume=args.resume)
     sys.exit(0 if success else 1)
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Engine Throughput Benchmark
+
+Runs the replay engine on deterministic synthetic data and records ticks/sec,
+peak RSS, time-to-first-tick and get_candles() latency per git commit.
+
+Usage:
+    python scripts/benchmark_engine.py run
+    python scripts/benchmark_engine.py run --symbols 1 10 --strategies combined --days 1
+    python scripts/benchmark_engine.py compare                  # latest vs previous recorded commit
+    python scripts/benchmark_engine.py compare --baseline abc123 --current def456 --threshold 0.05
+    python scripts/benchmark_engine.py list
+
+compare exits with status 1 when a metric regressed beyond the threshold.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.backtesting.engine.engine_benchmark import (
+    BenchmarkSettings, BenchmarkStore, EngineBenchmark, STRATEGY_SETS,
+    compare_results, format_comparison, tps_targets
+)
+
+
+def print_targets(results: dict):
+    """Print the roadmap ticks/sec targets reached by the combined runs."""
+    for case, target in tps_targets(results).items():
+        reached = ", ".join(target['reached']) or "none"
+        print(f"  {case:<34} {target['ticks_per_sec']:>10,.0f} tps  targets reached: {reached}")
+
+
+def cmd_run(args) -> int:
+    settings = BenchmarkSettings(
+        days=args.days,
+        history_days=args.history_days,
+        seed=args.seed,
+        ticks_per_hour=args.ticks_per_hour,
+        symbol_counts=tuple(args.symbols),
+        strategies=tuple(args.strategies),
+        streaming=not args.no_streaming,
+        event_skipping=args.event_skipping,
+    )
+    benchmark = EngineBenchmark(args.work_dir, settings, isolate=not args.no_isolate)
+    results = benchmark.run(progress_callback=lambda done, total, case: print(
+        f"[{done}/{total}] {case.name}: {case.metrics['ticks_per_sec']:,.0f} ticks/sec, "
+        f"peak RSS {case.metrics['peak_rss_mb']:,.0f} MB, "
+        f"first tick {case.metrics['time_to_first_tick_sec']:.2f}s, "
+        f"get_candles p50 {case.metrics['get_candles_p50_us']:.1f}us"))
+
+    store = BenchmarkStore(args.results)
+    path = store.save(results)
+    dirty = " (uncommitted changes)" if results['dirty'] else ""
+    print(f"\nResults for commit {results['commit'][:12]}{dirty} saved to {path}")
+    print_targets(results)
+    return 0
+
+
+def cmd_compare(args) -> int:
+    store = BenchmarkStore(args.results)
+    entries = store.load()
+    if not entries:
+        print(f"No benchmark results in {store.path}")
+        return 1
+
+    current = store.get(args.current) if args.current else store.get(list(entries)[-1])
+    baseline = store.get(args.baseline) if args.baseline else store.previous(current['commit'])
+    if baseline is None:
+        print(f"No results recorded before commit {current['commit'][:12]} to compare against")
+        return 1
+
+    print(f"Baseline {baseline['commit'][:12]} -> current {current['commit'][:12]}")
+    rows = compare_results(baseline, current, threshold=args.threshold)
+    print(format_comparison(rows, args.threshold))
+    print_targets(current)
+    return 1 if any(row['regression'] for row in rows) else 0
+
+
+def cmd_list(args) -> int:
+    store = BenchmarkStore(args.results)
+    for commit, results in store.load().items():
+        dirty = "*" if results.get('dirty') else " "
+        print(f"{commit[:12]}{dirty} {results['recorded_at']}  {len(results['cases'])} cases")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Replay engine throughput benchmarks')
+    parser.add_argument('--results', default=None,
+                        help='Results JSON file (default: data/benchmarks/engine_benchmarks.json)')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = subparsers.add_parser('run', help='Run the benchmark and record it under the current commit')
+    run_parser.add_argument('--work-dir', default='data/benchmarks/work',
+                            help='Directory for synthetic data and run files (reused between runs)')
+    run_parser.add_argument('--symbols', type=int, nargs='+', default=[1, 10, 30], help='Symbol counts')
+    run_parser.add_argument('--strategies', nargs='+', default=list(STRATEGY_SETS),
+                            choices=list(STRATEGY_SETS), help='Strategy sets')
+    run_parser.add_argument('--days', type=int, default=2, help='Simulated days')
+    run_parser.add_argument('--history-days', type=int, default=10, help='Days of candle history before the start')
+    run_parser.add_argument('--seed', type=int, default=42, help='Synthetic data seed')
+    run_parser.add_argument('--ticks-per-hour', type=float, default=2000.0, help='Synthetic tick rate')
+    run_parser.add_argument('--no-streaming', action='store_true', help='Skip the streaming timeline cases')
+    run_parser.add_argument('--event-skipping', action='store_true', help='Replay with event skipping')
+    run_parser.add_argument('--no-isolate', action='store_true',
+                            help='Run cases in this process (faster, but peak RSS accumulates)')
+    run_parser.set_defaults(func=cmd_run)
+
+    compare_parser = subparsers.add_parser('compare', help='Compare two recorded commits')
+    compare_parser.add_argument('--baseline', help='Baseline commit (default: the one recorded before current)')
+    compare_parser.add_argument('--current', help='Current commit (default: latest recorded)')
+    compare_parser.add_argument('--threshold', type=float, default=0.10,
+                                help='Relative change flagged as regression (default: 0.10)')
+    compare_parser.set_defaults(func=cmd_compare)
+
+    list_parser = subparsers.add_parser('list', help='List recorded commits')
+    list_parser.set_defaults(func=cmd_list)
+
+    args = parser.parse_args()
+    sys.exit(args.func(args))
+
+
+if __name__ == '__main__':
+    main()
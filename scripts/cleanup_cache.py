@@ -8,15 +8,21 @@ Use this after upgrading to the new cache validation system.
 Usage:
     python scripts/cleanup_cache.py                    # Dry run (shows what would be deleted)
     python scripts/cleanup_cache.py --confirm          # Actually delete files
-    python scripts/cleanup_cache.py --stats            # Show cache statistics only
+    python scripts/cleanup_cache.py --stats            # Show cache statistics and coverage only
 """
 
 import argparse
 import shutil
+import sys
+import time
 from pathlib import Path
 from datetime import datetime
 import pyarrow.parquet as pq
 
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
 
 def get_cache_metadata(cache_file: Path) -> dict:
     """Read metadata from cache file."""
@@ -83,6 +89,35 @@ def print_statistics(stats: dict):
     print("="*60)
 
 
+def print_coverage(cache_dir: Path, ttl_days: int, workers: int):
+    """Print the ok/stale/missing day counts per symbol and timeframe."""
+    from src.backtesting.engine.cache_coverage import (
+        CacheCoverageValidator, MISSING, OK, STALE, summarize_coverage
+    )
+
+    validator = CacheCoverageValidator(str(cache_dir), cache_ttl_days=ttl_days, max_workers=workers)
+    symbols, data_keys, first_day, last_day = validator.scan()
+    if first_day is None:
+        print("\nNo cached days found")
+        return
+
+    start = time.time()
+    matrix = validator.coverage_matrix(sorted(symbols), sorted(data_keys), first_day, last_day)
+    counts = summarize_coverage(matrix)
+    elapsed = time.time() - start
+
+    print("\n" + "="*60)
+    print(f"📅 CACHE COVERAGE {first_day} → {last_day} (TTL: {ttl_days} days)")
+    print("="*60)
+    print(f"{'Symbol':<14}{'Data':<12}{'OK':>8}{'Stale':>8}{'Missing':>9}")
+    for (symbol, data_key), status_counts in sorted(counts.items()):
+        print(f"{symbol:<14}{data_key:<12}{status_counts[OK]:>8}{status_counts[STALE]:>8}"
+              f"{status_counts[MISSING]:>9}")
+    print("="*60)
+    print(f"Checked {sum(sum(c.values()) for c in counts.values())} symbol-days in {elapsed:.2f}s "
+          f"({workers} workers)")
+
+
 def cleanup_cache(cache_dir: Path, confirm: bool = False):
     """Clean up cache files without metadata."""
     stats = analyze_cache_directory(cache_dir)
@@ -170,7 +205,7 @@ def main():
 Examples:
   python scripts/cleanup_cache.py                    # Dry run (shows what would be deleted)
   python scripts/cleanup_cache.py --confirm          # Actually delete files
-  python scripts/cleanup_cache.py --stats            # Show statistics only
+  python scripts/cleanup_cache.py --stats            # Show statistics and coverage only
   python scripts/cleanup_cache.py --cache-dir ./data/cache  # Custom cache directory
         """
     )
@@ -194,6 +229,20 @@ Examples:
         help='Path to cache directory (default: data/cache)'
     )
     
+    parser.add_argument(
+        '--ttl-days',
+        type=int,
+        default=7,
+        help='Cache time-to-live used to mark days stale in --stats (default: 7)'
+    )
+
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=8,
+        help='Concurrent footer reads for --stats coverage (default: 8)'
+    )
+
     args = parser.parse_args()
     
     cache_dir = Path(args.cache_dir)
@@ -208,6 +257,7 @@ Examples:
     if args.stats:
         stats = analyze_cache_directory(cache_dir)
         print_statistics(stats)
+        print_coverage(cache_dir, args.ttl_days, args.workers)
     else:
         cleanup_cache(cache_dir, confirm=args.confirm)
 
@@ -6,11 +6,14 @@ Maintains the same concurrent architecture as live trading.
 """
 from typing import List, Dict, Optional
 from datetime import datetime, timezone
+import itertools
 import threading
 import sys
 
 from src.core.trading_controller import TradingController
 from src.backtesting.engine.simulated_broker import SimulatedBroker
+from src.backtesting.engine.equity_recorder import EquityRecorder
+from src.backtesting.engine.tick_timeline import ColumnarTickTimeline, TickCursor
 from src.backtesting.engine.time_controller import TimeController, TimeMode
 from src.backtesting.engine.mt5_monkey_patch import apply_mt5_patch, restore_mt5_functions
 from src.execution.order_manager import OrderManager
@@ -25,9 +28,6 @@ try:
     from rich.progress import Progress, SpinnerColumn, BarColumn, TextColumn, TimeRemainingColumn, TimeElapsedColumn
     from rich.console import Console, Group
     from rich.live import Live
-    from rich.table import Table
-    from rich.panel import Panel
-    from rich.text import Text
     RICH_AVAILABLE = True
 except ImportError:
     RICH_AVAILABLE = False
@@ -43,7 +43,12 @@ class BacktestController:
     - Maintains same threading model as live trading
     - Reuses existing strategies without modification
     """
-    
+
+    # Sequential Rich dashboard: ticks between published progress snapshots
+    # (power of two - checked with a bit mask) and renderer frames per second
+    PROGRESS_PUBLISH_INTERVAL = 1024
+    PROGRESS_FPS = 4
+
     def __init__(self,
                  simulated_broker: SimulatedBroker,
                  time_controller: TimeController,
@@ -51,7 +56,10 @@ class BacktestController:
                  risk_manager: RiskManager,
                  trade_manager: TradeManager,
                  indicators: TechnicalIndicators,
-                 stop_loss_threshold: float = 0.0):
+                 stop_loss_threshold: float = 0.0,
+                 symbol_persistence=None,
+                 equity_recorder: Optional[EquityRecorder] = None,
+                 profiler=None):
         """
         Initialize backtest controller.
 
@@ -63,6 +71,12 @@ class BacktestController:
             trade_manager: Trade manager instance
             indicators: Technical indicators instance
             stop_loss_threshold: Stop backtest if balance falls below this % of initial (0 = disabled)
+            symbol_persistence: Optional SymbolPerformancePersistence (default: TradingController's,
+                                stored in data/). Parallel runs pass one per run directory.
+            equity_recorder: Optional EquityRecorder (default: in-memory per-minute curve only,
+                             nothing spilled to disk)
+            profiler: Optional StageProfiler - samples per-stage wall time of the
+                      sequential tick loop (default: disabled)
         """
         self.logger = get_logger()
         self.broker = simulated_broker
@@ -75,6 +89,7 @@ class BacktestController:
             risk_manager=risk_manager,
             trade_manager=trade_manager,
             indicators=indicators,
+            symbol_persistence=symbol_persistence,
             time_controller=time_controller  # Pass TimeController for backtest synchronization
         )
 
@@ -87,7 +102,14 @@ class BacktestController:
         self.end_time: Optional[datetime] = None
 
         # Results tracking
-        self.equity_curve: List[Dict] = []
+        # MEMORY OPTIMIZATION: Equity snapshots and closed trades are streamed to the
+        # recorder (bounded buffers spilled to parquet, per-minute curve in memory)
+        self.equity_recorder = equity_recorder if equity_recorder is not None else EquityRecorder()
+        self.broker.trade_recorder = self.equity_recorder
+        self._next_equity_snapshot_ns = 0
+
+        # Sampled per-stage profiling of the sequential loop (None = disabled)
+        self.profiler = profiler
 
         # Early termination settings
         self.stop_loss_threshold = stop_loss_threshold
@@ -109,19 +131,39 @@ class BacktestController:
         # Sequential processing mode (for performance)
         self.sequential_mode = False  # Set to True to disable threading
 
+        # Event-skipping replay (sequential mode only, opt-in)
+        # Fast-forwards over ticks that cannot call a strategy or hit SL/TP
+        self.event_skipping = False
+
+        # Live Rich progress display in sequential mode (disabled in worker processes,
+        # which report progress through the logger instead)
+        self.show_progress = True
+
+        # Mid-run checkpoints (sequential mode): BacktestCheckpoint written by the
+        # tick loops, and the tick index a resumed run starts at
+        self.checkpoint = None
+        self.resume_tick_index = 0
+
         self.logger.info("BacktestController initialized")
 
-    def initialize(self, symbols: List[str]) -> bool:
+    def initialize(self, symbols: List[str], strategies: Optional[Dict] = None) -> bool:
         """
         Initialize backtest with symbols.
         
         Args:
             symbols: List of symbols to backtest
+            strategies: Already-initialized strategies (symbol -> strategy), e.g. from
+                        a WarmStartSnapshot. Skips strategy creation and initialize().
             
         Returns:
             True if initialization successful
         """
         self.symbols = symbols
+
+        if strategies is not None:
+            self.trading_controller.strategies.update(strategies)
+            self.logger.info(f"BacktestController restored {len(strategies)} initialized strategies")
+            return bool(strategies)
         
         # Initialize TradingController (this creates strategies)
         success = self.trading_controller.initialize(symbols)
@@ -275,6 +317,19 @@ class BacktestController:
             # Process ticks sequentially
             self._process_ticks_sequential(timeline, strategies)
 
+            # Close the equity curve with the final account state
+            self._record_equity_snapshot()
+
+            # Streaming mode: report how long the engine waited on background parquet decoding
+            if hasattr(timeline, 'get_statistics'):
+                stream_stats = timeline.get_statistics()
+                if stream_stats.get('prefetch_depth', 0) > 0:
+                    self.logger.info(
+                        f"Streaming prefetch: {stream_stats['prefetch_batches']:,} batches, "
+                        f"{stream_stats['prefetch_stalls']:,} stalls, "
+                        f"{stream_stats['prefetch_stall_seconds']:.2f}s waiting for decode"
+                    )
+
         finally:
             # Always restore MT5 functions after backtest
             restore_mt5_functions()
@@ -288,53 +343,259 @@ class BacktestController:
         Process ticks sequentially without threading.
 
         Args:
-            timeline: List of GlobalTick objects
+            timeline: ColumnarTickTimeline (or StreamingTickTimeline in streaming mode)
             strategies: Dict of symbol -> strategy
         """
         import time
         total_ticks = len(timeline)
         start_wall_time = time.time()
+        checkpoint = self.checkpoint
+        start_index = self.resume_tick_index
+        if start_index:
+            self.logger.info(f"Resuming at tick {start_index:,}/{total_ticks:,}")
+
+        # Equity snapshots every recorder interval of simulated time (first one on the first tick)
+        self._next_equity_snapshot_ns = 0 if self.equity_recorder is not None else sys.maxsize
+
+        # PERFORMANCE OPTIMIZATION: In lazy candle mode, only detect bar boundaries for
+        # timeframes a strategy reacts to. Tick-only strategies (no required timeframes)
+        # are called on every tick anyway, so they need no boundary detection at all.
+        for symbol, candle_builder in self.broker.candle_builders.items():
+            strategy = strategies.get(symbol)
+            required_tfs = None
+            if strategy is not None and hasattr(strategy, 'get_required_timeframes'):
+                required_tfs = strategy.get_required_timeframes()
+            elif strategy is not None:
+                required_tfs = candle_builder.timeframes  # Legacy strategy - keep all boundaries
+            candle_builder.set_subscribed_timeframes(required_tfs)
 
-        # Use Rich progress bar if available
-        if RICH_AVAILABLE:
-            self._process_ticks_sequential_with_rich(timeline, strategies, total_ticks, start_wall_time)
-        else:
-            self._process_ticks_sequential_plain(timeline, strategies, total_ticks, start_wall_time)
+        # Sampled per-stage timing (see StageProfiler) - wrappers only exist while profiling
+        profiler = self.profiler
+        if profiler is not None:
+            profiler.install(self, strategies)
+            self.logger.info(f"Stage profiling: sampling every {profiler.sample_every:,}th processed tick")
 
-    def _process_ticks_sequential_with_rich(self, timeline, strategies, total_ticks, start_wall_time):
-        """Process ticks with Rich progress display."""
-        import time
+        try:
+            # EVENT SKIPPING: Needs random access to the columnar timeline
+            if self.event_skipping:
+                if isinstance(timeline, ColumnarTickTimeline):
+                    self._process_ticks_event_skipping(timeline, strategies, total_ticks, start_wall_time,
+                                                       start_index, checkpoint, profiler)
+                    return
+                self.logger.warning("Event-skipping replay requires an in-memory tick timeline - "
+                                    "processing every tick (streaming mode)")
+
+            # Use Rich progress bar if available (headless runs - no terminal - log plain progress)
+            if RICH_AVAILABLE and self.show_progress and getattr(sys.stdout, 'isatty', lambda: False)():
+                self._process_ticks_sequential_with_rich(timeline, strategies, total_ticks, start_wall_time,
+                                                         start_index, checkpoint, profiler)
+            else:
+                self._process_ticks_sequential_plain(timeline, strategies, total_ticks, start_wall_time,
+                                                     start_index, checkpoint, profiler)
+        finally:
+            if profiler is not None:
+                profiler.uninstall()
+                for line in profiler.report().splitlines():
+                    self.logger.info(line)
 
-        # Create Rich progress bar
-        progress = Progress(
-            SpinnerColumn(),
-            TextColumn("[bold blue]{task.description}"),
-            BarColumn(complete_style="green", finished_style="bold green"),
-            TextColumn("[progress.percentage]{task.percentage:>3.0f}%"),
-            TimeElapsedColumn(),
-            TextColumn("•"),
-            TimeRemainingColumn(),
-        )
+    def _iter_timeline(self, timeline, start_index: int):
+        """
+        Enumerate the timeline from start_index on (resumed runs).
 
-        task = progress.add_task("Processing ticks", total=total_ticks)
-        console = Console()
+        Args:
+            timeline: ColumnarTickTimeline or StreamingTickTimeline
+            start_index: Index of the first tick
 
-        # PERFORMANCE OPTIMIZATION #8: Pre-compute required timeframes for each strategy
-        # This avoids calling hasattr() and get_required_timeframes() on every tick
-        # PERFORMANCE OPTIMIZATION #13: Combine strategy and timeframes into single dict
-        # This reduces dictionary lookups from 2 to 1 per tick
+        Returns:
+            Iterator of (tick_idx, tick)
+        """
+        if not start_index:
+            return enumerate(timeline)
+        if isinstance(timeline, ColumnarTickTimeline):
+            return enumerate(timeline.iter_from(start_index), start_index)
+        # Streaming timeline: skipped ticks are still decoded, but not processed
+        return enumerate(itertools.islice(iter(timeline), start_index, None), start_index)
+
+    def _build_strategy_info(self, strategies, honor_every_tick: bool = False) -> Dict:
+        """
+        Pre-compute when each symbol's strategy must be called.
+
+        PERFORMANCE OPTIMIZATION #8: Avoids calling hasattr() and
+        get_required_timeframes() on every tick.
+
+        Args:
+            strategies: Dict of symbol -> strategy
+            honor_every_tick: Call strategies whose requires_every_tick() returns
+                              True on every tick (event-skipping replay only -
+                              the full tick loops keep bar-driven calls)
+
+        Returns:
+            Dict of symbol -> (strategy, required_timeframes_set). The set is None
+            when the strategy is called on every tick (tick-only, legacy, or
+            honor_every_tick and requires_every_tick() returns True).
+        """
         strategy_info = {}  # symbol -> (strategy, required_timeframes_set)
         for symbol, strategy in strategies.items():
             if hasattr(strategy, 'get_required_timeframes'):
                 required_tfs = strategy.get_required_timeframes()
                 required_tfs_set = set(required_tfs) if required_tfs else None
+                if honor_every_tick and hasattr(strategy, 'requires_every_tick') and strategy.requires_every_tick():
+                    required_tfs_set = None  # Strategy opted out of event skipping
             else:
                 required_tfs_set = None  # Legacy strategy - call on every tick
             strategy_info[symbol] = (strategy, required_tfs_set)
+        return strategy_info
+
+    def _process_ticks_event_skipping(self, timeline, strategies, total_ticks, start_wall_time,
+                                      start_index=0, checkpoint=None, profiler=None):
+        """
+        Process only ticks that can change the backtest (event-skipping replay).
+
+        PERFORMANCE OPTIMIZATION: Uses EventSkipIndex to jump from one event tick
+        to the next - new bars of a strategy's required timeframes, ticks of
+        symbols whose strategy needs every tick, and ticks reaching an SL/TP
+        trigger level. Ticks in between are fast-forwarded in bulk (candle
+        builders, current_ticks). Event ticks are processed exactly like the
+        full tick loop, so results are identical.
+
+        Equity snapshots stay on the recorder interval: the first tick at or
+        after each due snapshot time is processed like an event tick (no
+        strategy call unless it is also a bar event), so the equity curve
+        matches the full tick loop.
+
+        Progress is logged as plain text. Checkpoints are written after event
+        ticks (all skipped ticks before them are fast-forwarded by then).
+        """
+        import time
+        from src.backtesting.engine.event_skipping import EventSkipIndex
+
+        strategy_info = self._build_strategy_info(strategies, honor_every_tick=True)
+
+        every_tick_symbols = [s for s, (_, tfs) in strategy_info.items() if tfs is None]
+        symbol_timeframes = {s: tfs for s, (_, tfs) in strategy_info.items() if tfs is not None}
+        skip_index = EventSkipIndex(self.broker, timeline, every_tick_symbols, symbol_timeframes)
+
+        self.logger.info(
+            f"Event-skipping replay: {len(skip_index.static_events):,} bar/tick events "
+            f"in {total_ticks:,} ticks (every tick for: {', '.join(every_tick_symbols) or 'none'})"
+        )
+
+        cursor = TickCursor()
+        progress_interval = max(1, total_ticks // 1000)  # Log every 0.1%
+        last_progress_print = start_index
+        tick_idx = start_index
+
+        # Stage profiling counts processed event ticks (decode time includes fast-forwarding)
+        sample_at, mark_at = profiler.first_sample(0) if profiler is not None else (-1, sys.maxsize)
+
+        while tick_idx < total_ticks:
+            event_idx = min(skip_index.next_event(tick_idx),
+                            skip_index.next_time_event(tick_idx, self._next_equity_snapshot_ns))
+            if event_idx > tick_idx:
+                skip_index.fast_forward(tick_idx, event_idx)
+            if event_idx >= total_ticks:
+                break
+
+            tick = timeline.read_into(event_idx, cursor)
+            if skip_index.events_processed == sample_at:
+                profiler.begin_sample()
+            new_candles = self._advance_tick_sequential(tick, event_idx, build_candles=True)
+            skip_index.events_processed += 1
+
+            info = strategy_info.get(tick.symbol)
+            if info:
+                strategy, required_timeframes = info
+                if required_timeframes is None:
+                    should_call = True
+                elif new_candles:
+                    should_call = bool(new_candles.intersection(required_timeframes))
+                else:
+                    should_call = False
+
+                if should_call:
+                    try:
+                        strategy.on_tick()
+                    except Exception as e:
+                        self.logger.error(f"Error in strategy.on_tick() for {tick.symbol}: {e}")
+                        import traceback
+                        self.logger.error(f"Traceback: {traceback.format_exc()}")
+
+            # Check for early termination (balance only changes on event ticks)
+            if self.stop_loss_threshold > 0:
+                if self.broker.balance < self.stop_loss_balance_threshold:
+                    self.logger.warning("=" * 60)
+                    self.logger.warning("STOP LOSS THRESHOLD HIT!")
+                    self.logger.warning(f"Balance: ${self.broker.balance:.2f} < Threshold: ${self.stop_loss_balance_threshold:.2f}")
+                    self.logger.warning(f"Terminating backtest early at tick {event_idx+1:,}/{total_ticks:,}")
+                    self.logger.warning("=" * 60)
+                    self.stop_loss_triggered = True
+                    break
+
+            tick_idx = event_idx + 1
+
+            if checkpoint is not None and checkpoint.due(tick_idx):
+                checkpoint.save(tick_idx)
+
+            # Progress reporting
+            if tick_idx - last_progress_print >= progress_interval:
+                elapsed = time.time() - start_wall_time
+                ticks_per_sec = (tick_idx - start_index) / elapsed if elapsed > 0 else 0
+                eta_sec = (total_ticks - tick_idx) / ticks_per_sec if ticks_per_sec > 0 else 0
+
+                self.logger.info(
+                    f"Progress: {tick_idx / total_ticks * 100:.1f}% ({tick_idx:,}/{total_ticks:,} ticks) | "
+                    f"Speed: {ticks_per_sec:,.0f} ticks/sec | "
+                    f"ETA: {eta_sec:.0f}s | "
+                    f"Balance: ${self.broker.balance:.2f}"
+                )
+                last_progress_print = tick_idx
+
+            if skip_index.events_processed > mark_at:
+                sample_at, mark_at = profiler.tick_end(skip_index.events_processed - 1)
+
+        # Final stats
+        elapsed = time.time() - start_wall_time
+        ticks_per_sec = total_ticks / elapsed if elapsed > 0 else 0
+
+        # Flush any remaining SL/TP logs
+        self.broker.flush_sl_tp_logs()
+
+        self.logger.info("=" * 60)
+        self.logger.info("Event-skipping processing complete!")
+        self.logger.info(f"Total ticks: {total_ticks:,}")
+        self.logger.info(f"Event ticks processed: {skip_index.events_processed:,}")
+        self.logger.info(f"Ticks fast-forwarded: {skip_index.ticks_skipped:,}")
+        self.logger.info(f"Wall time: {elapsed:.1f}s")
+        self.logger.info(f"Average speed: {ticks_per_sec:,.0f} ticks/sec")
+        self.logger.info("=" * 60)
+
+    def _process_ticks_sequential_with_rich(self, timeline, strategies, total_ticks, start_wall_time,
+                                            start_index=0, checkpoint=None, profiler=None):
+        """
+        Process ticks with the Rich dashboard.
+
+        PERFORMANCE OPTIMIZATION: The loop only publishes a ProgressSnapshot (plain
+        numbers and tuples) every PROGRESS_PUBLISH_INTERVAL ticks; a ProgressRenderer
+        thread builds and draws the Rich renderables at a fixed frame rate.
+        """
+        import time
+        from src.backtesting.engine.progress_display import ProgressRenderer
+
+        # PERFORMANCE OPTIMIZATION #8: Pre-compute required timeframes for each strategy
+        # PERFORMANCE OPTIMIZATION #13: Combine strategy and timeframes into single dict
+        strategy_info = self._build_strategy_info(strategies)
+
+        publish_mask = self.PROGRESS_PUBLISH_INTERVAL - 1
+        renderer = ProgressRenderer(total_ticks, start_index, fps=self.PROGRESS_FPS)
+        renderer.snapshot = self._progress_snapshot(start_index)
+        renderer.start()
+        sample_at, mark_at = profiler.first_sample(start_index) if profiler is not None else (-1, sys.maxsize)
+        tick_idx = start_index - 1
+        try:
+            for tick_idx, tick in self._iter_timeline(timeline, start_index):
+                if tick_idx == sample_at:
+                    profiler.begin_sample()
 
-        # Use Live display for progress + positions table
-        with Live(console=console, refresh_per_second=2, transient=False) as live:
-            for tick_idx, tick in enumerate(timeline):
                 # Advance time and build candles on EVERY tick for accuracy
                 # Returns set of timeframes that had new candles formed
                 new_candles = self._advance_tick_sequential(tick, tick_idx, build_candles=True)
@@ -376,41 +637,18 @@ class BacktestController:
                         self.stop_loss_triggered = True
                         break
 
-                # PERFORMANCE OPTIMIZATION #18: Update progress and display together
-                # Only update every 1000 ticks instead of every tick
-                if tick_idx % 1000 == 0 or tick_idx == total_ticks - 1:
-                    # Update progress bar
-                    progress.update(task, completed=tick_idx + 1)
-                    # Create positions table
-                    positions_table = self._create_positions_table()
-
-                    # Create stats panel
-                    elapsed = time.time() - start_wall_time
-                    ticks_per_sec = (tick_idx + 1) / elapsed if elapsed > 0 else 0
-
-                    # Get current simulated time
-                    current_sim_time = self.broker.current_time
-                    time_str = current_sim_time.strftime('%Y-%m-%d %H:%M:%S') if current_sim_time else "N/A"
-
-                    # Calculate equity (balance + floating P&L)
-                    equity = self.broker.get_account_equity()
-
-                    stats_text = Text()
-                    stats_text.append(f"Time: {time_str} UTC  ", style="bold white")
-                    stats_text.append(f"Balance: ${self.broker.balance:,.2f}  ", style="bold green")
-                    stats_text.append(f"Equity: ${equity:,.2f}  ", style="bold cyan")
-                    stats_text.append(f"Speed: {ticks_per_sec:,.0f} ticks/sec", style="bold yellow")
-
-                    stats_panel = Panel(stats_text, title="[bold]Backtest Stats[/bold]", border_style="blue")
-
-                    # Combine progress, stats, and positions
-                    display_group = Group(
-                        progress,
-                        stats_panel,
-                        positions_table
-                    )
+                if checkpoint is not None and checkpoint.due(tick_idx + 1):
+                    checkpoint.save(tick_idx + 1)
+
+                # Publish state for the renderer thread (no display work here)
+                if (tick_idx & publish_mask) == 0:
+                    renderer.snapshot = self._progress_snapshot(tick_idx + 1)
 
-                    live.update(display_group)
+                if tick_idx >= mark_at:
+                    sample_at, mark_at = profiler.tick_end(tick_idx)
+        finally:
+            renderer.snapshot = self._progress_snapshot(tick_idx + 1)
+            renderer.stop()
 
         # Final stats
         elapsed = time.time() - start_wall_time
@@ -426,26 +664,25 @@ class BacktestController:
         self.logger.info(f"Average speed: {ticks_per_sec:,.0f} ticks/sec")
         self.logger.info("=" * 60)
 
-    def _process_ticks_sequential_plain(self, timeline, strategies, total_ticks, start_wall_time):
+    def _process_ticks_sequential_plain(self, timeline, strategies, total_ticks, start_wall_time,
+                                        start_index=0, checkpoint=None, profiler=None):
         """Process ticks with plain text progress (fallback when Rich not available)."""
         import time
 
         # PERFORMANCE OPTIMIZATION #8: Pre-compute required timeframes for each strategy
         # PERFORMANCE OPTIMIZATION #13: Combine strategy and timeframes into single dict
-        strategy_info = {}  # symbol -> (strategy, required_timeframes_set)
-        for symbol, strategy in strategies.items():
-            if hasattr(strategy, 'get_required_timeframes'):
-                required_tfs = strategy.get_required_timeframes()
-                required_tfs_set = set(required_tfs) if required_tfs else None
-            else:
-                required_tfs_set = None  # Legacy strategy - call on every tick
-            strategy_info[symbol] = (strategy, required_tfs_set)
+        strategy_info = self._build_strategy_info(strategies)
 
         # Progress tracking
-        last_progress_print = 0
+        last_progress_print = start_index
         progress_interval = max(1, total_ticks // 1000)  # Print every 0.1%
 
-        for tick_idx, tick in enumerate(timeline):
+        sample_at, mark_at = profiler.first_sample(start_index) if profiler is not None else (-1, sys.maxsize)
+
+        for tick_idx, tick in self._iter_timeline(timeline, start_index):
+            if tick_idx == sample_at:
+                profiler.begin_sample()
+
             # Advance time and build candles on EVERY tick for accuracy
             # Returns set of timeframes that had new candles formed
             new_candles = self._advance_tick_sequential(tick, tick_idx, build_candles=True)
@@ -491,11 +728,14 @@ class BacktestController:
                     self.stop_loss_triggered = True
                     break
 
+            if checkpoint is not None and checkpoint.due(tick_idx + 1):
+                checkpoint.save(tick_idx + 1)
+
             # Progress reporting
             if tick_idx - last_progress_print >= progress_interval or tick_idx == total_ticks - 1:
                 progress_pct = (tick_idx + 1) / total_ticks * 100
                 elapsed = time.time() - start_wall_time
-                ticks_per_sec = (tick_idx + 1) / elapsed if elapsed > 0 else 0
+                ticks_per_sec = (tick_idx + 1 - start_index) / elapsed if elapsed > 0 else 0
                 eta_sec = (total_ticks - tick_idx - 1) / ticks_per_sec if ticks_per_sec > 0 else 0
 
                 self.logger.info(
@@ -506,6 +746,9 @@ class BacktestController:
                 )
                 last_progress_print = tick_idx
 
+            if tick_idx >= mark_at:
+                sample_at, mark_at = profiler.tick_end(tick_idx)
+
         # Final stats
         elapsed = time.time() - start_wall_time
         ticks_per_sec = total_ticks / elapsed if elapsed > 0 else 0
@@ -528,7 +771,8 @@ class BacktestController:
         advance_global_time_tick_by_tick() that skips thread synchronization.
 
         Args:
-            tick: GlobalTick object
+            tick: TickCursor from the columnar or streaming timeline. The cursor
+                  is reused between ticks, so it must not be stored.
             tick_idx: Current tick index
             build_candles: Whether to build candles from this tick (default: True)
 
@@ -541,16 +785,17 @@ class BacktestController:
         broker = self.broker
 
         # Update broker time (no lock needed in sequential mode)
-        tick_time = tick.time
-        broker.current_time = tick_time
-        broker.current_time_snapshot = tick_time
+        # PERFORMANCE OPTIMIZATION: Time stays int64 epoch-ns here - datetimes are
+        # only built when someone reads broker.current_time / tick.time
+        time_ns = tick.time_ns
+        broker.current_time_ns = time_ns
         broker.current_tick_symbol = tick.symbol
         broker.global_tick_index = tick_idx + 1
 
         # Update current tick for this symbol
         symbol = tick.symbol
         broker.current_ticks[symbol] = TickData(
-            time=tick_time,
+            time_ns=time_ns,
             bid=tick.bid,
             ask=tick.ask,
             last=tick.last,
@@ -564,10 +809,14 @@ class BacktestController:
             candle_builder = broker.candle_builders.get(symbol)
             if candle_builder:
                 price = tick.last if tick.last > 0 else tick.bid
-                new_candles = candle_builder.add_tick(price, tick.volume, tick_time)
+                new_candles = candle_builder.add_tick_ns(price, tick.volume, time_ns)
 
         # Check SL/TP for this symbol's positions
-        broker._check_sl_tp_for_tick(symbol, tick, tick_time)
+        broker._check_sl_tp_for_tick(symbol, tick)
+
+        # Equity curve snapshot (once per recorder interval of simulated time)
+        if time_ns >= self._next_equity_snapshot_ns:
+            self._record_equity_snapshot(time_ns)
 
         return new_candles
 
@@ -765,7 +1014,7 @@ class BacktestController:
         total_trades = len(closed_trades)
 
         # Calculate live metrics
-        metrics = self._calculate_live_metrics(stats, closed_trades)
+        metrics = self._calculate_live_metrics()
 
         # Format profit with color indicator
         profit = stats['profit']
@@ -792,171 +1041,68 @@ class BacktestController:
         if not RICH_AVAILABLE:
             return ""
 
-        from datetime import datetime
+        from src.backtesting.engine.progress_display import build_positions_table, position_rows
 
-        # Get open positions from broker
-        positions = self.broker.get_positions()
-
-        # Create table
-        table = Table(
-            title=f"📊 Open Positions ({len(positions)})",
-            show_header=True,
-            header_style="bold cyan",
-            border_style="blue",
-            title_style="bold white",
-            show_lines=False,
-            padding=(0, 1)
-        )
-
-        # Add columns
-        table.add_column("Ticket", style="cyan", width=8, justify="right")
-        table.add_column("Symbol", style="white", width=10)
-        table.add_column("Type", style="white", width=5)
-        table.add_column("Entry", style="white", width=10, justify="right")
-        table.add_column("Current", style="white", width=10, justify="right")
-        table.add_column("P&L", style="white", width=12, justify="right")
-        table.add_column("SL", style="yellow", width=10, justify="right")
-        table.add_column("TP", style="green", width=10, justify="right")
-        table.add_column("Time", style="white", width=10)
-
-        # If no positions, show empty message
-        if not positions:
-            table.add_row("—", "—", "—", "—", "—", "—", "—", "—", "—")
-            return table
-
-        # Sort positions by open time (newest first)
-        sorted_positions = sorted(positions, key=lambda p: p.open_time, reverse=True)
-
-        # Limit to most recent 10 positions to avoid cluttering the display
-        display_positions = sorted_positions
-
-        # Get current time for duration calculation
-        current_time = self.broker.get_current_time()
-
-        # Add rows for each position
-        for pos in display_positions:
-            # Calculate time held
-            if current_time and pos.open_time:
-                time_held = current_time - pos.open_time
-                hours = int(time_held.total_seconds() // 3600)
-                minutes = int((time_held.total_seconds() % 3600) // 60)
-                time_str = f"{hours}h{minutes}m" if hours > 0 else f"{minutes}m"
-            else:
-                time_str = "—"
-
-            # Color code P&L
-            profit = pos.profit
-            if profit > 0:
-                pnl_str = f"[green]+${profit:,.2f}[/green]"
-            elif profit < 0:
-                pnl_str = f"[red]${profit:,.2f}[/red]"
-            else:
-                pnl_str = f"${profit:,.2f}"
-
-            # Format position type
-            pos_type = "BUY" if pos.position_type.name == "BUY" else "SELL"
-            type_color = "green" if pos_type == "BUY" else "red"
-
-            # Format SL/TP
-            sl_str = f"{pos.sl:.5f}" if pos.sl > 0 else "—"
-            tp_str = f"{pos.tp:.5f}" if pos.tp > 0 else "—"
-
-            table.add_row(
-                f"{pos.ticket}",
-                pos.symbol,
-                f"[{type_color}]{pos_type}[/{type_color}]",
-                f"{pos.open_price:.5f}",
-                f"{pos.current_price:.5f}",
-                pnl_str,
-                sl_str,
-                tp_str,
-                time_str
-            )
-
-        return table
-
-    def _record_equity_snapshot(self):
-        """Record current equity for equity curve."""
-        stats = self.broker.get_statistics()
-        current_time = self.broker.get_current_time()
+        return build_positions_table(position_rows(self.broker.get_positions()), self.broker.get_current_time())
 
-        snapshot = {
-            'time': current_time,
-            'balance': stats['balance'],
-            'equity': stats['equity'],
-            'profit': stats['profit'],
-            'open_positions': stats['open_positions'],
-        }
-
-        self.equity_curve.append(snapshot)
-
-    def _calculate_live_metrics(self, stats: Dict, closed_trades: List[Dict]) -> Dict:
+    def _progress_snapshot(self, tick_index: int):
         """
-        Calculate live trading metrics during backtest.
+        Capture the state shown by the sequential dashboard.
 
         Args:
-            stats: Current broker statistics
-            closed_trades: List of closed trades
+            tick_index: Ticks processed so far
 
         Returns:
-            Dictionary with calculated metrics
+            ProgressSnapshot (plain values only - safe to hand to the renderer thread)
         """
-        metrics = {
-            'win_rate': 0.0,
-            'profit_factor': 0.0,
-            'avg_win': 0.0,
-            'avg_loss': 0.0,
-            'total_wins': 0,
-            'total_losses': 0,
-            'sharpe_ratio': 0.0,
-            'max_drawdown': 0.0,
-        }
+        from src.backtesting.engine.progress_display import ProgressSnapshot, position_rows
 
-        if not closed_trades:
-            return metrics
-
-        # Calculate win/loss statistics
-        profits = [trade.get('profit', 0) for trade in closed_trades]
-        winning_trades = [p for p in profits if p > 0]
-        losing_trades = [p for p in profits if p < 0]
-
-        metrics['total_wins'] = len(winning_trades)
-        metrics['total_losses'] = len(losing_trades)
-        total_trades = len(profits)
-
-        if total_trades > 0:
-            metrics['win_rate'] = (metrics['total_wins'] / total_trades) * 100
-
-        if winning_trades:
-            metrics['avg_win'] = sum(winning_trades) / len(winning_trades)
+        broker = self.broker
+        positions = broker.get_positions()  # Refreshes floating P&L
+        metrics = broker.performance_metrics
+        return ProgressSnapshot(
+            tick_index=tick_index,
+            time_ns=broker.current_time_ns,
+            balance=broker.balance,
+            equity=broker.balance + sum(pos.profit for pos in positions),
+            closed_trades=metrics.total_trades,
+            wins=metrics.wins,
+            losses=metrics.losses,
+            positions=position_rows(positions),
+        )
 
-        if losing_trades:
-            metrics['avg_loss'] = abs(sum(losing_trades) / len(losing_trades))
+    def _record_equity_snapshot(self, time_ns: Optional[int] = None):
+        """
+        Record current equity for equity curve.
 
-        # Calculate profit factor
-        if losing_trades:
-            metrics['profit_factor'] = sum(winning_trades) / abs(sum(losing_trades))
-        elif winning_trades:
-            metrics['profit_factor'] = float('inf')
+        Args:
+            time_ns: Simulated time of the snapshot (default: broker's current time)
+        """
+        if time_ns is None:
+            time_ns = self.broker.current_time_ns
+            if time_ns is None:
+                return
+        time_ns = int(time_ns)
+        stats = self.broker.get_statistics()
 
-        # Calculate Sharpe ratio from equity curve
-        if len(self.equity_curve) > 1:
-            import numpy as np
-            equity_values = [snapshot['equity'] for snapshot in self.equity_curve]
-            returns = np.diff(equity_values) / equity_values[:-1]
+        recorder = self.equity_recorder
+        recorder.record(time_ns, stats['balance'], stats['equity'], stats['profit'], stats['open_positions'])
+        self.broker.performance_metrics.add_equity(stats['equity'])
+        self._next_equity_snapshot_ns = recorder.next_due_ns(time_ns)
 
-            if len(returns) > 0 and np.std(returns) > 0:
-                metrics['sharpe_ratio'] = np.mean(returns) / np.std(returns) * np.sqrt(252)
+    def _calculate_live_metrics(self) -> Dict:
+        """
+        Get live trading metrics during backtest.
 
-        # Calculate maximum drawdown
-        if len(self.equity_curve) > 1:
-            import numpy as np
-            equity_values = [snapshot['equity'] for snapshot in self.equity_curve]
-            running_max = np.maximum.accumulate(equity_values)
-            drawdown = (equity_values - running_max) / running_max * 100.0
-            metrics['max_drawdown'] = abs(min(drawdown))
+        PERFORMANCE OPTIMIZATION: Read in O(1) from the broker's incremental
+        performance_metrics (updated once per closed trade and equity snapshot)
+        instead of recomputing over all trades and the whole equity curve.
 
-        return metrics
+        Returns:
+            Dictionary with win rate, profit factor, average win/loss, win/loss
+            counts, Sharpe ratio and maximum drawdown
+        """
+        return self.broker.performance_metrics.live_metrics()
 
     def _print_progress_to_console(self):
         """
@@ -1025,7 +1171,7 @@ class BacktestController:
                         eta_display = " | ETA: calculating..."
 
             # Calculate live metrics
-            metrics = self._calculate_live_metrics(stats, closed_trades)
+            metrics = self._calculate_live_metrics()
 
             # Check for positions without SL (diagnostic)
             # Note: TP can be 0.0 legitimately (e.g., after trailing stop removes it)
@@ -1087,7 +1233,7 @@ class BacktestController:
             progress_pct = (current_idx / total_bars * 100) if total_bars > 0 else 0
 
             # Calculate live metrics
-            metrics = self._calculate_live_metrics(stats, closed_trades)
+            metrics = self._calculate_live_metrics()
 
             # Format profit factor
             pf_display = f"{metrics['profit_factor']:.2f}" if metrics['profit_factor'] != float('inf') else "∞"
@@ -1140,14 +1286,21 @@ class BacktestController:
         # Get closed trades from broker
         closed_trades = self.broker.get_closed_trades()
 
+        # Write the recorder's buffered rows (spilled files are complete from here on)
+        recorder = self.equity_recorder
+        recorder.close()
+
         return {
             'final_balance': stats['balance'],
             'final_equity': stats['equity'],
             'total_profit': stats['profit'],
             'profit_percent': stats['profit_percent'],
             'open_positions': stats['open_positions'],
-            'equity_curve': self.equity_curve,
+            'equity_curve': recorder.curve(),  # Per-minute curve
+            'equity_curve_path': str(recorder.equity_path) if recorder.equity_path else None,
             'trade_log': closed_trades,  # Use actual closed trades from broker
+            'trade_log_path': str(recorder.trades_path) if recorder.trades_path else None,
+            'metrics': self.broker.performance_metrics,  # OnlineMetrics over all snapshots and trades
         }
 
     def stop(self):
@@ -10,15 +10,20 @@ PERFORMANCE OPTIMIZATION:
 - Thread-safe: Supports parallel day loading with proper locking
 - Polars CSV parser: 2-3x faster than pandas for large CSV files (if available)
 - Parquet pre-conversion: Automatically converts archives to Parquet for 10-50x faster subsequent loads
+- Streaming pipeline: Archives are downloaded to disk in chunks and their CSV is
+  parsed in batches split by UTC day, so peak memory is bounded by the batch
+  size (plus the day being assembled) instead of holding the archive 3 times
 """
 import requests
 import zipfile
 import io
+import os
+import tempfile
 import time
 import re
 import threading
 from pathlib import Path
-from typing import Optional, Tuple, Dict
+from typing import Optional, Tuple, Dict, Iterator, Union, BinaryIO
 from datetime import datetime, timedelta, timezone
 from urllib.parse import urlparse
 import pandas as pd
@@ -32,6 +37,7 @@ except ImportError:
     POLARS_AVAILABLE = False
 
 from src.config.configs.tick_archive_config import TickArchiveConfig
+from src.backtesting.engine.tick_encoding import write_tick_table
 from src.utils.logger import get_logger
 
 
@@ -51,14 +57,16 @@ class BrokerArchiveDownloader:
     - Thread-safe for parallel day loading
     """
 
-    def __init__(self, config: TickArchiveConfig):
+    def __init__(self, config: TickArchiveConfig, compact_tick_encoding: bool = False):
         """
         Initialize broker archive downloader.
 
         Args:
             config: Tick archive configuration
+            compact_tick_encoding: Write day cache files in the compact integer encoding
         """
         self.config = config
+        self.compact_tick_encoding = compact_tick_encoding
         self.logger = get_logger()
 
         # Create archive cache directory if it doesn't exist
@@ -184,62 +192,204 @@ class BrokerArchiveDownloader:
                 f"Got month={month}, day={day}"
             )
     
-    def download_archive(self, url: str, symbol: str, year: int) -> Optional[bytes]:
+    def download_archive_to_file(self, url: str, symbol: str, year: int, target_path: Path) -> bool:
         """
-        Download tick data archive from URL with retry logic.
-        
+        Download tick data archive to a file with retry logic.
+
+        The response is streamed to '<target>.part' in chunks of
+        config.download_chunk_bytes and renamed to target_path once complete,
+        so the archive is never held in memory and an interrupted download
+        never leaves a truncated archive behind.
+
         Args:
             url: Archive download URL
             symbol: Symbol name (for logging)
             year: Year (for logging)
-            
+            target_path: Destination file
+
         Returns:
-            Archive file content as bytes, or None if download failed
+            True if the archive was downloaded, False otherwise
         """
         self.logger.info(f"  Downloading tick archive: {symbol} {year}")
         self.logger.info(f"    URL: {url}")
-        
+
+        target_path = Path(target_path)
+        target_path.parent.mkdir(parents=True, exist_ok=True)
+        part_path = target_path.with_name(target_path.name + '.part')
+
         for attempt in range(1, self.config.max_retries + 1):
             try:
-                response = requests.get(
-                    url,
-                    timeout=self.config.download_timeout_seconds,
-                    stream=True
-                )
-                
-                if response.status_code == 200:
-                    # Get total size if available
-                    total_size = int(response.headers.get('content-length', 0))
-                    if total_size > 0:
-                        self.logger.info(f"    Archive size: {total_size / 1024 / 1024:.1f} MB")
-                    
-                    # Download content
-                    content = response.content
-                    self.logger.info(f"  ✓ Download successful ({len(content) / 1024 / 1024:.1f} MB)")
-                    return content
-                    
-                elif response.status_code == 404:
-                    self.logger.info(f"  Archive not found (HTTP 404)")
-                    return None
-                    
-                else:
-                    self.logger.warning(f"  Download failed: HTTP {response.status_code}")
-                    
+                with requests.get(url, timeout=self.config.download_timeout_seconds, stream=True) as response:
+                    if response.status_code == 200:
+                        # Get total size if available
+                        total_size = int(response.headers.get('content-length', 0))
+                        if total_size > 0:
+                            self.logger.info(f"    Archive size: {total_size / 1024 / 1024:.1f} MB")
+
+                        # Stream content to disk
+                        downloaded = 0
+                        with open(part_path, 'wb') as f:
+                            for chunk in response.iter_content(chunk_size=self.config.download_chunk_bytes):
+                                f.write(chunk)
+                                downloaded += len(chunk)
+                        os.replace(part_path, target_path)
+                        self.logger.info(f"  ✓ Download successful ({downloaded / 1024 / 1024:.1f} MB)")
+                        return True
+
+                    elif response.status_code == 404:
+                        self.logger.info("  Archive not found (HTTP 404)")
+                        return False
+
+                    else:
+                        self.logger.warning(f"  Download failed: HTTP {response.status_code}")
+
             except requests.exceptions.Timeout:
                 self.logger.warning(f"  Download timeout (attempt {attempt}/{self.config.max_retries})")
-                
+
             except requests.exceptions.RequestException as e:
                 self.logger.warning(f"  Download error (attempt {attempt}/{self.config.max_retries}): {e}")
-            
+
+            finally:
+                if part_path.exists():
+                    part_path.unlink()
+
             # Retry delay (except on last attempt)
             if attempt < self.config.max_retries:
                 self.logger.info(f"  Retrying in {self.config.retry_delay_seconds} seconds...")
                 time.sleep(self.config.retry_delay_seconds)
-        
+
         self.logger.warning(f"  Failed to download archive after {self.config.max_retries} attempts")
+        return False
+
+    def download_archive(self, url: str, symbol: str, year: int) -> Optional[bytes]:
+        """
+        Download tick data archive from URL with retry logic.
+
+        Loads the whole archive into memory; prefer download_archive_to_file().
+
+        Args:
+            url: Archive download URL
+            symbol: Symbol name (for logging)
+            year: Year (for logging)
+
+        Returns:
+            Archive file content as bytes, or None if download failed
+        """
+        with tempfile.TemporaryDirectory() as temp_dir:
+            target_path = Path(temp_dir) / "archive.zip"
+            if not self.download_archive_to_file(url, symbol, year, target_path):
+                return None
+            return target_path.read_bytes()
+
+    def _find_data_file(self, zf: zipfile.ZipFile) -> Optional[str]:
+        """Name of the CSV/TXT member to parse (the largest if there are several)."""
+        file_list = zf.namelist()
+        self.logger.debug(f"    Archive contains {len(file_list)} file(s)")
+
+        data_files = [f for f in file_list if f.endswith('.csv') or f.endswith('.txt')]
+        if not data_files:
+            self.logger.warning("  No CSV/TXT files found in archive")
+            return None
+        return max(data_files, key=lambda f: zf.getinfo(f).file_size)
+
+    @staticmethod
+    def _detect_delimiter(header: bytes) -> Optional[str]:
+        """First of ',', ';', tab, space that splits the header line into at least 3 columns."""
+        line = header.decode('utf-8', errors='ignore').strip()
+        for delimiter in [',', ';', '\t', ' ']:
+            if len(line.split(delimiter)) >= 3:  # Need at least time, bid, ask
+                return delimiter
         return None
-    
 
+    def iter_archive_batches(self, archive: Union[str, Path, BinaryIO], symbol: str,
+                             batch_rows: Optional[int] = None) -> Iterator[pd.DataFrame]:
+        """
+        Stream cleaned tick batches from a ZIP archive's CSV.
+
+        The CSV member is decompressed and parsed incrementally, batch_rows
+        rows at a time, so memory use is bounded by the batch size.
+
+        Args:
+            archive: ZIP file path (or seekable binary file object)
+            symbol: Symbol name (for logging)
+            batch_rows: Rows per batch (default: config.csv_batch_rows)
+
+        Yields:
+            DataFrames with columns time (UTC), bid, ask, volume, sorted by time
+            within the batch
+        """
+        batch_rows = batch_rows or self.config.csv_batch_rows
+
+        try:
+            with zipfile.ZipFile(archive) as zf:
+                data_file = self._find_data_file(zf)
+                if data_file is None:
+                    return
+
+                self.logger.debug(f"    Streaming file: {data_file} ({batch_rows:,} rows per batch)")
+                with zf.open(data_file) as f:
+                    delimiter = self._detect_delimiter(f.readline())
+                if delimiter is None:
+                    self.logger.warning("  Could not parse CSV with any delimiter")
+                    return
+
+                with zf.open(data_file) as f:
+                    for chunk in pd.read_csv(f, delimiter=delimiter, chunksize=batch_rows):
+                        df = self._clean_tick_frame(chunk)
+                        if df is None:
+                            return
+                        if len(df) > 0:
+                            yield df
+
+        except zipfile.BadZipFile:
+            self.logger.warning("  Invalid ZIP archive")
+
+    def iter_archive_days(self, archive: Union[str, Path, BinaryIO], symbol: str,
+                          batch_rows: Optional[int] = None) -> Iterator[Tuple[datetime, pd.DataFrame]]:
+        """
+        Stream an archive's ticks grouped by UTC day.
+
+        Batches are split by UTC day; a day is yielded as soon as a batch
+        reaches a later day (archives are time ordered), so only the day being
+        assembled plus one batch are held in memory. Rows that arrive for an
+        already yielded day are dropped with a warning.
+
+        Args:
+            archive: ZIP file path (or seekable binary file object)
+            symbol: Symbol name (for logging)
+            batch_rows: Rows per CSV batch (default: config.csv_batch_rows)
+
+        Yields:
+            (day start as UTC datetime, that day's ticks sorted by time)
+        """
+        pending: Dict[pd.Timestamp, list] = {}
+        completed = set()
+        dropped = 0
+
+        def flush(day):
+            completed.add(day)
+            frames = pending.pop(day)
+            df = frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)
+            return day.to_pydatetime(), df.sort_values('time', kind='stable').reset_index(drop=True)
+
+        for batch in self.iter_archive_batches(archive, symbol, batch_rows):
+            batch_days = batch['time'].dt.floor('D')
+            for day, day_df in batch.groupby(batch_days, sort=True):
+                if day in completed:
+                    dropped += len(day_df)
+                    continue
+                pending.setdefault(day, []).append(day_df)
+
+            # Every pending day before the batch's last day is complete
+            last_day = batch_days.iloc[-1] if batch_days.is_monotonic_increasing else batch_days.max()
+            for day in sorted(d for d in pending if d < last_day):
+                yield flush(day)
+
+        for day in sorted(pending):
+            yield flush(day)
+
+        if dropped:
+            self.logger.warning(f"  {symbol}: dropped {dropped:,} out-of-order ticks of already completed days")
 
     def parse_archive(self, archive_content: bytes, symbol: str, year: int,
                      broker: str = None) -> Optional[pd.DataFrame]:
@@ -269,23 +419,11 @@ class BrokerArchiveDownloader:
         try:
             # Extract ZIP archive
             with zipfile.ZipFile(io.BytesIO(archive_content)) as zf:
-                # List files in archive
-                file_list = zf.namelist()
-                self.logger.debug(f"    Archive contains {len(file_list)} file(s)")
-
-                # Find CSV or data files
-                data_files = [f for f in file_list if f.endswith('.csv') or f.endswith('.txt')]
-
-                if not data_files:
-                    self.logger.warning(f"  No CSV/TXT files found in archive")
+                # Use the data file (largest if multiple)
+                data_file = self._find_data_file(zf)
+                if data_file is None:
                     return None
 
-                # Use the first data file (or largest if multiple)
-                data_file = data_files[0]
-                if len(data_files) > 1:
-                    # Find largest file
-                    data_file = max(data_files, key=lambda f: zf.getinfo(f).file_size)
-
                 self.logger.debug(f"    Parsing file: {data_file}")
 
                 # Read and parse CSV
@@ -361,56 +499,71 @@ class BrokerArchiveDownloader:
                     self.logger.warning(f"  Could not parse CSV with any delimiter")
                     return None
             
-            # Detect and rename columns
-            df = self._normalize_tick_columns(df)
-            
-            if df is None:
+            df = self._clean_tick_frame(df)
+
+            if df is not None and len(df) == 0:
+                self.logger.warning("  No valid tick data after filtering")
                 return None
+
+            return df
             
-            # Validate required columns
-            if 'time' not in df.columns or 'bid' not in df.columns or 'ask' not in df.columns:
-                self.logger.warning(f"  CSV missing required columns (time, bid, ask)")
-                return None
+        except Exception as e:
+            self.logger.warning(f"  Error parsing CSV: {e}")
+            return None
 
-            # Convert time to datetime (handle both string and numeric timestamps)
-            try:
-                # Try parsing as datetime string first
-                df['time'] = pd.to_datetime(df['time'], utc=True, errors='coerce')
-            except:
-                try:
-                    # Try parsing as Unix timestamp
-                    df['time'] = pd.to_datetime(df['time'], unit='s', utc=True, errors='coerce')
-                except:
-                    self.logger.warning(f"  Could not parse time column")
-                    return None
+    def _clean_tick_frame(self, df: pd.DataFrame) -> Optional[pd.DataFrame]:
+        """
+        Normalize and validate raw CSV rows (a whole file or one batch).
+
+        Args:
+            df: Raw DataFrame from CSV
 
-            # Convert bid and ask to numeric
-            df['bid'] = pd.to_numeric(df['bid'], errors='coerce')
-            df['ask'] = pd.to_numeric(df['ask'], errors='coerce')
+        Returns:
+            DataFrame with columns time (UTC), bid, ask, volume sorted by time
+            (empty if no row is valid), or None if the columns can't be detected
+        """
+        # Detect and rename columns
+        df = self._normalize_tick_columns(df)
+
+        if df is None:
+            return None
 
-            # Filter out invalid rows
-            df = df.dropna(subset=['time', 'bid', 'ask'])
-            df = df[(df['bid'] > 0) & (df['ask'] > 0) & (df['ask'] >= df['bid'])].copy()
+        # Validate required columns
+        if 'time' not in df.columns or 'bid' not in df.columns or 'ask' not in df.columns:
+            self.logger.warning("  CSV missing required columns (time, bid, ask)")
+            return None
 
-            if len(df) == 0:
-                self.logger.warning(f"  No valid tick data after filtering")
+        # Convert time to datetime (handle both string and numeric timestamps)
+        try:
+            # Try parsing as datetime string first
+            df['time'] = pd.to_datetime(df['time'], utc=True, errors='coerce')
+        except:
+            try:
+                # Try parsing as Unix timestamp
+                df['time'] = pd.to_datetime(df['time'], unit='s', utc=True, errors='coerce')
+            except:
+                self.logger.warning("  Could not parse time column")
                 return None
 
-            # Add volume column if missing (use 0 as placeholder)
-            if 'volume' not in df.columns:
-                df['volume'] = 0
-            else:
-                df['volume'] = pd.to_numeric(df['volume'], errors='coerce').fillna(0)
+        # Convert bid and ask to numeric
+        df['bid'] = pd.to_numeric(df['bid'], errors='coerce')
+        df['ask'] = pd.to_numeric(df['ask'], errors='coerce')
 
-            # Sort by time
-            df = df.sort_values('time').reset_index(drop=True)
+        # Filter out invalid rows
+        df = df.dropna(subset=['time', 'bid', 'ask'])
+        df = df[(df['bid'] > 0) & (df['ask'] > 0) & (df['ask'] >= df['bid'])].copy()
 
-            # Return only the required columns
-            return df[['time', 'bid', 'ask', 'volume']]
-            
-        except Exception as e:
-            self.logger.warning(f"  Error parsing CSV: {e}")
-            return None
+        # Add volume column if missing (use 0 as placeholder)
+        if 'volume' not in df.columns:
+            df['volume'] = 0
+        else:
+            df['volume'] = pd.to_numeric(df['volume'], errors='coerce').fillna(0)
+
+        # Sort by time
+        df = df.sort_values('time').reset_index(drop=True)
+
+        # Return only the required columns
+        return df[['time', 'bid', 'ask', 'volume']]
 
     def _normalize_tick_columns(self, df: pd.DataFrame) -> Optional[pd.DataFrame]:
         """
@@ -606,7 +759,6 @@ class BrokerArchiveDownloader:
         try:
             from datetime import timezone
             import pyarrow as pa
-            import pyarrow.parquet as pq
 
             cache_path = self._get_tick_cache_path(symbol, date, tick_type, cache_dir)
 
@@ -638,15 +790,13 @@ class BrokerArchiveDownloader:
             table = table.replace_schema_metadata(metadata_bytes)
 
             # Write with metadata
-            pq.write_table(table, cache_path, compression='snappy')
+            write_tick_table(table, cache_path, encoded=self.compact_tick_encoding)
 
             return True
         except Exception as e:
             self.logger.warning(f"  Error saving day cache for {date.date()}: {e}")
             return False
 
-
-
     def fetch_tick_data_for_day(self, symbol: str, date: datetime, server_name: str,
                                 tick_type: int = mt5.COPY_TICKS_INFO,
                                 cache_dir: Optional[str] = None,
@@ -684,9 +834,8 @@ class BrokerArchiveDownloader:
         month = date.month
         day = date.day
 
-        # Define day boundaries
+        # Define day start (UTC)
         day_start = datetime(year, month, day, 0, 0, 0, tzinfo=timezone.utc)
-        day_end = datetime(year, month, day, 23, 59, 59, 999999, tzinfo=timezone.utc)
 
         # Try day-based archive only
         if self.config.use_granular_downloads:
@@ -695,23 +844,32 @@ class BrokerArchiveDownloader:
             url = self.construct_archive_url(normalized_symbol, year, broker, month, day)
 
             if self.validate_archive_source(url):
-                # Try to download day archive
-                archive_content = self._try_download_archive(url, normalized_symbol, year, month, day, 'day')
+                # Try to download day archive (to disk)
+                archive = self._try_download_archive(url, normalized_symbol, year, month, day, 'day')
+
+                if archive:
+                    archive_path, temporary = archive
+                    df = None
+                    try:
+                        # Stream the archive by UTC day and keep only the requested day
+                        for archive_day, day_df in self.iter_archive_days(archive_path, normalized_symbol):
+                            if archive_day == day_start:
+                                df = day_df
+                                break
+                    except Exception as e:
+                        self.logger.warning(f"  Error parsing archive: {e}")
+                    finally:
+                        if temporary:
+                            archive_path.unlink(missing_ok=True)
 
-                if archive_content:
-                    # Parse and extract the day
-                    df = self.parse_archive(archive_content, normalized_symbol, year, broker)
                     if df is not None and len(df) > 0:
-                        # Filter to exact day
-                        df = df[(df['time'] >= day_start) & (df['time'] <= day_end)].copy()
-                        if len(df) > 0:
-                            self.logger.info(f"    ✓ Fetched {len(df):,} ticks from day-based archive")
+                        self.logger.info(f"    ✓ Fetched {len(df):,} ticks from day-based archive")
 
-                            # Cache this day
-                            if cache_dir:
-                                self._save_day_to_cache(df, symbol, date, tick_type, cache_dir)
+                        # Cache this day
+                        if cache_dir:
+                            self._save_day_to_cache(df, symbol, date, tick_type, cache_dir)
 
-                            return df
+                        return df
 
         # No data available - day archive doesn't exist or download failed
         self.logger.debug(f"    No day-based archive available for {date.date()}")
@@ -719,10 +877,14 @@ class BrokerArchiveDownloader:
 
     def _try_download_archive(self, url: str, symbol: str, year: int,
                               month: Optional[int], day: Optional[int],
-                              granularity: str) -> Optional[bytes]:
+                              granularity: str) -> Optional[Tuple[Path, bool]]:
         """
         Try to download an archive with caching support.
 
+        The archive is streamed to disk: into the archive cache when
+        save_downloaded_archives is set, otherwise into a temporary file that
+        the caller deletes.
+
         Args:
             url: Archive URL
             symbol: Symbol name
@@ -732,7 +894,7 @@ class BrokerArchiveDownloader:
             granularity: 'day', 'month', or 'year'
 
         Returns:
-            Archive content as bytes, or None if download failed
+            (archive path, is temporary file), or None if download failed
         """
         # Construct cache filename
         if day is not None and month is not None:
@@ -747,24 +909,22 @@ class BrokerArchiveDownloader:
             cache_file = self.archive_cache_path / cache_filename
             if cache_file.exists():
                 self.logger.debug(f"    Found cached {granularity} archive: {cache_file.name}")
-                try:
-                    return cache_file.read_bytes()
-                except Exception as e:
-                    self.logger.debug(f"    Error reading cached archive: {e}")
-
-        # Download from URL
-        archive_content = self.download_archive(url, symbol, year)
+                return cache_file, False
 
-        # Save to cache if successful
-        if archive_content and self.config.save_downloaded_archives:
-            try:
-                cache_file = self.archive_cache_path / cache_filename
-                cache_file.write_bytes(archive_content)
+            # Download from URL straight into the archive cache
+            if self.download_archive_to_file(url, symbol, year, cache_file):
                 self.logger.debug(f"    Saved {granularity} archive to cache: {cache_file.name}")
-            except Exception as e:
-                self.logger.debug(f"    Error saving archive to cache: {e}")
+                return cache_file, False
+            return None
 
-        return archive_content
+        # Download from URL into a temporary file
+        fd, temp_name = tempfile.mkstemp(prefix=f"{symbol}_", suffix=".zip")
+        os.close(fd)
+        temp_file = Path(temp_name)
+        if self.download_archive_to_file(url, symbol, year, temp_file):
+            return temp_file, True
+        temp_file.unlink(missing_ok=True)
+        return None
 
 
 
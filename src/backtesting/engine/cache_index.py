@@ -1,17 +1,29 @@
 ﻿"""
 Cache metadata index for fast cache validation.
 
-Maintains an in-memory index of cached date ranges to avoid
+Maintains an embedded SQLite index (cache_index.db) of cached days to avoid
 filesystem scans on every cache check.
 
+Every cached (symbol, data_key, day) is one row, written with a single
+upsert, so adding a day no longer rewrites the whole index. WAL mode lets
+concurrent downloaders write while backtests read. Rows carry the file's
+cache metadata (cached_at, first/last data time, row count) plus its size
+and mtime, so DataCache.validate_cache_coverage answers from one range
+query without opening a parquet file.
+
 This significantly speeds up cache validation:
 - Without index: 0.5-1s (filesystem scan)
-- With index: <0.01s (in-memory lookup)
+- With index: <0.01s (indexed range query)
+
+An existing cache_index.json (previous format) is imported once when the
+database is created.
 """
 import json
+import os
+import sqlite3
 from pathlib import Path
 from datetime import datetime, date, timezone
-from typing import Dict, Set, Optional, List
+from typing import Dict, Set, Optional, List, Tuple
 from threading import Lock
 from src.utils.logger import get_logger
 
@@ -19,80 +31,132 @@ from src.utils.logger import get_logger
 class CacheIndex:
     """
     Maintains index of cached data for fast validation.
-    
-    Index structure:
-    {
-        "EURUSD": {
-            "M1": {
-                "cached_days": ["2025-01-01", "2025-01-02", ...],
-                "last_updated": "2025-11-22T10:30:00Z"
-            },
-            "ticks": {
-                "cached_days": ["2025-01-01", ...],
-                "last_updated": "2025-11-22T10:30:00Z"
-            }
-        }
-    }
-    
-    Thread-safe for concurrent access.
-    Auto-rebuilds if corrupted or missing.
+
+    Table cached_days, primary key (symbol, data_key, day):
+
+        symbol      'EURUSD'
+        data_key    'M1', 'M5', ..., or 'ticks'
+        day         '2025-01-01' (ISO, so range queries sort chronologically)
+        row_count, first_data_time, last_data_time, cached_at   (file metadata; NULL if unknown)
+        file_size, mtime_ns                                     (NULL if unknown)
+        updated_at
+
+    Thread-safe for concurrent access; safe for concurrent processes (WAL).
+    Auto-rebuilds if corrupted.
     """
-    
+
+    INDEX_FILE = "cache_index.db"
+    LEGACY_INDEX_FILE = "cache_index.json"
+
+    # Seconds a writer waits for another process's write transaction
+    BUSY_TIMEOUT = 30.0
+
+    _COLUMNS = ('row_count', 'first_data_time', 'last_data_time', 'cached_at', 'file_size', 'mtime_ns')
+
     def __init__(self, cache_dir: str, auto_rebuild: bool = True):
         """
         Initialize cache index.
-        
+
         Args:
             cache_dir: Root cache directory
             auto_rebuild: Automatically rebuild index if corrupted (default: True)
         """
         self.cache_dir = Path(cache_dir)
-        self.index_path = self.cache_dir / "cache_index.json"
-        self.index: Dict = {}
+        self.index_path = self.cache_dir / self.INDEX_FILE
         self.lock = Lock()
         self.auto_rebuild = auto_rebuild
         self.logger = get_logger()
+        self._conn: Optional[sqlite3.Connection] = None
         self._load_index()
-    
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database and create the schema."""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.index_path), timeout=self.BUSY_TIMEOUT, check_same_thread=False,
+                               isolation_level=None)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS cached_days (
+                    symbol TEXT NOT NULL,
+                    data_key TEXT NOT NULL,
+                    day TEXT NOT NULL,
+                    row_count INTEGER,
+                    first_data_time TEXT,
+                    last_data_time TEXT,
+                    cached_at TEXT,
+                    file_size INTEGER,
+                    mtime_ns INTEGER,
+                    updated_at TEXT NOT NULL,
+                    PRIMARY KEY (symbol, data_key, day)
+                ) WITHOUT ROWID
+            """)
+            conn.execute("PRAGMA quick_check").fetchone()
+        except sqlite3.DatabaseError:
+            conn.close()
+            raise
+        return conn
+
     def _load_index(self):
-        """Load index from disk."""
+        """Open the index database (importing or rebuilding it if needed)."""
         with self.lock:
-            if self.index_path.exists():
-                try:
-                    with open(self.index_path, 'r') as f:
-                        self.index = json.load(f)
-
-                    # Count total cached days
-                    total_days = sum(
-                        len(data.get('cached_days', []))
-                        for symbol_data in self.index.values()
-                        for data in symbol_data.values()
-                    )
-                    self.logger.debug(f"Cache index loaded: {len(self.index)} symbols, {total_days} total cached days")
-                except (json.JSONDecodeError, IOError) as e:
-                    # Corrupted index
-                    self.logger.warning(f"Cache index corrupted: {e}")
-                    if self.auto_rebuild:
-                        self.logger.info("Auto-rebuilding cache index from filesystem...")
-                        self.index = {}
-                        self.rebuild_index()
-                    else:
-                        self.logger.warning("Auto-rebuild disabled, starting with empty index")
-                        self.index = {}
-            else:
-                self.logger.debug("No cache index found, starting with empty index")
-                self.index = {}
-    
-    def _save_index(self):
-        """Save index to disk (must be called with lock held)."""
+            created = not self.index_path.exists()
+            try:
+                self._conn = self._connect()
+            except sqlite3.DatabaseError as e:
+                # Corrupted index
+                self.logger.warning(f"Cache index corrupted: {e}")
+                for suffix in ('', '-wal', '-shm'):
+                    path = Path(f"{self.index_path}{suffix}")
+                    if path.exists():
+                        path.unlink()
+                self._conn = self._connect()
+                if self.auto_rebuild:
+                    self.logger.info("Auto-rebuilding cache index from filesystem...")
+                    self._rebuild_locked()
+                else:
+                    self.logger.warning("Auto-rebuild disabled, starting with empty index")
+                return
+
+            if created:
+                self._import_legacy_index()
+
+            total_days = self._conn.execute("SELECT COUNT(*) FROM cached_days").fetchone()[0]
+            self.logger.debug(f"Cache index loaded: {total_days} total cached days")
+
+    def _import_legacy_index(self):
+        """Import days from a cache_index.json of the previous index format (lock held)."""
+        legacy_path = self.cache_dir / self.LEGACY_INDEX_FILE
+        if not legacy_path.exists():
+            return
         try:
-            self.cache_dir.mkdir(parents=True, exist_ok=True)
-            with open(self.index_path, 'w') as f:
-                json.dump(self.index, f, indent=2)
-        except IOError:
-            # Ignore save errors (index will be rebuilt on next load)
-            pass
-    
+            with open(legacy_path, 'r') as f:
+                legacy = json.load(f)
+            rows = [(symbol, data_key, day_str)
+                    for symbol, symbol_data in legacy.items()
+                    for data_key, data in symbol_data.items()
+                    for day_str in data.get('cached_days', [])]
+        except (json.JSONDecodeError, IOError, AttributeError) as e:
+            self.logger.warning(f"Ignoring unreadable {self.LEGACY_INDEX_FILE}: {e}")
+            return
+
+        now = datetime.now(timezone.utc).isoformat()
+        with self._conn:
+            self._conn.execute("BEGIN")
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO cached_days (symbol, data_key, day, updated_at) VALUES (?, ?, ?, ?)",
+                [row + (now,) for row in rows]
+            )
+        self.logger.info(f"Imported {len(rows)} cached days from {self.LEGACY_INDEX_FILE}")
+
+    def close(self):
+        """Close the database connection."""
+        with self.lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
     def get_cached_days(self, symbol: str, data_key: str) -> Set[date]:
         """
         Get set of cached days for symbol/data_key.
@@ -105,231 +169,281 @@ class CacheIndex:
             Set of dates that are cached
         """
         with self.lock:
-            if symbol not in self.index:
-                self.logger.debug(f"Cache index lookup: {symbol} {data_key} - symbol not in index")
-                return set()
-            if data_key not in self.index[symbol]:
-                self.logger.debug(f"Cache index lookup: {symbol} {data_key} - data_key not in index")
-                return set()
-
-            day_strings = self.index[symbol][data_key].get('cached_days', [])
+            rows = self._conn.execute(
+                "SELECT day FROM cached_days WHERE symbol = ? AND data_key = ?", (symbol, data_key)
+            ).fetchall()
+        try:
+            cached_days = {date.fromisoformat(row[0]) for row in rows}
+        except ValueError:
+            # Corrupted data
+            self.logger.warning(f"Cache index lookup: {symbol} {data_key} - corrupted data")
+            return set()
+        self.logger.debug(f"Cache index lookup: {symbol} {data_key} - {len(cached_days)} days found")
+        return cached_days
+
+    def get_day_records(self, symbol: str, data_key: str, start_day: date, end_day: date) -> Dict[date, Dict]:
+        """
+        Get the indexed days of a date range with their file metadata.
+
+        Args:
+            symbol: Symbol name
+            data_key: Data key (timeframe or 'ticks')
+            start_day: First day (inclusive)
+            end_day: Last day (inclusive)
+
+        Returns:
+            Dict of date -> {'row_count', 'first_data_time', 'last_data_time',
+            'cached_at', 'file_size', 'mtime_ns'} (values None if unknown)
+        """
+        with self.lock:
+            rows = self._conn.execute(
+                f"SELECT day, {', '.join(self._COLUMNS)} FROM cached_days "
+                "WHERE symbol = ? AND data_key = ? AND day BETWEEN ? AND ? ORDER BY day",
+                (symbol, data_key, start_day.isoformat(), end_day.isoformat())
+            ).fetchall()
+        return {date.fromisoformat(row[0]): dict(zip(self._COLUMNS, row[1:])) for row in rows}
+
+    @staticmethod
+    def _metadata_values(metadata: Optional[Dict[str, str]], path: Optional[Path]) -> Tuple:
+        """Row values of the metadata columns from a file's cache metadata and stat."""
+        metadata = metadata or {}
+        row_count = metadata.get('row_count')
+        file_size = mtime_ns = None
+        if path is not None:
             try:
-                cached_days = {datetime.fromisoformat(d).date() for d in day_strings}
-                self.logger.debug(f"Cache index lookup: {symbol} {data_key} - {len(cached_days)} days found")
-                return cached_days
-            except (ValueError, AttributeError):
-                # Corrupted data
-                self.logger.warning(f"Cache index lookup: {symbol} {data_key} - corrupted data")
-                return set()
-    
+                stat = os.stat(path)
+                file_size, mtime_ns = stat.st_size, stat.st_mtime_ns
+            except OSError:
+                pass
+        return (int(row_count) if row_count not in (None, '') else None,
+                metadata.get('first_data_time') or None,
+                metadata.get('last_data_time') or None,
+                metadata.get('cached_at') or None,
+                file_size, mtime_ns)
+
+    def record_days(self, symbol: str, data_key: str,
+                    days: List[Tuple[date, Optional[Dict[str, str]], Optional[Path]]]):
+        """
+        Upsert days with the cache metadata of their files (one transaction).
+
+        Args:
+            symbol: Symbol name
+            data_key: Data key (timeframe or 'ticks')
+            days: List of (day, cache metadata dict or None, file path or None)
+        """
+        if not days:
+            return
+        now = datetime.now(timezone.utc).isoformat()
+        rows = [(symbol, data_key, day.isoformat()) + self._metadata_values(metadata, path) + (now,)
+                for day, metadata, path in days]
+        with self.lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany(
+                    f"INSERT INTO cached_days (symbol, data_key, day, {', '.join(self._COLUMNS)}, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT (symbol, data_key, day) DO UPDATE SET "
+                    + ", ".join(f"{column} = excluded.{column}" for column in self._COLUMNS)
+                    + ", updated_at = excluded.updated_at",
+                    rows
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        self.logger.debug(f"Cache index updated: {symbol} {data_key} - recorded {len(rows)} days")
+
     def add_cached_day(self, symbol: str, data_key: str, day: date):
         """
         Add a day to the index.
-        
+
         Args:
             symbol: Symbol name
             data_key: Data key (timeframe or 'ticks')
             day: Date to add
         """
-        with self.lock:
-            if symbol not in self.index:
-                self.index[symbol] = {}
-            if data_key not in self.index[symbol]:
-                self.index[symbol][data_key] = {
-                    'cached_days': [],
-                    'last_updated': datetime.now(timezone.utc).isoformat()
-                }
-            
-            day_str = day.isoformat()
-            if day_str not in self.index[symbol][data_key]['cached_days']:
-                self.index[symbol][data_key]['cached_days'].append(day_str)
-                self.index[symbol][data_key]['cached_days'].sort()
-                self.index[symbol][data_key]['last_updated'] = datetime.now(timezone.utc).isoformat()
-                self._save_index()
-    
+        self.add_cached_days(symbol, data_key, [day])
+
     def add_cached_days(self, symbol: str, data_key: str, days: List[date]):
         """
         Add multiple days to the index (batch operation).
 
-        More efficient than calling add_cached_day() multiple times.
+        Days already in the index keep their recorded metadata. Use
+        record_days() to store file metadata as well.
 
         Args:
             symbol: Symbol name
             data_key: Data key (timeframe or 'ticks')
             days: List of dates to add
         """
+        now = datetime.now(timezone.utc).isoformat()
         with self.lock:
-            if symbol not in self.index:
-                self.index[symbol] = {}
-            if data_key not in self.index[symbol]:
-                self.index[symbol][data_key] = {
-                    'cached_days': [],
-                    'last_updated': datetime.now(timezone.utc).isoformat()
-                }
-
-            # Get existing days
-            existing_days = set(self.index[symbol][data_key]['cached_days'])
-
-            # Add new days
-            new_days = [d.isoformat() for d in days if d.isoformat() not in existing_days]
-
-            if new_days:
-                self.index[symbol][data_key]['cached_days'].extend(new_days)
-                self.index[symbol][data_key]['cached_days'].sort()
-                self.index[symbol][data_key]['last_updated'] = datetime.now(timezone.utc).isoformat()
-                self._save_index()
-                self.logger.debug(f"Cache index updated: {symbol} {data_key} - added {len(new_days)} days")
-            else:
-                self.logger.debug(f"Cache index: {symbol} {data_key} - all {len(days)} days already indexed")
-    
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                before = self._conn.total_changes
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO cached_days (symbol, data_key, day, updated_at) VALUES (?, ?, ?, ?)",
+                    [(symbol, data_key, day.isoformat(), now) for day in days]
+                )
+                added = self._conn.total_changes - before
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        if added:
+            self.logger.debug(f"Cache index updated: {symbol} {data_key} - added {added} days")
+        else:
+            self.logger.debug(f"Cache index: {symbol} {data_key} - all {len(days)} days already indexed")
+
     def remove_cached_day(self, symbol: str, data_key: str, day: date):
         """
         Remove a day from the index.
-        
+
         Args:
             symbol: Symbol name
             data_key: Data key (timeframe or 'ticks')
             day: Date to remove
         """
         with self.lock:
-            if symbol not in self.index:
-                return
-            if data_key not in self.index[symbol]:
-                return
-            
-            day_str = day.isoformat()
-            if day_str in self.index[symbol][data_key]['cached_days']:
-                self.index[symbol][data_key]['cached_days'].remove(day_str)
-                self.index[symbol][data_key]['last_updated'] = datetime.now(timezone.utc).isoformat()
-                self._save_index()
-    
+            self._conn.execute("DELETE FROM cached_days WHERE symbol = ? AND data_key = ? AND day = ?",
+                               (symbol, data_key, day.isoformat()))
+
     def clear_symbol(self, symbol: str):
         """
         Clear all cached days for a symbol.
-        
+
         Args:
             symbol: Symbol name
         """
         with self.lock:
-            if symbol in self.index:
-                del self.index[symbol]
-                self._save_index()
-    
+            self._conn.execute("DELETE FROM cached_days WHERE symbol = ?", (symbol,))
+
     def clear_all(self):
         """Clear entire index."""
         with self.lock:
-            self.index = {}
-            self._save_index()
-    
+            self._conn.execute("DELETE FROM cached_days")
+
+    def _scan_files(self) -> Dict[Tuple[str, str, str], Path]:
+        """
+        Find every cache file of the date hierarchy (directory listing and stat only).
+
+        Returns:
+            Dict of (symbol, data_key, ISO day) -> file path
+        """
+        files = {}
+        if not self.cache_dir.exists():
+            return files
+
+        # Scan cache directory structure: YYYY/MM/DD/candles/ and YYYY/MM/DD/ticks/
+        for year_dir in self.cache_dir.iterdir():
+            if not year_dir.is_dir() or not year_dir.name.isdigit():
+                continue
+
+            # Scan month directories
+            for month_dir in year_dir.iterdir():
+                if not month_dir.is_dir() or not month_dir.name.isdigit():
+                    continue
+
+                # Scan day directories
+                for day_dir in month_dir.iterdir():
+                    if not day_dir.is_dir() or not day_dir.name.isdigit():
+                        continue
+
+                    try:
+                        # Parse date from directory structure
+                        day_str = date(int(year_dir.name), int(month_dir.name), int(day_dir.name)).isoformat()
+                    except (ValueError, OSError):
+                        continue
+
+                    # Candles: SYMBOL_TIMEFRAME.parquet, ticks: SYMBOL_TICKTYPE.parquet
+                    for subdir in ("candles", "ticks"):
+                        files_dir = day_dir / subdir
+                        if not files_dir.exists():
+                            continue
+                        for cache_file in files_dir.glob("*.parquet"):
+                            parts = cache_file.stem.split('_')
+                            if len(parts) < 2:
+                                continue
+                            symbol = '_'.join(parts[:-1])  # Handle symbols with underscores
+                            data_key = parts[-1] if subdir == "candles" else 'ticks'
+                            files[(symbol, data_key, day_str)] = cache_file
+        return files
+
+    @staticmethod
+    def _read_file_metadata(path: Path) -> Optional[Dict[str, str]]:
+        """Cache metadata of a parquet file (footer only), or None if it has none."""
+        import pyarrow.parquet as pq
+
+        try:
+            metadata = pq.read_schema(path).metadata or {}
+        except Exception:
+            return None
+        decoded = {k.decode(): v.decode() for k, v in metadata.items() if k != b'pandas'}
+        return decoded if 'cache_version' in decoded else None
+
+    def _rebuild_locked(self):
+        """Body of rebuild_index() (lock held)."""
+        files = self._scan_files()
+        known = {
+            (symbol, data_key, day): (file_size, mtime_ns)
+            for symbol, data_key, day, file_size, mtime_ns in self._conn.execute(
+                "SELECT symbol, data_key, day, file_size, mtime_ns FROM cached_days")
+        }
+
+        now = datetime.now(timezone.utc).isoformat()
+        upserts = []
+        for key, path in files.items():
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            if known.get(key) == (stat.st_size, stat.st_mtime_ns):
+                continue  # Unchanged since it was indexed
+            upserts.append(key + self._metadata_values(self._read_file_metadata(path), path) + (now,))
+        removed = [key for key in known if key not in files]
+
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._conn.executemany(
+                "DELETE FROM cached_days WHERE symbol = ? AND data_key = ? AND day = ?", removed
+            )
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO cached_days (symbol, data_key, day, {', '.join(self._COLUMNS)}, "
+                "updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                upserts
+            )
+            self._conn.execute("COMMIT")
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        return len(files), len(upserts), len(removed)
+
     def rebuild_index(self):
         """
         Rebuild index by scanning filesystem.
 
-        This scans the cache directory and rebuilds the index from scratch.
+        Incremental: the directory tree is listed and stat'ed, but only files
+        that are new or changed (size/mtime differ from the index) have their
+        footer read; index rows of deleted files are removed.
         Useful if the index becomes out of sync with the filesystem.
         """
         self.logger.info("Rebuilding cache index from filesystem...")
         rebuild_start = datetime.now()
 
         with self.lock:
-            self.index = {}
+            total, updated, removed = self._rebuild_locked()
+
+        # Log rebuild completion
+        rebuild_duration = (datetime.now() - rebuild_start).total_seconds()
+        self.logger.info(
+            f"Cache index rebuilt: {total} cached files, {updated} updated, {removed} removed "
+            f"({rebuild_duration:.2f}s)"
+        )
 
-            # Scan cache directory structure: YYYY/MM/DD/candles/ and YYYY/MM/DD/ticks/
-            if not self.cache_dir.exists():
-                self.logger.debug("Cache directory does not exist, index will be empty")
-                self._save_index()
-                return
-            
-            # Scan year directories
-            for year_dir in self.cache_dir.iterdir():
-                if not year_dir.is_dir() or not year_dir.name.isdigit():
-                    continue
-                
-                # Scan month directories
-                for month_dir in year_dir.iterdir():
-                    if not month_dir.is_dir() or not month_dir.name.isdigit():
-                        continue
-                    
-                    # Scan day directories
-                    for day_dir in month_dir.iterdir():
-                        if not day_dir.is_dir() or not day_dir.name.isdigit():
-                            continue
-                        
-                        try:
-                            # Parse date from directory structure
-                            year = int(year_dir.name)
-                            month = int(month_dir.name)
-                            day = int(day_dir.name)
-                            cache_date = date(year, month, day)
-                        except (ValueError, OSError):
-                            continue
-                        
-                        # Scan candles directory
-                        candles_dir = day_dir / "candles"
-                        if candles_dir.exists():
-                            for cache_file in candles_dir.glob("*.parquet"):
-                                # Parse filename: SYMBOL_TIMEFRAME.parquet
-                                parts = cache_file.stem.split('_')
-                                if len(parts) >= 2:
-                                    symbol = '_'.join(parts[:-1])  # Handle symbols with underscores
-                                    timeframe = parts[-1]
-                                    
-                                    if symbol not in self.index:
-                                        self.index[symbol] = {}
-                                    if timeframe not in self.index[symbol]:
-                                        self.index[symbol][timeframe] = {
-                                            'cached_days': [],
-                                            'last_updated': datetime.now(timezone.utc).isoformat()
-                                        }
-                                    
-                                    day_str = cache_date.isoformat()
-                                    if day_str not in self.index[symbol][timeframe]['cached_days']:
-                                        self.index[symbol][timeframe]['cached_days'].append(day_str)
-                        
-                        # Scan ticks directory
-                        ticks_dir = day_dir / "ticks"
-                        if ticks_dir.exists():
-                            for cache_file in ticks_dir.glob("*.parquet"):
-                                # Parse filename: SYMBOL_TICKTYPE.parquet
-                                parts = cache_file.stem.split('_')
-                                if len(parts) >= 2:
-                                    symbol = '_'.join(parts[:-1])  # Handle symbols with underscores
-                                    
-                                    if symbol not in self.index:
-                                        self.index[symbol] = {}
-                                    if 'ticks' not in self.index[symbol]:
-                                        self.index[symbol]['ticks'] = {
-                                            'cached_days': [],
-                                            'last_updated': datetime.now(timezone.utc).isoformat()
-                                        }
-                                    
-                                    day_str = cache_date.isoformat()
-                                    if day_str not in self.index[symbol]['ticks']['cached_days']:
-                                        self.index[symbol]['ticks']['cached_days'].append(day_str)
-            
-            # Sort all cached_days lists
-            for symbol in self.index:
-                for data_key in self.index[symbol]:
-                    self.index[symbol][data_key]['cached_days'].sort()
-
-            self._save_index()
-
-            # Log rebuild completion
-            rebuild_duration = (datetime.now() - rebuild_start).total_seconds()
-            total_days = sum(
-                len(data.get('cached_days', []))
-                for symbol_data in self.index.values()
-                for data in symbol_data.values()
-            )
-            self.logger.info(
-                f"Cache index rebuilt: {len(self.index)} symbols, {total_days} total cached days "
-                f"({rebuild_duration:.2f}s)"
-            )
-    
     def get_stats(self) -> Dict:
         """
         Get index statistics.
-        
+
         Returns:
             Dictionary with statistics:
             - total_symbols: Number of symbols in index
@@ -337,20 +451,9 @@ class CacheIndex:
             - symbols: List of symbols with their cached day counts
         """
         with self.lock:
-            stats = {
-                'total_symbols': len(self.index),
-                'total_days': 0,
-                'symbols': {}
-            }
-            
-            for symbol in self.index:
-                symbol_days = 0
-                for data_key in self.index[symbol]:
-                    day_count = len(self.index[symbol][data_key].get('cached_days', []))
-                    symbol_days += day_count
-                
-                stats['symbols'][symbol] = symbol_days
-                stats['total_days'] += symbol_days
-            
-            return stats
-
+            rows = self._conn.execute("SELECT symbol, COUNT(*) FROM cached_days GROUP BY symbol").fetchall()
+        return {
+            'total_symbols': len(rows),
+            'total_days': sum(count for _, count in rows),
+            'symbols': dict(rows),
+        }
@@ -2,17 +2,210 @@
 Real-time candle builder for tick-by-tick backtesting.
 
 Builds OHLCV candles from tick data in real-time as ticks arrive.
+
+Two modes:
+- Eager (default): every tick updates the open candle of every timeframe.
+- Lazy: ticks are appended to a compact (time, price, volume) ring and folded
+  into candles only when candles are read, with boundary detection limited to
+  the timeframes a strategy subscribes to. Produces bit-identical candles.
+
+Closed candles are stored per timeframe in a CandleRingBuffer (structured
+NumPy array with an append cursor), so reading the last N candles is an O(1)
+slice - either as a DataFrame (get_candles) or as zero-copy CandleArrays
+views (get_candle_arrays).
 """
-from datetime import datetime, timezone
-from typing import Dict, List, Optional
+from array import array
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional
 import pandas as pd
 import numpy as np
 from collections import defaultdict
 
-from src.models.models.candle_models import CandleData
+from src.models.models.candle_models import CandleData, CandleArrays
 from src.utils.timeframe_converter import TimeframeConverter
 
 
+# Lazy mode time arithmetic (UTC epoch microseconds)
+_EPOCH_UTC = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_ONE_US = timedelta(microseconds=1)
+_US_PER_MINUTE = 60_000_000
+_US_PER_DAY = 86_400_000_000
+
+
+class CandleRingBuffer:
+    """
+    Append-only store of closed candles for one timeframe.
+
+    Rows live in a preallocated structured NumPy array (time_ns, open, high,
+    low, close, volume) plus a parallel object array holding the original
+    datetime objects (so DataFrame 'time' values and tzinfo are unchanged).
+    Live rows are always contiguous in storage[start:end], so the last N
+    candles are a single O(1) slice.
+
+    Storage doubles when full. With max_length set, the oldest candles are
+    dropped and live rows are moved back to the front when the end of the
+    (2 * max_length) storage is reached - amortized O(1) per append.
+    """
+
+    DTYPE = np.dtype([
+        ('time_ns', np.int64),
+        ('open', np.float64),
+        ('high', np.float64),
+        ('low', np.float64),
+        ('close', np.float64),
+        ('volume', np.int64),
+    ])
+
+    INITIAL_CAPACITY = 1024
+
+    def __init__(self, max_length: Optional[int] = None):
+        """
+        Initialize empty candle store.
+
+        Args:
+            max_length: Maximum number of candles kept (None = keep all)
+        """
+        self.max_length = max_length
+        capacity = self.INITIAL_CAPACITY
+        if max_length is not None:
+            capacity = min(capacity, 2 * max_length)
+        self._data = np.zeros(capacity, dtype=self.DTYPE)
+        self._times = np.empty(capacity, dtype=object)
+        self._start = 0
+        self._end = 0
+
+        # Total candles ever appended (changes on every append, even when full)
+        self.appended = 0
+
+    def __len__(self) -> int:
+        return self._end - self._start
+
+    def __getitem__(self, index: int) -> CandleData:
+        """
+        Get one candle as CandleData.
+
+        Args:
+            index: Candle index (negative indices count from the end)
+
+        Returns:
+            CandleData
+        """
+        n = self._end - self._start
+        if index < 0:
+            index += n
+        if index < 0 or index >= n:
+            raise IndexError("candle index out of range")
+
+        i = self._start + index
+        row = self._data[i]
+        return CandleData(
+            time=self._times[i],
+            open=float(row['open']),
+            high=float(row['high']),
+            low=float(row['low']),
+            close=float(row['close']),
+            volume=int(row['volume'])
+        )
+
+    def append(self, candle: CandleData) -> None:
+        """
+        Append a closed candle.
+
+        Args:
+            candle: Candle to store (time should be timezone-aware UTC)
+        """
+        if self._end == len(self._data):
+            self._make_room()
+
+        candle_time = candle.time
+        if candle_time.tzinfo is None:
+            time_us = (candle_time.replace(tzinfo=timezone.utc) - _EPOCH_UTC) // _ONE_US
+        else:
+            time_us = (candle_time - _EPOCH_UTC) // _ONE_US
+
+        i = self._end
+        self._data[i] = (time_us * 1000, candle.open, candle.high, candle.low, candle.close, candle.volume)
+        self._times[i] = candle_time
+        self._end = i + 1
+        self.appended += 1
+
+        if self.max_length is not None and self._end - self._start > self.max_length:
+            self._times[self._start] = None
+            self._start += 1
+
+    def _make_room(self) -> None:
+        """Compact live rows to the front, or grow storage when it is mostly live."""
+        n = self._end - self._start
+        capacity = len(self._data)
+
+        if self._start > 0 and n <= capacity // 2:
+            self._data[:n] = self._data[self._start:self._end]
+            self._times[:n] = self._times[self._start:self._end]
+            self._times[n:] = None
+        else:
+            new_capacity = capacity * 2
+            if self.max_length is not None:
+                new_capacity = max(min(new_capacity, 2 * self.max_length), n + 1)
+            data = np.zeros(new_capacity, dtype=self.DTYPE)
+            times = np.empty(new_capacity, dtype=object)
+            data[:n] = self._data[self._start:self._end]
+            times[:n] = self._times[self._start:self._end]
+            self._data = data
+            self._times = times
+
+        self._start = 0
+        self._end = n
+
+    def _tail_bounds(self, count: int):
+        """Get storage (start, end) of the last count candles."""
+        return max(self._start, self._end - count), self._end
+
+    def tail_arrays(self, count: int) -> CandleArrays:
+        """
+        Get the last count candles as zero-copy column views.
+
+        Args:
+            count: Number of candles
+
+        Returns:
+            CandleArrays with views into the storage
+        """
+        start, end = self._tail_bounds(count)
+        rows = self._data[start:end]
+        return CandleArrays(
+            time=self._times[start:end],
+            open=rows['open'],
+            high=rows['high'],
+            low=rows['low'],
+            close=rows['close'],
+            tick_volume=rows['volume'],
+        )
+
+    def tail_dataframe(self, count: int) -> pd.DataFrame:
+        """
+        Get the last count candles as a DataFrame.
+
+        Same columns and dtypes as the previous list-based get_candles():
+        time, open, high, low, close, tick_volume.
+
+        Args:
+            count: Number of candles
+
+        Returns:
+            DataFrame (owns its data - independent of the store)
+        """
+        start, end = self._tail_bounds(count)
+        rows = self._data[start:end]
+        return pd.DataFrame({
+            'time': self._times[start:end],
+            'open': rows['open'],
+            'high': rows['high'],
+            'low': rows['low'],
+            'close': rows['close'],
+            'tick_volume': rows['volume'],
+        })
+
+
 class CandleBuilder:
     """
     Builds a single candle for a specific timeframe.
@@ -51,6 +244,16 @@ class CandleBuilder:
             volume: Tick volume
             tick_time: Tick timestamp
         """
+        self.add_price(price, volume)
+
+    def add_price(self, price: float, volume: int) -> None:
+        """
+        Add a tick's price and volume to the candle (the tick time is not needed).
+
+        Args:
+            price: Tick price
+            volume: Tick volume
+        """
         # First tick sets open
         if self.open is None:
             self.open = price
@@ -99,15 +302,30 @@ class MultiTimeframeCandleBuilder:
     
     Maintains separate candle builders for M1, M5, M15, H1, H4 and manages
     candle boundaries (when to close current candle and start new one).
+
+    LAZY MODE: Most ticks never change what a strategy reads - strategies only
+    look at candles at bar boundaries. In lazy mode add_tick() only appends the
+    tick to a ring of (time, price, volume) arrays and checks boundaries for the
+    subscribed timeframes. The ring is folded into candles (vectorized) when
+    get_candles(), get_latest_candle() or get_current_candle() is called, or
+    when the ring is full. Lazy mode assumes ticks arrive in chronological
+    order with UTC timestamps (true for the global tick timeline).
     """
-    
-    def __init__(self, symbol: str, timeframes: List[str]):
+
+    # Maximum number of ticks buffered in lazy mode before an automatic fold
+    LAZY_RING_CAPACITY = 65536
+
+    # Maximum closed candles kept per timeframe (None = keep all, same as before)
+    MAX_CANDLE_HISTORY: Optional[int] = None
+
+    def __init__(self, symbol: str, timeframes: List[str], lazy: bool = False):
         """
         Initialize multi-timeframe candle builder.
 
         Args:
             symbol: Symbol name
             timeframes: List of timeframes to build (e.g., ['M1', 'M5', 'M15', 'H1', 'H4'])
+            lazy: Defer candle building until candles are read (default: False)
         """
         self.symbol = symbol
         self.timeframes = timeframes
@@ -115,14 +333,16 @@ class MultiTimeframeCandleBuilder:
         # Current candle builders for each timeframe
         self.current_builders: Dict[str, Optional[CandleBuilder]] = {tf: None for tf in timeframes}
 
-        # Completed candles for each timeframe (stored as list)
-        self.completed_candles: Dict[str, List[CandleData]] = {tf: [] for tf in timeframes}
+        # Completed candles for each timeframe (structured NumPy store, O(1) tail slices)
+        self.completed_candles: Dict[str, CandleRingBuffer] = {
+            tf: CandleRingBuffer(self.MAX_CANDLE_HISTORY) for tf in timeframes
+        }
 
         # PERFORMANCE OPTIMIZATION #4: Cache last candle start times to skip redundant boundary checks
         self._last_candle_starts: Dict[str, Optional[datetime]] = {tf: None for tf in timeframes}
 
         # PERFORMANCE OPTIMIZATION #9: Cache DataFrame creation to avoid rebuilding when candles unchanged
-        # Stores (candle_count, count_requested, cached_df) for each timeframe
+        # Stores (candles_appended, count_requested, cached_df) for each timeframe
         self._df_cache: Dict[str, tuple] = {tf: (0, 0, None) for tf in timeframes}
 
         # PERFORMANCE OPTIMIZATION #10: Pre-compute timeframe durations in seconds
@@ -134,6 +354,47 @@ class MultiTimeframeCandleBuilder:
         # PERFORMANCE OPTIMIZATION #16: Reuse set object to avoid allocations
         # Instead of creating new set on every tick, reuse and clear
         self._new_candles_set: set = set()
+
+        # LAZY MODE: Only timeframes whose duration divides a day can be folded
+        # vectorized with the same alignment as _align_to_timeframe()
+        self._timeframe_minutes: Dict[str, Optional[int]] = {
+            tf: TimeframeConverter.get_duration_minutes(tf) for tf in timeframes
+        }
+        if lazy and not all(m and 1440 % m == 0 for m in self._timeframe_minutes.values()):
+            from src.utils.logger import get_logger
+            get_logger().warning(f"[{symbol}] Lazy candle building requires intraday timeframes, "
+                                 f"using eager mode for {timeframes}")
+            lazy = False
+        self.lazy = lazy
+
+        # LAZY MODE: Pending ticks not yet folded into candles (compact typed arrays)
+        self._ring_time_us = array('q')
+        self._ring_price = array('d')
+        self._ring_volume = array('q')
+        self._ring_tzinfo = timezone.utc
+
+        # LAZY MODE: Boundary detection state for subscribed timeframes only
+        # Default: all timeframes are subscribed (same add_tick() result as eager mode)
+        self._subscribed: List[str] = list(timeframes)
+        self._lazy_candle_start_us: Dict[str, Optional[int]] = {tf: None for tf in timeframes}
+        self._lazy_next_boundary_us: Dict[str, int] = {tf: -1 for tf in timeframes}
+
+        # INTEGER TIME: (builder, start_us, end_us) of the open candle per timeframe,
+        # used by add_tick_ns() to detect boundaries without datetime arithmetic
+        self._bucket_us: Dict[str, Optional[tuple]] = {tf: None for tf in timeframes}
+        self._integer_buckets = all(m for m in self._timeframe_minutes.values())
+
+    def set_subscribed_timeframes(self, timeframes: Optional[Iterable[str]]) -> None:
+        """
+        Limit lazy-mode boundary detection to the timeframes a strategy reacts to.
+
+        In lazy mode add_tick() only reports new candles for subscribed timeframes;
+        candles for all timeframes are still built (on read). No effect in eager mode.
+
+        Args:
+            timeframes: Timeframes to report from add_tick() (None or empty = none)
+        """
+        self._subscribed = [tf for tf in self.timeframes if timeframes and tf in timeframes]
     
     def add_tick(self, price: float, volume: int, tick_time: datetime) -> set:
         """
@@ -166,6 +427,9 @@ class MultiTimeframeCandleBuilder:
         if tick_time.tzinfo is None:
             tick_time = tick_time.replace(tzinfo=timezone.utc)
 
+        if self.lazy:
+            return self._add_tick_lazy(price, volume, tick_time)
+
         # PERFORMANCE OPTIMIZATION #16: Reuse set object instead of creating new one
         # Clear the reusable set for this tick
         new_candles = self._new_candles_set
@@ -215,7 +479,7 @@ class MultiTimeframeCandleBuilder:
                         # PERFORMANCE OPTIMIZATION #3: Track that this timeframe had a new candle
                         new_candles.add(timeframe)
                         # PERFORMANCE OPTIMIZATION #9: Invalidate DataFrame cache when new candle added
-                        self._df_cache[timeframe] = (len(self.completed_candles[timeframe]), 0, None)
+                        self._df_cache[timeframe] = (self.completed_candles[timeframe].appended, 0, None)
 
                 # Start new candle
                 self.current_builders[timeframe] = CandleBuilder(timeframe, candle_start)
@@ -226,6 +490,262 @@ class MultiTimeframeCandleBuilder:
 
         return new_candles
 
+    def add_tick_ns(self, price: float, volume: int, time_ns: int) -> set:
+        """
+        Add a tick timestamped in UTC epoch nanoseconds.
+
+        Same result as add_tick() with the equivalent UTC datetime, but candle
+        boundaries are found with integer division: a datetime is only built
+        once per new candle (its start time), never per tick. Used by the
+        sequential replay loop, which carries int64 times.
+
+        Args:
+            price: Tick price
+            volume: Tick volume
+            time_ns: Tick time as UTC epoch nanoseconds
+
+        Returns:
+            Set of timeframe strings that had new candles formed on this tick
+        """
+        time_us = time_ns // 1000
+
+        if self.lazy:
+            return self._add_tick_lazy_us(price, volume, time_us, timezone.utc)
+
+        if not self._integer_buckets:
+            return self.add_tick(price, volume, _EPOCH_UTC + timedelta(microseconds=time_us))
+
+        new_candles = self._new_candles_set
+        new_candles.clear()
+
+        builders = self.current_builders
+        buckets = self._bucket_us
+        for timeframe in self.timeframes:
+            builder = builders[timeframe]
+            bucket = buckets[timeframe]
+
+            # Same candle while the tick is before the candle's end (as in add_tick())
+            if bucket is None or bucket[0] is not builder or time_us >= bucket[2]:
+                builder = self._roll_candle_us(timeframe, time_us, new_candles)
+
+            builder.add_price(price, volume)
+
+        return new_candles
+
+    def _roll_candle_us(self, timeframe: str, time_us: int, new_candles: set) -> CandleBuilder:
+        """
+        Find the candle for time_us in eager mode, closing the open one if needed.
+
+        Args:
+            timeframe: Timeframe string
+            time_us: Tick time as UTC epoch microseconds
+            new_candles: Set to add the timeframe to when a candle closes
+
+        Returns:
+            Builder of the candle containing time_us
+        """
+        minutes = self._timeframe_minutes[timeframe]
+        start_us = self._align_us(time_us, minutes)
+        builder = self.current_builders[timeframe]
+
+        if builder is None or (builder.start_time - _EPOCH_UTC) // _ONE_US != start_us:
+            # Close previous candle if exists (same as add_tick())
+            if builder is not None and not builder.is_closed:
+                builder.close_candle()
+                candle_data = builder.to_candle_data()
+                if candle_data is not None:
+                    self.completed_candles[timeframe].append(candle_data)
+                    new_candles.add(timeframe)
+                    self._df_cache[timeframe] = (self.completed_candles[timeframe].appended, 0, None)
+
+            builder = CandleBuilder(timeframe, _EPOCH_UTC + timedelta(microseconds=start_us))
+            self.current_builders[timeframe] = builder
+            self._last_candle_starts[timeframe] = builder.start_time
+
+        self._bucket_us[timeframe] = (builder, start_us, start_us + minutes * _US_PER_MINUTE)
+        return builder
+
+    def _add_tick_lazy(self, price: float, volume: int, tick_time: datetime) -> set:
+        """
+        Lazy-mode add_tick(): buffer the tick and detect subscribed boundaries.
+
+        Args:
+            price: Tick price
+            volume: Tick volume
+            tick_time: Tick timestamp (timezone-aware UTC)
+
+        Returns:
+            Set of subscribed timeframes whose previous candle closed on this tick
+        """
+        time_us = (tick_time - _EPOCH_UTC) // _ONE_US
+        return self._add_tick_lazy_us(price, volume, time_us, tick_time.tzinfo)
+
+    def _add_tick_lazy_us(self, price: float, volume: int, time_us: int, tzinfo) -> set:
+        """
+        Lazy-mode tick with the time as UTC epoch microseconds.
+
+        Args:
+            price: Tick price
+            volume: Tick volume
+            time_us: Tick time as UTC epoch microseconds
+            tzinfo: Timezone of the tick (applied to candle start times on fold)
+
+        Returns:
+            Set of subscribed timeframes whose previous candle closed on this tick
+        """
+        new_candles = self._new_candles_set
+        new_candles.clear()
+
+        # Integer boundary check per subscribed timeframe (no datetime arithmetic)
+        next_boundaries = self._lazy_next_boundary_us
+        for timeframe in self._subscribed:
+            if time_us >= next_boundaries[timeframe]:
+                minutes = self._timeframe_minutes[timeframe]
+                candle_start = self._align_us(time_us, minutes)
+                if self._lazy_candle_start_us[timeframe] is not None:
+                    new_candles.add(timeframe)
+                self._lazy_candle_start_us[timeframe] = candle_start
+                next_boundaries[timeframe] = candle_start + minutes * _US_PER_MINUTE
+
+        self._ring_time_us.append(time_us)
+        self._ring_price.append(price)
+        self._ring_volume.append(volume)
+        self._ring_tzinfo = tzinfo
+
+        if len(self._ring_price) >= self.LAZY_RING_CAPACITY:
+            self._fold_pending_ticks()
+
+        return new_candles
+
+    def add_ticks_bulk(self, times_ns: np.ndarray, prices: np.ndarray, volumes: np.ndarray) -> None:
+        """
+        Add a chronological run of ticks without reporting new candles.
+
+        Used by event-skipping replay to fast-forward over ticks on which no
+        strategy is called. In lazy mode the ticks are appended to the ring in
+        one step; in eager mode they go through add_tick_ns() one by one.
+        Candle state afterwards is identical to calling add_tick() per tick.
+
+        Args:
+            times_ns: int64 UTC epoch nanoseconds
+            prices: float64 tick prices
+            volumes: int64 tick volumes
+        """
+        n = len(times_ns)
+        if n == 0:
+            return
+
+        if not self.lazy:
+            for time_ns, price, volume in zip(np.asarray(times_ns, dtype=np.int64).tolist(),
+                                              prices.tolist(), volumes.tolist()):
+                self.add_tick_ns(price, volume, time_ns)
+            return
+
+        times_us = np.asarray(times_ns, dtype=np.int64) // 1000
+
+        # Boundary state for subscribed timeframes follows the last tick
+        last_us = int(times_us[-1])
+        for timeframe in self._subscribed:
+            if last_us >= self._lazy_next_boundary_us[timeframe]:
+                minutes = self._timeframe_minutes[timeframe]
+                candle_start = self._align_us(last_us, minutes)
+                self._lazy_candle_start_us[timeframe] = candle_start
+                self._lazy_next_boundary_us[timeframe] = candle_start + minutes * _US_PER_MINUTE
+
+        self._ring_time_us.frombytes(times_us.tobytes())
+        self._ring_price.frombytes(np.asarray(prices, dtype=np.float64).tobytes())
+        self._ring_volume.frombytes(np.asarray(volumes, dtype=np.int64).tobytes())
+        self._ring_tzinfo = timezone.utc
+
+        if len(self._ring_price) >= self.LAZY_RING_CAPACITY:
+            self._fold_pending_ticks()
+
+    @staticmethod
+    def _align_us(time_us: int, duration_minutes: int) -> int:
+        """
+        Align epoch microseconds to a timeframe boundary.
+
+        Same result as _align_to_timeframe() (minutes since midnight, floored) for UTC.
+        """
+        day_start = time_us - time_us % _US_PER_DAY
+        minutes = (time_us - day_start) // _US_PER_MINUTE
+        return day_start + (minutes // duration_minutes) * duration_minutes * _US_PER_MINUTE
+
+    def _fold_pending_ticks(self) -> None:
+        """
+        Fold buffered lazy-mode ticks into candles for every timeframe.
+
+        Vectorized: candle buckets are computed for all pending ticks at once and
+        OHLCV per bucket comes from reduceat, then merged with the open candle.
+        Results are identical to feeding the same ticks through eager add_tick().
+        """
+        if len(self._ring_price) == 0:
+            return
+
+        times_us = np.array(self._ring_time_us, dtype=np.int64)
+        prices = np.array(self._ring_price, dtype=np.float64)
+        volumes = np.array(self._ring_volume, dtype=np.int64)
+        tzinfo = self._ring_tzinfo
+
+        del self._ring_time_us[:]
+        del self._ring_price[:]
+        del self._ring_volume[:]
+
+        day_starts = times_us - times_us % _US_PER_DAY
+        minutes_of_day = (times_us - day_starts) // _US_PER_MINUTE
+        n = len(times_us)
+
+        for timeframe in self.timeframes:
+            duration = self._timeframe_minutes[timeframe]
+            starts_us = day_starts + (minutes_of_day // duration) * duration * _US_PER_MINUTE
+
+            # Group consecutive ticks that fall into the same candle
+            change = np.flatnonzero(starts_us[1:] != starts_us[:-1]) + 1
+            group_starts = np.concatenate(([0], change))
+            group_ends = np.append(change, n)
+
+            group_start_us = starts_us[group_starts].tolist()
+            opens = prices[group_starts].tolist()
+            highs = np.maximum.reduceat(prices, group_starts).tolist()
+            lows = np.minimum.reduceat(prices, group_starts).tolist()
+            closes = prices[group_ends - 1].tolist()
+            group_volumes = np.add.reduceat(volumes, group_starts).tolist()
+
+            builder = self.current_builders[timeframe]
+            first_group = 0
+
+            # Continue the open candle if the first pending ticks belong to it
+            if builder is not None and builder.open is not None:
+                builder_start_us = (builder.start_time - _EPOCH_UTC) // _ONE_US
+                if builder_start_us == group_start_us[0]:
+                    if highs[0] > builder.high:
+                        builder.high = highs[0]
+                    if lows[0] < builder.low:
+                        builder.low = lows[0]
+                    builder.close = closes[0]
+                    builder.volume += group_volumes[0]
+                    first_group = 1
+
+            completed = self.completed_candles[timeframe]
+            for g in range(first_group, len(group_start_us)):
+                # Close previous candle (same as eager boundary handling)
+                if builder is not None and not builder.is_closed:
+                    builder.close_candle()
+                    candle_data = builder.to_candle_data()
+                    if candle_data is not None:
+                        completed.append(candle_data)
+
+                candle_start = (_EPOCH_UTC + timedelta(microseconds=group_start_us[g])).replace(tzinfo=tzinfo)
+                builder = CandleBuilder(timeframe, candle_start)
+                builder.open = opens[g]
+                builder.high = highs[g]
+                builder.low = lows[g]
+                builder.close = closes[g]
+                builder.volume = group_volumes[g]
+
+            self.current_builders[timeframe] = builder
+            self._last_candle_starts[timeframe] = builder.start_time if builder is not None else None
+
     def get_candles(self, timeframe: str, count: int = 100) -> Optional[pd.DataFrame]:
         """
         Get completed candles for a timeframe.
@@ -247,58 +767,57 @@ class MultiTimeframeCandleBuilder:
         if timeframe not in self.completed_candles:
             return None
 
+        # LAZY MODE: Materialize buffered ticks before reading
+        if self._ring_price:
+            self._fold_pending_ticks()
+
         candles = self.completed_candles[timeframe]
         if len(candles) == 0:
             return None
 
         # PERFORMANCE OPTIMIZATION #9: Check cache before rebuilding DataFrame
-        current_candle_count = len(candles)
+        current_candle_count = candles.appended
         cached_count, cached_request_count, cached_df = self._df_cache[timeframe]
 
         # Cache hit: same number of candles and same count requested
         if cached_df is not None and cached_count == current_candle_count and cached_request_count == count:
             return cached_df
 
-        # Cache miss: rebuild DataFrame
-        # Get last N candles
-        candles_to_return = candles[-count:] if len(candles) > count else candles
-
-        # PERFORMANCE OPTIMIZATION #12: Use NumPy arrays for faster DataFrame creation
-        # This is 2-3x faster than list comprehensions for large candle lists
-        n = len(candles_to_return)
-
-        # Pre-allocate arrays
-        times = np.empty(n, dtype=object)
-        opens = np.empty(n, dtype=np.float64)
-        highs = np.empty(n, dtype=np.float64)
-        lows = np.empty(n, dtype=np.float64)
-        closes = np.empty(n, dtype=np.float64)
-        volumes = np.empty(n, dtype=np.int64)
-
-        # Fill arrays (single loop is faster than 6 list comprehensions)
-        for i, c in enumerate(candles_to_return):
-            times[i] = c.time
-            opens[i] = c.open
-            highs[i] = c.high
-            lows[i] = c.low
-            closes[i] = c.close
-            volumes[i] = c.volume
-
-        # Create DataFrame from arrays
-        df = pd.DataFrame({
-            'time': times,
-            'open': opens,
-            'high': highs,
-            'low': lows,
-            'close': closes,
-            'tick_volume': volumes,
-        })
+        # Cache miss: rebuild DataFrame from an O(1) slice of the candle store
+        df = candles.tail_dataframe(count)
 
         # Update cache
         self._df_cache[timeframe] = (current_candle_count, count, df)
 
         return df
 
+    def get_candle_arrays(self, timeframe: str, count: int = 100) -> Optional[CandleArrays]:
+        """
+        Get completed candles for a timeframe as NumPy column views.
+
+        Same rows as get_candles() without building a DataFrame. The arrays are
+        zero-copy views into the candle store and must be used immediately.
+
+        Args:
+            timeframe: Timeframe string
+            count: Number of candles to return
+
+        Returns:
+            CandleArrays or None if no candles
+        """
+        if timeframe not in self.completed_candles:
+            return None
+
+        # LAZY MODE: Materialize buffered ticks before reading
+        if self._ring_price:
+            self._fold_pending_ticks()
+
+        candles = self.completed_candles[timeframe]
+        if len(candles) == 0:
+            return None
+
+        return candles.tail_arrays(count)
+
     def get_latest_candle(self, timeframe: str) -> Optional[CandleData]:
         """
         Get the latest **closed** candle for a timeframe.
@@ -309,6 +828,10 @@ class MultiTimeframeCandleBuilder:
         if timeframe not in self.completed_candles:
             return None
 
+        # LAZY MODE: Materialize buffered ticks before reading
+        if self._ring_price:
+            self._fold_pending_ticks()
+
         candles = self.completed_candles[timeframe]
         if len(candles) == 0:
             return None
@@ -328,6 +851,10 @@ class MultiTimeframeCandleBuilder:
         if timeframe not in self.current_builders:
             return None
 
+        # LAZY MODE: Materialize buffered ticks before reading
+        if self._ring_price:
+            self._fold_pending_ticks()
+
         builder = self.current_builders[timeframe]
         if builder is None:
             return None
@@ -351,6 +878,10 @@ class MultiTimeframeCandleBuilder:
         if candles_df is None or len(candles_df) == 0:
             return
 
+        # LAZY MODE: Keep chronological order if ticks were already buffered
+        if self._ring_price:
+            self._fold_pending_ticks()
+
         # Convert DataFrame rows to CandleData objects
         for _, row in candles_df.iterrows():
             # BUGFIX: Ensure timezone-aware datetime to avoid comparison errors
@@ -0,0 +1,265 @@
+"""
+Mid-Run Checkpoints for Long Backtests.
+
+A sequential backtest can be interrupted (crash, reboot, Ctrl+C) and resumed
+from its last checkpoint instead of replaying from the first tick:
+
+- BacktestCheckpoint.due(): called by the tick loops after every tick;
+  becomes True every N ticks and/or every M minutes of wall time.
+- BacktestCheckpoint.save(): writes the index of the next tick to process and
+  the state of every stateful run component (broker balance, positions,
+  closed trades, candle builders, strategies, order/risk/trade managers,
+  persistence) to one zlib-compressed pickle file.
+- BacktestCheckpoint.restore(): called on a freshly wired run (same data,
+  symbols and configuration), loads the state back INTO the run's component
+  objects and returns the tick index to resume from.
+
+Component state is saved as each object's attribute dict. References between
+components, configuration sections, the logger and the tick timeline are
+pickled as persistent references (see warm_start.ComponentPickler), so the
+restored objects keep pointing at the new run's objects. Data that is fixed
+once loaded (OHLC frames, symbol info, the tick timeline) is not saved - the
+resumed run loads it again.
+
+Checkpoints are keyed by run_key() (symbols, date range, tick count and the
+complete configuration), so a checkpoint is never applied to a different run.
+"""
+import hashlib
+import io
+import os
+import tempfile
+import threading
+import time
+import zlib
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable
+
+from src.backtesting.engine.warm_start import (
+    ComponentPickler,
+    ComponentUnpickler,
+    WarmStartSnapshot,
+    stable_repr,
+)
+from src.utils.logger import get_logger
+
+
+# Locks are pickled as new, unlocked locks
+_LOCK_FACTORIES = {type(threading.Lock()): threading.Lock, type(threading.RLock()): threading.RLock}
+
+
+class BacktestCheckpoint:
+    """
+    Periodic checkpoint file of one backtest run.
+
+    Usage:
+        checkpoint = BacktestCheckpoint(path, run_key, every_minutes=15)
+        checkpoint.attach(broker=broker, trading_controller=..., order_manager=..., ...)
+        if resume:
+            controller.resume_tick_index = checkpoint.restore()
+        controller.checkpoint = checkpoint
+        controller.run_sequential(...)
+    """
+
+    FORMAT_VERSION = 1
+    COMPRESSION_LEVEL = 3
+
+    # Attributes that are fixed once the run's data is loaded (or identify the
+    # live object) - kept from the resumed run instead of the checkpoint
+    STATIC_ATTRIBUTES = {
+        'broker': ('symbol_data', 'symbol_info', 'symbol_timestamps', 'symbol_data_lengths',
+                   'symbol_ticks', 'tick_timestamps', 'global_tick_timeline', 'symbol_cache',
+                   'instance_id', 'trade_recorder'),
+    }
+
+    # Components that hold no replay state of their own (threaded mode only) -
+    # referenced, never saved or restored
+    REFERENCE_COMPONENTS = ('time_controller',)
+
+    def __init__(self, path: str, run_key: str, every_ticks: int = 0, every_minutes: float = 0.0):
+        """
+        Initialize checkpoint.
+
+        Args:
+            path: Checkpoint file path
+            run_key: Run identity from run_key()
+            every_ticks: Save every N processed ticks (0 = disabled)
+            every_minutes: Save every M minutes of wall time (0 = disabled)
+        """
+        self.path = Path(path)
+        self.key = run_key
+        self.every_ticks = int(every_ticks or 0)
+        self.every_seconds = float(every_minutes or 0.0) * 60.0
+        self.logger = get_logger()
+
+        # Stateful components (restored in place) and reference-only components
+        self.components: Dict[str, Any] = {}
+        self.references: Dict[str, Any] = {}
+
+        self.saved_count = 0
+        self._last_tick_index = 0
+        self._last_wall_time = time.monotonic()
+        self._calls = 0
+
+    @classmethod
+    def run_key(cls, symbols: Iterable[str], start_time: datetime, end_time: datetime,
+                total_ticks: int, **settings) -> str:
+        """
+        Build the key identifying a run.
+
+        Args:
+            symbols: Symbols of the run (order does not matter)
+            start_time: Backtest start time
+            end_time: Backtest end time
+            total_ticks: Number of ticks in the run's timeline
+            **settings: Further run settings (initial balance, replay mode, ...)
+
+        Returns:
+            Hex digest
+        """
+        from src.config import config
+
+        digest = hashlib.sha1()
+        sections = [f"{name}={stable_repr(section)}" for name, section in sorted(vars(config).items())
+                    if not name.startswith('_')]
+        for part in (cls.FORMAT_VERSION, sorted(symbols), start_time.isoformat(), end_time.isoformat(),
+                     int(total_ticks), sorted(settings.items()), sections):
+            digest.update(repr(part).encode('utf-8'))
+            digest.update(b'\0')
+        return digest.hexdigest()[:20]
+
+    def attach(self, **components) -> None:
+        """
+        Register the run's stateful components.
+
+        Args:
+            **components: Name -> component (broker=..., trading_controller=..., ...).
+                          None values are ignored.
+        """
+        self.references = WarmStartSnapshot.run_components(**components)
+        self.components = {name: obj for name, obj in components.items()
+                           if obj is not None and name not in self.REFERENCE_COMPONENTS}
+        broker = self.components.get('broker')
+        if broker is not None:
+            self.references['timeline'] = broker.global_tick_timeline
+
+    def due(self, next_tick_index: int) -> bool:
+        """
+        Check whether a checkpoint should be written before processing next_tick_index.
+
+        Cheap enough to be called on every tick: the wall clock is only read
+        every 1024 calls.
+        """
+        if self.every_ticks and next_tick_index - self._last_tick_index >= self.every_ticks:
+            return True
+        if self.every_seconds:
+            self._calls += 1
+            if (self._calls & 1023) == 0:
+                return time.monotonic() - self._last_wall_time >= self.every_seconds
+        return False
+
+    def exists(self) -> bool:
+        """Check whether the checkpoint file exists."""
+        return self.path.exists()
+
+    def save(self, next_tick_index: int) -> bool:
+        """
+        Write the checkpoint (atomically - an interrupted write keeps the previous one).
+
+        Args:
+            next_tick_index: Index of the first tick not yet processed
+
+        Returns:
+            True if written, False if the state could not be pickled (logged)
+        """
+        self._last_tick_index = next_tick_index
+        self._last_wall_time = time.monotonic()
+
+        started = time.perf_counter()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        by_id = {id(obj): name for name, obj in self.references.items()}
+
+        temp_path = None
+        try:
+            buffer = io.BytesIO()
+            _CheckpointPickler(buffer, by_id, self.references).dump({
+                'format_version': self.FORMAT_VERSION,
+                'key': self.key,
+                'next_tick_index': next_tick_index,
+                'components': {name: self._component_state(name, obj) for name, obj in self.components.items()},
+            })
+            fd, temp_path = tempfile.mkstemp(prefix=f".{self.path.name}.", dir=str(self.path.parent))
+            with os.fdopen(fd, 'wb') as f:
+                f.write(zlib.compress(buffer.getbuffer(), self.COMPRESSION_LEVEL))
+            os.replace(temp_path, self.path)
+        except Exception as e:
+            if temp_path is not None and os.path.exists(temp_path):
+                os.remove(temp_path)
+            self.logger.warning(f"Checkpoint not saved ({type(e).__name__}: {e})")
+            return False
+
+        self.saved_count += 1
+        self.logger.info(f"Checkpoint saved at tick {next_tick_index:,}: {self.path} "
+                         f"({self.path.stat().st_size / 1024 / 1024:.1f} MB, "
+                         f"{time.perf_counter() - started:.2f}s)")
+        return True
+
+    def restore(self) -> int:
+        """
+        Load the checkpoint into the attached components.
+
+        Returns:
+            Index of the tick to resume from (0 if there is no usable checkpoint -
+            the components are then left untouched)
+        """
+        if not self.path.exists():
+            self.logger.warning(f"No checkpoint at {self.path} - starting from the first tick")
+            return 0
+
+        try:
+            with open(self.path, 'rb') as f:
+                data = zlib.decompress(f.read())
+            state = ComponentUnpickler(io.BytesIO(data), self.references).load()
+        except Exception as e:
+            self.logger.warning(f"Checkpoint {self.path.name} unusable ({type(e).__name__}: {e}) - "
+                                f"starting from the first tick")
+            return 0
+
+        if state.get('format_version') != self.FORMAT_VERSION or state.get('key') != self.key:
+            self.logger.warning(f"Checkpoint {self.path.name} belongs to a different run - "
+                                f"starting from the first tick")
+            return 0
+        missing = set(state['components']) - set(self.components)
+        if missing:
+            self.logger.warning(f"Checkpoint {self.path.name} needs components {sorted(missing)} - "
+                                f"starting from the first tick")
+            return 0
+
+        for name, component_state in state['components'].items():
+            self.components[name].__dict__.update(component_state)
+
+        next_tick_index = state['next_tick_index']
+        self._last_tick_index = next_tick_index
+        self._last_wall_time = time.monotonic()
+        self.logger.info(f"Checkpoint restored: resuming at tick {next_tick_index:,} ({self.path.name})")
+        return next_tick_index
+
+    def remove(self) -> None:
+        """Delete the checkpoint file (after the run completed)."""
+        if self.path.exists():
+            self.path.unlink()
+
+    def _component_state(self, name: str, component: Any) -> Dict[str, Any]:
+        """Attribute dict of a component without its static attributes."""
+        static = self.STATIC_ATTRIBUTES.get(name, ())
+        return {attr: value for attr, value in vars(component).items() if attr not in static}
+
+
+class _CheckpointPickler(ComponentPickler):
+    """ComponentPickler that stores locks as new, unlocked locks."""
+
+    def reducer_override(self, obj):
+        factory = _LOCK_FACTORIES.get(type(obj))
+        if factory is not None:
+            return factory, ()
+        return NotImplemented
@@ -6,6 +6,7 @@ repeated downloads from MT5 and enable offline backtesting.
 """
 import os
 import json
+import hashlib
 import pandas as pd
 from pathlib import Path
 from datetime import datetime, timezone
@@ -14,6 +15,8 @@ import MetaTrader5 as mt5
 
 from src.utils.logger import get_logger
 from src.backtesting.engine.cache_index import CacheIndex
+from src.backtesting.engine.cache_coverage import CacheCoverageValidator, CoverageMatrix, STALE
+from src.backtesting.engine.tick_encoding import read_tick_schema, read_tick_table
 
 
 class DataCache:
@@ -29,6 +32,9 @@ class DataCache:
                             {SYMBOL}_{TIMEFRAME}.parquet  # OHLC data for this day
                         ticks/
                             {SYMBOL}_{TICK_TYPE}.parquet  # Tick data for this day
+                            {SYMBOL}_{TICK_TYPE}.no_ticks # Marker: day was downloaded, no ticks (holiday)
+                        tick_bars/
+                            {SYMBOL}_{TICK_TYPE}_{TIMEFRAME}.parquet  # Bars built from the tick file
                         symbol_info/
                             {SYMBOL}.json                 # Symbol metadata
 
@@ -37,10 +43,20 @@ class DataCache:
         - Better organization for long-term backtests
         - Easier to identify which days have cached data
         - Simpler cache invalidation (per day instead of per date range)
+
+    Tick bars (load_tick_bars()) are tagged with the content hash of the tick
+    file they were built from and rebuilt only when that file changes.
     """
 
+    # Timeframes built together from a day's ticks (plus any other requested one)
+    TICK_BAR_TIMEFRAMES = ['M1', 'M5', 'M15', 'H1', 'H4']
+    TICK_BARS_VERSION = '1.0'
+
+    # Suffix of the marker replacing the tick file of a day without ticks
+    NO_TICKS_SUFFIX = '.no_ticks'
+
     def __init__(self, cache_dir: str = "data/cache", cache_ttl_days: int = 7,
-                 use_index: bool = True):
+                 use_index: bool = True, validation_workers: int = 8):
         """
         Initialize data cache.
 
@@ -48,6 +64,7 @@ class DataCache:
             cache_dir: Root directory for cached data (default: data/cache)
             cache_ttl_days: Cache time-to-live in days (default: 7)
             use_index: Use cache index for fast validation (default: True)
+            validation_workers: Concurrent footer reads when validating cache coverage (default: 8)
         """
         self.cache_dir = Path(cache_dir)
         self.cache_ttl_days = cache_ttl_days
@@ -60,6 +77,12 @@ class DataCache:
         # Initialize cache index
         self.index = CacheIndex(str(self.cache_dir)) if use_index else None
 
+        # Parallel, memoized footer reads for coverage checks
+        self.coverage = CacheCoverageValidator(str(self.cache_dir), cache_ttl_days, validation_workers)
+
+        # Tick file content hashes: (path, mtime_ns, size) -> hex digest
+        self._tick_hashes: Dict[Tuple[str, int, int], str] = {}
+
     def _read_cache_metadata(self, cache_path: Path) -> Optional[Dict[str, str]]:
         """
         Read metadata from cached parquet file.
@@ -99,6 +122,9 @@ class DataCache:
         """
         Validate that cached data covers requested range without gaps.
 
+        Days recorded in the cache index are validated from their indexed
+        metadata without touching the filesystem.
+
         Checks for:
         1. Missing cache files for any day in the range
         2. Cache files without metadata (old/broken cache)
@@ -139,22 +165,43 @@ class DataCache:
         else:
             days_to_check = days
 
+        # Metadata of indexed days comes from one range query (no file access);
+        # days the index has no metadata for are checked on disk and backfilled
+        indexed = {}
+        if self.index:
+            records = self.index.get_day_records(symbol, timeframe, days[0].date(), days[-1].date())
+            indexed = {
+                day: {key: value for key, value in record.items() if value is not None}
+                for day, record in records.items() if record['cached_at']
+            }
+
+        # Read footers of the remaining days concurrently
+        unindexed_paths = {
+            day: self.coverage.file_path(day.date(), symbol, timeframe)
+            for day in days_to_check if day.date() not in indexed
+        }
+        footers = self.coverage.read_footers(unindexed_paths.values())
+
         # Check each day for existence and metadata
         for i, day in enumerate(days_to_check):
-            cache_path = self._get_day_cache_path(day, symbol, timeframe)
+            metadata = indexed.get(day.date())
 
-            if not cache_path.exists():
-                self.logger.debug(f"  Validation failed: Missing cache file for {day.date()}")
-                self.logger.debug(f"    Expected path: {cache_path}")
-                return False, f"Missing cache for day {day.date()}"
+            if metadata is None:
+                cache_path = unindexed_paths[day]
+                metadata = footers[cache_path]
 
-            # Read metadata
-            metadata = self._read_cache_metadata(cache_path)
+                if metadata is None:
+                    self.logger.debug(f"  Validation failed: Missing cache file for {day.date()}")
+                    self.logger.debug(f"    Expected path: {cache_path}")
+                    return False, f"Missing cache for day {day.date()}"
 
-            if not metadata:
-                # No metadata - invalidate (old/broken cache)
-                self.logger.debug(f"  Validation failed: Missing metadata for {day.date()}")
-                return False, f"No metadata for day {day.date()} - cache will be rebuilt"
+                if not metadata:
+                    # No metadata - invalidate (old/broken cache)
+                    self.logger.debug(f"  Validation failed: Missing metadata for {day.date()}")
+                    return False, f"No metadata for day {day.date()} - cache will be rebuilt"
+
+                if self.index:
+                    self.index.record_days(symbol, timeframe, [(day.date(), metadata, cache_path)])
 
             # Check cache freshness (TTL)
             if 'cached_at' in metadata:
@@ -218,6 +265,50 @@ class DataCache:
         filename = f"{symbol}_{timeframe}.parquet"
         return day_dir / filename
 
+    def _get_tick_path(self, date: datetime, symbol: str, tick_type: str) -> Path:
+        """
+        Get the tick file path for a symbol on a specific day.
+
+        Args:
+            date: Date of the tick file
+            symbol: Symbol name
+            tick_type: Tick type name (e.g., 'INFO', 'ALL', 'TRADE')
+
+        Returns:
+            Path to tick file (YYYY/MM/DD/ticks/SYMBOL_TICKTYPE.parquet)
+        """
+        return self.cache_dir / date.strftime('%Y') / date.strftime('%m') / date.strftime('%d') / "ticks" / \
+            f"{symbol}_{tick_type}.parquet"
+
+    @classmethod
+    def get_no_ticks_path(cls, tick_path: Path) -> Path:
+        """
+        Get the path of the marker recording that a day has no ticks.
+
+        Args:
+            tick_path: Tick file path of the day
+
+        Returns:
+            Path to marker file (YYYY/MM/DD/ticks/SYMBOL_TICKTYPE.no_ticks)
+        """
+        return tick_path.with_suffix(cls.NO_TICKS_SUFFIX)
+
+    def _get_tick_bars_path(self, date: datetime, symbol: str, tick_type: str, timeframe: str) -> Path:
+        """
+        Get the path of the bars built from a day's tick file.
+
+        Args:
+            date: Date of the tick file
+            symbol: Symbol name
+            tick_type: Tick type name
+            timeframe: Timeframe
+
+        Returns:
+            Path to bar file (YYYY/MM/DD/tick_bars/SYMBOL_TICKTYPE_TIMEFRAME.parquet)
+        """
+        return self.cache_dir / date.strftime('%Y') / date.strftime('%m') / date.strftime('%d') / "tick_bars" / \
+            f"{symbol}_{tick_type}_{timeframe}.parquet"
+
     def _get_symbol_info_path(self, date: datetime, symbol: str) -> Path:
         """
         Get path to symbol info JSON file for a specific day.
@@ -321,38 +412,31 @@ class DataCache:
 
         self.logger.debug(f"  Checking {len(days)} days for cached data...")
 
+        # Read all footers concurrently (memoized, so a preceding coverage check is reused)
+        day_paths = {day: self.coverage.file_path(day.date(), symbol, timeframe) for day in days}
+        footers = self.coverage.read_footers(day_paths.values())
+        now = datetime.now(timezone.utc)
+
         # Check each day
         for day in days:
-            cache_path = self._get_day_cache_path(day, symbol, timeframe)
+            cache_path = day_paths[day]
+            metadata = footers[cache_path]
 
-            if not cache_path.exists():
+            if metadata is None:
                 missing_days.append(day)
                 continue
 
-            # Read metadata to validate
-            metadata = self._read_cache_metadata(cache_path)
-
             if not metadata:
                 # No metadata - treat as missing (will be rebuilt)
                 self.logger.debug(f"  No metadata for {symbol} {timeframe} on {day.date()}, will re-fetch")
                 missing_days.append(day)
                 continue
 
-            # Check freshness
-            if 'cached_at' in metadata:
-                try:
-                    cached_at = datetime.fromisoformat(metadata['cached_at'])
-                    age_days = (datetime.now(timezone.utc) - cached_at).total_seconds() / 86400
-
-                    if age_days > self.cache_ttl_days:
-                        self.logger.debug(f"  Cache expired for {symbol} {timeframe} on {day.date()} ({age_days:.1f} days old)")
-                        missing_days.append(day)
-                        continue
-                except Exception as e:
-                    self.logger.warning(f"  Error parsing cached_at metadata: {e}")
-                    # Treat as missing if we can't validate freshness
-                    missing_days.append(day)
-                    continue
+            # Check freshness (unparseable cached_at is stale as well)
+            if self.coverage.classify(metadata, now) == STALE:
+                self.logger.debug(f"  Cache expired for {symbol} {timeframe} on {day.date()}")
+                missing_days.append(day)
+                continue
 
             # Load this day's data
             try:
@@ -401,6 +485,26 @@ class DataCache:
 
         return cached_df, missing_days, symbol_info
 
+    def get_coverage_matrix(self, symbols: List[str], timeframes: List[str],
+                            start_date: datetime, end_date: datetime) -> CoverageMatrix:
+        """
+        Cache status of every (symbol, day, timeframe) in a date range.
+
+        Indexed days are classified from the cache index; footers of the
+        other files are read concurrently and memoized, so the
+        load_from_cache_partial() calls that follow do not read them again.
+
+        Args:
+            symbols: Symbols to check
+            timeframes: Candle timeframes (or 'ticks_<TYPE>' for raw tick files)
+            start_date: Start date
+            end_date: End date
+
+        Returns:
+            Dict of symbol -> day -> timeframe -> 'ok' / 'stale' / 'missing'
+        """
+        return self.coverage.coverage_matrix(symbols, timeframes, start_date, end_date, index=self.index)
+
     def load_from_cache(self, symbol: str, timeframe: str,
                         start_date: datetime, end_date: datetime) -> Optional[Tuple[pd.DataFrame, Dict]]:
         """
@@ -587,17 +691,181 @@ class DataCache:
 
                 days_saved += 1
                 total_bars += len(day_df)
-                saved_dates.append(date)
+                saved_dates.append((date, metadata, cache_path))
 
             # Update cache index
             if self.index and saved_dates:
-                self.index.add_cached_days(symbol, timeframe, saved_dates)
+                self.index.record_days(symbol, timeframe, saved_dates)
 
             self.logger.info(f"  ✓ Saved to cache: {symbol} {timeframe} ({total_bars} bars across {days_saved} days)")
 
         except Exception as e:
             self.logger.error(f"  ✗ Error saving cache for {symbol} {timeframe}: {e}")
 
+    def tick_file_hash(self, tick_path: Path) -> str:
+        """
+        Get the content hash of a tick file.
+
+        PERFORMANCE OPTIMIZATION: Memoized per (path, mtime, size), so an
+        unchanged file is hashed once per process.
+
+        Args:
+            tick_path: Tick parquet file
+
+        Returns:
+            Hex digest of the file contents
+        """
+        stat = tick_path.stat()
+        memo_key = (str(tick_path), stat.st_mtime_ns, stat.st_size)
+        digest = self._tick_hashes.get(memo_key)
+        if digest is None:
+            hasher = hashlib.blake2b(digest_size=16)
+            with open(tick_path, 'rb') as f:
+                for chunk in iter(lambda: f.read(4 * 1024 * 1024), b''):
+                    hasher.update(chunk)
+            digest = hasher.hexdigest()
+            self._tick_hashes[memo_key] = digest
+        return digest
+
+    def build_tick_bars(self, date: datetime, symbol: str, tick_type: str = 'INFO',
+                        timeframes: Optional[List[str]] = None) -> Optional[Dict[str, pd.DataFrame]]:
+        """
+        Build every timeframe's bars from a day's tick file and cache them.
+
+        All timeframes come from one vectorized pass over the ticks
+        (tick_bars.build_bars()). Each bar file records the tick file's
+        content hash.
+
+        Args:
+            date: Day of the tick file
+            symbol: Symbol name
+            tick_type: Tick type name
+            timeframes: Timeframes to build (default: TICK_BAR_TIMEFRAMES)
+
+        Returns:
+            Dict of timeframe -> bars, or None if there is no tick file for the day
+        """
+        import numpy as np
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        from src.backtesting.engine.tick_bars import build_bars
+
+        tick_path = self._get_tick_path(date, symbol, tick_type)
+        if not tick_path.exists():
+            return None
+
+        tick_hash = self.tick_file_hash(tick_path)
+        columns = [name for name in ('time', 'bid', 'volume') if name in read_tick_schema(tick_path).names]
+        ticks = read_tick_table(tick_path, columns=columns)
+        times_ns = pd.DatetimeIndex(pd.to_datetime(ticks.column('time').to_pandas(), utc=True)).as_unit('ns').asi8
+        volumes = (ticks.column('volume').to_numpy() if 'volume' in columns
+                   else np.zeros(len(times_ns), dtype=np.int64))
+
+        bars = build_bars(times_ns, ticks.column('bid').to_numpy(), volumes,
+                          timeframes or self.TICK_BAR_TIMEFRAMES)
+
+        for timeframe, df in bars.items():
+            metadata = {
+                'cached_at': datetime.now(timezone.utc).isoformat(),
+                'source': 'ticks',
+                'tick_hash': tick_hash,
+                'first_data_time': df['time'].iloc[0].isoformat() if len(df) > 0 else '',
+                'last_data_time': df['time'].iloc[-1].isoformat() if len(df) > 0 else '',
+                'row_count': str(len(df)),
+                'cache_version': self.TICK_BARS_VERSION
+            }
+            path = self._get_tick_bars_path(date, symbol, tick_type, timeframe)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            table = table.replace_schema_metadata({k.encode(): v.encode() for k, v in metadata.items()})
+            pq.write_table(table, path, compression='snappy')
+
+        self.logger.debug(f"  Built tick bars for {symbol} on {date.date()}: "
+                          f"{', '.join(f'{tf}={len(df)}' for tf, df in bars.items())}")
+        return bars
+
+    def get_missing_tick_days(self, symbol: str, start_date: datetime, end_date: datetime,
+                              tick_type: str = 'INFO') -> List[datetime]:
+        """
+        Get the days of a date range without a cached tick file.
+
+        Days recorded as having no ticks (see get_no_ticks_path(), e.g.
+        holidays) are covered.
+
+        Args:
+            symbol: Symbol name
+            start_date: Start date (UTC)
+            end_date: End date (UTC)
+            tick_type: Tick type name of the tick files
+
+        Returns:
+            List of day start datetimes without a tick file or no-ticks marker
+        """
+        missing = []
+        for day in self._get_date_range_days(start_date, end_date):
+            tick_path = self._get_tick_path(day, symbol, tick_type)
+            if not tick_path.exists() and not self.get_no_ticks_path(tick_path).exists():
+                missing.append(day)
+        return missing
+
+    def load_tick_bars(self, symbol: str, timeframe: str, start_date: datetime, end_date: datetime,
+                       tick_type: str = 'INFO') -> Optional[pd.DataFrame]:
+        """
+        Load bars derived from the cached tick files of a date range.
+
+        Days whose bar file is missing or was built from different tick file
+        contents are rebuilt (all timeframes at once, see build_tick_bars()).
+        Days without a tick file are skipped - check get_missing_tick_days()
+        first when the bars must cover the whole range.
+
+        Args:
+            symbol: Symbol name
+            timeframe: Timeframe
+            start_date: Start date (UTC)
+            end_date: End date (UTC)
+            tick_type: Tick type name of the tick files
+
+        Returns:
+            DataFrame with OHLC data (same format as copy_rates_range) or None
+            if no day in the range has ticks
+        """
+        daily_dfs = []
+        rebuilt = 0
+
+        for day in self._get_date_range_days(start_date, end_date):
+            tick_path = self._get_tick_path(day, symbol, tick_type)
+            if not tick_path.exists():
+                continue
+
+            bars_path = self._get_tick_bars_path(day, symbol, tick_type, timeframe)
+            metadata = self._read_cache_metadata(bars_path)
+            if metadata and metadata.get('tick_hash') == self.tick_file_hash(tick_path):
+                df = pd.read_parquet(bars_path, engine='pyarrow')
+            else:
+                timeframes = list(dict.fromkeys(self.TICK_BAR_TIMEFRAMES + [timeframe]))
+                df = self.build_tick_bars(day, symbol, tick_type, timeframes)[timeframe]
+                rebuilt += 1
+
+            if len(df) > 0:
+                daily_dfs.append(df)
+
+        if not daily_dfs:
+            return None
+
+        merged_df = pd.concat(daily_dfs, ignore_index=True) if len(daily_dfs) > 1 else daily_dfs[0]
+        if merged_df['time'].duplicated().any():
+            # A tick file holding ticks past midnight shares a bar with the next day's file
+            merged_df = merged_df.groupby('time', sort=True, as_index=False).agg({
+                'open': 'first', 'high': 'max', 'low': 'min', 'close': 'last',
+                'tick_volume': 'sum', 'spread': 'first', 'real_volume': 'sum'
+            })
+
+        merged_df = merged_df[(merged_df['time'] >= start_date) & (merged_df['time'] <= end_date)].reset_index(drop=True)
+
+        self.logger.info(f"  ✓ Tick bars: {symbol} {timeframe} ({len(merged_df)} bars from {len(daily_dfs)} days, "
+                         f"{rebuilt} days rebuilt)")
+        return merged_df
+
     def clear_cache(self, symbol: Optional[str] = None, date: Optional[datetime] = None):
         """
         Clear cached data.
@@ -622,9 +890,11 @@ class DataCache:
                     # Clear specific symbol for this date
                     candles_file = date_dir / "candles" / f"{symbol}_*.parquet"
                     ticks_file = date_dir / "ticks" / f"{symbol}_*.parquet"
+                    no_ticks_file = date_dir / "ticks" / f"{symbol}_*{self.NO_TICKS_SUFFIX}"
+                    tick_bars_file = date_dir / "tick_bars" / f"{symbol}_*.parquet"
                     info_file = date_dir / "symbol_info" / f"{symbol}.json"
 
-                    for pattern in [candles_file, ticks_file, info_file]:
+                    for pattern in [candles_file, ticks_file, no_ticks_file, tick_bars_file, info_file]:
                         for file in date_dir.rglob(pattern.name):
                             if file.exists():
                                 file.unlink()
@@ -659,7 +929,7 @@ class DataCache:
                             continue
 
                         # Remove symbol files from this day
-                        for subdir in ['candles', 'ticks', 'symbol_info']:
+                        for subdir in ['candles', 'ticks', 'tick_bars', 'symbol_info']:
                             subdir_path = day_dir / subdir
                             if subdir_path.exists():
                                 for file in subdir_path.glob(f"{symbol}*"):
@@ -731,8 +1001,8 @@ class DataCache:
                         'symbols': set()
                     }
 
-                    # Count files in candles, ticks, and symbol_info subdirectories
-                    for subdir_name in ['candles', 'ticks', 'symbol_info']:
+                    # Count files in candles, ticks, tick_bars and symbol_info subdirectories
+                    for subdir_name in ['candles', 'ticks', 'tick_bars', 'symbol_info']:
                         subdir = day_dir / subdir_name
                         if not subdir.exists():
                             continue
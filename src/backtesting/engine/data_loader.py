@@ -12,9 +12,18 @@ import MetaTrader5 as mt5
 from src.core.mt5_connector import MT5Connector
 from src.backtesting.engine.data_cache import DataCache
 from src.backtesting.engine.broker_archive_downloader import BrokerArchiveDownloader
+from src.backtesting.engine.tick_encoding import read_tick_table, write_tick_table
 from src.utils.logger import get_logger
 
 
+# MT5 tick type flag -> tick type name used in tick cache file names
+TICK_TYPE_NAMES = {
+    mt5.COPY_TICKS_INFO: "INFO",
+    mt5.COPY_TICKS_ALL: "ALL",
+    mt5.COPY_TICKS_TRADE: "TRADE"
+}
+
+
 class BacktestDataLoader:
     """
     Load and prepare historical data for backtesting.
@@ -27,7 +36,7 @@ class BacktestDataLoader:
     
     def __init__(self, connector: Optional[MT5Connector] = None,
                  use_cache: bool = True, cache_dir: str = "data",
-                 cache_ttl_days: int = 7):
+                 cache_ttl_days: int = 7, compact_tick_encoding: bool = False):
         """
         Initialize data loader.
 
@@ -36,6 +45,8 @@ class BacktestDataLoader:
             use_cache: Whether to use data caching (default: True)
             cache_dir: Directory for cached data (default: "data")
             cache_ttl_days: Cache time-to-live in days (default: 7)
+            compact_tick_encoding: Write new tick cache files in the compact integer
+                                   encoding (tick_encoding.py); both layouts are always readable
         """
         self.logger = get_logger()
         self.connector = connector
@@ -53,7 +64,9 @@ class BacktestDataLoader:
 
         # Initialize broker archive downloader
         from src.config import config
-        self.archive_downloader = BrokerArchiveDownloader(config.tick_archive)
+        self.compact_tick_encoding = compact_tick_encoding
+        self.archive_downloader = BrokerArchiveDownloader(config.tick_archive,
+                                                          compact_tick_encoding=compact_tick_encoding)
 
     def _get_tick_cache_path(self, cache_dir: str, date: datetime, symbol: str, tick_type_name: str) -> Path:
         """
@@ -177,6 +190,8 @@ class BacktestDataLoader:
         Returns:
             DataFrame with tick data for the day, or None if no data available
         """
+        ticks = None
+
         # Try MT5 first
         try:
             # Connect if needed
@@ -261,14 +276,26 @@ class BacktestDataLoader:
                 self.logger.warning(f"    Archive download failed: {e}")
 
         # No data available from any source
+        if cache_path and ticks is not None and len(ticks) == 0 and day_end < datetime.now(timezone.utc):
+            # MT5 has no ticks for a finished day: record it as covered (e.g. a holiday)
+            self._save_no_ticks_marker(cache_path)
         return None
 
+    def _save_no_ticks_marker(self, cache_path: Path):
+        """Record that the day of a tick cache file has no ticks."""
+        try:
+            marker_path = DataCache.get_no_ticks_path(cache_path)
+            marker_path.parent.mkdir(parents=True, exist_ok=True)
+            marker_path.write_text(datetime.now(timezone.utc).isoformat())
+            self.logger.debug(f"    Recorded no ticks in {marker_path}")
+        except Exception as e:
+            self.logger.warning(f"    Failed to record day without ticks: {e}")
+
     def _save_tick_cache(self, df: pd.DataFrame, cache_path: Path):
         """Save tick data to cache file with metadata."""
         try:
             from datetime import timezone
             import pyarrow as pa
-            import pyarrow.parquet as pq
 
             cache_path.parent.mkdir(parents=True, exist_ok=True)
 
@@ -292,7 +319,7 @@ class BacktestDataLoader:
             table = table.replace_schema_metadata(metadata_bytes)
 
             # Write with metadata
-            pq.write_table(table, cache_path, compression='snappy')
+            write_tick_table(table, cache_path, encoded=self.compact_tick_encoding)
 
             self.logger.debug(f"    Cached to {cache_path}")
         except Exception as e:
@@ -303,7 +330,8 @@ class BacktestDataLoader:
                      force_refresh: bool = False,
                      preloaded_ticks: Optional[pd.DataFrame] = None,
                      use_incremental_loading: bool = True,
-                     suppress_not_found_error: bool = False) -> Optional[Tuple[pd.DataFrame, Dict]]:
+                     suppress_not_found_error: bool = False,
+                     tick_type: int = mt5.COPY_TICKS_INFO) -> Optional[Tuple[pd.DataFrame, Dict]]:
         """
         Load historical data from MT5 with caching support.
 
@@ -321,6 +349,7 @@ class BacktestDataLoader:
             use_incremental_loading: If True, use partial cache hits and only download missing days
             suppress_not_found_error: If True, log at DEBUG level instead of ERROR when symbol not found
                                      (useful when trying multiple symbol variations for conversion pairs)
+            tick_type: MT5 tick type used when candles are built from ticks (default: COPY_TICKS_INFO)
 
         Returns:
             Tuple of (DataFrame, symbol_info dict) or None if failed
@@ -389,7 +418,7 @@ class BacktestDataLoader:
 
                         day_download_start = time.time()
                         day_result = self._download_from_mt5(
-                            symbol, timeframe, missing_day, day_end, preloaded_ticks
+                            symbol, timeframe, missing_day, day_end, preloaded_ticks, tick_type=tick_type
                         )
                         day_download_time = time.time() - day_download_start
 
@@ -469,7 +498,8 @@ class BacktestDataLoader:
                 self.logger.info(f"  ⚠ Cache miss: {symbol} {timeframe} - downloading from MT5...")
 
         # Load from MT5 (full range)
-        result = self._download_from_mt5(symbol, timeframe, start_date, end_date, preloaded_ticks)
+        result = self._download_from_mt5(symbol, timeframe, start_date, end_date, preloaded_ticks,
+                                         tick_type=tick_type)
 
         # Save to cache if successful
         if result is not None and self.use_cache:
@@ -480,7 +510,8 @@ class BacktestDataLoader:
 
     def _download_from_mt5(self, symbol: str, timeframe: str,
                           start_date: datetime, end_date: datetime,
-                          preloaded_ticks: Optional[pd.DataFrame] = None) -> Optional[Tuple[pd.DataFrame, Dict]]:
+                          preloaded_ticks: Optional[pd.DataFrame] = None,
+                          tick_type: int = mt5.COPY_TICKS_INFO) -> Optional[Tuple[pd.DataFrame, Dict]]:
         """
         Download historical data from MT5 (internal method).
 
@@ -544,7 +575,8 @@ class BacktestDataLoader:
 
                 # FALLBACK: Try to build candles from ticks for any timeframe
                 self.logger.debug(f"  ⚡ Attempting to build {timeframe} candles from tick data for {symbol}...")
-                df = self._build_candles_from_ticks(symbol, timeframe, start_date, end_date, preloaded_ticks)
+                df = self._build_candles_from_ticks(symbol, timeframe, start_date, end_date, preloaded_ticks,
+                                                    tick_type)
 
                 if df is not None and len(df) > 0:
                     self.logger.info(f"  ✓ Successfully built {len(df)} {timeframe} candles from ticks")
@@ -589,13 +621,18 @@ class BacktestDataLoader:
 
     def _build_candles_from_ticks(self, symbol: str, timeframe: str,
                                    start_date: datetime, end_date: datetime,
-                                   preloaded_ticks: Optional[pd.DataFrame] = None) -> Optional[pd.DataFrame]:
+                                   preloaded_ticks: Optional[pd.DataFrame] = None,
+                                   tick_type: int = mt5.COPY_TICKS_INFO) -> Optional[pd.DataFrame]:
         """
         Build candles of any timeframe from tick data.
 
         This is a fallback when candles are not available from the broker.
         Supports: M1, M5, M15, M30, H1, H4, D1
 
+        Preloaded ticks are resampled first. Otherwise, with the cache enabled,
+        bars come from DataCache.load_tick_bars() when every trading day of the
+        range has a cached tick file; if not, ticks are loaded from MT5.
+
         Args:
             symbol: Symbol name
             timeframe: Timeframe (e.g., 'M1', 'M5', 'H1', 'H4', 'D1')
@@ -603,6 +640,7 @@ class BacktestDataLoader:
             end_date: End date (UTC)
             preloaded_ticks: Optional pre-loaded tick DataFrame. If provided, use this instead
                            of loading from MT5 again.
+            tick_type: MT5 tick type of the cached tick files and MT5 tick requests
 
         Returns:
             DataFrame with OHLC data (same format as copy_rates_range) or None
@@ -625,7 +663,7 @@ class BacktestDataLoader:
 
             resample_freq = timeframe_map[timeframe]
 
-            # Use pre-loaded ticks if available, otherwise load from MT5
+            # Use pre-loaded ticks if available, otherwise cached tick bars or MT5 ticks
             if preloaded_ticks is not None and len(preloaded_ticks) > 0:
                 self.logger.info(f"  Using pre-loaded tick data ({len(preloaded_ticks):,} ticks)...")
                 df_ticks = preloaded_ticks.copy()
@@ -646,9 +684,16 @@ class BacktestDataLoader:
 
                 self.logger.info(f"  Filtered to {len(df_ticks):,} ticks in date range")
             else:
+                # PERFORMANCE OPTIMIZATION: Bars precompiled from the cached tick files
+                # (all timeframes built together, rebuilt only when a tick file changes)
+                if self.cache:
+                    cached_bars = self._load_cached_tick_bars(symbol, timeframe, start_date, end_date, tick_type)
+                    if cached_bars is not None:
+                        return cached_bars
+
                 # Load tick data from MT5
                 self.logger.debug(f"  Loading tick data from MT5 for {symbol}...")
-                ticks = mt5.copy_ticks_range(symbol, start_date, end_date, mt5.COPY_TICKS_INFO)
+                ticks = mt5.copy_ticks_range(symbol, start_date, end_date, tick_type)
 
                 if ticks is None or len(ticks) == 0:
                     # No tick data - this is normal for holidays/weekends
@@ -699,6 +744,39 @@ class BacktestDataLoader:
             self.logger.error(traceback.format_exc())
             return None
 
+    def _load_cached_tick_bars(self, symbol: str, timeframe: str, start_date: datetime, end_date: datetime,
+                               tick_type: int) -> Optional[pd.DataFrame]:
+        """
+        Load bars built from cached tick files if they cover the whole range.
+
+        DataCache.load_tick_bars() skips days without a tick file, so partial
+        coverage would return bars that look complete. Days the market is
+        closed (see _should_skip_day) and days recorded as having no ticks
+        (holidays, see _download_day_ticks) need no tick file.
+
+        Args:
+            symbol: Symbol name
+            timeframe: Timeframe
+            start_date: Start date (UTC)
+            end_date: End date (UTC)
+            tick_type: MT5 tick type flag
+
+        Returns:
+            DataFrame with OHLC data, or None if a trading day has no cached ticks
+        """
+        tick_type_name = TICK_TYPE_NAMES.get(tick_type, "UNKNOWN")
+        missing_days = [day for day in self.cache.get_missing_tick_days(symbol, start_date, end_date, tick_type_name)
+                        if not self._should_skip_day(symbol, day)]
+        if missing_days:
+            self.logger.debug(f"  Cached {tick_type_name} ticks of {symbol} miss {len(missing_days)} days - "
+                              f"not using tick bars for {timeframe}")
+            return None
+
+        bars = self.cache.load_tick_bars(symbol, timeframe, start_date, end_date, tick_type_name)
+        if bars is None or len(bars) == 0:
+            return None
+        return bars
+
     def clear_cache(self, symbol: Optional[str] = None):
         """
         Clear cached data.
@@ -712,6 +790,28 @@ class BacktestDataLoader:
         else:
             self.logger.warning("Cache is not enabled")
 
+    def check_cache_coverage(self, symbols: List[str], timeframes: List[str],
+                             start_date: datetime, end_date: datetime) -> Optional[Dict]:
+        """
+        Cache status of every (symbol, day, timeframe) before loading.
+
+        Reads all footers in one parallel pass; the per-symbol cache loads
+        that follow reuse the memoized results.
+
+        Args:
+            symbols: Symbols to check
+            timeframes: Candle timeframes
+            start_date: Start date (UTC)
+            end_date: End date (UTC)
+
+        Returns:
+            Dict of symbol -> day -> timeframe -> 'ok' / 'stale' / 'missing',
+            or None if the cache is not enabled
+        """
+        if not self.cache:
+            return None
+        return self.cache.get_coverage_matrix(symbols, timeframes, start_date, end_date)
+
     def get_cache_stats(self) -> Dict:
         """
         Get statistics about cached data.
@@ -853,11 +953,7 @@ class BacktestDataLoader:
         import concurrent.futures
         import threading
 
-        tick_type_name = {
-            mt5.COPY_TICKS_INFO: "INFO",
-            mt5.COPY_TICKS_ALL: "ALL",
-            mt5.COPY_TICKS_TRADE: "TRADE"
-        }.get(tick_type, "UNKNOWN")
+        tick_type_name = TICK_TYPE_NAMES.get(tick_type, "UNKNOWN")
 
         self.logger.info(f"Loading {symbol} ticks for {start_date.date()} to {end_date.date()}")
 
@@ -909,7 +1005,7 @@ class BacktestDataLoader:
                     load_start = time.time()
                     file_size_mb = day_cache_path.stat().st_size / (1024 * 1024)
 
-                    df = pd.read_parquet(day_cache_path)
+                    df = read_tick_table(day_cache_path).to_pandas()
                     if 'time' in df.columns:
                         df['time'] = pd.to_datetime(df['time'], utc=True)
 
@@ -0,0 +1,605 @@
+"""
+End-to-End Engine Throughput Benchmarks.
+
+test_performance_benchmarks.py covers cache I/O only. EngineBenchmark
+measures the replay engine itself on deterministic synthetic data
+(SyntheticTickGenerator), wired exactly like backtest.py in sequential mode:
+
+- ticks/sec of BacktestController.run_sequential() for every strategy type
+  alone and combined, at 1/10/30 symbols (in-memory timeline)
+- the same combined runs with the streaming timeline (load_ticks_streaming)
+- peak RSS of every run (each case runs in a fresh 'spawn' process, so peak
+  RSS belongs to that case alone)
+- time-to-first-tick: from the start of tick loading to the first tick
+  reaching _advance_tick_sequential()
+- get_candles() latency after the replay (p50/p99 in microseconds)
+
+Results are stored in one JSON file keyed by git commit (BenchmarkStore);
+compare_results() flags metrics that got worse than a baseline commit by more
+than a threshold, and tps_targets() checks the PERFORMANCE_OPTIMIZATION_ROADMAP
+ticks/sec targets against measured numbers.
+
+Directory layout of a benchmark work directory:
+
+    <work_dir>/cache/                      synthetic data cache (daily files)
+    <work_dir>/dataset/<SYMBOL>_ticks.parquet  merged ticks of the simulated days
+    <work_dir>/dataset/<SYMBOL>_<TF>.parquet   merged candles (history + simulated days)
+    <work_dir>/dataset/<SYMBOL>.json       symbol info
+    <work_dir>/runs/<case>/                per-case persistence files
+"""
+import json
+import multiprocessing
+import platform
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.utils.logger import get_logger
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[3]
+DEFAULT_RESULTS_FILE = PROJECT_ROOT / "data" / "benchmarks" / "engine_benchmarks.json"
+
+# 30 symbols: SyntheticTickGenerator profiles first, then FX crosses (derived profiles)
+BENCHMARK_SYMBOLS = [
+    'EURUSD', 'GBPUSD', 'USDJPY', 'XAUUSD', 'AUDUSD', 'USDCHF', 'USDCAD', 'EURJPY', 'BTCUSD', 'ETHUSD',
+    'NZDUSD', 'EURGBP', 'EURCHF', 'EURAUD', 'EURCAD', 'EURNZD', 'GBPJPY', 'GBPCHF', 'GBPAUD', 'GBPCAD',
+    'GBPNZD', 'AUDJPY', 'AUDCHF', 'AUDCAD', 'AUDNZD', 'CADJPY', 'CHFJPY', 'NZDJPY', 'NZDCAD', 'XAGUSD',
+]
+
+# Strategy sets -> config.strategy_enable flags switched on (all others off)
+STRATEGY_FLAGS = ('true_breakout_enabled', 'fakeout_enabled', 'hft_momentum_enabled')
+STRATEGY_SETS = {
+    'true_breakout': ('true_breakout_enabled',),
+    'fakeout': ('fakeout_enabled',),
+    'hft_momentum': ('hft_momentum_enabled',),
+    'combined': STRATEGY_FLAGS,
+}
+
+CANDLE_TIMEFRAMES = ["M1", "M5", "M15", "H1", "H4"]  # backtest.py TIMEFRAMES
+
+# Metric -> +1 (higher is better) or -1 (lower is better); compared by compare_results()
+METRIC_DIRECTIONS = {
+    'ticks_per_sec': 1,
+    'peak_rss_mb': -1,
+    'time_to_first_tick_sec': -1,
+    'get_candles_p50_us': -1,
+    'get_candles_p99_us': -1,
+}
+
+# Ticks/sec targets of docs/PERFORMANCE_OPTIMIZATION_ROADMAP.md
+TPS_TARGETS = {
+    'Phase 4': 20_000,
+    'Phase 5A': 22_000,
+    'Phase 5B': 30_000,
+    'Phase 5C': 40_000,
+}
+
+
+@dataclass
+class BenchmarkSettings:
+    """Synthetic data and run settings shared by every benchmark case"""
+    start_date: datetime = datetime(2024, 1, 8, tzinfo=timezone.utc)  # Monday
+    days: int = 2
+    history_days: int = 10
+    seed: int = 42
+    ticks_per_hour: float = 2000.0
+    symbol_counts: Tuple[int, ...] = (1, 10, 30)
+    strategies: Tuple[str, ...] = ('true_breakout', 'fakeout', 'hft_momentum', 'combined')
+    streaming: bool = True
+    initial_balance: float = 10000.0
+    event_skipping: bool = False
+    candle_calls: int = 1000
+    candle_count: int = 100
+
+    @property
+    def end_date(self) -> datetime:
+        """Last simulated instant."""
+        return self.start_date + timedelta(days=self.days) - timedelta(microseconds=1)
+
+    @property
+    def history_start(self) -> datetime:
+        """First day of candle history."""
+        return self.start_date - timedelta(days=self.history_days)
+
+    def data_key(self) -> Dict[str, Any]:
+        """Settings that determine the generated data."""
+        return {'start_date': self.start_date.isoformat(), 'days': self.days, 'history_days': self.history_days,
+                'seed': self.seed, 'ticks_per_hour': self.ticks_per_hour,
+                'symbols': BENCHMARK_SYMBOLS[:max(self.symbol_counts)]}
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable settings."""
+        values = asdict(self)
+        values['start_date'] = self.start_date.isoformat()
+        values['symbol_counts'] = list(self.symbol_counts)
+        values['strategies'] = list(self.strategies)
+        return values
+
+
+@dataclass
+class BenchmarkCase:
+    """One benchmark run"""
+    strategy: str
+    symbol_count: int
+    streaming: bool = False
+    metrics: Dict[str, float] = field(default_factory=dict)
+
+    @property
+    def name(self) -> str:
+        mode = 'streaming' if self.streaming else 'in_memory'
+        return f"{mode}/{self.strategy}/{self.symbol_count}sym"
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of the current process in MB."""
+    try:
+        import resource
+    except ImportError:
+        import psutil
+        info = psutil.Process().memory_info()
+        return getattr(info, 'peak_wset', info.rss) / 1024 / 1024  # Windows: peak working set
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024 / 1024 if sys.platform == 'darwin' else peak / 1024  # macOS bytes, Linux KB
+
+
+def git_commit() -> Tuple[str, bool]:
+    """
+    Current git commit of the repository.
+
+    Returns:
+        (commit hash or 'unknown', True if tracked files have uncommitted changes)
+    """
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=PROJECT_ROOT, capture_output=True,
+                                text=True, check=True).stdout.strip()
+        status = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=PROJECT_ROOT,
+                                capture_output=True, text=True, check=True).stdout.strip()
+        return commit, bool(status)
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown', False
+
+
+class EngineBenchmark:
+    """
+    Benchmark the sequential replay engine on synthetic data.
+
+    Usage:
+        benchmark = EngineBenchmark("data/benchmarks/work", BenchmarkSettings())
+        results = benchmark.run()
+        BenchmarkStore().save(results)
+    """
+
+    DATASET_DIR = "dataset"
+    CACHE_DIR = "cache"
+    RUNS_DIR = "runs"
+    DATA_KEY_FILE = "data_key.json"
+
+    def __init__(self, work_dir: str, settings: Optional[BenchmarkSettings] = None, isolate: bool = True):
+        """
+        Initialize benchmark.
+
+        Args:
+            work_dir: Directory for the synthetic cache, merged dataset and run files
+            settings: Benchmark settings (default: BenchmarkSettings())
+            isolate: Run every case in a fresh process (required for meaningful peak RSS)
+        """
+        self.work_dir = Path(work_dir)
+        self.settings = settings or BenchmarkSettings()
+        self.isolate = isolate
+        self.logger = get_logger()
+
+        unknown = set(self.settings.strategies) - set(STRATEGY_SETS)
+        if unknown:
+            raise ValueError(f"Unknown strategy sets: {sorted(unknown)} (choose from {sorted(STRATEGY_SETS)})")
+        if max(self.settings.symbol_counts) > len(BENCHMARK_SYMBOLS):
+            raise ValueError(f"At most {len(BENCHMARK_SYMBOLS)} symbols are supported")
+
+    def cases(self) -> List[BenchmarkCase]:
+        """Every strategy set at every symbol count (in-memory), plus combined runs streamed."""
+        cases = [BenchmarkCase(strategy, count) for strategy in self.settings.strategies
+                 for count in self.settings.symbol_counts]
+        if self.settings.streaming:
+            strategy = 'combined' if 'combined' in self.settings.strategies else self.settings.strategies[-1]
+            cases.extend(BenchmarkCase(strategy, count, streaming=True) for count in self.settings.symbol_counts)
+        return cases
+
+    def prepare(self) -> Path:
+        """
+        Generate the synthetic cache and merged per-symbol dataset (skipped if up to date).
+
+        Returns:
+            Dataset directory
+        """
+        from src.backtesting.engine.synthetic_ticks import SyntheticTickGenerator
+
+        settings = self.settings
+        dataset_dir = self.work_dir / self.DATASET_DIR
+        key_path = self.work_dir / self.DATA_KEY_FILE
+        data_key = settings.data_key()
+        if key_path.exists() and json.loads(key_path.read_text(encoding='utf-8')) == data_key:
+            return dataset_dir
+
+        symbols = data_key['symbols']
+        self.logger.info("=" * 60)
+        self.logger.info(f"Generating benchmark data: {len(symbols)} symbols, "
+                         f"{settings.history_start.date()} to {settings.end_date.date()}")
+
+        cache_dir = self.work_dir / self.CACHE_DIR
+        generator = SyntheticTickGenerator(seed=settings.seed, ticks_per_hour=settings.ticks_per_hour)
+        generator.write_cache(str(cache_dir), symbols, settings.history_start, settings.end_date,
+                              timeframes=CANDLE_TIMEFRAMES)
+
+        dataset_dir.mkdir(parents=True, exist_ok=True)
+        for symbol in symbols:
+            ticks = self._merge_days(cache_dir, settings.start_date, settings.end_date,
+                                     f"ticks/{symbol}_INFO.parquet")
+            ticks.to_parquet(dataset_dir / f"{symbol}_ticks.parquet", index=False)
+            for timeframe in CANDLE_TIMEFRAMES:
+                candles = self._merge_days(cache_dir, settings.history_start, settings.end_date,
+                                           f"candles/{symbol}_{timeframe}.parquet")
+                candles.to_parquet(dataset_dir / f"{symbol}_{timeframe}.parquet", index=False)
+            with open(dataset_dir / f"{symbol}.json", 'w') as f:
+                json.dump(generator.symbol_info(symbol), f, indent=2)
+
+        key_path.write_text(json.dumps(data_key, indent=2), encoding='utf-8')
+        self.logger.info(f"  Benchmark data ready in {self.work_dir}")
+        return dataset_dir
+
+    @staticmethod
+    def _merge_days(cache_dir: Path, start: datetime, end: datetime, relative_path: str) -> pd.DataFrame:
+        """Concatenate the daily cache files of a date range."""
+        frames = []
+        day = datetime(start.year, start.month, start.day, tzinfo=timezone.utc)
+        while day <= end:
+            path = cache_dir / day.strftime('%Y') / day.strftime('%m') / day.strftime('%d') / relative_path
+            if path.exists():
+                frames.append(pd.read_parquet(path))
+            day += timedelta(days=1)
+        return pd.concat(frames, ignore_index=True)
+
+    def run(self, progress_callback: Optional[Callable[[int, int, BenchmarkCase], None]] = None) -> Dict:
+        """
+        Run every case.
+
+        Args:
+            progress_callback: Optional callback(done, total, case) after each case
+
+        Returns:
+            Results dictionary: commit, dirty, recorded_at, python, platform,
+            settings and cases (case name -> metrics)
+        """
+        self.prepare()
+        cases = self.cases()
+        for done, case in enumerate(cases, start=1):
+            if self.isolate:
+                # 'spawn' gives every case a clean process (own peak RSS, fresh config)
+                context = multiprocessing.get_context('spawn')
+                with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+                    case.metrics = executor.submit(_run_benchmark_case, str(self.work_dir), self.settings,
+                                                   case.strategy, case.symbol_count, case.streaming,
+                                                   True).result()
+            else:
+                case.metrics = run_benchmark_case(self.work_dir, self.settings, case.strategy,
+                                                  case.symbol_count, case.streaming)
+            self.logger.info(f"  {case.name}: {case.metrics['ticks_per_sec']:,.0f} ticks/sec, "
+                             f"peak RSS {case.metrics['peak_rss_mb']:,.0f} MB")
+            if progress_callback:
+                progress_callback(done, len(cases), case)
+
+        commit, dirty = git_commit()
+        return {
+            'commit': commit,
+            'dirty': dirty,
+            'recorded_at': datetime.now(timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'settings': self.settings.to_dict(),
+            'cases': {case.name: case.metrics for case in cases},
+        }
+
+
+def _run_benchmark_case(work_dir: str, settings: BenchmarkSettings, strategy: str, symbol_count: int,
+                        streaming: bool, quiet: bool = True) -> Dict[str, float]:
+    """Process entry point of one case (quiet logging, like sweep workers)."""
+    if quiet:
+        from src.utils.logger import init_logger
+        init_logger(log_to_file=False, log_to_console=False, log_level="ERROR", use_async_logging=False)
+    return run_benchmark_case(Path(work_dir), settings, strategy, symbol_count, streaming)
+
+
+def run_benchmark_case(work_dir: Path, settings: BenchmarkSettings, strategy: str, symbol_count: int,
+                       streaming: bool = False) -> Dict[str, float]:
+    """
+    Run one benchmark case in the current process.
+
+    Same wiring as backtest.py (sequential mode): candles are loaded first,
+    strategies are initialized, then ticks are loaded for the strategies'
+    timeframes and replayed with run_sequential().
+
+    Args:
+        work_dir: Benchmark work directory (EngineBenchmark.prepare() already ran)
+        settings: Benchmark settings
+        strategy: Strategy set (key of STRATEGY_SETS)
+        symbol_count: Trade the first N BENCHMARK_SYMBOLS
+        streaming: Stream ticks from the daily cache instead of loading them into memory
+
+    Returns:
+        Metrics: ticks, trades, setup_sec, load_sec, run_sec, ticks_per_sec,
+        time_to_first_tick_sec, peak_rss_mb, get_candles_p50_us, get_candles_p99_us
+    """
+    from src.backtesting.engine.backtest_controller import BacktestController
+    from src.backtesting.engine.simulated_broker import SimulatedBroker
+    from src.backtesting.engine.time_controller import TimeController, TimeMode
+    from src.config import config
+    from src.execution.order_manager import OrderManager
+    from src.execution.position_persistence import PositionPersistence
+    from src.execution.trade_manager import TradeManager
+    from src.indicators.technical_indicators import TechnicalIndicators
+    from src.risk.risk_manager import RiskManager
+    from src.strategy.symbol_performance_persistence import SymbolPerformancePersistence
+
+    symbols = BENCHMARK_SYMBOLS[:symbol_count]
+    dataset_dir = work_dir / EngineBenchmark.DATASET_DIR
+    run_dir = work_dir / EngineBenchmark.RUNS_DIR / f"{'streaming' if streaming else 'in_memory'}_{strategy}_{symbol_count}"
+
+    flags = config.strategy_enable
+    saved_flags = {name: getattr(flags, name) for name in STRATEGY_FLAGS}
+    try:
+        for name in STRATEGY_FLAGS:
+            setattr(flags, name, name in STRATEGY_SETS[strategy])
+
+        setup_start = time.perf_counter()
+        persistence = PositionPersistence(data_dir=str(run_dir))
+        persistence.clear_all()
+        broker = SimulatedBroker(initial_balance=settings.initial_balance, persistence=persistence,
+                                 enable_slippage=False)
+        for symbol in symbols:
+            with open(dataset_dir / f"{symbol}.json", 'r') as f:
+                symbol_info = json.load(f)
+            for timeframe in CANDLE_TIMEFRAMES:
+                candles = pd.read_parquet(dataset_dir / f"{symbol}_{timeframe}.parquet")
+                broker.load_symbol_data(symbol, candles, symbol_info, timeframe)
+
+        time_controller = TimeController(symbols, mode=TimeMode.MAX_SPEED, include_position_monitor=True,
+                                         broker=broker)
+        risk_manager = RiskManager(connector=broker, risk_config=config.risk, persistence=persistence)
+        order_manager = OrderManager(
+            connector=broker,
+            magic_number=config.advanced.magic_number,
+            trade_comment=config.advanced.trade_comment,
+            persistence=persistence,
+            risk_manager=risk_manager
+        )
+        indicators = TechnicalIndicators()
+        trade_manager = TradeManager(
+            connector=broker,
+            order_manager=order_manager,
+            trailing_config=config.trailing_stop,
+            use_breakeven=config.advanced.use_breakeven,
+            breakeven_trigger_rr=config.advanced.breakeven_trigger_rr,
+            indicators=indicators,
+            range_configs=config.range_config.ranges
+        )
+        controller = BacktestController(
+            simulated_broker=broker,
+            time_controller=time_controller,
+            order_manager=order_manager,
+            risk_manager=risk_manager,
+            trade_manager=trade_manager,
+            indicators=indicators,
+            symbol_persistence=SymbolPerformancePersistence(data_dir=str(run_dir))
+        )
+        controller.event_skipping = settings.event_skipping
+        controller.show_progress = False
+
+        broker.set_start_time(settings.start_date)
+        if not controller.initialize(symbols):
+            raise RuntimeError("BacktestController initialization failed (no strategies)")
+        required_timeframes = set()
+        for symbol_strategy in controller.trading_controller.strategies.values():
+            required_timeframes.update(symbol_strategy.get_required_timeframes() or [])
+        setup_sec = time.perf_counter() - setup_start
+
+        # Time-to-first-tick: one-shot instance wrapper, removed on the first tick
+        first_tick = []
+
+        def advance_first(*args, **kwargs):
+            first_tick.append(time.perf_counter())
+            del controller._advance_tick_sequential
+            return controller._advance_tick_sequential(*args, **kwargs)
+
+        load_start = time.perf_counter()
+        if streaming:
+            broker.load_ticks_streaming(
+                cache_files={},
+                required_timeframes=sorted(required_timeframes),
+                start_date=settings.start_date,
+                end_date=settings.end_date,
+                cache_dir=str(work_dir / EngineBenchmark.CACHE_DIR),
+                symbols=symbols,
+            )
+        else:
+            broker.load_ticks_from_cache_files({symbol: str(dataset_dir / f"{symbol}_ticks.parquet")
+                                                for symbol in symbols},
+                                               required_timeframes=sorted(required_timeframes))
+        load_sec = time.perf_counter() - load_start
+
+        controller._advance_tick_sequential = advance_first
+        run_start = time.perf_counter()
+        controller.run_sequential(backtest_start_time=settings.start_date)
+        run_sec = time.perf_counter() - run_start
+        vars(controller).pop('_advance_tick_sequential', None)
+
+        ticks = len(broker.global_tick_timeline)
+        p50_us, p99_us = _get_candles_latency(broker, symbols, sorted(required_timeframes) or CANDLE_TIMEFRAMES,
+                                              settings.candle_calls, settings.candle_count)
+        return {
+            'ticks': ticks,
+            'trades': len(broker.closed_trades),
+            'setup_sec': setup_sec,
+            'load_sec': load_sec,
+            'run_sec': run_sec,
+            'ticks_per_sec': ticks / run_sec if run_sec > 0 else 0.0,
+            'time_to_first_tick_sec': (first_tick[0] - load_start) if first_tick else load_sec + run_sec,
+            'peak_rss_mb': peak_rss_mb(),
+            'get_candles_p50_us': p50_us,
+            'get_candles_p99_us': p99_us,
+        }
+    finally:
+        for name, value in saved_flags.items():
+            setattr(flags, name, value)
+
+
+def _get_candles_latency(broker, symbols: List[str], timeframes: List[str], calls: int,
+                         count: int) -> Tuple[float, float]:
+    """
+    get_candles() latency at the end of the replay.
+
+    Returns:
+        (p50, p99) in microseconds over `calls` calls cycling through symbols and timeframes
+    """
+    pairs = [(symbol, timeframe) for symbol in symbols for timeframe in timeframes]
+    if not pairs or calls <= 0:
+        return 0.0, 0.0
+    elapsed = np.empty(calls, dtype=np.int64)
+    for i in range(calls):
+        symbol, timeframe = pairs[i % len(pairs)]
+        start = time.perf_counter_ns()
+        broker.get_candles(symbol, timeframe, count)
+        elapsed[i] = time.perf_counter_ns() - start
+    p50, p99 = np.percentile(elapsed, [50, 99])
+    return float(p50) / 1e3, float(p99) / 1e3
+
+
+class BenchmarkStore:
+    """
+    Benchmark results in one JSON file keyed by git commit.
+
+    Re-running a commit replaces its entry; entries keep the order in which
+    commits were first recorded.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Initialize store.
+
+        Args:
+            path: JSON file (default: data/benchmarks/engine_benchmarks.json)
+        """
+        self.path = Path(path) if path else DEFAULT_RESULTS_FILE
+
+    def load(self) -> Dict[str, Dict]:
+        """All results: commit -> results dictionary."""
+        if not self.path.exists():
+            return {}
+        with open(self.path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def save(self, results: Dict) -> Path:
+        """Store one EngineBenchmark.run() result under its commit."""
+        entries = self.load()
+        entries[results['commit']] = results
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(entries, f, indent=2)
+        tmp_path.replace(self.path)
+        return self.path
+
+    def get(self, commit: str) -> Dict:
+        """
+        Results of a commit (full hash or unique prefix).
+
+        Raises:
+            KeyError: No (or more than one) stored commit matches
+        """
+        entries = self.load()
+        matches = [key for key in entries if key.startswith(commit)]
+        if len(matches) != 1:
+            raise KeyError(f"{len(matches)} stored benchmark results match commit '{commit}'")
+        return entries[matches[0]]
+
+    def previous(self, commit: str) -> Optional[Dict]:
+        """Results recorded before the given commit's (None if it is the first)."""
+        keys = list(self.load())
+        target = self.get(commit)['commit']
+        index = keys.index(target)
+        return self.get(keys[index - 1]) if index > 0 else None
+
+
+def compare_results(baseline: Dict, current: Dict, threshold: float = 0.10) -> List[Dict]:
+    """
+    Per-metric changes between two benchmark results.
+
+    Args:
+        baseline: Baseline results (EngineBenchmark.run())
+        current: Current results
+        threshold: Relative change beyond which a worse metric is a regression (0.10 = 10%)
+
+    Returns:
+        One row per case and metric present in both: case, metric, baseline,
+        current, change (relative, signed) and regression flag
+    """
+    rows = []
+    for case, metrics in current['cases'].items():
+        base_metrics = baseline['cases'].get(case)
+        if base_metrics is None:
+            continue
+        for metric, direction in METRIC_DIRECTIONS.items():
+            base_value = base_metrics.get(metric)
+            value = metrics.get(metric)
+            if base_value is None or value is None or base_value <= 0:
+                continue
+            change = (value - base_value) / base_value
+            rows.append({
+                'case': case,
+                'metric': metric,
+                'baseline': base_value,
+                'current': value,
+                'change': change,
+                'regression': change * direction < -threshold,
+            })
+    return rows
+
+
+def tps_targets(results: Dict) -> Dict[str, Dict[str, Any]]:
+    """
+    Roadmap ticks/sec targets reached by the combined in-memory runs.
+
+    Returns:
+        Case name -> {'ticks_per_sec', 'reached': [phase, ...]}
+    """
+    reached = {}
+    for case, metrics in results['cases'].items():
+        if case.startswith('in_memory/combined/'):
+            tps = metrics['ticks_per_sec']
+            reached[case] = {'ticks_per_sec': tps,
+                             'reached': [phase for phase, target in TPS_TARGETS.items() if tps >= target]}
+    return reached
+
+
+def format_comparison(rows: List[Dict], threshold: float) -> str:
+    """Text table of compare_results() rows."""
+    lines = [
+        "=" * 96,
+        f"{'Case':<34} {'Metric':<24} {'Baseline':>12} {'Current':>12} {'Change':>8}",
+        "-" * 96,
+    ]
+    for row in rows:
+        flag = "  REGRESSION" if row['regression'] else ""
+        lines.append(f"{row['case'][:34]:<34} {row['metric']:<24} {row['baseline']:>12,.2f} "
+                     f"{row['current']:>12,.2f} {row['change'] * 100:>+7.1f}%{flag}")
+    regressions = sum(row['regression'] for row in rows)
+    lines.append("-" * 96)
+    lines.append(f"{regressions} regression(s) beyond {threshold * 100:.0f}%")
+    lines.append("=" * 96)
+    return "\n".join(lines)
@@ -0,0 +1,270 @@
+"""
+Streaming Equity-Curve and Trade-Log Recorder.
+
+Records account snapshots (balance, equity, profit, open positions) and closed
+trades with bounded memory:
+
+- Snapshots are appended to preallocated NumPy column buffers. A full buffer
+  is written to <directory>/equity.parquet as one row group and reused, so a
+  run of any length holds at most ROW_GROUP_SIZE snapshots in memory.
+- Closed trades are spilled the same way to <directory>/trades.parquet.
+- A downsampled curve (per-minute OHLC of equity plus the last balance, profit
+  and open positions of each minute) stays in memory for the live display and
+  for results['equity_curve'].
+
+Without a directory nothing is spilled - only the per-minute curve is kept.
+ResultsAnalyzer reads equity.parquet back lazily, one row group at a time.
+"""
+from array import array
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.utils.logger import get_logger
+
+
+NS_PER_SECOND = 1_000_000_000
+NS_PER_MINUTE = 60 * NS_PER_SECOND
+
+
+class EquityRecorder:
+    """
+    Append-only columnar recorder of the equity curve and the trade log.
+
+    Usage:
+        recorder = EquityRecorder(log_dir, interval_seconds=10)
+        recorder.record(time_ns, balance, equity, profit, open_positions)
+        recorder.record_trade(trade_record)
+        recorder.close()
+        curve = recorder.curve()          # per-minute curve (list of dicts)
+    """
+
+    EQUITY_FILE = "equity.parquet"
+    TRADES_FILE = "trades.parquet"
+    ROW_GROUP_SIZE = 65_536
+    TRADE_ROW_GROUP_SIZE = 4_096
+
+    # Trade record fields (SimulatedBroker._close_position) and their Arrow types
+    TRADE_FIELDS = (
+        ('ticket', 'int64'), ('symbol', 'string'), ('type', 'string'), ('volume', 'float64'),
+        ('open_price', 'float64'), ('close_price', 'float64'), ('open_time', 'timestamp'),
+        ('close_time', 'timestamp'), ('profit', 'float64'), ('sl', 'float64'), ('tp', 'float64'),
+        ('magic', 'int64'), ('comment', 'string'),
+    )
+
+    def __init__(self, directory: Optional[str] = None, interval_seconds: float = 10.0,
+                 row_group_size: Optional[int] = None):
+        """
+        Initialize recorder.
+
+        Args:
+            directory: Directory of equity.parquet / trades.parquet (None = keep only
+                       the per-minute curve, spill nothing)
+            interval_seconds: Simulated seconds between snapshots in sequential mode
+            row_group_size: Snapshots per row group (default: ROW_GROUP_SIZE)
+        """
+        self.directory = Path(directory) if directory is not None else None
+        self.interval_ns = max(1, int(interval_seconds * NS_PER_SECOND))
+        self.row_group_size = int(row_group_size or self.ROW_GROUP_SIZE)
+        self.logger = get_logger()
+
+        # MEMORY OPTIMIZATION: One reusable buffer per column, written out when full
+        self._times = np.empty(self.row_group_size, dtype=np.int64)
+        self._balance = np.empty(self.row_group_size, dtype=np.float64)
+        self._equity = np.empty(self.row_group_size, dtype=np.float64)
+        self._profit = np.empty(self.row_group_size, dtype=np.float64)
+        self._open_positions = np.empty(self.row_group_size, dtype=np.int32)
+        self._buffered = 0
+        self._trades: List[Dict] = []
+
+        self._equity_writer = None
+        self._trade_writer = None
+        self.snapshot_count = 0
+        self.trade_count = 0
+        self.closed = False
+
+        # Per-minute curve: minute, equity OHLC, last balance/profit/open positions
+        self._minute = array('q')
+        self._open = array('d')
+        self._high = array('d')
+        self._low = array('d')
+        self._close = array('d')
+        self._last_balance = array('d')
+        self._last_profit = array('d')
+        self._last_open_positions = array('q')
+
+    @property
+    def equity_path(self) -> Optional[Path]:
+        """Spilled equity curve (None if nothing was spilled)."""
+        if self.directory is None or not self.snapshot_count:
+            return None
+        return self.directory / self.EQUITY_FILE
+
+    @property
+    def trades_path(self) -> Optional[Path]:
+        """Spilled trade log (None if nothing was spilled)."""
+        if self.directory is None or not self.trade_count:
+            return None
+        return self.directory / self.TRADES_FILE
+
+    def next_due_ns(self, time_ns: int) -> int:
+        """Simulated time of the next snapshot after one taken at time_ns."""
+        return time_ns - time_ns % self.interval_ns + self.interval_ns
+
+    def record(self, time_ns: int, balance: float, equity: float, profit: float,
+               open_positions: int) -> None:
+        """
+        Append one account snapshot.
+
+        Args:
+            time_ns: Simulated time (UTC epoch nanoseconds)
+            balance: Account balance
+            equity: Account equity (balance + floating P&L)
+            profit: Realized profit since the start
+            open_positions: Number of open positions
+        """
+        minute = time_ns // NS_PER_MINUTE
+        if self._minute and self._minute[-1] == minute:
+            if equity > self._high[-1]:
+                self._high[-1] = equity
+            if equity < self._low[-1]:
+                self._low[-1] = equity
+            self._close[-1] = equity
+            self._last_balance[-1] = balance
+            self._last_profit[-1] = profit
+            self._last_open_positions[-1] = open_positions
+        else:
+            self._minute.append(minute)
+            self._open.append(equity)
+            self._high.append(equity)
+            self._low.append(equity)
+            self._close.append(equity)
+            self._last_balance.append(balance)
+            self._last_profit.append(profit)
+            self._last_open_positions.append(open_positions)
+
+        self.snapshot_count += 1
+        if self.directory is None:
+            return
+
+        i = self._buffered
+        self._times[i] = time_ns
+        self._balance[i] = balance
+        self._equity[i] = equity
+        self._profit[i] = profit
+        self._open_positions[i] = open_positions
+        self._buffered = i + 1
+        if self._buffered == self.row_group_size:
+            self._flush_equity()
+
+    def record_trade(self, trade: Dict) -> None:
+        """
+        Append one closed trade (a SimulatedBroker trade record).
+
+        Args:
+            trade: Trade record dictionary
+        """
+        if self.directory is None:
+            return
+        self._trades.append(trade)
+        self.trade_count += 1
+        if len(self._trades) >= self.TRADE_ROW_GROUP_SIZE:
+            self._flush_trades()
+
+    def close(self) -> None:
+        """Write buffered rows and close the parquet files (idempotent)."""
+        if self.closed:
+            return
+        self._flush_equity()
+        self._flush_trades()
+        for writer in (self._equity_writer, self._trade_writer):
+            if writer is not None:
+                writer.close()
+        self._equity_writer = self._trade_writer = None
+        self.closed = True
+
+    def minute_equity(self) -> np.ndarray:
+        """Closing equity of every recorded minute."""
+        return _to_numpy(self._close, np.float64)
+
+    def minute_frame(self) -> pd.DataFrame:
+        """Per-minute curve as a DataFrame (time, open, high, low, close, balance, profit, open_positions)."""
+        return pd.DataFrame({
+            'time': pd.to_datetime(_to_numpy(self._minute, np.int64) * NS_PER_MINUTE, unit='ns', utc=True),
+            'open': _to_numpy(self._open, np.float64),
+            'high': _to_numpy(self._high, np.float64),
+            'low': _to_numpy(self._low, np.float64),
+            'close': _to_numpy(self._close, np.float64),
+            'balance': _to_numpy(self._last_balance, np.float64),
+            'profit': _to_numpy(self._last_profit, np.float64),
+            'open_positions': _to_numpy(self._last_open_positions, np.int64),
+        })
+
+    def curve(self) -> List[Dict]:
+        """
+        Per-minute curve in the results['equity_curve'] format.
+
+        Returns:
+            List of {'time', 'balance', 'equity', 'profit', 'open_positions'}
+            dictionaries (equity = last equity of the minute)
+        """
+        frame = self.minute_frame()
+        return [
+            {'time': t.to_pydatetime(), 'balance': float(b), 'equity': float(e), 'profit': float(p),
+             'open_positions': int(n)}
+            for t, b, e, p, n in zip(frame['time'], frame['balance'], frame['close'],
+                                     frame['profit'], frame['open_positions'])
+        ]
+
+    def _flush_equity(self) -> None:
+        """Write the buffered snapshots as one row group."""
+        count = self._buffered
+        if not count:
+            return
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        table = pa.table({
+            'time': pa.array(self._times[:count], type=pa.timestamp('ns', tz='UTC')),
+            'balance': self._balance[:count],
+            'equity': self._equity[:count],
+            'profit': self._profit[:count],
+            'open_positions': self._open_positions[:count],
+        })
+        if self._equity_writer is None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self._equity_writer = pq.ParquetWriter(str(self.directory / self.EQUITY_FILE), table.schema)
+        self._equity_writer.write_table(table, row_group_size=count)
+        self._buffered = 0
+
+    def _flush_trades(self) -> None:
+        """Write the buffered trades as one row group."""
+        if not self._trades:
+            return
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        schema = self._trade_schema()
+        table = pa.Table.from_pylist(self._trades, schema=schema)
+        if self._trade_writer is None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self._trade_writer = pq.ParquetWriter(str(self.directory / self.TRADES_FILE), schema)
+        self._trade_writer.write_table(table)
+        self._trades = []
+
+    @classmethod
+    def _trade_schema(cls):
+        """Arrow schema of trades.parquet."""
+        import pyarrow as pa
+
+        types = {'int64': pa.int64(), 'float64': pa.float64(), 'string': pa.string(),
+                 'timestamp': pa.timestamp('us', tz='UTC')}
+        return pa.schema([(name, types[kind]) for name, kind in cls.TRADE_FIELDS])
+
+
+
+def _to_numpy(values: array, dtype) -> np.ndarray:
+    """Copy of an array.array (a view would block further appends)."""
+    return np.frombuffer(values, dtype=dtype).copy() if len(values) else np.empty(0, dtype=dtype)
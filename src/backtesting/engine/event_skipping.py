@@ -0,0 +1,228 @@
+"""
+Event-skipping replay index for sequential backtesting.
+
+Most ticks neither close a position nor cross a bar boundary a strategy
+reacts to. On such ticks the sequential loop only updates state
+(current tick, candle builder) - no strategy is called and no SL/TP is hit.
+
+EventSkipIndex finds the next tick that CAN change something:
+
+- Static events (precomputed once, vectorized over the columnar timeline):
+  every tick of a symbol whose strategy needs every tick (tick-only/legacy
+  strategies, or strategies that opt out via requires_every_tick()), and the
+  first tick of each new bar for the timeframes a symbol's strategy requires.
+- Trigger events (recomputed only when open positions change): the next tick
+  whose bid/ask reaches the nearest trigger levels of a symbol's
+  SymbolPositionTable.
+- Time events: the first tick at or after a simulated time, used by the
+  replay loop for equity snapshots at the recorder interval.
+
+Ticks between events are fast-forwarded in bulk: candle builders receive
+them in one add_ticks_bulk() call per symbol and current_ticks is set to
+each symbol's last tick. The resulting broker state at every event tick is
+identical to processing every tick.
+"""
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+import numpy as np
+
+from src.backtesting.engine.tick_timeline import ColumnarTickTimeline
+from src.utils.timeframe_converter import TimeframeConverter
+
+
+_NS_PER_MINUTE = 60_000_000_000
+_NS_PER_DAY = 86_400_000_000_000
+
+
+class EventSkipIndex:
+    """
+    Next-event lookup and bulk fast-forward over a ColumnarTickTimeline.
+    """
+
+    # First scan window for trigger events (doubles up to MAX_SCAN_CHUNK)
+    MIN_SCAN_CHUNK = 4096
+    MAX_SCAN_CHUNK = 1 << 20
+
+    def __init__(self, broker, timeline: ColumnarTickTimeline,
+                 every_tick_symbols: Iterable[str],
+                 symbol_timeframes: Dict[str, Iterable[str]]):
+        """
+        Precompute static event ticks.
+
+        Args:
+            broker: SimulatedBroker (position tables, candle builders, current_ticks)
+            timeline: Columnar global tick timeline
+            every_tick_symbols: Symbols whose strategy must see every tick
+            symbol_timeframes: Symbol -> timeframes whose new bars call its strategy
+        """
+        self.broker = broker
+        self.timeline = timeline
+        self.length = len(timeline)
+        self.symbol_ids: Dict[str, int] = {symbol: i for i, symbol in enumerate(timeline.symbols)}
+
+        # Candle price per tick (same rule as the tick loop: last if > 0, else bid)
+        self.prices = np.where(timeline.last > 0, timeline.last, timeline.bid)
+
+        self.static_events = self._build_static_events(set(every_tick_symbols), symbol_timeframes)
+
+        # Trigger event cache: (trigger levels key, first trigger index found for that key)
+        self._trigger_key: Optional[Tuple] = None
+        self._trigger_index: int = -1
+
+        # Statistics
+        self.events_processed = 0
+        self.ticks_skipped = 0
+
+    def _build_static_events(self, every_tick_symbols: Set[str],
+                             symbol_timeframes: Dict[str, Iterable[str]]) -> np.ndarray:
+        """
+        Find ticks on which a strategy is called regardless of positions.
+
+        Returns:
+            Sorted int64 array of tick indices
+        """
+        timeline = self.timeline
+        mask = np.zeros(self.length, dtype=np.bool_)
+
+        for symbol, symbol_id in self.symbol_ids.items():
+            timeframes = list(symbol_timeframes.get(symbol) or [])
+            if symbol not in every_tick_symbols and not timeframes:
+                continue
+
+            indices = np.flatnonzero(timeline.symbol_ids == symbol_id)
+            if symbol in every_tick_symbols:
+                mask[indices] = True
+                continue
+
+            # New bar = candle start differs from the symbol's previous tick
+            # (same alignment as MultiTimeframeCandleBuilder._align_to_timeframe for UTC)
+            times_ns = timeline.times_ns[indices]
+            day_starts = times_ns - times_ns % _NS_PER_DAY
+            minutes_of_day = (times_ns - day_starts) // _NS_PER_MINUTE
+            for timeframe in timeframes:
+                duration = TimeframeConverter.get_duration_minutes(timeframe)
+                if not duration:
+                    continue
+                if 1440 % duration:
+                    # Bars not aligned to the day - call on every tick (always exact)
+                    mask[indices] = True
+                    break
+                starts = day_starts + (minutes_of_day // duration) * duration * _NS_PER_MINUTE
+                new_bar = np.flatnonzero(starts[1:] != starts[:-1]) + 1
+                mask[indices[new_bar]] = True
+
+        return np.flatnonzero(mask)
+
+    def next_static_event(self, start: int) -> int:
+        """Get the first static event index >= start (length if none)."""
+        pos = int(np.searchsorted(self.static_events, start))
+        if pos < len(self.static_events):
+            return int(self.static_events[pos])
+        return self.length
+
+    def next_trigger_event(self, start: int) -> int:
+        """
+        Get the first tick index >= start whose bid/ask reaches an SL/TP trigger level.
+
+        Rescans only when the trigger levels of open positions changed since
+        the last scan (or the cached hit has already been processed).
+
+        Returns:
+            Tick index, or length if no position can trigger
+        """
+        tables = self.broker.position_tables
+        key = tuple(sorted(
+            (symbol, t.buy_sl_max, t.buy_tp_min, t.sell_sl_min, t.sell_tp_max)
+            for symbol, t in tables.items() if len(t) and symbol in self.symbol_ids
+        ))
+
+        if key == self._trigger_key and self._trigger_index >= start:
+            return self._trigger_index
+
+        self._trigger_key = key
+        self._trigger_index = self._scan_triggers(start, key)
+        return self._trigger_index
+
+    def _scan_triggers(self, start: int, key: Tuple) -> int:
+        """Vectorized forward scan for the first tick reaching a trigger level."""
+        if not key:
+            return self.length
+
+        n_symbols = len(self.timeline.symbols)
+        buy_sl_max = np.full(n_symbols, -np.inf)
+        buy_tp_min = np.full(n_symbols, np.inf)
+        sell_sl_min = np.full(n_symbols, np.inf)
+        sell_tp_max = np.full(n_symbols, -np.inf)
+        for symbol, b_sl, b_tp, s_sl, s_tp in key:
+            symbol_id = self.symbol_ids[symbol]
+            buy_sl_max[symbol_id] = b_sl
+            buy_tp_min[symbol_id] = b_tp
+            sell_sl_min[symbol_id] = s_sl
+            sell_tp_max[symbol_id] = s_tp
+
+        timeline = self.timeline
+        chunk = self.MIN_SCAN_CHUNK
+        begin = start
+        while begin < self.length:
+            end = min(begin + chunk, self.length)
+            ids = timeline.symbol_ids[begin:end]
+            bid = timeline.bid[begin:end]
+            ask = timeline.ask[begin:end]
+            hit = ((bid <= buy_sl_max[ids]) | (bid >= buy_tp_min[ids]) |
+                   (ask >= sell_sl_min[ids]) | (ask <= sell_tp_max[ids]))
+            hits = np.flatnonzero(hit)
+            if len(hits):
+                return begin + int(hits[0])
+            begin = end
+            chunk = min(chunk * 2, self.MAX_SCAN_CHUNK)
+
+        return self.length
+
+    def next_time_event(self, start: int, time_ns: int) -> int:
+        """Get the first tick index >= start at or after simulated time time_ns (length if none)."""
+        return max(start, int(np.searchsorted(self.timeline.times_ns, time_ns, side='left')))
+
+    def next_event(self, start: int) -> int:
+        """Get the first tick index >= start that must be processed (length if none)."""
+        return min(self.next_static_event(start), self.next_trigger_event(start))
+
+    def fast_forward(self, start: int, stop: int) -> None:
+        """
+        Apply ticks [start, stop) to broker state without strategy calls or SL/TP checks.
+
+        Args:
+            start: First tick index
+            stop: One past the last tick index (stop > start)
+        """
+        from src.backtesting.engine.simulated_broker import TickData
+
+        timeline = self.timeline
+        broker = self.broker
+        ids = timeline.symbol_ids[start:stop]
+
+        for symbol_id in np.unique(ids).tolist():
+            symbol = timeline.symbols[symbol_id]
+            positions = np.flatnonzero(ids == symbol_id) + start
+
+            candle_builder = broker.candle_builders.get(symbol)
+            if candle_builder is not None:
+                candle_builder.add_ticks_bulk(timeline.times_ns[positions],
+                                              self.prices[positions],
+                                              timeline.volume[positions])
+
+            last = int(positions[-1])
+            broker.current_ticks[symbol] = TickData(
+                time_ns=int(timeline.times_ns[last]),
+                bid=float(timeline.bid[last]),
+                ask=float(timeline.ask[last]),
+                last=float(timeline.last[last]),
+                volume=int(timeline.volume[last]),
+                spread=float(timeline.spread[last])
+            )
+
+        last_index = stop - 1
+        broker.current_time_ns = int(timeline.times_ns[last_index])
+        broker.current_tick_symbol = timeline.symbols[int(timeline.symbol_ids[last_index])]
+        broker.global_tick_index = stop
+
+        self.ticks_skipped += stop - start
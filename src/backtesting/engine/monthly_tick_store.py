@@ -0,0 +1,454 @@
+"""
+Monthly Compacted Tick Files for Backtesting.
+
+The daily cache layout (YYYY/MM/DD/ticks/SYMBOL_TICKTYPE.parquet) makes a
+one-year, 30-symbol run open ~11,000 small files, each paying open() and
+footer parsing. Compaction merges a symbol's daily files into one parquet
+file per month:
+
+    <cache_dir>/monthly/YYYY/MM/ticks/SYMBOL_TICKTYPE.parquet
+
+Rows keep the daily files' columns and order. Each row group covers a fixed
+time bucket (one hour by default) and carries min/max statistics of the
+time column, so a reader selects the row groups of a date range from the
+footer alone (row-group pruning) instead of opening one file per day.
+
+Daily files stay the write-ahead format: downloads keep writing them, and
+compaction is run afterwards. The monthly file records (size, mtime) of
+every daily file it was built from. A month is read from the monthly file
+only while every daily file of the requested days is either unchanged or
+deleted; a newly downloaded or rewritten day makes the reader fall back to
+the daily files of that month until the month is compacted again.
+
+Compact from the command line:
+
+    python -m src.backtesting.engine.monthly_tick_store --start 2025-01-01 --end 2025-12-31 \\
+        --symbols EURUSD GBPUSD --cache-dir data/cache
+"""
+import json
+import os
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from src.backtesting.engine.tick_encoding import read_tick_schema, read_tick_table
+from src.utils.logger import get_logger
+
+
+_NS_PER_SECOND = 1_000_000_000
+_NS_PER_DAY = 86_400 * _NS_PER_SECOND
+_NS_PER_UNIT = {'s': 1_000_000_000, 'ms': 1_000_000, 'us': 1_000, 'ns': 1}
+
+
+@dataclass
+class MonthlySegment:
+    """
+    The row groups of one monthly file that cover a requested day range.
+
+    needs_filter is set when a selected row group also holds ticks outside
+    [start_ns, end_ns) (row groups that do not align with day boundaries).
+    """
+    path: str
+    row_groups: List[int]
+    start_ns: int
+    end_ns: int
+    num_rows: int
+    needs_filter: bool = False
+
+
+class MonthlyTickStore:
+    """
+    Compacts daily tick files into monthly files and plans reads over both layouts.
+
+    Usage:
+        store = MonthlyTickStore("data/cache")
+        store.compact(["EURUSD"], START_DATE, END_DATE)
+        entries = store.plan_symbol("EURUSD", START_DATE, END_DATE)  # MonthlySegment or daily path
+    """
+
+    MONTHLY_DIR = "monthly"
+    CACHE_VERSION = '1.0'
+    FORMAT_VERSION = '1'
+
+    # Schema metadata keys of a monthly file
+    SOURCES_KEY = 'compacted_sources'
+    ROW_GROUP_SECONDS_KEY = 'row_group_seconds'
+
+    def __init__(self, cache_dir: str, tick_type_name: str = "INFO", row_group_seconds: int = 3600):
+        """
+        Initialize store.
+
+        Args:
+            cache_dir: Root cache directory (YYYY/MM/DD/ticks/ hierarchy)
+            tick_type_name: Tick type name (e.g., 'INFO', 'ALL', 'TRADE')
+            row_group_seconds: Time span of one row group in compacted files
+        """
+        if row_group_seconds <= 0:
+            raise ValueError("row_group_seconds must be positive")
+        self.cache_dir = Path(cache_dir)
+        self.tick_type_name = tick_type_name
+        self.row_group_seconds = row_group_seconds
+        self.logger = get_logger()
+
+    # ------------------------------------------------------------------
+    # Layout
+    # ------------------------------------------------------------------
+
+    def daily_path(self, symbol: str, day: datetime) -> Path:
+        """Path of a symbol's daily tick file."""
+        return (self.cache_dir / day.strftime('%Y') / day.strftime('%m') / day.strftime('%d') / "ticks"
+                / f"{symbol}_{self.tick_type_name}.parquet")
+
+    def monthly_dir(self, year: int, month: int) -> Path:
+        """Directory of one month's compacted tick files."""
+        return self.cache_dir / self.MONTHLY_DIR / f"{year:04d}" / f"{month:02d}" / "ticks"
+
+    def monthly_path(self, symbol: str, year: int, month: int) -> Path:
+        """Path of a symbol's compacted file for one month."""
+        return self.monthly_dir(year, month) / f"{symbol}_{self.tick_type_name}.parquet"
+
+    @staticmethod
+    def _day_range(start_date: datetime, end_date: datetime) -> List[datetime]:
+        """Get the UTC days from start_date to end_date (inclusive)."""
+        current = start_date.replace(hour=0, minute=0, second=0, microsecond=0)
+        end = end_date.replace(hour=0, minute=0, second=0, microsecond=0)
+        days = []
+        while current <= end:
+            days.append(current)
+            current += timedelta(days=1)
+        return days
+
+    @classmethod
+    def _months(cls, days: List[datetime]) -> Dict[Tuple[int, int], List[datetime]]:
+        """Group days by (year, month), in chronological order."""
+        months: Dict[Tuple[int, int], List[datetime]] = {}
+        for day in days:
+            months.setdefault((day.year, day.month), []).append(day)
+        return months
+
+    @staticmethod
+    def _day_start_ns(day: datetime) -> int:
+        """Epoch nanoseconds of 00:00 UTC of a day."""
+        return int(datetime(day.year, day.month, day.day, tzinfo=timezone.utc).timestamp()) * _NS_PER_SECOND
+
+    def find_symbols(self, start_date: datetime, end_date: datetime) -> List[str]:
+        """
+        Symbols with a compacted file in any month of a date range.
+
+        Returns:
+            Sorted symbol names
+        """
+        suffix = f"_{self.tick_type_name}.parquet"
+        symbols = set()
+        for year, month in self._months(self._day_range(start_date, end_date)):
+            monthly_dir = self.monthly_dir(year, month)
+            if monthly_dir.exists():
+                symbols.update(path.name[:-len(suffix)] for path in monthly_dir.glob(f"*{suffix}"))
+        return sorted(symbols)
+
+    # ------------------------------------------------------------------
+    # Compaction
+    # ------------------------------------------------------------------
+
+    def _month_sources(self, symbol: str, year: int, month: int) -> List[Tuple[datetime, Path]]:
+        """Existing daily files of a symbol's month, in day order."""
+        first = datetime(year, month, 1, tzinfo=timezone.utc)
+        last = (first + timedelta(days=32)).replace(day=1) - timedelta(days=1)
+        sources = []
+        for day in self._day_range(first, last):
+            path = self.daily_path(symbol, day)
+            if path.exists():
+                sources.append((day, path))
+        return sources
+
+    @staticmethod
+    def _fingerprint(path: Path) -> List[int]:
+        """[size, mtime_ns] of a file."""
+        stat = os.stat(path)
+        return [stat.st_size, stat.st_mtime_ns]
+
+    def read_sources(self, path: Path) -> Optional[Dict[str, List[int]]]:
+        """
+        Daily files a monthly file was compacted from.
+
+        Returns:
+            Day of month ('DD') -> [size, mtime_ns], or None if the file is not a compacted file
+        """
+        import pyarrow.parquet as pq
+
+        try:
+            metadata = pq.read_schema(path).metadata or {}
+        except Exception:
+            return None
+        sources = metadata.get(self.SOURCES_KEY.encode())
+        return json.loads(sources.decode()) if sources else None
+
+    def is_current(self, symbol: str, year: int, month: int) -> bool:
+        """True if the month's compacted file covers every daily file of the month unchanged."""
+        path = self.monthly_path(symbol, year, month)
+        if not path.exists():
+            return False
+        sources = self.read_sources(path)
+        if sources is None:
+            return False
+        try:
+            current = {day.strftime('%d'): self._fingerprint(daily)
+                       for day, daily in self._month_sources(symbol, year, month)}
+        except OSError:
+            return False
+        return all(sources.get(day) == fingerprint for day, fingerprint in current.items())
+
+    def compact_month(self, symbol: str, year: int, month: int, force: bool = False) -> Optional[int]:
+        """
+        Merge a symbol's daily files of one month into the monthly file.
+
+        Days are read and written one at a time, so memory use is bounded by
+        one day of ticks. Columns present in every daily file are kept (with
+        the first file's types); time is written as UTC nanoseconds. Daily
+        files in the compact encoding are decoded; the monthly file is always
+        written in the plain layout (its row-group statistics are the index).
+
+        Args:
+            symbol: Symbol name
+            year: Year
+            month: Month
+            force: Rewrite even if the monthly file is up to date
+
+        Returns:
+            Rows written (0 if already up to date), or None if the month has no daily files
+        """
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        sources = self._month_sources(symbol, year, month)
+        if not sources:
+            return None
+        if not force and self.is_current(symbol, year, month):
+            return 0
+
+        # Columns present in every day (in the first file's order)
+        schemas = [read_tick_schema(path) for _, path in sources]
+        names = [name for name in schemas[0].names if all(name in schema.names for schema in schemas)]
+        if 'time' not in names:
+            raise ValueError(f"Daily tick files of {symbol} {year}-{month:02d} have no 'time' column")
+        fields = [pa.field('time', pa.timestamp('ns', tz='UTC')) if name == 'time'
+                  else schemas[0].field(name).remove_metadata() for name in names]
+        schema = pa.schema(fields)
+
+        fingerprints = {day.strftime('%d'): self._fingerprint(path) for day, path in sources}
+        row_count = sum(pq.ParquetFile(path).metadata.num_rows for _, path in sources)
+        metadata = {
+            'cached_at': datetime.now(timezone.utc).isoformat(),
+            'source': 'compacted',
+            'row_count': str(row_count),
+            'cache_version': self.CACHE_VERSION,
+            'compacted_format': self.FORMAT_VERSION,
+            self.ROW_GROUP_SECONDS_KEY: str(self.row_group_seconds),
+            self.SOURCES_KEY: json.dumps(fingerprints, sort_keys=True),
+        }
+
+        path = self.monthly_path(symbol, year, month)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_name(f".{path.name}.tmp-{os.getpid()}")
+        bucket_ns = self.row_group_seconds * _NS_PER_SECOND
+        try:
+            with pq.ParquetWriter(temp_path, schema.with_metadata(metadata), compression='snappy',
+                                  version='2.6', write_statistics=True) as writer:
+                for _, daily in sources:
+                    table = read_tick_table(daily, columns=names)
+                    if table.num_rows == 0:
+                        continue
+                    table = table.cast(schema)
+                    times_ns = table.column('time').cast(pa.int64()).to_numpy()
+
+                    # One row group per time bucket (a new group wherever the bucket changes)
+                    buckets = times_ns // bucket_ns
+                    bounds = np.flatnonzero(np.diff(buckets)) + 1
+                    starts = np.concatenate(([0], bounds))
+                    stops = np.concatenate((bounds, [table.num_rows]))
+                    for start, stop in zip(starts.tolist(), stops.tolist()):
+                        writer.write_table(table.slice(start, stop - start), row_group_size=stop - start)
+            os.replace(temp_path, path)
+        except BaseException:
+            if temp_path.exists():
+                temp_path.unlink()
+            raise
+        return row_count
+
+    def compact(self, symbols: Optional[List[str]], start_date: datetime, end_date: datetime,
+                force: bool = False) -> Dict[str, Dict[str, int]]:
+        """
+        Compact every month touched by a date range.
+
+        Args:
+            symbols: Symbols (None = every symbol with a daily file in the range)
+            start_date: First day
+            end_date: Last day
+            force: Rewrite up-to-date monthly files too
+
+        Returns:
+            Symbol -> {'YYYY-MM': rows written (0 = already up to date)}
+        """
+        months = self._months(self._day_range(start_date, end_date))
+        if not symbols:
+            suffix = f"_{self.tick_type_name}.parquet"
+            found = set()
+            for year, month in months:
+                month_dir = self.cache_dir / f"{year:04d}" / f"{month:02d}"
+                if month_dir.exists():
+                    found.update(path.name[:-len(suffix)] for path in month_dir.glob(f"*/ticks/*{suffix}"))
+            symbols = sorted(found)
+
+        summary: Dict[str, Dict[str, int]] = {}
+        for symbol in symbols:
+            for year, month in months:
+                start = time.time()
+                rows = self.compact_month(symbol, year, month, force=force)
+                if rows is None:
+                    continue
+                summary.setdefault(symbol, {})[f"{year:04d}-{month:02d}"] = rows
+                if rows:
+                    self.logger.info(f"  ✓ Compacted {symbol} {year:04d}-{month:02d}: {rows:,} ticks "
+                                     f"in {time.time() - start:.1f}s")
+        return summary
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+
+    def row_group_bounds(self, parquet_file) -> List[Tuple[int, int, int]]:
+        """
+        Time range of every row group from the footer statistics.
+
+        Args:
+            parquet_file: Open pyarrow.parquet.ParquetFile of a compacted file
+
+        Returns:
+            (min_time_ns, max_time_ns, num_rows) per row group
+        """
+        schema = parquet_file.schema_arrow
+        column = schema.get_field_index('time')
+        scale = _NS_PER_UNIT[schema.field('time').type.unit]
+        metadata = parquet_file.metadata
+        bounds = []
+        for index in range(metadata.num_row_groups):
+            row_group = metadata.row_group(index)
+            statistics = row_group.column(column).statistics
+            if statistics is None or not statistics.has_min_max:
+                raise ValueError(f"Row group {index} of {parquet_file} has no time statistics")
+            bounds.append((int(statistics.min_raw) * scale, int(statistics.max_raw) * scale, row_group.num_rows))
+        return bounds
+
+    def month_segment(self, symbol: str, year: int, month: int, days: List[datetime]) -> Optional[MonthlySegment]:
+        """
+        Row groups of a month's compacted file that cover some of its days.
+
+        Args:
+            symbol: Symbol name
+            year: Year
+            month: Month
+            days: Consecutive days of this month to read
+
+        Returns:
+            MonthlySegment, or None if there is no compacted file or a daily file
+            of the requested days is newer than the compaction
+        """
+        import pyarrow.parquet as pq
+
+        path = self.monthly_path(symbol, year, month)
+        if not path.exists():
+            return None
+
+        parquet_file = pq.ParquetFile(path)
+        raw_sources = (parquet_file.schema_arrow.metadata or {}).get(self.SOURCES_KEY.encode())
+        if raw_sources is None:
+            return None
+        sources = json.loads(raw_sources.decode())
+        for day in days:
+            daily = self.daily_path(symbol, day)
+            try:
+                fingerprint = self._fingerprint(daily)
+            except FileNotFoundError:
+                continue  # Deleted after compaction
+            if sources.get(day.strftime('%d')) != fingerprint:
+                self.logger.info(f"Monthly tick file {path.name} ({year:04d}-{month:02d}) is older than "
+                                 f"{day.date()} - reading daily files (re-run compaction)")
+                return None
+
+        start_ns = self._day_start_ns(days[0])
+        end_ns = self._day_start_ns(days[-1]) + _NS_PER_DAY
+        row_groups = []
+        num_rows = 0
+        needs_filter = False
+        for index, (min_ns, max_ns, rows) in enumerate(self.row_group_bounds(parquet_file)):
+            if max_ns < start_ns or min_ns >= end_ns:
+                continue
+            row_groups.append(index)
+            num_rows += rows
+            needs_filter = needs_filter or min_ns < start_ns or max_ns >= end_ns
+        return MonthlySegment(str(path), row_groups, start_ns, end_ns, num_rows, needs_filter)
+
+    def plan_symbol(self, symbol: str, start_date: datetime,
+                    end_date: datetime) -> List[Union[MonthlySegment, str]]:
+        """
+        Files to read for a symbol's date range, preferring compacted months.
+
+        Args:
+            symbol: Symbol name
+            start_date: First day
+            end_date: Last day
+
+        Returns:
+            Chronological list of MonthlySegment (compacted, up-to-date months)
+            and daily parquet paths (every other month)
+        """
+        entries: List[Union[MonthlySegment, str]] = []
+        for (year, month), days in self._months(self._day_range(start_date, end_date)).items():
+            segment = self.month_segment(symbol, year, month, days)
+            if segment is not None:
+                if segment.row_groups:
+                    entries.append(segment)
+                continue
+            for day in days:
+                daily = self.daily_path(symbol, day)
+                if daily.exists():
+                    entries.append(str(daily))
+        return entries
+
+
+def main():
+    """Compact daily tick files into monthly files from the command line."""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Merge daily tick files into one parquet file per symbol and month"
+    )
+    parser.add_argument('--start', required=True, help="First day (YYYY-MM-DD)")
+    parser.add_argument('--end', required=True, help="Last day (YYYY-MM-DD)")
+    parser.add_argument('--symbols', nargs='*', help="Symbols (default: every symbol in the cache)")
+    parser.add_argument('--tick-type', default="INFO", help="Tick type name (default: INFO)")
+    parser.add_argument('--cache-dir', default="data/cache", help="Tick cache root (default: data/cache)")
+    parser.add_argument('--row-group-minutes', type=int, default=60,
+                        help="Time span of one row group in minutes (default: 60)")
+    parser.add_argument('--force', action='store_true', help="Rewrite monthly files that are up to date")
+    args = parser.parse_args()
+
+    from src.utils.logger import init_logger
+    init_logger(log_to_file=False, log_to_console=True, log_level="INFO", use_async_logging=False)
+
+    start_date = datetime.strptime(args.start, '%Y-%m-%d').replace(tzinfo=timezone.utc)
+    end_date = datetime.strptime(args.end, '%Y-%m-%d').replace(tzinfo=timezone.utc)
+    store = MonthlyTickStore(args.cache_dir, args.tick_type, row_group_seconds=args.row_group_minutes * 60)
+    summary = store.compact(args.symbols or None, start_date, end_date, force=args.force)
+
+    for symbol, months in summary.items():
+        written = {month: rows for month, rows in months.items() if rows}
+        print(f"{symbol}: {len(written)} month(s) compacted, {len(months) - len(written)} up to date")
+
+
+if __name__ == '__main__':
+    main()
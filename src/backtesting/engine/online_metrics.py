@@ -0,0 +1,231 @@
+"""
+Online (Incremental) Performance Metrics.
+
+OnlineMetrics is updated once per closed trade (add_trade) and once per
+equity sample (add_equity) and answers every metric in O(1):
+
+- Trades: running win/loss counts and sums (win rate, profit factor,
+  average win/loss), largest win/loss and consecutive win/loss streaks.
+- Equity: Welford mean/variance of sample-to-sample returns (Sharpe ratio),
+  running peak (maximum drawdown) and first/last equity (total return).
+
+Values equal the batch calculations of ResultsAnalyzer over the same trades
+and equity samples (population standard deviation, like np.std).
+"""
+from typing import Dict
+
+import numpy as np
+
+
+class OnlineMetrics:
+    """
+    Incremental trade and equity-curve statistics.
+
+    Usage:
+        metrics = OnlineMetrics()
+        metrics.add_trade(trade['profit'])        # once per closed trade
+        metrics.add_equity(equity)                # once per equity sample
+        metrics.live_metrics()                    # progress display
+        metrics.trade_metrics()                   # ResultsAnalyzer trade statistics
+    """
+
+    def __init__(self):
+        """Initialize empty metrics."""
+        # Trades
+        self.total_trades = 0
+        self.wins = 0
+        self.losses = 0
+        self.gross_profit = 0.0
+        self.gross_loss = 0.0  # Sum of losing profits (negative)
+        self.largest_win = 0.0
+        self.largest_loss = 0.0  # Most negative profit
+        self.consecutive_wins = 0
+        self.consecutive_losses = 0
+        self.max_consecutive_wins = 0
+        self.max_consecutive_losses = 0
+
+        # Equity samples
+        self.equity_count = 0
+        self.first_equity = 0.0
+        self.last_equity = 0.0
+        self.peak_equity = 0.0
+        self.max_drawdown = 0.0  # Percent of the running peak
+
+        # Returns between consecutive equity samples (Welford)
+        self.return_count = 0
+        self.return_mean = 0.0
+        self.return_m2 = 0.0
+
+    def add_trade(self, profit: float) -> None:
+        """
+        Add one closed trade.
+
+        Args:
+            profit: Trade profit (0 counts as neither win nor loss)
+        """
+        self.total_trades += 1
+        if profit > 0:
+            self.wins += 1
+            self.gross_profit += profit
+            if profit > self.largest_win:
+                self.largest_win = profit
+            self.consecutive_wins += 1
+            self.consecutive_losses = 0
+            if self.consecutive_wins > self.max_consecutive_wins:
+                self.max_consecutive_wins = self.consecutive_wins
+        elif profit < 0:
+            self.losses += 1
+            self.gross_loss += profit
+            if profit < self.largest_loss:
+                self.largest_loss = profit
+            self.consecutive_losses += 1
+            self.consecutive_wins = 0
+            if self.consecutive_losses > self.max_consecutive_losses:
+                self.max_consecutive_losses = self.consecutive_losses
+
+    def add_equity(self, equity: float) -> None:
+        """
+        Add one equity sample.
+
+        Args:
+            equity: Account equity
+        """
+        if self.equity_count == 0:
+            self.first_equity = self.peak_equity = equity
+        else:
+            previous = self.last_equity
+            if previous != 0:
+                value = (equity - previous) / previous
+                self.return_count += 1
+                delta = value - self.return_mean
+                self.return_mean += delta / self.return_count
+                self.return_m2 += delta * (value - self.return_mean)
+            if equity > self.peak_equity:
+                self.peak_equity = equity
+            elif self.peak_equity > 0:
+                drawdown = (self.peak_equity - equity) / self.peak_equity * 100.0
+                if drawdown > self.max_drawdown:
+                    self.max_drawdown = drawdown
+        self.last_equity = equity
+        self.equity_count += 1
+
+    def add_equity_batch(self, equity: np.ndarray) -> None:
+        """
+        Add many equity samples at once (vectorized, same result as add_equity per value).
+
+        Args:
+            equity: Equity samples in time order
+        """
+        equity = np.asarray(equity, dtype=np.float64)
+        if len(equity) == 0:
+            return
+        if self.equity_count == 0:
+            self.first_equity = self.peak_equity = float(equity[0])
+            series = equity
+        else:
+            series = np.concatenate(([self.last_equity], equity))
+
+        running_max = np.maximum.accumulate(np.maximum(series, self.peak_equity))
+        if (running_max > 0).all():
+            drawdown = float(((running_max - series) / running_max * 100.0).max())
+            self.max_drawdown = max(self.max_drawdown, drawdown)
+        self.peak_equity = float(running_max[-1])
+
+        previous = series[:-1]
+        valid = previous != 0
+        returns = np.diff(series)[valid] / previous[valid]
+        if len(returns):
+            # Chan et al. merge of (count, mean, M2)
+            count = len(returns)
+            mean = float(returns.mean())
+            m2 = float(((returns - mean) ** 2).sum())
+            delta = mean - self.return_mean
+            total = self.return_count + count
+            self.return_mean += delta * count / total
+            self.return_m2 += m2 + delta * delta * self.return_count * count / total
+            self.return_count = total
+
+        self.last_equity = float(equity[-1])
+        self.equity_count += len(equity)
+
+    @property
+    def win_rate(self) -> float:
+        """Winning trades in percent of all trades."""
+        return self.wins / self.total_trades * 100 if self.total_trades else 0.0
+
+    @property
+    def profit_factor(self) -> float:
+        """Gross profit / gross loss (inf without losses, 0 without trades)."""
+        if self.losses:
+            return self.gross_profit / abs(self.gross_loss)
+        return float('inf') if self.wins else 0.0
+
+    @property
+    def avg_win(self) -> float:
+        """Average winning trade."""
+        return self.gross_profit / self.wins if self.wins else 0.0
+
+    @property
+    def avg_loss(self) -> float:
+        """Average losing trade (positive)."""
+        return abs(self.gross_loss / self.losses) if self.losses else 0.0
+
+    def sharpe_ratio(self, risk_free_rate: float = 0.0) -> float:
+        """
+        Sharpe ratio of the sample-to-sample returns (annualized with sqrt(252)).
+
+        Args:
+            risk_free_rate: Annual risk-free rate (default 0%)
+        """
+        if self.return_count == 0:
+            return 0.0
+        std = np.sqrt(self.return_m2 / self.return_count)
+        if std == 0:
+            return 0.0
+        return (self.return_mean - risk_free_rate / 252) / std * np.sqrt(252)
+
+    @property
+    def total_return(self) -> float:
+        """Return from the first to the last equity sample in percent."""
+        if self.equity_count < 2 or self.first_equity == 0:
+            return 0.0
+        return (self.last_equity - self.first_equity) / self.first_equity * 100.0
+
+    def live_metrics(self) -> Dict:
+        """Metrics shown by the progress display (BacktestController._calculate_live_metrics)."""
+        return {
+            'win_rate': self.win_rate,
+            'profit_factor': self.profit_factor,
+            'avg_win': self.avg_win,
+            'avg_loss': self.avg_loss,
+            'total_wins': self.wins,
+            'total_losses': self.losses,
+            'sharpe_ratio': self.sharpe_ratio(),
+            'max_drawdown': self.max_drawdown,
+        }
+
+    def curve_metrics(self, risk_free_rate: float = 0.0) -> Dict:
+        """Equity-curve metrics of ResultsAnalyzer.analyze()."""
+        return {
+            'total_return': self.total_return,
+            'max_drawdown': self.max_drawdown,
+            'sharpe_ratio': self.sharpe_ratio(risk_free_rate),
+        }
+
+    def trade_metrics(self) -> Dict:
+        """Trade statistics of ResultsAnalyzer.analyze() (same keys as _analyze_trades())."""
+        if not self.total_trades:
+            return {}
+        return {
+            'total_trades': self.total_trades,
+            'winning_trades': self.wins,
+            'losing_trades': self.losses,
+            'win_rate': self.win_rate,
+            'avg_win': self.avg_win,
+            'avg_loss': self.avg_loss,
+            'profit_factor': self.profit_factor,
+            'largest_win': self.largest_win,
+            'largest_loss': abs(self.largest_loss),
+            'max_consecutive_wins': self.max_consecutive_wins,
+            'max_consecutive_losses': self.max_consecutive_losses,
+        }
@@ -0,0 +1,636 @@
+"""
+Multi-Process Parameter Sweep for Backtesting.
+
+Runs the same backtest many times with different strategy and risk settings
+and ranks the results:
+
+- ParameterSpace: a grid (every combination) or random samples over
+  "<section>.<field>" keys of FakeoutConfig (fakeout), TrueBreakoutConfig
+  (true_breakout), HFTMomentumConfig (hft_momentum) and RiskConfig (risk),
+  e.g. {"fakeout.risk_reward_ratio": [1.5, 2.0, 3.0]}.
+- ParameterSweepRunner: writes the tick timeline ONCE as memory-mapped .npy
+  columns (plus the OHLC data and symbol info a run needs) and fans runs out
+  over a ProcessPoolExecutor. Every worker maps the same files read-only, so
+  N workers share one copy of the ticks through the OS page cache instead of
+  each decoding parquet.
+- Each run goes through BacktestController.run_sequential() and
+  ResultsAnalyzer.analyze(); all runs end up in one leaderboard written as
+  parquet and CSV.
+- Warm start (SweepSettings.warm_start): the first run of every strategy
+  configuration saves its warmup state (WarmStartSnapshot); runs that only
+  differ in risk parameters restore it and start replay immediately.
+
+Directory layout of a sweep:
+
+    <output_dir>/dataset/timeline/*.npy     shared tick timeline
+    <output_dir>/dataset/market_data.pkl    OHLC data, symbol info, settings
+    <output_dir>/dataset/warm_start/*.pkl   warm-start snapshots
+    <output_dir>/runs/<run_id>/             per-run persistence files
+    <output_dir>/leaderboard.parquet|.csv   ranked results
+"""
+import itertools
+import multiprocessing
+import os
+import pickle
+import random
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import contextmanager
+from dataclasses import dataclass, fields, replace
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import pandas as pd
+
+from src.backtesting.engine.tick_timeline import ColumnarTickTimeline
+from src.config.configs import HFTMomentumConfig, RiskConfig
+from src.config.strategies import FakeoutConfig, TrueBreakoutConfig
+from src.utils.logger import get_logger
+
+
+class ParameterSpace:
+    """
+    Parameter space over strategy and risk configuration fields.
+
+    Keys are "<section>.<field>". Values are either a list of choices
+    (grid and random sampling) or a (low, high) tuple range (random sampling
+    only: uniform float, or integer if both bounds are ints). A single
+    scalar value is treated as a one-element list.
+    """
+
+    # Section name -> configuration dataclass whose fields can be swept
+    SECTIONS = {
+        'fakeout': FakeoutConfig,
+        'true_breakout': TrueBreakoutConfig,
+        'hft_momentum': HFTMomentumConfig,
+        'risk': RiskConfig,
+    }
+
+    def __init__(self, parameters: Dict[str, Any]):
+        """
+        Initialize and validate the parameter space.
+
+        Args:
+            parameters: Dict of "<section>.<field>" -> list of choices or (low, high) range
+
+        Raises:
+            ValueError: If a key does not name a known section and field
+        """
+        for key in parameters:
+            self.split_key(key)
+        self.parameters = dict(parameters)
+
+    @classmethod
+    def split_key(cls, key: str) -> Tuple[str, str]:
+        """
+        Split and validate a "<section>.<field>" key.
+
+        Args:
+            key: Parameter key
+
+        Returns:
+            (section, field)
+
+        Raises:
+            ValueError: If the section or field does not exist
+        """
+        section, _, field_name = key.partition('.')
+        config_class = cls.SECTIONS.get(section)
+        if config_class is None or not field_name:
+            raise ValueError(
+                f"Invalid sweep parameter '{key}': expected '<section>.<field>' "
+                f"with section in {sorted(cls.SECTIONS)}"
+            )
+        if field_name not in {f.name for f in fields(config_class)}:
+            raise ValueError(f"Invalid sweep parameter '{key}': {config_class.__name__} has no field '{field_name}'")
+        return section, field_name
+
+    def grid(self) -> List[Dict[str, Any]]:
+        """
+        Get every combination of the parameter choices.
+
+        Returns:
+            List of parameter sets (dict of key -> value)
+
+        Raises:
+            ValueError: If a parameter is a (low, high) range
+        """
+        keys = list(self.parameters)
+        choices = []
+        for key in keys:
+            value = self.parameters[key]
+            if isinstance(value, tuple):
+                raise ValueError(f"Sweep parameter '{key}' is a range - use sample() for ranges")
+            choices.append(value if isinstance(value, list) else [value])
+
+        return [dict(zip(keys, combination)) for combination in itertools.product(*choices)]
+
+    def sample(self, count: int, seed: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Draw random parameter sets.
+
+        Args:
+            count: Number of parameter sets
+            seed: Random seed (same seed = same parameter sets)
+
+        Returns:
+            List of parameter sets (dict of key -> value)
+        """
+        rng = random.Random(seed)
+        parameter_sets = []
+        for _ in range(count):
+            parameter_set = {}
+            for key, value in self.parameters.items():
+                if isinstance(value, tuple):
+                    low, high = value
+                    if isinstance(low, int) and isinstance(high, int):
+                        parameter_set[key] = rng.randint(low, high)
+                    else:
+                        parameter_set[key] = rng.uniform(low, high)
+                elif isinstance(value, list):
+                    parameter_set[key] = rng.choice(value)
+                else:
+                    parameter_set[key] = value
+            parameter_sets.append(parameter_set)
+        return parameter_sets
+
+
+@contextmanager
+def apply_config_overrides(overrides: Dict[str, Any]) -> Iterator[None]:
+    """
+    Temporarily apply "<section>.<field>" overrides to the configuration.
+
+    Strategy configs are created with FakeoutConfig.from_env() (and the
+    TrueBreakout/HFT equivalents) when strategies are initialized, so from_env()
+    is wrapped to return a copy with the overridden fields. RiskConfig and the
+    HFT settings used by the martingale position sizer are read from the global
+    config object, whose fields are set directly. Everything is restored on exit.
+
+    Args:
+        overrides: Dict of "<section>.<field>" -> value
+    """
+    from src.config import config
+
+    by_section: Dict[str, Dict[str, Any]] = {}
+    for key, value in overrides.items():
+        section, field_name = ParameterSpace.split_key(key)
+        by_section.setdefault(section, {})[field_name] = value
+
+    patched_classes = []
+    patched_instances = []
+
+    try:
+        for section, values in by_section.items():
+            config_class = ParameterSpace.SECTIONS[section]
+
+            if hasattr(config_class, 'from_env'):
+                original = config_class.__dict__['from_env']
+                patched_classes.append((config_class, original))
+
+                def from_env(cls, *args, _original=original.__func__, _values=values, **kwargs):
+                    return replace(_original(cls, *args, **kwargs), **_values)
+
+                config_class.from_env = classmethod(from_env)
+
+            instance = getattr(config, section, None)
+            if isinstance(instance, config_class):
+                for field_name, value in values.items():
+                    patched_instances.append((instance, field_name, getattr(instance, field_name)))
+                    setattr(instance, field_name, value)
+
+        yield
+
+    finally:
+        for instance, field_name, value in reversed(patched_instances):
+            setattr(instance, field_name, value)
+        for config_class, original in patched_classes:
+            config_class.from_env = original
+
+
+@dataclass
+class SweepSettings:
+    """Backtest settings shared by every run of a sweep (mirrors backtest.py)"""
+    start_date: datetime
+    initial_balance: float = 1000.0
+    stop_loss_threshold: float = 0.0
+    leverage: float = 100.0
+    enable_slippage: bool = False
+    slippage_points: float = 0.5
+    lazy_candles: bool = True
+    event_skipping: bool = False
+    warm_start: bool = True
+
+
+def write_backtest_dataset(dataset_dir: Path, settings: SweepSettings, timeline, symbols: List[str],
+                           symbol_data: Dict[Tuple[str, str], pd.DataFrame],
+                           symbol_info: Dict[str, Dict]) -> Path:
+    """
+    Write the dataset worker processes run backtests from.
+
+    Args:
+        dataset_dir: Dataset directory (timeline/ and market_data.pkl are replaced)
+        settings: Backtest settings shared by all runs
+        timeline: ColumnarTickTimeline (saved directly) or any chronological tick
+                  iterable such as StreamingTickTimeline (streamed to disk)
+        symbols: Symbols to backtest
+        symbol_data: (symbol, timeframe) -> OHLC DataFrame, as passed to load_symbol_data()
+        symbol_info: Symbol -> symbol info dict (tick_value already converted to USD)
+
+    Returns:
+        Dataset directory
+    """
+    dataset_dir = Path(dataset_dir)
+    timeline_dir = dataset_dir / ParameterSweepRunner.TIMELINE_DIR
+    if timeline_dir.exists():
+        shutil.rmtree(timeline_dir)
+    # Snapshots of the previous dataset are stale
+    warm_start_dir = dataset_dir / ParameterSweepRunner.WARM_START_DIR
+    if warm_start_dir.exists():
+        shutil.rmtree(warm_start_dir)
+
+    start = time.time()
+    if isinstance(timeline, ColumnarTickTimeline):
+        timeline.save(timeline_dir)
+        tick_count = len(timeline)
+    else:
+        tick_count = ColumnarTickTimeline.write_ticks(timeline, timeline_dir)
+
+    with open(dataset_dir / ParameterSweepRunner.MARKET_DATA_FILE, 'wb') as f:
+        pickle.dump({
+            'settings': settings,
+            'symbols': list(symbols),
+            'symbol_data': symbol_data,
+            'symbol_info': symbol_info,
+        }, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    get_logger().info(f"Backtest dataset written to {dataset_dir}: "
+                      f"{tick_count:,} ticks, {len(symbol_data)} OHLC series ({time.time() - start:.1f}s)")
+    return dataset_dir
+
+
+# Per-process state set by _init_sweep_worker() (dataset stays open between runs)
+_worker_state: Dict[str, Any] = {}
+
+
+def _init_sweep_worker(dataset_dir: str, quiet: bool = True):
+    """
+    Open the shared sweep dataset in a worker process.
+
+    Args:
+        dataset_dir: Dataset directory written by ParameterSweepRunner.prepare()
+        quiet: Re-initialize logging without files/console (worker processes)
+    """
+    if quiet:
+        from src.utils.logger import init_logger
+        init_logger(log_to_file=False, log_to_console=False, log_level="ERROR", use_async_logging=False)
+
+    dataset_path = Path(dataset_dir)
+    market_data_path = dataset_path / ParameterSweepRunner.MARKET_DATA_FILE
+    with open(market_data_path, 'rb') as f:
+        market_data = pickle.load(f)
+
+    stat = market_data_path.stat()
+    _worker_state['dataset_dir'] = dataset_path
+    _worker_state['data_id'] = f"{stat.st_size}:{stat.st_mtime_ns}"
+    _worker_state['show_progress'] = not quiet
+    _worker_state['market_data'] = market_data
+    # MEMORY OPTIMIZATION: Read-only memory map shared with all other workers
+    _worker_state['timeline'] = ColumnarTickTimeline.load(dataset_path / ParameterSweepRunner.TIMELINE_DIR)
+
+
+def _run_sweep_task(run_id: str, overrides: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Run one parameter set in the current (worker) process.
+
+    Args:
+        run_id: Run identifier (also the per-run directory name)
+        overrides: Parameter set (dict of "<section>.<field>" -> value)
+
+    Returns:
+        Leaderboard row: run_id, parameters, status, error, wall time and summarized metrics
+    """
+    from src.backtesting.engine.results_analyzer import ResultsAnalyzer
+
+    row: Dict[str, Any] = {'run_id': run_id}
+    row.update(overrides)
+
+    # Risk parameters are read during replay only - runs differing in them share a snapshot
+    from src.backtesting.engine.warm_start import WarmStartSnapshot
+    warm_start_overrides = None
+    if _worker_state['market_data']['settings'].warm_start:
+        warm_start_overrides = {key: value for key, value in overrides.items()
+                                if ParameterSpace.split_key(key)[0] not in WarmStartSnapshot.REPLAY_SECTIONS}
+
+    start_wall_time = time.time()
+    try:
+        with apply_config_overrides(overrides):
+            results = _run_single_backtest(run_id, warm_start_overrides=warm_start_overrides)
+        metrics = ResultsAnalyzer().analyze(results)
+        row['status'] = 'ok'
+        row['error'] = ''
+        row.update(ResultsAnalyzer().summarize(metrics))
+    except Exception as e:
+        row['status'] = 'error'
+        row['error'] = f"{type(e).__name__}: {e}"
+
+    row['wall_time_sec'] = time.time() - start_wall_time
+    return row
+
+
+def _run_single_backtest(run_id: str, run_symbols: Optional[List[str]] = None,
+                         warm_start_overrides: Optional[Dict[str, Any]] = None) -> Dict:
+    """
+    Build broker, trading components and controller for one run and execute it.
+
+    Same wiring as backtest.py (sequential mode), with persistence files in
+    the run's own directory so parallel runs do not share state.
+
+    Args:
+        run_id: Run identifier
+        run_symbols: Trade only these dataset symbols (None = all). Ticks and OHLC
+                     data of other non-trading symbols (conversion pairs) are kept.
+        warm_start_overrides: Strategy parameter overrides of the run (part of the
+                              snapshot key); None disables warm start
+
+    Returns:
+        Results dictionary from BacktestController.get_results()
+    """
+    from src.backtesting.engine.backtest_controller import BacktestController
+    from src.backtesting.engine.simulated_broker import SimulatedBroker
+    from src.backtesting.engine.time_controller import TimeController, TimeMode
+    from src.backtesting.engine.warm_start import WarmStartSnapshot
+    from src.config import config
+    from src.execution.order_manager import OrderManager
+    from src.execution.position_persistence import PositionPersistence
+    from src.execution.trade_manager import TradeManager
+    from src.indicators.technical_indicators import TechnicalIndicators
+    from src.risk.risk_manager import RiskManager
+    from src.strategy.symbol_performance_persistence import SymbolPerformancePersistence
+
+    market_data = _worker_state['market_data']
+    settings: SweepSettings = market_data['settings']
+    symbols: List[str] = market_data['symbols']
+    symbol_info: Dict[str, Dict] = market_data['symbol_info']
+    symbol_data: Dict[Tuple[str, str], pd.DataFrame] = market_data['symbol_data']
+    timeline: ColumnarTickTimeline = _worker_state['timeline']
+
+    if run_symbols is not None:
+        excluded = set(symbols) - set(run_symbols)
+        symbols = [symbol for symbol in symbols if symbol not in excluded]
+        symbol_data = {key: df for key, df in symbol_data.items() if key[0] not in excluded}
+        # Copies only this subset's ticks out of the shared memory map
+        timeline = timeline.select_symbols(s for s in timeline.symbols if s not in excluded)
+
+    run_dir = _worker_state['dataset_dir'].parent / ParameterSweepRunner.RUNS_DIR / run_id
+    persistence = PositionPersistence(data_dir=str(run_dir))
+    persistence.clear_all()
+
+    broker = SimulatedBroker(
+        initial_balance=settings.initial_balance,
+        persistence=persistence,
+        enable_slippage=settings.enable_slippage,
+        slippage_points=settings.slippage_points,
+        leverage=settings.leverage,
+        lazy_candles=settings.lazy_candles
+    )
+    for (symbol, timeframe), df in symbol_data.items():
+        broker.load_symbol_data(symbol, df, symbol_info[symbol], timeframe)
+
+    time_controller = TimeController(symbols, mode=TimeMode.MAX_SPEED, include_position_monitor=True, broker=broker)
+    risk_manager = RiskManager(connector=broker, risk_config=config.risk, persistence=persistence)
+    order_manager = OrderManager(
+        connector=broker,
+        magic_number=config.advanced.magic_number,
+        trade_comment=config.advanced.trade_comment,
+        persistence=persistence,
+        risk_manager=risk_manager
+    )
+    indicators = TechnicalIndicators()
+    trade_manager = TradeManager(
+        connector=broker,
+        order_manager=order_manager,
+        trailing_config=config.trailing_stop,
+        use_breakeven=config.advanced.use_breakeven,
+        breakeven_trigger_rr=config.advanced.breakeven_trigger_rr,
+        indicators=indicators,
+        range_configs=config.range_config.ranges
+    )
+
+    controller = BacktestController(
+        simulated_broker=broker,
+        time_controller=time_controller,
+        order_manager=order_manager,
+        risk_manager=risk_manager,
+        trade_manager=trade_manager,
+        indicators=indicators,
+        stop_loss_threshold=settings.stop_loss_threshold,
+        symbol_persistence=SymbolPerformancePersistence(data_dir=str(run_dir))
+    )
+    controller.event_skipping = settings.event_skipping
+    controller.show_progress = _worker_state.get('show_progress', True)
+
+    # WARM START: Restore set_start_time(), strategy initialize() and candle seeding
+    snapshot = None
+    warm_state = None
+    components = None
+    if warm_start_overrides is not None:
+        key = WarmStartSnapshot.snapshot_key(f"{_worker_state['data_id']}:{len(timeline)}", symbols,
+                                             settings.start_date, warm_start_overrides)
+        snapshot = WarmStartSnapshot(_worker_state['dataset_dir'] / ParameterSweepRunner.WARM_START_DIR, key)
+        components = WarmStartSnapshot.run_components(
+            broker=broker, persistence=persistence, time_controller=time_controller,
+            risk_manager=risk_manager, order_manager=order_manager, indicators=indicators,
+            trade_manager=trade_manager, trading_controller=controller.trading_controller,
+            symbol_persistence=controller.trading_controller.symbol_persistence)
+        warm_state = snapshot.load(components)
+
+    if warm_state is not None:
+        if not controller.initialize(symbols, strategies=warm_state['strategies']):
+            raise RuntimeError("BacktestController initialization failed (no strategies)")
+        broker.restore_warm_state(warm_state['broker'], timeline)
+    else:
+        broker.set_start_time(settings.start_date)
+        if not controller.initialize(symbols):
+            raise RuntimeError("BacktestController initialization failed (no strategies)")
+
+        required_timeframes = set()
+        for strategy in controller.trading_controller.strategies.values():
+            required_timeframes.update(strategy.get_required_timeframes() or [])
+
+        broker.load_tick_timeline(timeline, sorted(required_timeframes))
+        if snapshot is not None:
+            snapshot.save(broker.get_warm_state(), controller.trading_controller.strategies, components)
+
+    controller.run_sequential(backtest_start_time=settings.start_date)
+
+    results = controller.get_results()
+    if not results['equity_curve']:
+        results['equity_curve'] = _realized_equity_curve(settings, results, broker.get_current_time())
+    return results
+
+
+def _realized_equity_curve(settings: SweepSettings, results: Dict,
+                           end_time: Optional[datetime]) -> List[Dict]:
+    """
+    Build an equity curve from closed trades (sequential runs record no snapshots).
+
+    Points: initial balance, balance after each closed trade, final equity.
+
+    Args:
+        settings: Sweep settings (start date, initial balance)
+        results: Results dictionary from BacktestController.get_results()
+        end_time: Simulated time at the end of the run
+
+    Returns:
+        List of {'time', 'balance', 'equity'} dictionaries
+    """
+    balance = settings.initial_balance
+    curve = [{'time': settings.start_date, 'balance': balance, 'equity': balance}]
+    for trade in sorted(results['trade_log'], key=lambda t: t['close_time']):
+        balance += trade['profit']
+        curve.append({'time': trade['close_time'], 'balance': balance, 'equity': balance})
+    curve.append({'time': end_time or curve[-1]['time'],
+                  'balance': results['final_balance'], 'equity': results['final_equity']})
+    return curve
+
+
+class ParameterSweepRunner:
+    """
+    Run many parameter sets over one shared, memory-mapped tick timeline.
+
+    Usage:
+        runner = ParameterSweepRunner("data/sweeps/run1", SweepSettings(start_date=START_DATE))
+        runner.prepare(broker.global_tick_timeline, symbols, symbol_data, symbol_info)
+        leaderboard = runner.run(ParameterSpace({...}).grid())
+    """
+
+    DATASET_DIR = "dataset"
+    TIMELINE_DIR = "timeline"
+    MARKET_DATA_FILE = "market_data.pkl"
+    WARM_START_DIR = "warm_start"
+    RUNS_DIR = "runs"
+    LEADERBOARD_NAME = "leaderboard"
+
+    def __init__(self, output_dir: str, settings: SweepSettings,
+                 max_workers: Optional[int] = None, sort_by: str = 'total_profit'):
+        """
+        Initialize sweep runner.
+
+        Args:
+            output_dir: Sweep directory (dataset, per-run files, leaderboard)
+            settings: Backtest settings shared by all runs
+            max_workers: Worker processes (None = os.cpu_count(), 1 = run in this process)
+            sort_by: Leaderboard ranking metric (higher is better)
+        """
+        self.output_dir = Path(output_dir)
+        self.dataset_dir = self.output_dir / self.DATASET_DIR
+        self.settings = settings
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.sort_by = sort_by
+        self.logger = get_logger()
+
+    def prepare(self, timeline, symbols: List[str],
+                symbol_data: Dict[Tuple[str, str], pd.DataFrame],
+                symbol_info: Dict[str, Dict]) -> Path:
+        """
+        Write the shared dataset every worker reads.
+
+        Args:
+            timeline: ColumnarTickTimeline (saved directly) or any chronological tick
+                      iterable such as StreamingTickTimeline (streamed to disk)
+            symbols: Symbols to backtest
+            symbol_data: (symbol, timeframe) -> OHLC DataFrame, as passed to load_symbol_data()
+            symbol_info: Symbol -> symbol info dict (tick_value already converted to USD)
+
+        Returns:
+            Dataset directory
+        """
+        return write_backtest_dataset(self.dataset_dir, self.settings, timeline,
+                                      symbols, symbol_data, symbol_info)
+
+    def run(self, parameter_sets: List[Dict[str, Any]],
+            progress_callback: Optional[Callable[[int, int, Dict], None]] = None) -> pd.DataFrame:
+        """
+        Run every parameter set and write the leaderboard.
+
+        The leaderboard is rewritten after each finished run, so a long sweep
+        can be inspected (or survives an interruption) while it runs.
+
+        Args:
+            parameter_sets: Parameter sets from ParameterSpace.grid() or sample()
+            progress_callback: Optional callback(done, total, row) after each run
+
+        Returns:
+            Leaderboard DataFrame (best run first)
+        """
+        for parameter_set in parameter_sets:
+            for key in parameter_set:
+                ParameterSpace.split_key(key)
+
+        total = len(parameter_sets)
+        width = len(str(max(total - 1, 0)))
+        tasks = [(f"run_{i:0{width}d}", parameter_set) for i, parameter_set in enumerate(parameter_sets)]
+        rows: List[Dict] = []
+
+        self.logger.info("=" * 60)
+        self.logger.info(f"Parameter sweep: {total} runs on {min(self.max_workers, max(total, 1))} worker(s)")
+        self.logger.info("=" * 60)
+
+        def collect(row: Dict):
+            rows.append(row)
+            self.write_leaderboard(rows)
+            if row['status'] != 'ok':
+                self.logger.warning(f"Sweep {row['run_id']} failed: {row['error']}")
+            if progress_callback:
+                progress_callback(len(rows), total, row)
+
+        if self.max_workers <= 1:
+            # Debug mode: run in this process (no pickling, breakpoints work)
+            _init_sweep_worker(str(self.dataset_dir), quiet=False)
+            try:
+                for run_id, parameter_set in tasks:
+                    collect(_run_sweep_task(run_id, parameter_set))
+            finally:
+                _worker_state.clear()
+        else:
+            # 'spawn' avoids forking a process that holds logger/progress threads
+            context = multiprocessing.get_context('spawn')
+            with ProcessPoolExecutor(max_workers=min(self.max_workers, total) or 1, mp_context=context,
+                                     initializer=_init_sweep_worker,
+                                     initargs=(str(self.dataset_dir),)) as executor:
+                futures = {executor.submit(_run_sweep_task, run_id, parameter_set): run_id
+                           for run_id, parameter_set in tasks}
+                for future in as_completed(futures):
+                    try:
+                        collect(future.result())
+                    except Exception as e:
+                        # Worker process died (e.g. out of memory) - record and continue
+                        collect({'run_id': futures[future], 'status': 'error', 'error': f"{type(e).__name__}: {e}"})
+
+        return self.write_leaderboard(rows)
+
+    def write_leaderboard(self, rows: List[Dict]) -> pd.DataFrame:
+        """
+        Rank runs and write leaderboard.parquet and leaderboard.csv.
+
+        Args:
+            rows: Leaderboard rows returned by the runs
+
+        Returns:
+            Leaderboard DataFrame (best run first)
+        """
+        from src.backtesting.engine.results_analyzer import ResultsAnalyzer
+
+        leaderboard = ResultsAnalyzer().build_leaderboard(rows, sort_by=self.sort_by)
+        if leaderboard.empty:
+            return leaderboard
+
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        leaderboard.to_csv(self.output_dir / f"{self.LEADERBOARD_NAME}.csv", index=False)
+        try:
+            leaderboard.to_parquet(self.output_dir / f"{self.LEADERBOARD_NAME}.parquet", index=False)
+        except Exception as e:
+            self.logger.warning(f"Could not write leaderboard parquet ({e}) - CSV written")
+        return leaderboard
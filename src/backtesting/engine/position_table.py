@@ -0,0 +1,224 @@
+"""
+Per-symbol open position table for tick-level SL/TP detection.
+
+Stores the SL/TP-relevant fields of a symbol's open positions as parallel
+NumPy arrays instead of walking PositionInfo objects on every tick:
+
+    tickets  int64    position ticket
+    is_buy   bool     True for BUY, False for SELL
+    sl       float64  stop loss (0 = none)
+    tp       float64  take profit (0 = none)
+    volume   float64  lots
+
+Rows keep the order positions were opened, so hits are reported in the same
+order as the previous per-ticket loop in SimulatedBroker._check_sl_tp_for_tick().
+
+PERFORMANCE OPTIMIZATION: The table also caches the nearest trigger levels
+(highest BUY SL, lowest BUY TP, lowest SELL SL, highest SELL TP). A tick whose
+bid/ask lies strictly inside those levels cannot close any position, so most
+ticks are rejected with four float compares and no NumPy call at all.
+"""
+from typing import List, Tuple
+
+import numpy as np
+
+
+class SymbolPositionTable:
+    """
+    Open positions of one symbol as parallel NumPy arrays.
+
+    Not thread-safe: the caller (SimulatedBroker) holds position_lock.
+    """
+
+    # Initial row capacity (doubles when full)
+    INITIAL_CAPACITY = 16
+
+    def __init__(self):
+        """Initialize empty position table."""
+        capacity = self.INITIAL_CAPACITY
+        self.tickets = np.zeros(capacity, dtype=np.int64)
+        self.is_buy = np.zeros(capacity, dtype=np.bool_)
+        self.sl = np.zeros(capacity, dtype=np.float64)
+        self.tp = np.zeros(capacity, dtype=np.float64)
+        self.volume = np.zeros(capacity, dtype=np.float64)
+        self.count = 0
+
+        # Nearest trigger levels (no positions = nothing can trigger)
+        self.buy_sl_max = float('-inf')    # bid <= this closes a BUY at SL
+        self.buy_tp_min = float('inf')     # bid >= this closes a BUY at TP
+        self.sell_sl_min = float('inf')    # ask >= this closes a SELL at SL
+        self.sell_tp_max = float('-inf')   # ask <= this closes a SELL at TP
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __contains__(self, ticket: int) -> bool:
+        return self._find(ticket) >= 0
+
+    def get_tickets(self) -> List[int]:
+        """Get tickets in the order positions were opened."""
+        return self.tickets[:self.count].tolist()
+
+    def add(self, ticket: int, is_buy: bool, sl: float, tp: float, volume: float) -> None:
+        """
+        Add an open position.
+
+        Args:
+            ticket: Position ticket
+            is_buy: True for BUY, False for SELL
+            sl: Stop loss price (0 = none)
+            tp: Take profit price (0 = none)
+            volume: Position volume in lots
+        """
+        if self.count == len(self.tickets):
+            self._grow()
+
+        i = self.count
+        self.tickets[i] = ticket
+        self.is_buy[i] = is_buy
+        self.sl[i] = sl
+        self.tp[i] = tp
+        self.volume[i] = volume
+        self.count = i + 1
+
+        self._include_triggers(is_buy, sl, tp)
+
+    def remove(self, ticket: int) -> bool:
+        """
+        Remove a position (keeps the order of the remaining rows).
+
+        Args:
+            ticket: Position ticket
+
+        Returns:
+            True if the ticket was in the table
+        """
+        i = self._find(ticket)
+        if i < 0:
+            return False
+
+        n = self.count
+        for column in (self.tickets, self.is_buy, self.sl, self.tp, self.volume):
+            column[i:n - 1] = column[i + 1:n]
+        self.count = n - 1
+
+        self._refresh_triggers()
+        return True
+
+    def update_stops(self, ticket: int, sl: float, tp: float) -> bool:
+        """
+        Update SL/TP of a position.
+
+        Args:
+            ticket: Position ticket
+            sl: New stop loss (0 = none)
+            tp: New take profit (0 = none)
+
+        Returns:
+            True if the ticket was in the table
+        """
+        i = self._find(ticket)
+        if i < 0:
+            return False
+
+        self.sl[i] = sl
+        self.tp[i] = tp
+        self._refresh_triggers()
+        return True
+
+    def may_trigger(self, bid: float, ask: float) -> bool:
+        """
+        Quick check whether a tick can hit any SL/TP.
+
+        Args:
+            bid: Tick bid (BUY positions close at bid)
+            ask: Tick ask (SELL positions close at ask)
+
+        Returns:
+            False if no position can be closed by this tick
+        """
+        return (bid <= self.buy_sl_max or bid >= self.buy_tp_min or
+                ask >= self.sell_sl_min or ask <= self.sell_tp_max)
+
+    def check(self, bid: float, ask: float) -> List[Tuple[int, float, str]]:
+        """
+        Find positions whose SL or TP is hit by a tick.
+
+        Same rules as the per-position loop: BUY closes at bid (SL if
+        bid <= sl, else TP if bid >= tp), SELL closes at ask (SL if ask >= sl,
+        else TP if ask <= tp). Levels of 0 are ignored.
+
+        Args:
+            bid: Tick bid
+            ask: Tick ask
+
+        Returns:
+            List of (ticket, close_price, 'SL' or 'TP') in position open order
+        """
+        if not self.may_trigger(bid, ask):
+            return []
+
+        n = self.count
+        is_buy = self.is_buy[:n]
+        sl = self.sl[:n]
+        tp = self.tp[:n]
+
+        sl_hit = (sl > 0) & np.where(is_buy, bid <= sl, ask >= sl)
+        tp_hit = (tp > 0) & np.where(is_buy, bid >= tp, ask <= tp) & ~sl_hit
+
+        hits = []
+        for i in np.flatnonzero(sl_hit | tp_hit).tolist():
+            hits.append((
+                int(self.tickets[i]),
+                bid if is_buy[i] else ask,
+                'SL' if sl_hit[i] else 'TP',
+            ))
+        return hits
+
+    def _find(self, ticket: int) -> int:
+        """Get the row of a ticket (-1 if not found)."""
+        matches = np.flatnonzero(self.tickets[:self.count] == ticket)
+        return int(matches[0]) if len(matches) else -1
+
+    def _grow(self) -> None:
+        """Double row capacity."""
+        n = self.count
+        capacity = max(len(self.tickets) * 2, self.INITIAL_CAPACITY)
+        for name in ('tickets', 'is_buy', 'sl', 'tp', 'volume'):
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:n] = old[:n]
+            setattr(self, name, new)
+
+    def _include_triggers(self, is_buy: bool, sl: float, tp: float) -> None:
+        """Widen the nearest trigger levels for one new position."""
+        if is_buy:
+            if sl > 0 and sl > self.buy_sl_max:
+                self.buy_sl_max = sl
+            if tp > 0 and tp < self.buy_tp_min:
+                self.buy_tp_min = tp
+        else:
+            if sl > 0 and sl < self.sell_sl_min:
+                self.sell_sl_min = sl
+            if tp > 0 and tp > self.sell_tp_max:
+                self.sell_tp_max = tp
+
+    def _refresh_triggers(self) -> None:
+        """Recompute the nearest trigger levels from all rows (vectorized)."""
+        n = self.count
+        is_buy = self.is_buy[:n]
+        is_sell = ~is_buy
+        sl = self.sl[:n]
+        tp = self.tp[:n]
+        has_sl = sl > 0
+        has_tp = tp > 0
+
+        buy_sl = sl[is_buy & has_sl]
+        buy_tp = tp[is_buy & has_tp]
+        sell_sl = sl[is_sell & has_sl]
+        sell_tp = tp[is_sell & has_tp]
+
+        self.buy_sl_max = float(buy_sl.max()) if len(buy_sl) else float('-inf')
+        self.buy_tp_min = float(buy_tp.min()) if len(buy_tp) else float('inf')
+        self.sell_sl_min = float(sell_sl.min()) if len(sell_sl) else float('inf')
+        self.sell_tp_max = float(sell_tp.max()) if len(sell_tp) else float('-inf')
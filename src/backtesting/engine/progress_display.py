@@ -0,0 +1,271 @@
+"""
+Decoupled Rich Progress Display for Sequential Backtests.
+
+The tick loop only publishes a ProgressSnapshot - a small immutable tuple of
+numbers (tick index, simulated time, balance, equity, trade counters) and the
+open positions as plain tuples - by assigning it to ProgressRenderer.snapshot.
+A single reference assignment is atomic, so no lock is needed.
+
+ProgressRenderer runs in its own daemon thread and builds the Rich
+renderables (progress bar, stats panel, positions table) from the latest
+snapshot at a fixed frame rate. The tick loop never creates display objects
+and never reads the wall clock for display purposes; headless runs (no Rich,
+no terminal, show_progress disabled) do not create a renderer at all.
+"""
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Iterable, NamedTuple, Optional, Tuple
+
+
+class PositionRow(NamedTuple):
+    """One open position as displayed."""
+    ticket: int
+    symbol: str
+    type_name: str
+    open_price: float
+    current_price: float
+    profit: float
+    sl: float
+    tp: float
+    open_time: Optional[datetime]
+
+
+class ProgressSnapshot(NamedTuple):
+    """State published by the tick loop for the renderer."""
+    tick_index: int  # Ticks processed
+    time_ns: Optional[int]  # Simulated time (UTC epoch ns)
+    balance: float
+    equity: float
+    closed_trades: int
+    wins: int
+    losses: int
+    positions: Tuple[PositionRow, ...]
+
+
+def position_rows(positions: Iterable) -> Tuple[PositionRow, ...]:
+    """
+    Copy open positions into display rows.
+
+    Args:
+        positions: PositionInfo objects (e.g. broker.get_positions())
+
+    Returns:
+        Tuple of PositionRow, newest first
+    """
+    rows = [
+        PositionRow(pos.ticket, pos.symbol, pos.position_type.name, pos.open_price, pos.current_price,
+                    pos.profit, pos.sl, pos.tp, pos.open_time)
+        for pos in positions
+    ]
+    rows.sort(key=lambda row: row.open_time, reverse=True)
+    return tuple(rows)
+
+
+def build_positions_table(rows: Tuple[PositionRow, ...], current_time: Optional[datetime]):
+    """
+    Create a rich table showing currently open positions.
+
+    Args:
+        rows: Open positions (newest first)
+        current_time: Simulated time (for the time held column)
+
+    Returns:
+        rich.table.Table
+    """
+    from rich.table import Table
+
+    table = Table(
+        title=f"📊 Open Positions ({len(rows)})",
+        show_header=True,
+        header_style="bold cyan",
+        border_style="blue",
+        title_style="bold white",
+        show_lines=False,
+        padding=(0, 1)
+    )
+
+    # Add columns
+    table.add_column("Ticket", style="cyan", width=8, justify="right")
+    table.add_column("Symbol", style="white", width=10)
+    table.add_column("Type", style="white", width=5)
+    table.add_column("Entry", style="white", width=10, justify="right")
+    table.add_column("Current", style="white", width=10, justify="right")
+    table.add_column("P&L", style="white", width=12, justify="right")
+    table.add_column("SL", style="yellow", width=10, justify="right")
+    table.add_column("TP", style="green", width=10, justify="right")
+    table.add_column("Time", style="white", width=10)
+
+    # If no positions, show empty message
+    if not rows:
+        table.add_row("—", "—", "—", "—", "—", "—", "—", "—", "—")
+        return table
+
+    for row in rows:
+        # Calculate time held
+        if current_time and row.open_time:
+            time_held = current_time - row.open_time
+            hours = int(time_held.total_seconds() // 3600)
+            minutes = int((time_held.total_seconds() % 3600) // 60)
+            time_str = f"{hours}h{minutes}m" if hours > 0 else f"{minutes}m"
+        else:
+            time_str = "—"
+
+        # Color code P&L
+        profit = row.profit
+        if profit > 0:
+            pnl_str = f"[green]+${profit:,.2f}[/green]"
+        elif profit < 0:
+            pnl_str = f"[red]${profit:,.2f}[/red]"
+        else:
+            pnl_str = f"${profit:,.2f}"
+
+        # Format position type
+        pos_type = "BUY" if row.type_name == "BUY" else "SELL"
+        type_color = "green" if pos_type == "BUY" else "red"
+
+        # Format SL/TP
+        sl_str = f"{row.sl:.5f}" if row.sl > 0 else "—"
+        tp_str = f"{row.tp:.5f}" if row.tp > 0 else "—"
+
+        table.add_row(
+            f"{row.ticket}",
+            row.symbol,
+            f"[{type_color}]{pos_type}[/{type_color}]",
+            f"{row.open_price:.5f}",
+            f"{row.current_price:.5f}",
+            pnl_str,
+            sl_str,
+            tp_str,
+            time_str
+        )
+
+    return table
+
+
+class ProgressRenderer:
+    """
+    Renderer thread of the sequential Rich dashboard.
+
+    Usage:
+        renderer = ProgressRenderer(total_ticks, start_index)
+        renderer.start()
+        ...                                   # tick loop
+        renderer.snapshot = ProgressSnapshot(...)  # every N ticks
+        ...
+        renderer.stop()                       # renders the final frame
+    """
+
+    def __init__(self, total_ticks: int, start_index: int = 0, fps: float = 4.0, console=None):
+        """
+        Initialize renderer.
+
+        Args:
+            total_ticks: Ticks in the timeline
+            start_index: First tick of this run (resumed runs)
+            fps: Frames per second
+            console: Optional rich.console.Console (default: a new console)
+        """
+        self.total_ticks = total_ticks
+        self.start_index = start_index
+        self.frame_interval = 1.0 / fps
+        self.console = console
+        self.frames = 0
+
+        # Latest snapshot - written by the tick loop, read by the renderer thread
+        self.snapshot: Optional[ProgressSnapshot] = None
+
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._live = None
+        self._progress = None
+        self._task = None
+        self._rendered = None
+        self._start_wall_time = time.perf_counter()
+
+    def start(self) -> None:
+        """Open the live display and start the renderer thread."""
+        from rich.console import Console
+        from rich.live import Live
+        from rich.progress import (
+            BarColumn, Progress, SpinnerColumn, TextColumn, TimeElapsedColumn, TimeRemainingColumn,
+        )
+
+        self._progress = Progress(
+            SpinnerColumn(),
+            TextColumn("[bold blue]{task.description}"),
+            BarColumn(complete_style="green", finished_style="bold green"),
+            TextColumn("[progress.percentage]{task.percentage:>3.0f}%"),
+            TimeElapsedColumn(),
+            TextColumn("•"),
+            TimeRemainingColumn(),
+        )
+        self._task = self._progress.add_task("Processing ticks", total=self.total_ticks,
+                                             completed=self.start_index)
+        self._live = Live(console=self.console or Console(), auto_refresh=False, transient=False)
+        self._live.start()
+
+        self._start_wall_time = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="ProgressRenderer", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the renderer thread, render the last snapshot and close the live display."""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._live is not None:
+            self.render()
+            self._live.stop()
+            self._live = None
+
+    def render(self) -> None:
+        """Render the latest snapshot (if it changed since the last frame)."""
+        snapshot = self.snapshot
+        if snapshot is None or snapshot is self._rendered or self._live is None:
+            return
+        self._rendered = snapshot
+        self._live.update(self.build(snapshot), refresh=True)
+        self.frames += 1
+
+    def build(self, snapshot: ProgressSnapshot):
+        """
+        Build the dashboard renderable of one snapshot.
+
+        Args:
+            snapshot: Published state
+
+        Returns:
+            rich.console.Group of progress bar, stats panel and positions table
+        """
+        from rich.console import Group
+        from rich.panel import Panel
+        from rich.text import Text
+
+        self._progress.update(self._task, completed=snapshot.tick_index)
+
+        elapsed = time.perf_counter() - self._start_wall_time
+        ticks_per_sec = (snapshot.tick_index - self.start_index) / elapsed if elapsed > 0 else 0
+
+        current_time = None
+        if snapshot.time_ns is not None:
+            current_time = datetime.fromtimestamp(snapshot.time_ns / 1e9, tz=timezone.utc)
+        time_str = current_time.strftime('%Y-%m-%d %H:%M:%S') if current_time else "N/A"
+
+        stats_text = Text()
+        stats_text.append(f"Time: {time_str} UTC  ", style="bold white")
+        stats_text.append(f"Balance: ${snapshot.balance:,.2f}  ", style="bold green")
+        stats_text.append(f"Equity: ${snapshot.equity:,.2f}  ", style="bold cyan")
+        stats_text.append(f"Trades: {snapshot.closed_trades} ({snapshot.wins}W/{snapshot.losses}L)  ",
+                          style="bold white")
+        stats_text.append(f"Speed: {ticks_per_sec:,.0f} ticks/sec", style="bold yellow")
+
+        stats_panel = Panel(stats_text, title="[bold]Backtest Stats[/bold]", border_style="blue")
+
+        return Group(self._progress, stats_panel, build_positions_table(snapshot.positions, current_time))
+
+    def _run(self) -> None:
+        """Renderer thread: one frame every frame_interval until stopped."""
+        while not self._stop_event.wait(self.frame_interval):
+            self.render()
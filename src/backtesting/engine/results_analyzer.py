@@ -21,6 +21,7 @@ class ResultsAnalyzer:
     - Maximum drawdown
     - Win rate, profit factor
     - Per-strategy metrics
+    - Leaderboards over many runs (parameter sweeps)
     """
     
     def __init__(self):
@@ -38,22 +39,36 @@ class ResultsAnalyzer:
             Dictionary with performance metrics
         """
         equity_curve = results.get('equity_curve', [])
+        equity_curve_path = results.get('equity_curve_path')
         trade_log = results.get('trade_log', [])
-        
-        if not equity_curve:
+        online = results.get('metrics')  # OnlineMetrics from BacktestController.get_results()
+
+        if online is not None and online.equity_count:
+            # PERFORMANCE OPTIMIZATION: Accumulated during the run over every equity snapshot
+            curve_metrics = online.curve_metrics()
+        elif equity_curve_path:
+            # MEMORY OPTIMIZATION: Full-resolution curve spilled by EquityRecorder -
+            # read back lazily (equity column only, one row group at a time)
+            curve_metrics = self._analyze_equity_file(equity_curve_path)
+        elif equity_curve:
+            # Convert to DataFrame for easier analysis
+            equity_df = pd.DataFrame(equity_curve)
+            curve_metrics = {
+                'total_return': self._calculate_total_return(equity_df),
+                'max_drawdown': self._calculate_max_drawdown(equity_df),
+                'sharpe_ratio': self._calculate_sharpe_ratio(equity_df),
+            }
+        else:
             self.logger.warning("No equity curve data to analyze")
             return {}
-        
-        # Convert to DataFrame for easier analysis
-        equity_df = pd.DataFrame(equity_curve)
-        
+
         # Calculate metrics
         metrics = {
-            'total_return': self._calculate_total_return(equity_df),
+            'total_return': curve_metrics['total_return'],
             'total_profit': results.get('total_profit', 0),
             'profit_percent': results.get('profit_percent', 0),
-            'max_drawdown': self._calculate_max_drawdown(equity_df),
-            'sharpe_ratio': self._calculate_sharpe_ratio(equity_df),
+            'max_drawdown': curve_metrics['max_drawdown'],
+            'sharpe_ratio': curve_metrics['sharpe_ratio'],
             'total_trades': len(trade_log),
             'final_balance': results.get('final_balance', 0),
             'final_equity': results.get('final_equity', 0),
@@ -62,7 +77,10 @@ class ResultsAnalyzer:
         
         # Add trade statistics if available
         if trade_log:
-            trade_stats = self._analyze_trades(trade_log)
+            if online is not None and online.total_trades == len(trade_log):
+                trade_stats = online.trade_metrics()
+            else:
+                trade_stats = self._analyze_trades(trade_log)
             metrics.update(trade_stats)
 
             # Add per-symbol breakdown
@@ -73,6 +91,29 @@ class ResultsAnalyzer:
 
         return metrics
     
+    def _analyze_equity_file(self, path: str, risk_free_rate: float = 0.0) -> Dict:
+        """
+        Total return, maximum drawdown and Sharpe ratio of a spilled equity curve.
+
+        Streams the parquet file one row group at a time into OnlineMetrics
+        (running peak and merged return statistics), so memory stays bounded by
+        the row group size. Results equal the in-memory calculations.
+
+        Args:
+            path: equity.parquet written by EquityRecorder
+            risk_free_rate: Annual risk-free rate (default 0%)
+
+        Returns:
+            Dict with total_return, max_drawdown and sharpe_ratio
+        """
+        import pyarrow.parquet as pq
+        from src.backtesting.engine.online_metrics import OnlineMetrics
+
+        online = OnlineMetrics()
+        for batch in pq.ParquetFile(str(path)).iter_batches(columns=['equity']):
+            online.add_equity_batch(batch.column(0).to_numpy(zero_copy_only=False))
+        return online.curve_metrics(risk_free_rate)
+
     def _calculate_total_return(self, equity_df: pd.DataFrame) -> float:
         """Calculate total return percentage."""
         if len(equity_df) < 2:
@@ -304,3 +345,49 @@ class ResultsAnalyzer:
 
         return results
 
+    def summarize(self, metrics: Dict) -> Dict:
+        """
+        Flatten metrics to scalar values (one leaderboard row).
+
+        Drops nested breakdowns (per_symbol, per_strategy) and converts
+        NumPy scalars to Python values.
+
+        Args:
+            metrics: Dictionary returned by analyze()
+
+        Returns:
+            Dictionary of metric name -> scalar
+        """
+        row = {}
+        for key, value in metrics.items():
+            if isinstance(value, np.generic):
+                value = value.item()
+            if isinstance(value, (bool, int, float, str)):
+                row[key] = value
+        return row
+
+    def build_leaderboard(self, rows: List[Dict], sort_by: str = 'total_profit',
+                          ascending: bool = False) -> pd.DataFrame:
+        """
+        Combine per-run rows (parameters + summarized metrics) into a ranked table.
+
+        Args:
+            rows: One dictionary per run
+            sort_by: Metric column to rank by (runs without it are ranked last)
+            ascending: Sort ascending instead of best-first
+
+        Returns:
+            DataFrame with a 1-based 'rank' column, best run first
+        """
+        leaderboard = pd.DataFrame(rows)
+        if leaderboard.empty:
+            return leaderboard
+
+        if sort_by in leaderboard.columns:
+            leaderboard = leaderboard.sort_values(sort_by, ascending=ascending, na_position='last', kind='stable')
+        else:
+            self.logger.warning(f"Leaderboard metric '{sort_by}' not found - keeping run order")
+
+        leaderboard = leaderboard.reset_index(drop=True)
+        leaderboard.insert(0, 'rank', np.arange(1, len(leaderboard) + 1))
+        return leaderboard
@@ -0,0 +1,293 @@
+"""
+Per-Symbol Process Sharding for Backtesting.
+
+With cross-symbol risk limits disabled (RiskConfig.enable_portfolio_risk =
+False, i.e. no portfolio/group risk validation) a symbol's trades depend
+only on its own ticks, so symbols can be backtested independently:
+
+- plan_shards(): splits the symbols into groups with balanced tick counts
+  (largest first, each onto the currently lightest shard).
+- ShardedBacktestRunner: writes the tick timeline ONCE as memory-mapped .npy
+  columns (same dataset as ParameterSweepRunner) and runs every shard in its
+  own process with its own SimulatedBroker via run_sequential().
+- merge_shard_results(): combines closed trades and rebuilds one
+  time-ordered portfolio equity curve from the shard curves.
+
+Each shard trades a sub-account that starts with the full initial balance;
+the portfolio balance/equity at any time is the initial balance plus the sum
+of every shard's profit up to that time. Position sizing and the stop-loss
+threshold therefore use the shard's own balance, and RiskConfig.max_positions
+applies per shard. The merged balance and equity curve are an approximation
+of a single-account run, not a reproduction of run_sequential().
+
+Directory layout:
+
+    <output_dir>/dataset/timeline/*.npy     shared tick timeline
+    <output_dir>/dataset/market_data.pkl    OHLC data, symbol info, settings
+    <output_dir>/runs/<shard_id>/           per-shard persistence files
+"""
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from src.backtesting.engine.parameter_sweep import (
+    ParameterSweepRunner,
+    SweepSettings,
+    _init_sweep_worker,
+    _run_single_backtest,
+    _worker_state,
+    write_backtest_dataset,
+)
+from src.backtesting.engine.tick_timeline import ColumnarTickTimeline
+from src.utils.logger import get_logger
+
+
+def plan_shards(symbol_ticks: Dict[str, int], shard_count: int) -> List[List[str]]:
+    """
+    Group symbols into shards with balanced tick counts.
+
+    Greedy longest-processing-time assignment: symbols sorted by tick count
+    (descending), each added to the shard with the fewest ticks so far.
+
+    Args:
+        symbol_ticks: Symbol -> number of ticks (run time is roughly linear in ticks)
+        shard_count: Maximum number of shards
+
+    Returns:
+        Non-empty symbol lists (symbols keep their input order inside a shard)
+    """
+    shard_count = max(1, min(shard_count, len(symbol_ticks)))
+    loads = [0] * shard_count
+    assignment: Dict[str, int] = {}
+
+    for symbol in sorted(symbol_ticks, key=lambda s: symbol_ticks[s], reverse=True):
+        shard = loads.index(min(loads))
+        assignment[symbol] = shard
+        loads[shard] += max(symbol_ticks[symbol], 1)
+
+    shards = [[symbol for symbol in symbol_ticks if assignment[symbol] == i] for i in range(shard_count)]
+    return [shard for shard in shards if shard]
+
+
+def reconstruct_portfolio_equity(curves: List[List[Dict]], initial_balance: float) -> List[Dict]:
+    """
+    Merge per-shard equity curves into one time-ordered portfolio curve.
+
+    Every shard point changes the portfolio by that shard's change since its
+    previous point (shards start at initial_balance). Points with the same
+    time are collapsed to the last one.
+
+    Args:
+        curves: Per-shard lists of {'time', 'balance', 'equity'} dictionaries
+        initial_balance: Initial balance of each shard (and of the portfolio)
+
+    Returns:
+        List of {'time', 'balance', 'equity'} dictionaries
+    """
+    frames = []
+    for shard, curve in enumerate(curves):
+        if not curve:
+            continue
+        df = pd.DataFrame(curve, columns=['time', 'balance', 'equity'])
+        df['shard'] = shard
+        frames.append(df)
+
+    if not frames:
+        return []
+
+    points = pd.concat(frames, ignore_index=True)
+    points['time'] = pd.to_datetime(points['time'], utc=True)
+    points = points.sort_values(['time'], kind='stable').reset_index(drop=True)
+
+    portfolio = pd.DataFrame({'time': points['time']})
+    for column in ('balance', 'equity'):
+        previous = points.groupby('shard')[column].shift(1).fillna(initial_balance)
+        portfolio[column] = initial_balance + (points[column] - previous).cumsum()
+
+    portfolio = portfolio.drop_duplicates('time', keep='last')
+    return [
+        {'time': t.to_pydatetime(), 'balance': float(b), 'equity': float(e)}
+        for t, b, e in zip(portfolio['time'], portfolio['balance'], portfolio['equity'])
+    ]
+
+
+def merge_shard_results(shard_results: List[Dict], initial_balance: float) -> Dict:
+    """
+    Combine shard results into one results dictionary (same keys as
+    BacktestController.get_results()).
+
+    Args:
+        shard_results: Results dictionaries of the shards (from get_results())
+        initial_balance: Initial balance of each shard (and of the portfolio)
+
+    Returns:
+        Combined results: summed profit, all trades ordered by close time and
+        the reconstructed portfolio equity curve
+    """
+    total_profit = sum(r['final_balance'] - initial_balance for r in shard_results)
+    floating = sum(r['final_equity'] - r['final_balance'] for r in shard_results)
+
+    trade_log = [trade for r in shard_results for trade in r['trade_log']]
+    trade_log.sort(key=lambda t: t['close_time'])
+
+    final_balance = initial_balance + total_profit
+    return {
+        'final_balance': final_balance,
+        'final_equity': final_balance + floating,
+        'total_profit': total_profit,
+        'profit_percent': total_profit / initial_balance * 100.0 if initial_balance else 0.0,
+        'open_positions': sum(r['open_positions'] for r in shard_results),
+        'equity_curve': reconstruct_portfolio_equity([r['equity_curve'] for r in shard_results], initial_balance),
+        'trade_log': trade_log,
+    }
+
+
+def _run_shard_task(shard_id: str, symbols: List[str]) -> Dict[str, Any]:
+    """
+    Run one shard in the current (worker) process.
+
+    Args:
+        shard_id: Shard identifier (also the per-shard directory name)
+        symbols: Symbols traded by this shard
+
+    Returns:
+        Dict with shard_id, symbols, status, error, wall_time_sec and results
+    """
+    start_wall_time = time.time()
+    shard: Dict[str, Any] = {'shard_id': shard_id, 'symbols': list(symbols)}
+    try:
+        # Configuration is used as-is: callers only shard with portfolio risk disabled
+        # (backtest.py falls back to a single run otherwise)
+        results = _run_single_backtest(shard_id, symbols)
+        for trade in results['trade_log']:
+            trade['shard'] = shard_id
+        shard['status'] = 'ok'
+        shard['error'] = ''
+        shard['results'] = results
+    except Exception as e:
+        shard['status'] = 'error'
+        shard['error'] = f"{type(e).__name__}: {e}"
+        shard['results'] = None
+
+    shard['wall_time_sec'] = time.time() - start_wall_time
+    return shard
+
+
+class ShardedBacktestRunner:
+    """
+    Run independent symbol groups in parallel processes and merge the results.
+
+    Usage:
+        runner = ShardedBacktestRunner("data/shards/run1", SweepSettings(start_date=START_DATE))
+        runner.prepare(broker.global_tick_timeline, symbols, symbol_data, symbol_info)
+        results = runner.run()   # same keys as BacktestController.get_results()
+    """
+
+    def __init__(self, output_dir: str, settings: SweepSettings, shard_count: Optional[int] = None):
+        """
+        Initialize sharded runner.
+
+        Args:
+            output_dir: Output directory (dataset and per-shard files)
+            settings: Backtest settings used by every shard
+            shard_count: Number of shards/processes (None = os.cpu_count(), 1 = run in this process)
+        """
+        self.output_dir = Path(output_dir)
+        self.dataset_dir = self.output_dir / ParameterSweepRunner.DATASET_DIR
+        self.settings = settings
+        self.shard_count = shard_count or os.cpu_count() or 1
+        self.symbols: List[str] = []
+        self.symbol_ticks: Dict[str, int] = {}
+        self.shard_rows: List[Dict] = []
+        self.logger = get_logger()
+
+    def prepare(self, timeline, symbols: List[str],
+                symbol_data: Dict[Tuple[str, str], pd.DataFrame],
+                symbol_info: Dict[str, Dict]) -> Path:
+        """
+        Write the shared dataset and count ticks per symbol for shard planning.
+
+        Args:
+            timeline: ColumnarTickTimeline or any chronological tick iterable
+            symbols: Symbols to backtest
+            symbol_data: (symbol, timeframe) -> OHLC DataFrame, as passed to load_symbol_data()
+            symbol_info: Symbol -> symbol info dict (tick_value already converted to USD)
+
+        Returns:
+            Dataset directory
+        """
+        write_backtest_dataset(self.dataset_dir, self.settings, timeline, symbols, symbol_data, symbol_info)
+
+        counts = ColumnarTickTimeline.load(self.dataset_dir / ParameterSweepRunner.TIMELINE_DIR).symbol_counts()
+        self.symbols = list(symbols)
+        self.symbol_ticks = {symbol: counts.get(symbol, 0) for symbol in self.symbols}
+        return self.dataset_dir
+
+    def run(self, progress_callback: Optional[Callable[[int, int, Dict], None]] = None) -> Dict:
+        """
+        Run all shards and merge their results.
+
+        Args:
+            progress_callback: Optional callback(done, total, shard) after each shard
+
+        Returns:
+            Combined results dictionary (see merge_shard_results())
+
+        Raises:
+            RuntimeError: If a shard failed (partial results would be misleading)
+        """
+        shards = plan_shards(self.symbol_ticks, self.shard_count)
+        width = len(str(max(len(shards) - 1, 0)))
+        tasks = [(f"shard_{i:0{width}d}", symbols) for i, symbols in enumerate(shards)]
+        self.shard_rows = []
+
+        self.logger.info("=" * 60)
+        self.logger.info(f"Sharded backtest: {len(self.symbols)} symbols in {len(tasks)} shard(s)")
+        for shard_id, symbols in tasks:
+            ticks = sum(self.symbol_ticks[s] for s in symbols)
+            self.logger.info(f"  {shard_id}: {', '.join(symbols)} ({ticks:,} ticks)")
+        self.logger.info("=" * 60)
+
+        def collect(shard: Dict):
+            self.shard_rows.append(shard)
+            if shard['status'] != 'ok':
+                self.logger.error(f"Shard {shard['shard_id']} failed: {shard['error']}")
+            if progress_callback:
+                progress_callback(len(self.shard_rows), len(tasks), shard)
+
+        if len(tasks) <= 1:
+            # Single shard: run in this process (no pickling, breakpoints work)
+            _init_sweep_worker(str(self.dataset_dir), quiet=False)
+            try:
+                for shard_id, symbols in tasks:
+                    collect(_run_shard_task(shard_id, symbols))
+            finally:
+                _worker_state.clear()
+        else:
+            # 'spawn' avoids forking a process that holds logger/progress threads
+            context = multiprocessing.get_context('spawn')
+            with ProcessPoolExecutor(max_workers=len(tasks), mp_context=context,
+                                     initializer=_init_sweep_worker,
+                                     initargs=(str(self.dataset_dir),)) as executor:
+                futures = {executor.submit(_run_shard_task, shard_id, symbols): (shard_id, symbols)
+                           for shard_id, symbols in tasks}
+                for future in as_completed(futures):
+                    try:
+                        collect(future.result())
+                    except Exception as e:
+                        # Worker process died (e.g. out of memory)
+                        shard_id, symbols = futures[future]
+                        collect({'shard_id': shard_id, 'symbols': symbols, 'status': 'error',
+                                 'error': f"{type(e).__name__}: {e}", 'results': None})
+
+        failed = [s['shard_id'] for s in self.shard_rows if s['status'] != 'ok']
+        if failed:
+            raise RuntimeError(f"{len(failed)} shard(s) failed: {', '.join(sorted(failed))}")
+
+        self.shard_rows.sort(key=lambda s: s['shard_id'])
+        return merge_shard_results([s['results'] for s in self.shard_rows], self.settings.initial_balance)
@@ -11,9 +11,19 @@ import threading
 import pandas as pd
 import numpy as np
 
-from src.models.data_models import CandleData, PositionInfo, PositionType
+from src.models.data_models import CandleData, CandleArrays, PositionInfo, PositionType
 from src.utils.logger import get_logger
 from src.backtesting.engine.candle_builder import MultiTimeframeCandleBuilder
+from src.backtesting.engine.tick_timeline import (
+    ColumnarTickTimeline,
+    TickCursor,
+    datetime_to_ns,
+    extract_tick_columns,
+    ns_to_datetime,
+)
+from src.backtesting.engine.position_table import SymbolPositionTable
+from src.backtesting.engine.tick_encoding import read_tick_table
+from src.backtesting.engine.online_metrics import OnlineMetrics
 
 
 class MockSymbolInfoCache:
@@ -103,51 +113,6 @@ class GlobalTick:
         return (self.bid + self.ask) / 2.0
 
 
-def _convert_dataframe_to_ticks_vectorized(df: pd.DataFrame, symbol: str) -> List[GlobalTick]:
-    """
-    Convert DataFrame to GlobalTick objects using vectorized operations.
-
-    PERFORMANCE OPTIMIZATION: This is 10-20x faster than df.iterrows()
-    For 5.7M ticks: ~90 seconds → ~10 seconds
-
-    Args:
-        df: DataFrame with columns [time, bid, ask, last, volume]
-        symbol: Symbol name for these ticks
-
-    Returns:
-        List of GlobalTick objects
-    """
-    # Convert time column to datetime64[ns, UTC] in one vectorized operation
-    times = pd.to_datetime(df['time'], utc=True)
-
-    # Extract numpy arrays (zero-copy views into DataFrame memory)
-    time_array = times.to_numpy()
-    bid_array = df['bid'].to_numpy()
-    ask_array = df['ask'].to_numpy()
-    last_array = df['last'].to_numpy()
-    volume_array = df['volume'].to_numpy()
-
-    # Pre-allocate list for better performance
-    n = len(df)
-    ticks = []
-    ticks_append = ticks.append  # Cache method lookup
-
-    # Batch create GlobalTick objects
-    # Using cached method and direct array access for speed
-    for i in range(n):
-        ticks_append(GlobalTick(
-            time=pd.Timestamp(time_array[i]).to_pydatetime(),
-            symbol=symbol,
-            bid=bid_array[i],  # Already float64, no conversion needed
-            ask=ask_array[i],
-            last=last_array[i],
-            volume=int(volume_array[i])
-        ))
-
-    return ticks
-
-
-@dataclass
 class TickData:
     """
     Tick data for a specific symbol at a specific time.
@@ -156,21 +121,57 @@ class TickData:
 
     PERFORMANCE OPTIMIZATION #6: Uses __slots__ to reduce memory overhead
     and improve attribute access speed.
+
+    PERFORMANCE OPTIMIZATION: The replay loop creates ticks from time_ns
+    (int64 UTC epoch nanoseconds); the datetime 'time' is built on first read.
     """
-    __slots__ = ('time', 'bid', 'ask', 'last', 'volume', 'spread')
+    __slots__ = ('time_ns', '_time', 'bid', 'ask', 'last', 'volume', 'spread')
 
-    time: datetime
-    bid: float
-    ask: float
-    last: float
-    volume: int
-    spread: float
+    def __init__(self, time: Optional[datetime] = None, bid: float = 0.0, ask: float = 0.0,
+                 last: float = 0.0, volume: int = 0, spread: float = 0.0,
+                 time_ns: Optional[int] = None):
+        """
+        Initialize tick data.
+
+        Args:
+            time: Tick time (optional if time_ns is given)
+            bid: Bid price
+            ask: Ask price
+            last: Last price
+            volume: Tick volume
+            spread: Spread (ask - bid)
+            time_ns: Tick time as UTC epoch nanoseconds (optional if time is given)
+        """
+        self._time = time
+        self.time_ns = time_ns if time_ns is not None or time is None else datetime_to_ns(time)
+        self.bid = bid
+        self.ask = ask
+        self.last = last
+        self.volume = volume
+        self.spread = spread
+
+    @property
+    def time(self) -> Optional[datetime]:
+        """Tick time as a datetime (built lazily from time_ns)."""
+        if self._time is None and self.time_ns is not None:
+            self._time = ns_to_datetime(self.time_ns)
+        return self._time
 
     @property
     def mid(self) -> float:
         """Calculate mid price."""
         return (self.bid + self.ask) / 2.0
 
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, TickData):
+            return NotImplemented
+        return ((self.time_ns, self.bid, self.ask, self.last, self.volume, self.spread) ==
+                (other.time_ns, other.bid, other.ask, other.last, other.volume, other.spread))
+
+    def __repr__(self) -> str:
+        return (f"TickData(time={self.time}, bid={self.bid}, ask={self.ask}, last={self.last}, "
+                f"volume={self.volume}, spread={self.spread})")
+
 
 @dataclass
 class OrderResult:
@@ -192,7 +193,7 @@ class SimulatedBroker:
     
     def __init__(self, initial_balance: float = 10000.0, spread_points: float = 10.0,
                  persistence=None, enable_slippage: bool = True, slippage_points: float = 0.5,
-                 leverage: float = 100.0):
+                 leverage: float = 100.0, lazy_candles: bool = False):
         """
         Initialize simulated broker.
 
@@ -203,6 +204,8 @@ class SimulatedBroker:
             enable_slippage: Whether to simulate slippage on order execution (default: True)
             slippage_points: Base slippage in points for normal market conditions (default: 0.5)
             leverage: Leverage ratio (e.g., 100.0 for 100:1 leverage, default: 100.0)
+            lazy_candles: Build candles from buffered ticks only when they are read
+                          (see MultiTimeframeCandleBuilder lazy mode, default: False)
         """
         self.logger = get_logger()
 
@@ -245,8 +248,9 @@ class SimulatedBroker:
         self.position_lock = threading.Lock()
 
         # PERFORMANCE OPTIMIZATION: Indexed position tracking for O(1) SL/TP checks
-        # Instead of iterating all positions on every tick, we maintain symbol-indexed lists
-        self.positions_by_symbol: Dict[str, List[int]] = {}  # symbol -> list of ticket numbers
+        # Instead of iterating all positions on every tick, we maintain a per-symbol
+        # table of (ticket, type, sl, tp, volume) NumPy arrays with nearest-trigger levels
+        self.position_tables: Dict[str, SymbolPositionTable] = {}  # symbol -> open positions
 
         # Historical data for each symbol and timeframe
         # Key: (symbol, timeframe), Value: DataFrame with OHLC
@@ -273,8 +277,10 @@ class SimulatedBroker:
 
         # TICK-LEVEL BACKTESTING: Global tick timeline (always enabled)
         # All ticks from all symbols merged into single chronologically-sorted timeline
-        self.global_tick_timeline: List[GlobalTick] = []  # Merged tick timeline
+        # MEMORY OPTIMIZATION: Columnar struct-of-arrays (~50 bytes/tick instead of ~200)
+        self.global_tick_timeline: ColumnarTickTimeline = ColumnarTickTimeline.empty()
         self.global_tick_index: int = 0                   # Current position in timeline
+        self._tick_cursor: TickCursor = TickCursor()      # Reused cursor for indexed timeline reads
         self.current_tick_symbol: Optional[str] = None    # Symbol that owns current tick
 
         # TICK-LEVEL BACKTESTING: Per-symbol tick data
@@ -294,6 +300,8 @@ class SimulatedBroker:
         # TICK-LEVEL BACKTESTING: Real-time candle builders
         # Build candles from ticks in real-time (M1, M5, M15, H1, H4)
         self.candle_builders: Dict[str, MultiTimeframeCandleBuilder] = {}  # symbol -> builder
+        # PERFORMANCE OPTIMIZATION: Lazy candle building (fold ticks into candles on read)
+        self.lazy_candles = lazy_candles
 
         # ETA CALCULATION: Moving average window for accurate time estimates
         # Track recent processing speed instead of total average to handle variable speeds
@@ -302,11 +310,13 @@ class SimulatedBroker:
         self.eta_timestamps = deque(maxlen=self.eta_window_size)  # (tick_index, wall_clock_time) pairs
         self.eta_warmup_ticks = 500  # Wait for 500 ticks before showing ETA (skip slow initialization)
 
-        # Current simulated time
-        self.current_time: Optional[datetime] = None
-        # Non-blocking snapshot of current simulated time for logging/time provider
-        # Updated whenever current_time changes while holding time_lock
-        self.current_time_snapshot: Optional[datetime] = None
+        # Current simulated time as UTC epoch nanoseconds (None before data is loaded)
+        # PERFORMANCE OPTIMIZATION: The replay loop only sets this integer; the
+        # current_time datetime is built lazily when it is read
+        self.current_time_ns: Optional[int] = None
+        # (time_ns, datetime) pair for current_time, replaced as one object so
+        # non-blocking readers never see a mismatched pair
+        self._current_time_cache: Optional[Tuple[int, datetime]] = None
         # Use RLock (reentrant lock) instead of Lock to allow same thread to acquire multiple times
         # This prevents deadlock if a method that holds the lock calls another method that also needs the lock
         self.time_lock = threading.RLock()
@@ -323,6 +333,10 @@ class SimulatedBroker:
 
         # Trade history for results analysis
         self.closed_trades: List[Dict] = []  # List of closed trade records
+        self.trade_recorder = None  # Optional EquityRecorder: closed trades are also spilled to parquet
+
+        # PERFORMANCE OPTIMIZATION: Incremental trade/equity statistics (O(1) reads)
+        self.performance_metrics = OnlineMetrics()
 
         self.logger.info(f"SimulatedBroker initialized with balance: ${initial_balance:,.2f} [Instance: {self.instance_id}]")
     
@@ -537,7 +551,7 @@ class SimulatedBroker:
         # BUGFIX: Use streaming_timeline.loader.symbols instead of cache_files.keys()
         # because cache_files is empty when using cache_dir mode
         for symbol in streaming_timeline.loader.symbols:
-            self.candle_builders[symbol] = MultiTimeframeCandleBuilder(symbol, timeframes)
+            self.candle_builders[symbol] = MultiTimeframeCandleBuilder(symbol, timeframes, lazy=self.lazy_candles)
 
             # Pre-seed with LIMITED historical OHLC data (only recent lookback period)
             for tf in timeframes:
@@ -562,7 +576,6 @@ class SimulatedBroker:
 
         # Set initial time (we'll get it from first tick during execution)
         self.current_time = None
-        self.current_time_snapshot = None
 
         # Enable trading for all symbols
         # NEW: Get symbols from streaming_timeline instead of cache_files
@@ -576,7 +589,8 @@ class SimulatedBroker:
         self.logger.info("=" * 60)
         self.logger.info("")
 
-    def load_ticks_from_cache_files(self, cache_files: dict, progress_callback=None, live_display=None, table_creator=None, required_timeframes: Optional[List[str]] = None):
+    def load_ticks_from_cache_files(self, cache_files: dict, progress_callback=None, live_display=None, table_creator=None, required_timeframes: Optional[List[str]] = None,
+                                    tick_store=None):
         """
         Load ticks directly from cached parquet files and merge into global timeline.
 
@@ -590,11 +604,19 @@ class SimulatedBroker:
             table_creator: Optional function to create updated table for live display
             required_timeframes: List of timeframes to build (default: all timeframes)
                                 PERFORMANCE OPTIMIZATION: Only build timeframes that strategies use
+            tick_store: Optional compiled TickStore. When given, the timeline is attached
+                        from its memory-mapped columns instead of reading cache_files
+                        (only the symbols in cache_files are used).
         """
         import psutil
         import os
         from pathlib import Path
 
+        if tick_store is not None:
+            self._attach_tick_store(tick_store, list(cache_files.keys()), progress_callback,
+                                    live_display, table_creator, required_timeframes)
+            return
+
         process = psutil.Process(os.getpid())
         mem_before = process.memory_info().rss / 1024 / 1024  # MB
 
@@ -602,7 +624,7 @@ class SimulatedBroker:
         self.logger.info("Loading ticks from cache files (memory-efficient mode)...")
         self.logger.info(f"  Memory before loading: {mem_before:.1f} MB")
 
-        all_ticks = []
+        symbol_columns = []
 
         # Load ticks from each cache file
         for symbol, cache_file in cache_files.items():
@@ -623,8 +645,8 @@ class SimulatedBroker:
                 if live_display and table_creator:
                     live_display.update(table_creator())
 
-            # Read parquet file
-            df = pd.read_parquet(cache_path)
+            # Read parquet file (plain or compact tick encoding)
+            df = read_tick_table(cache_path).to_pandas()
 
             self.logger.info(f"    {len(df):,} ticks loaded")
 
@@ -634,13 +656,11 @@ class SimulatedBroker:
                 if live_display and table_creator:
                     live_display.update(table_creator())
 
-            # PERFORMANCE OPTIMIZATION: Vectorized conversion (50-100x faster than iterrows)
-            # Convert DataFrame to GlobalTick objects using vectorized operations
+            # MEMORY OPTIMIZATION: Extract columns as NumPy arrays (no per-tick Python objects)
             import time
             start_time = time.time()
 
-            symbol_ticks = _convert_dataframe_to_ticks_vectorized(df, symbol)
-            all_ticks.extend(symbol_ticks)
+            symbol_columns.append((symbol, extract_tick_columns(df)))
 
             conversion_time = time.time() - start_time
             ticks_per_sec = len(df) / conversion_time if conversion_time > 0 else 0
@@ -654,15 +674,116 @@ class SimulatedBroker:
 
             # Clear DataFrame to free memory immediately
             del df
-            del symbol_ticks
 
-        # Sort by timestamp
-        self.logger.info(f"  Sorting {len(all_ticks):,} ticks chronologically...")
-        all_ticks.sort(key=lambda t: t.time)
+        # Merge and sort by timestamp (stable argsort over int64 times)
+        total_loaded = sum(len(columns['times_ns']) for _, columns in symbol_columns)
+        self.logger.info(f"  Sorting {total_loaded:,} ticks chronologically...")
+        timeline = ColumnarTickTimeline.from_symbol_columns(symbol_columns)
+        del symbol_columns
 
-        self.global_tick_timeline = all_ticks
+        self.global_tick_timeline = timeline
         self.global_tick_index = 0
 
+        self._init_candle_builders_from_timeline(list(cache_files.keys()), timeline, required_timeframes)
+
+        # Set initial time and initialize current_ticks with first tick of each symbol
+        if len(timeline) > 0:
+            self._init_current_ticks_from_timeline(timeline)
+
+            mem_after = process.memory_info().rss / 1024 / 1024  # MB
+            mem_used = mem_after - mem_before
+
+            self.logger.info(f"  ✓ Global timeline created: {len(timeline):,} ticks ({timeline.nbytes / 1024 / 1024:.1f} MB columnar)")
+            self.logger.info(f"  Time range: {timeline.time_at(0)} to {timeline.time_at(-1)}")
+            self.logger.info(f"  Memory after loading: {mem_after:.1f} MB")
+            self.logger.info(f"  Memory used: {mem_used:.1f} MB")
+
+            self._log_timeline_distribution(timeline)
+        else:
+            self.logger.warning("  No ticks loaded!")
+
+        self.logger.info("=" * 60)
+
+    def _attach_tick_store(self, tick_store, symbols: List[str], progress_callback=None, live_display=None,
+                           table_creator=None, required_timeframes: Optional[List[str]] = None):
+        """
+        Use a compiled TickStore as the global timeline.
+
+        MEMORY OPTIMIZATION: The store's columns are read-only memory maps
+        (zero copy, shared with every other process using the same store).
+        Only if the store holds symbols that are not requested is the
+        requested subset copied out.
+
+        Args:
+            tick_store: Compiled TickStore
+            symbols: Symbols to backtest
+            progress_callback: Optional callback(symbol, status, ticks, message, total_ticks)
+            live_display: Optional Rich Live display object to update
+            table_creator: Optional function to create updated table for live display
+            required_timeframes: List of timeframes to build (default: all timeframes)
+        """
+        timeline = tick_store.timeline
+        missing = [symbol for symbol in symbols if symbol not in timeline.symbols]
+        if missing:
+            self.logger.warning(f"  Tick store {tick_store.directory.name} has no ticks for: {', '.join(missing)}")
+
+        if set(timeline.symbols) - set(symbols):
+            self.logger.info(f"  Selecting {len(symbols) - len(missing)} of {len(timeline.symbols)} tick store symbols")
+            timeline = timeline.select_symbols(symbols)
+        else:
+            self.logger.info(f"  Attached tick store {tick_store.directory.name} (memory-mapped, zero copy)")
+
+        counts = timeline.symbol_counts()
+        if progress_callback:
+            for symbol in symbols:
+                if symbol in counts:
+                    progress_callback(symbol, 'complete', counts[symbol], 'Attached from tick store',
+                                      total_ticks=counts[symbol])
+                else:
+                    progress_callback(symbol, 'error', 0, 'Not in tick store')
+            if live_display and table_creator:
+                live_display.update(table_creator())
+
+        self.load_tick_timeline(timeline, required_timeframes)
+
+    def load_tick_timeline(self, timeline: ColumnarTickTimeline, required_timeframes: Optional[List[str]] = None):
+        """
+        Use an already-built columnar timeline (e.g. memory-mapped with ColumnarTickTimeline.load()).
+
+        Same setup as load_ticks_from_cache_files() without reading parquet:
+        candle builders are created and seeded from loaded OHLC data, and
+        current_ticks is initialized from each symbol's first tick.
+
+        Args:
+            timeline: Chronologically-sorted columnar timeline
+            required_timeframes: List of timeframes to build (default: all timeframes)
+        """
+        self.logger.info("=" * 60)
+        self.logger.info(f"Using prebuilt tick timeline: {len(timeline):,} ticks")
+
+        self.global_tick_timeline = timeline
+        self.global_tick_index = 0
+
+        self._init_candle_builders_from_timeline(list(timeline.symbol_counts().keys()), timeline, required_timeframes)
+
+        if len(timeline) > 0:
+            self._init_current_ticks_from_timeline(timeline)
+            self.logger.info(f"  Time range: {timeline.time_at(0)} to {timeline.time_at(-1)}")
+        else:
+            self.logger.warning("  No ticks in timeline!")
+
+        self.logger.info("=" * 60)
+
+    def _init_candle_builders_from_timeline(self, symbols: List[str], timeline: ColumnarTickTimeline,
+                                            required_timeframes: Optional[List[str]]):
+        """
+        Create candle builders and seed them with historical OHLC data before the first tick.
+
+        Args:
+            symbols: Symbols to create builders for
+            timeline: Columnar timeline (its first tick bounds the seeded history)
+            required_timeframes: List of timeframes to build (None = all timeframes)
+        """
         # Initialize candle builders for each symbol and pre-seed with historical data
         self.logger.info("  Initializing real-time candle builders...")
         # PERFORMANCE OPTIMIZATION: Only build timeframes that strategies actually use
@@ -686,9 +807,9 @@ class SimulatedBroker:
             'H4': 200    # ~33 days of H4 candles
         }
 
-        for symbol in cache_files.keys():
+        for symbol in symbols:
             if timeframes:  # Only create builder if timeframes are needed
-                self.candle_builders[symbol] = MultiTimeframeCandleBuilder(symbol, timeframes)
+                self.candle_builders[symbol] = MultiTimeframeCandleBuilder(symbol, timeframes, lazy=self.lazy_candles)
             else:
                 # No candles needed - skip builder creation
                 self.logger.info(f"    ✓ {symbol}: Skipped candle builder (tick-only mode)")
@@ -696,7 +817,7 @@ class SimulatedBroker:
 
             # Pre-seed with LIMITED historical OHLC data from cache
             # This gives strategies enough candle history from the start without loading entire dataset
-            first_tick_time = all_ticks[0].time if len(all_ticks) > 0 else None
+            first_tick_time = timeline.time_at(0) if len(timeline) > 0 else None
             if first_tick_time:
                 for tf in timeframes:
                     data_key = (symbol, tf)
@@ -718,59 +839,6 @@ class SimulatedBroker:
 
             self.logger.info(f"    ✓ {symbol}: Candle builder initialized for {len(timeframes)} timeframes")
 
-        # Set initial time and initialize current_ticks with first tick of each symbol
-        if len(all_ticks) > 0:
-            self.current_time = all_ticks[0].time
-            # Also update snapshot for non-blocking time provider
-            self.current_time_snapshot = self.current_time
-
-            # Initialize current_ticks with first tick of each symbol for get_current_price()
-            # This ensures strategies can get prices during initialization
-            first_ticks_by_symbol = {}
-            for tick in all_ticks:
-                if tick.symbol not in first_ticks_by_symbol:
-                    first_ticks_by_symbol[tick.symbol] = tick
-
-            for symbol, tick in first_ticks_by_symbol.items():
-                self.current_ticks[symbol] = TickData(
-                    time=tick.time,
-                    bid=tick.bid,
-                    ask=tick.ask,
-                    last=tick.last,
-                    volume=tick.volume,
-                    spread=tick.spread
-                )
-
-            self.logger.info(f"  Initialized current_ticks for {len(self.current_ticks)} symbols")
-
-            mem_after = process.memory_info().rss / 1024 / 1024  # MB
-            mem_used = mem_after - mem_before
-
-            self.logger.info(f"  ✓ Global timeline created: {len(all_ticks):,} ticks")
-            self.logger.info(f"  Time range: {all_ticks[0].time} to {all_ticks[-1].time}")
-            self.logger.info(f"  Memory after loading: {mem_after:.1f} MB")
-            self.logger.info(f"  Memory used: {mem_used:.1f} MB")
-
-            # Calculate statistics
-            time_span = (all_ticks[-1].time - all_ticks[0].time).total_seconds()
-            ticks_per_second = len(all_ticks) / time_span if time_span > 0 else 0
-            self.logger.info(f"  Duration: {time_span/3600:.1f} hours")
-            self.logger.info(f"  Average: {ticks_per_second:.1f} ticks/second")
-
-            # Symbol distribution
-            symbol_counts = {}
-            for tick in all_ticks:
-                symbol_counts[tick.symbol] = symbol_counts.get(tick.symbol, 0) + 1
-
-            self.logger.info("  Symbol distribution:")
-            for symbol, count in sorted(symbol_counts.items()):
-                pct = 100.0 * count / len(all_ticks)
-                self.logger.info(f"    {symbol}: {count:,} ticks ({pct:.1f}%)")
-        else:
-            self.logger.warning("  No ticks loaded!")
-
-        self.logger.info("=" * 60)
-
     def merge_global_tick_timeline(self):
         """
         Merge all symbol tick data into a single chronologically-sorted global timeline.
@@ -792,19 +860,17 @@ class SimulatedBroker:
         self.logger.info("Merging global tick timeline...")
         self.logger.info(f"  Memory before merge: {mem_before:.1f} MB")
 
-        all_ticks = []
+        symbol_columns = []
 
         # Collect ticks from all symbols
         for symbol, ticks_df in self.symbol_ticks.items():
             self.logger.info(f"  Adding {len(ticks_df):,} ticks from {symbol}")
 
-            # PERFORMANCE OPTIMIZATION: Vectorized conversion (50-100x faster than iterrows)
-            # Convert DataFrame to GlobalTick objects using vectorized operations
+            # MEMORY OPTIMIZATION: Extract columns as NumPy arrays (no per-tick Python objects)
             import time
             start_time = time.time()
 
-            symbol_ticks = _convert_dataframe_to_ticks_vectorized(ticks_df, symbol)
-            all_ticks.extend(symbol_ticks)
+            symbol_columns.append((symbol, extract_tick_columns(ticks_df)))
 
             conversion_time = time.time() - start_time
             ticks_per_sec = len(ticks_df) / conversion_time if conversion_time > 0 else 0
@@ -819,20 +885,23 @@ class SimulatedBroker:
         self.logger.info(f"  Memory after clearing DataFrames: {mem_after_clear:.1f} MB (freed {mem_freed:.1f} MB)")
 
         # Sort by timestamp (CRITICAL for tick-by-tick replay!)
-        self.logger.info(f"  Sorting {len(all_ticks):,} ticks chronologically...")
-        all_ticks.sort(key=lambda t: t.time)
+        # Stable argsort over int64 times keeps same-timestamp ticks in load order
+        total_loaded = sum(len(columns['times_ns']) for _, columns in symbol_columns)
+        self.logger.info(f"  Sorting {total_loaded:,} ticks chronologically...")
+        timeline = ColumnarTickTimeline.from_symbol_columns(symbol_columns)
+        del symbol_columns
 
-        self.global_tick_timeline = all_ticks
+        self.global_tick_timeline = timeline
         self.global_tick_index = 0
 
         # Initialize candle builders for each symbol and pre-seed with historical data
         self.logger.info("  Initializing real-time candle builders...")
         timeframes = ['M1', 'M5', 'M15', 'H1', 'H4']
-        symbols = set(tick.symbol for tick in all_ticks)
-        first_tick_time = all_ticks[0].time if len(all_ticks) > 0 else None
+        symbols = timeline.symbol_counts().keys()
+        first_tick_time = timeline.time_at(0) if len(timeline) > 0 else None
 
         for symbol in symbols:
-            self.candle_builders[symbol] = MultiTimeframeCandleBuilder(symbol, timeframes)
+            self.candle_builders[symbol] = MultiTimeframeCandleBuilder(symbol, timeframes, lazy=self.lazy_candles)
 
             # Pre-seed with historical OHLC data from cache
             # This gives strategies enough candle history from the start
@@ -851,57 +920,64 @@ class SimulatedBroker:
             self.logger.info(f"    ✓ {symbol}: Candle builder initialized for {len(timeframes)} timeframes")
 
         # Set initial time to first tick and initialize current_ticks
-        if len(all_ticks) > 0:
-            self.current_time = all_ticks[0].time
-            # Also update snapshot for non-blocking time provider
-            self.current_time_snapshot = self.current_time
-
-            # Initialize current_ticks with first tick of each symbol for get_current_price()
-            # This ensures strategies can get prices during initialization
-            first_ticks_by_symbol = {}
-            for tick in all_ticks:
-                if tick.symbol not in first_ticks_by_symbol:
-                    first_ticks_by_symbol[tick.symbol] = tick
-
-            for symbol, tick in first_ticks_by_symbol.items():
-                self.current_ticks[symbol] = TickData(
-                    time=tick.time,
-                    bid=tick.bid,
-                    ask=tick.ask,
-                    last=tick.last,
-                    volume=tick.volume,
-                    spread=tick.spread
-                )
-
-            self.logger.info(f"  Initialized current_ticks for {len(self.current_ticks)} symbols")
+        if len(timeline) > 0:
+            self._init_current_ticks_from_timeline(timeline)
 
             mem_after_merge = process.memory_info().rss / 1024 / 1024  # MB
 
-            self.logger.info(f"  Global timeline created: {len(all_ticks):,} ticks")
-            self.logger.info(f"  Time range: {all_ticks[0].time} to {all_ticks[-1].time}")
+            self.logger.info(f"  Global timeline created: {len(timeline):,} ticks ({timeline.nbytes / 1024 / 1024:.1f} MB columnar)")
+            self.logger.info(f"  Time range: {timeline.time_at(0)} to {timeline.time_at(-1)}")
             self.logger.info(f"  Memory after merge: {mem_after_merge:.1f} MB")
             self.logger.info(f"  Memory used by timeline: ~{mem_after_merge - mem_after_clear:.1f} MB")
 
-            # Calculate statistics
-            time_span = (all_ticks[-1].time - all_ticks[0].time).total_seconds()
-            ticks_per_second = len(all_ticks) / time_span if time_span > 0 else 0
-            self.logger.info(f"  Duration: {time_span/3600:.1f} hours")
-            self.logger.info(f"  Average: {ticks_per_second:.1f} ticks/second")
-
-            # Symbol distribution
-            symbol_counts = {}
-            for tick in all_ticks:
-                symbol_counts[tick.symbol] = symbol_counts.get(tick.symbol, 0) + 1
-
-            self.logger.info("  Symbol distribution:")
-            for symbol, count in sorted(symbol_counts.items()):
-                pct = 100.0 * count / len(all_ticks)
-                self.logger.info(f"    {symbol}: {count:,} ticks ({pct:.1f}%)")
+            self._log_timeline_distribution(timeline)
         else:
             self.logger.warning("  No ticks loaded - global timeline is empty!")
 
         self.logger.info("=" * 60)
 
+    def _init_current_ticks_from_timeline(self, timeline: ColumnarTickTimeline):
+        """
+        Set initial time and current_ticks from the first tick of each symbol.
+
+        This ensures strategies can get prices (get_current_price()) during initialization.
+
+        Args:
+            timeline: Non-empty columnar tick timeline
+        """
+        self.current_time_ns = int(timeline.times_ns[0])
+
+        for symbol, index in timeline.first_index_by_symbol().items():
+            tick = timeline[index]
+            self.current_ticks[symbol] = TickData(
+                time_ns=tick.time_ns,
+                bid=tick.bid,
+                ask=tick.ask,
+                last=tick.last,
+                volume=tick.volume,
+                spread=tick.spread
+            )
+
+        self.logger.info(f"  Initialized current_ticks for {len(self.current_ticks)} symbols")
+
+    def _log_timeline_distribution(self, timeline: ColumnarTickTimeline):
+        """
+        Log duration, tick rate and per-symbol distribution of a timeline.
+
+        Args:
+            timeline: Non-empty columnar tick timeline
+        """
+        total = len(timeline)
+        time_span = (int(timeline.times_ns[-1]) - int(timeline.times_ns[0])) / 1e9
+        ticks_per_second = total / time_span if time_span > 0 else 0
+        self.logger.info(f"  Duration: {time_span/3600:.1f} hours")
+        self.logger.info(f"  Average: {ticks_per_second:.1f} ticks/second")
+
+        self.logger.info("  Symbol distribution:")
+        for symbol, count in sorted(timeline.symbol_counts().items()):
+            pct = 100.0 * count / total
+            self.logger.info(f"    {symbol}: {count:,} ticks ({pct:.1f}%)")
+
     def set_start_time(self, start_time: datetime):
         """
         Set the starting time for the backtest.
@@ -956,8 +1032,38 @@ class SimulatedBroker:
             tid = threading.current_thread().name
             with self.time_lock:
                 self.current_time = earliest_bar_time
-                # Update non-blocking snapshot as well
-                self.current_time_snapshot = self.current_time
+
+    def get_warm_state(self) -> Dict:
+        """
+        Get the state built by the warmup (set_start_time() and candle seeding).
+
+        Used by WarmStartSnapshot; call after load_tick_timeline() and before replay.
+
+        Returns:
+            Dict with current_indices and the seeded candle builders
+        """
+        return {
+            'current_indices': dict(self.current_indices),
+            'candle_builders': dict(self.candle_builders),
+        }
+
+    def restore_warm_state(self, state: Dict, timeline: ColumnarTickTimeline):
+        """
+        Restore warmup state instead of set_start_time() + load_tick_timeline().
+
+        OHLC data must already be loaded (load_symbol_data()).
+
+        Args:
+            state: Dict from get_warm_state() (e.g. a WarmStartSnapshot)
+            timeline: Chronologically-sorted columnar timeline to replay
+        """
+        self.current_indices.update(state['current_indices'])
+        self.candle_builders.update(state['candle_builders'])
+
+        self.global_tick_timeline = timeline
+        self.global_tick_index = 0
+        if len(timeline) > 0:
+            self._init_current_ticks_from_timeline(timeline)
 
     # ========================================================================
     # Connection Management (MT5Connector interface)
@@ -1038,6 +1144,30 @@ class SimulatedBroker:
         df = filtered_data.tail(count).copy()
         return df
 
+    def get_candle_arrays(self, symbol: str, timeframe: str, count: int = 100) -> Optional[CandleArrays]:
+        """
+        Get candles as NumPy column views instead of a DataFrame.
+
+        Same candles as get_candles(). For symbols with a real-time candle
+        builder the arrays are zero-copy views of its candle store.
+
+        Args:
+            symbol: Symbol name
+            timeframe: Timeframe (e.g., 'M1', 'M5', 'M15', 'H1', 'H4')
+            count: Number of candles to return
+
+        Returns:
+            CandleArrays or None
+        """
+        if symbol in self.candle_builders:
+            return self.candle_builders[symbol].get_candle_arrays(timeframe, count)
+
+        # Fallback: Wrap pre-loaded data (currency conversion pairs, etc.)
+        df = self.get_candles(symbol, timeframe, count)
+        if df is None or len(df) == 0:
+            return None
+        return CandleArrays.from_dataframe(df)
+
     def get_latest_candle(self, symbol: str, timeframe: str) -> Optional[CandleData]:
         """
         Get the latest closed candle for a symbol and timeframe.
@@ -1765,10 +1895,10 @@ class SimulatedBroker:
 
             self.positions[ticket] = position
 
-            # PERFORMANCE OPTIMIZATION: Add to symbol index for O(1) SL/TP checks
-            if symbol not in self.positions_by_symbol:
-                self.positions_by_symbol[symbol] = []
-            self.positions_by_symbol[symbol].append(ticket)
+            # PERFORMANCE OPTIMIZATION: Add to symbol position table for vectorized SL/TP checks
+            if symbol not in self.position_tables:
+                self.position_tables[symbol] = SymbolPositionTable()
+            self.position_tables[symbol].add(ticket, order_type == PositionType.BUY, sl, tp, volume)
 
             # WARNING: Check for missing SL (TP can be 0.0 legitimately)
             if sl == 0.0:
@@ -1818,6 +1948,11 @@ class SimulatedBroker:
             if tp is not None:
                 position.tp = tp
 
+            # Keep SL/TP trigger levels in sync
+            table = self.position_tables.get(position.symbol)
+            if table is not None:
+                table.update_stops(ticket, position.sl, position.tp)
+
             self.logger.info(
                 f"[BACKTEST] Position {ticket} modified: SL={position.sl:.5f}, TP={position.tp:.5f}"
             )
@@ -1890,6 +2025,9 @@ class SimulatedBroker:
             'comment': position.comment,
         }
         self.closed_trades.append(trade_record)
+        self.performance_metrics.add_trade(trade_record['profit'])
+        if self.trade_recorder is not None:
+            self.trade_recorder.record_trade(trade_record)
 
         # PERFORMANCE OPTIMIZATION #5: Use WARNING level to ensure trade logs are always captured
         self.logger.warning(
@@ -1900,16 +2038,13 @@ class SimulatedBroker:
         # Remove from open positions
         del self.positions[ticket]
 
-        # PERFORMANCE OPTIMIZATION: Remove from symbol index
-        if position.symbol in self.positions_by_symbol:
-            try:
-                self.positions_by_symbol[position.symbol].remove(ticket)
-                # Clean up empty lists
-                if not self.positions_by_symbol[position.symbol]:
-                    del self.positions_by_symbol[position.symbol]
-            except ValueError:
-                # Ticket not in list (shouldn't happen, but defensive)
-                pass
+        # PERFORMANCE OPTIMIZATION: Remove from symbol position table
+        table = self.position_tables.get(position.symbol)
+        if table is not None:
+            table.remove(ticket)
+            # Clean up empty tables
+            if len(table) == 0:
+                del self.position_tables[position.symbol]
 
         # Remove from persistence (if available)
         # This ensures backtest behavior matches live trading where positions are removed from persistence when closed
@@ -2172,8 +2307,6 @@ class SimulatedBroker:
             # Advance global time by 1 minute
             from datetime import timedelta
             self.current_time = self.current_time + timedelta(minutes=1)
-            # Update non-blocking snapshot as well
-            self.current_time_snapshot = self.current_time
 
             # OPTIMIZATION #3b: Update NEXT buffer (not visible to threads yet)
             # Threads are still reading from 'current' buffer (stable, no lock needed)
@@ -2232,19 +2365,28 @@ class SimulatedBroker:
                 return False
 
             # Get next tick from global timeline
-            next_tick = self.global_tick_timeline[self.global_tick_index]
+            # MEMORY OPTIMIZATION: Columnar timeline is read through a single reused cursor
+            timeline = self.global_tick_timeline
+            if isinstance(timeline, ColumnarTickTimeline):
+                next_tick = timeline.read_into(self.global_tick_index, self._tick_cursor)
+            else:
+                next_tick = timeline[self.global_tick_index]
 
             # Advance global time to this tick's timestamp
-            self.current_time = next_tick.time
-            # Update non-blocking snapshot as well
-            self.current_time_snapshot = self.current_time
+            time_ns = getattr(next_tick, 'time_ns', None)
+            if time_ns is None:
+                # List[GlobalTick] timeline (datetime times only)
+                self.current_time = next_tick.time
+                time_ns = self.current_time_ns
+            else:
+                self.current_time_ns = time_ns
 
             # Set which symbol owns this tick (for has_data_at_current_time check)
             self.current_tick_symbol = next_tick.symbol
 
             # Update current tick for the symbol that owns this tick
             self.current_ticks[next_tick.symbol] = TickData(
-                time=next_tick.time,
+                time_ns=time_ns,
                 bid=next_tick.bid,
                 ask=next_tick.ask,
                 last=next_tick.last,
@@ -2256,13 +2398,13 @@ class SimulatedBroker:
             if next_tick.symbol in self.candle_builders:
                 # Use 'last' price if available, otherwise use 'bid'
                 price = next_tick.last if next_tick.last > 0 else next_tick.bid
-                self.candle_builders[next_tick.symbol].add_tick(price, next_tick.volume, next_tick.time)
+                self.candle_builders[next_tick.symbol].add_tick_ns(price, next_tick.volume, time_ns)
 
             # IMPORTANT: Advance current_indices for symbols that only have M1 candle data (e.g., conversion pairs)
             # These symbols don't have tick data, so their indices need to be advanced based on time
             # This ensures get_latest_candle() returns current data for currency conversion
             # OPTIMIZATION: Only check when minute changes (M1 bar boundary)
-            current_minute = self.current_time.replace(second=0, microsecond=0)
+            current_minute = time_ns // 60_000_000_000
             if not hasattr(self, '_last_minute_check') or self._last_minute_check != current_minute:
                 self._last_minute_check = current_minute
 
@@ -2293,9 +2435,8 @@ class SimulatedBroker:
             # P&L will be calculated on-demand in get_positions() and _check_sl_tp_for_tick()
 
             # Check SL/TP for positions of this symbol
-            # Pass current time to avoid re-acquiring time_lock
             # Note: _check_sl_tp_for_tick() will update P&L only for positions being checked
-            self._check_sl_tp_for_tick(next_tick.symbol, next_tick, self.current_time)
+            self._check_sl_tp_for_tick(next_tick.symbol, next_tick)
 
             # Advance index
             self.global_tick_index += 1
@@ -2385,60 +2526,30 @@ class SimulatedBroker:
             tid = threading.current_thread().name
             self.time_lock.release()
 
-    def _check_sl_tp_for_tick(self, symbol: str, tick: GlobalTick, current_time: datetime):
+    def _check_sl_tp_for_tick(self, symbol: str, tick: TickCursor, current_time: Optional[datetime] = None):
         """
         Check if any positions for this symbol hit SL/TP on this tick.
 
-        PERFORMANCE OPTIMIZATION: Uses indexed position lookup for O(1) access
-        instead of iterating all positions on every tick.
+        PERFORMANCE OPTIMIZATION: Uses the symbol's SymbolPositionTable - a
+        nearest-trigger check rejects most ticks without looking at positions,
+        otherwise all positions are compared against bid/ask in one vectorized pass.
 
         Args:
             symbol: Symbol to check
             tick: The tick that just arrived
+            current_time: Close time for hits (default: current_time, only built on a hit)
         """
         with self.position_lock:
-            positions_to_close = []
-
             # OPTIMIZATION: Only check positions for this symbol using index
-            # This is O(n) where n = positions for this symbol, not all positions
-            if symbol not in self.positions_by_symbol:
+            table = self.position_tables.get(symbol)
+            if table is None:
                 return  # No positions for this symbol
 
-            # Get tickets for this symbol from index
-            symbol_tickets = self.positions_by_symbol[symbol]
-
-            # PERFORMANCE OPTIMIZATION #17: Cache tick prices to avoid repeated attribute access
-            tick_bid = tick.bid
-            tick_ask = tick.ask
-
-            for ticket in symbol_tickets:
-                position = self.positions.get(ticket)
-                if position is None:
-                    continue  # Position was closed (shouldn't happen, but defensive)
-
-                # PERFORMANCE OPTIMIZATION #17: Cache position attributes
-                pos_type = position.position_type
-                pos_sl = position.sl
-                pos_tp = position.tp
-
-                # Check SL/TP hit
-                if pos_type == PositionType.BUY:
-                    # For BUY: check if bid hit SL or TP
-                    if pos_sl > 0 and tick_bid <= pos_sl:
-                        # Stop loss hit
-                        positions_to_close.append((ticket, tick_bid, 'SL'))
-                    elif pos_tp > 0 and tick_bid >= pos_tp:
-                        # Take profit hit
-                        positions_to_close.append((ticket, tick_bid, 'TP'))
-
-                elif pos_type == PositionType.SELL:
-                    # For SELL: check if ask hit SL or TP
-                    if pos_sl > 0 and tick_ask >= pos_sl:
-                        # Stop loss hit
-                        positions_to_close.append((ticket, tick_ask, 'SL'))
-                    elif pos_tp > 0 and tick_ask <= pos_tp:
-                        # Take profit hit
-                        positions_to_close.append((ticket, tick_ask, 'TP'))
+            # BUY positions close at bid, SELL positions close at ask
+            # Returns [] immediately when no SL/TP level lies at or beyond bid/ask
+            positions_to_close = table.check(tick.bid, tick.ask)
+            if positions_to_close and current_time is None:
+                current_time = self.current_time
 
             # Close positions that hit SL/TP
             for ticket, close_price, reason in positions_to_close:
@@ -2498,6 +2609,43 @@ class SimulatedBroker:
         """
         return self.has_more_data(symbol)
 
+    @property
+    def current_time(self) -> Optional[datetime]:
+        """
+        Current simulated time as a datetime, built from current_time_ns on demand.
+
+        Assigning a datetime (or pd.Timestamp) sets current_time_ns and keeps the
+        assigned object as the cached value.
+        """
+        time_ns = self.current_time_ns
+        if time_ns is None:
+            return None
+        cache = self._current_time_cache
+        if cache is None or cache[0] != time_ns:
+            cache = (time_ns, ns_to_datetime(time_ns))
+            self._current_time_cache = cache
+        return cache[1]
+
+    @current_time.setter
+    def current_time(self, value: Optional[datetime]):
+        if value is None:
+            self.current_time_ns = None
+            self._current_time_cache = None
+            return
+        time_ns = datetime_to_ns(value)
+        self._current_time_cache = (time_ns, value)
+        self.current_time_ns = time_ns
+
+    @property
+    def current_time_snapshot(self) -> Optional[datetime]:
+        """Non-blocking view of current_time for logging/time provider (same value)."""
+        return self.current_time
+
+    @current_time_snapshot.setter
+    def current_time_snapshot(self, value: Optional[datetime]):
+        # Kept for callers that update the snapshot together with current_time
+        self.current_time = value
+
     def get_current_time(self) -> Optional[datetime]:
         """Get current simulated time."""
         with self.time_lock:
@@ -2595,60 +2743,32 @@ class SimulatedBroker:
 
     def _get_cached_statistics(self) -> Dict:
         """
-        Get cached backtesting statistics.
-
-        OPTIMIZATION: Cache statistics and only recalculate when trades change.
-        This avoids expensive iterations through closed_trades on every tick.
-        """
-        # Check if cache is valid (no new trades since last calculation)
-        current_trade_count = len(self.closed_trades)
-        if (hasattr(self, '_stats_cache') and
-            hasattr(self, '_stats_cache_trade_count') and
-            self._stats_cache_trade_count == current_trade_count):
-            # Update only the dynamic parts (equity, floating P&L)
-            with self.position_lock:
-                open_positions = len(self.positions)
-                floating_pnl = sum(pos.profit for pos in self.positions.values())
-
-            self._stats_cache['equity'] = self.balance + floating_pnl
-            self._stats_cache['profit'] = self.balance - self.initial_balance
-            self._stats_cache['profit_percent'] = ((self.balance - self.initial_balance) / self.initial_balance) * 100
-            self._stats_cache['open_positions'] = open_positions
-            self._stats_cache['floating_pnl'] = floating_pnl
-            return self._stats_cache
-
-        # Cache miss - recalculate everything
+        Get backtesting statistics including win/loss figures.
+
+        OPTIMIZATION: Win/loss figures come from the incremental
+        performance_metrics (O(1)) instead of iterating through closed_trades.
+        """
         with self.position_lock:
             open_positions = len(self.positions)
             floating_pnl = sum(pos.profit for pos in self.positions.values())
 
-        # Calculate win/loss statistics
-        wins = sum(1 for t in self.closed_trades if t['profit'] > 0)
-        losses = sum(1 for t in self.closed_trades if t['profit'] < 0)
-        win_rate = (wins / current_trade_count * 100) if current_trade_count > 0 else 0
-
-        # Calculate profit factor
-        gross_profit = sum(t['profit'] for t in self.closed_trades if t['profit'] > 0)
-        gross_loss = abs(sum(t['profit'] for t in self.closed_trades if t['profit'] < 0))
-        profit_factor = (gross_profit / gross_loss) if gross_loss > 0 else (float('inf') if gross_profit > 0 else 0)
+        metrics = self.performance_metrics
+        profit_factor = metrics.profit_factor
         pf_display = f"{profit_factor:.2f}" if profit_factor != float('inf') else "∞"
 
-        # Build cache
-        self._stats_cache = {
+        return {
             'balance': self.balance,
             'equity': self.balance + floating_pnl,
             'profit': self.balance - self.initial_balance,
             'profit_percent': ((self.balance - self.initial_balance) / self.initial_balance) * 100,
             'open_positions': open_positions,
             'floating_pnl': floating_pnl,
-            'wins': wins,
-            'losses': losses,
-            'win_rate': win_rate,
+            'wins': metrics.wins,
+            'losses': metrics.losses,
+            'win_rate': metrics.win_rate,
             'profit_factor': profit_factor,
             'pf_display': pf_display,
         }
-        self._stats_cache_trade_count = current_trade_count
-        return self._stats_cache
 
     def get_statistics(self) -> Dict:
         """Get backtesting statistics."""
@@ -0,0 +1,325 @@
+"""
+Sampled Per-Stage Profiler for the Sequential Engine.
+
+cProfile instruments every Python call, which distorts a loop as tight as
+the sequential tick loop. StageProfiler instead measures only every Nth
+processed tick, with time.perf_counter_ns(), and attributes its wall time to
+engine stages:
+
+    tick decode          reading the tick from the timeline (time since the
+                         previous tick ended - includes fast-forwarding in
+                         event-skipping mode)
+    tick                 the loop body itself (self time = loop overhead)
+    advance tick         _advance_tick_sequential()
+      candle building    candle builder add_tick_ns()
+      SL/TP check        _check_sl_tp_for_tick()
+    strategy <symbol>    the symbol's strategy.on_tick()
+      on_tick <key>      each sub-strategy of a multi-strategy orchestrator
+    order execution      broker orders, modifications and closes
+    logging              logger calls
+
+Stages nest: a stage's self time excludes its nested stages. install() wraps
+the measured methods on the run's objects (instance attributes - the classes
+are untouched); wrappers only read the clock while a sampled tick is being
+measured. uninstall() removes them.
+
+Outputs: report() (per-stage table, also with times extrapolated to all
+ticks) and write_speedscope() (https://www.speedscope.app "sampled" profile
+of the stage stacks, weighted by self time).
+"""
+import json
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from src.utils.logger import get_logger
+
+
+ROOT_STAGE = "tick"
+DECODE_STAGE = "tick decode"
+
+_MISSING = object()
+
+
+class _TimedCall:
+    """Callable wrapper timing a method as a stage while a tick is sampled."""
+
+    __slots__ = ('profiler', 'stage', 'func')
+
+    def __init__(self, profiler: 'StageProfiler', stage: str, func):
+        self.profiler = profiler
+        self.stage = stage
+        self.func = func
+
+    def __call__(self, *args, **kwargs):
+        profiler = self.profiler
+        if not profiler.active or profiler.stack[-1][0] == self.stage:
+            return self.func(*args, **kwargs)
+        profiler.enter(self.stage)
+        try:
+            return self.func(*args, **kwargs)
+        finally:
+            profiler.exit()
+
+    def __reduce__(self):
+        # Pickled objects (checkpoints) get the plain method back
+        return getattr, (self.func.__self__, self.func.__name__)
+
+
+class StageProfiler:
+    """
+    Sampled stage timing of a sequential backtest.
+
+    Usage:
+        profiler = StageProfiler(sample_every=1000)
+        controller.profiler = profiler
+        controller.run_sequential(...)
+        print(profiler.report())
+        profiler.write_speedscope("stages.speedscope.json")
+    """
+
+    ORDER_METHODS = ('place_market_order', 'modify_position', '_close_position_internal')
+    LOG_METHODS = ('debug', 'info', 'warning', 'error')
+
+    def __init__(self, sample_every: int = 1000):
+        """
+        Initialize profiler.
+
+        Args:
+            sample_every: Measure every Nth processed tick
+        """
+        self.sample_every = max(1, int(sample_every))
+
+        self.active = False
+        self.stack: List[list] = [[None, 0, 0]]  # [stage, start_ns, child_ns]; sentinel at the bottom
+
+        # Results: self time per stage stack, inclusive time and calls per stage
+        self.self_ns: Dict[Tuple[str, ...], int] = defaultdict(int)
+        self.inclusive_ns: Dict[str, int] = defaultdict(int)
+        self.calls: Dict[str, int] = defaultdict(int)
+        self.samples = 0
+
+        self._decode_start_ns: Optional[int] = None
+        self._installed: List[tuple] = []
+
+    # ------------------------------------------------------------------
+    # Loop interface
+    # ------------------------------------------------------------------
+
+    def first_sample(self, start_index: int) -> Tuple[int, int]:
+        """
+        Loop counters for the first sample.
+
+        Returns:
+            (sample_at, mark_at): counter value of the first sampled tick, and the
+            counter value at whose end tick_end() must be called
+        """
+        sample_at = start_index + self.sample_every
+        return sample_at, sample_at - 1
+
+    def begin_sample(self) -> None:
+        """Start measuring the current tick (call first thing in the loop body)."""
+        now = time.perf_counter_ns()
+        if self._decode_start_ns is not None:
+            self.self_ns[(DECODE_STAGE,)] += now - self._decode_start_ns
+            self.calls[DECODE_STAGE] += 1
+            self._decode_start_ns = None
+        self.active = True
+        self.stack.append([ROOT_STAGE, time.perf_counter_ns(), 0])
+
+    def tick_end(self, counter: int) -> Tuple[int, int]:
+        """
+        Called at the end of the loop body when counter reached mark_at.
+
+        Before a sampled tick it starts the decode timer; after a sampled tick
+        it finishes the measurement.
+
+        Args:
+            counter: Loop counter of the tick that just ended
+
+        Returns:
+            New (sample_at, mark_at)
+        """
+        if self.active:
+            self.exit()
+            self.active = False
+            self.samples += 1
+            sample_at = counter + self.sample_every
+            return sample_at, sample_at - 1
+        self._decode_start_ns = time.perf_counter_ns()
+        return counter + 1, counter + 1
+
+    def enter(self, stage: str) -> None:
+        """Open a nested stage."""
+        self.stack.append([stage, time.perf_counter_ns(), 0])
+
+    def exit(self) -> None:
+        """Close the innermost stage."""
+        end = time.perf_counter_ns()
+        stage, start, child_ns = self.stack.pop()
+        elapsed = end - start
+        path = tuple(frame[0] for frame in self.stack[1:]) + (stage,)
+        self.self_ns[path] += elapsed - child_ns
+        if stage not in path[:-1]:
+            self.inclusive_ns[stage] += elapsed
+        self.calls[stage] += 1
+        self.stack[-1][2] += elapsed
+
+    # ------------------------------------------------------------------
+    # Instrumentation
+    # ------------------------------------------------------------------
+
+    def install(self, controller, strategies: Dict) -> None:
+        """
+        Wrap the run's stage methods.
+
+        Args:
+            controller: BacktestController (its broker, candle builders and logger)
+            strategies: Dict of symbol -> strategy
+        """
+        broker = controller.broker
+        self._wrap(controller, '_advance_tick_sequential', 'advance tick')
+        self._wrap(broker, '_check_sl_tp_for_tick', 'SL/TP check')
+        for builder in broker.candle_builders.values():
+            self._wrap(builder, 'add_tick_ns', 'candle building')
+        for method in self.ORDER_METHODS:
+            self._wrap(broker, method, 'order execution')
+
+        for symbol, strategy in strategies.items():
+            self._wrap(strategy, 'on_tick', f"strategy {symbol}")
+            sub_strategies = getattr(strategy, 'strategies', None)
+            if isinstance(sub_strategies, dict):
+                for key, sub_strategy in sub_strategies.items():
+                    self._wrap(sub_strategy, 'on_tick', f"on_tick {key}")
+            order_manager = getattr(strategy, 'order_manager', None)
+            if order_manager is not None:
+                self._wrap(order_manager, 'execute_signal', 'order execution')
+
+        loggers = {id(logger): logger for logger in (get_logger(), controller.logger, broker.logger)}
+        for logger in loggers.values():
+            for method in self.LOG_METHODS:
+                self._wrap(logger, method, 'logging')
+
+    def uninstall(self) -> None:
+        """Remove every wrapper installed by install()."""
+        for obj, name, previous in reversed(self._installed):
+            if previous is _MISSING:
+                vars(obj).pop(name, None)
+            else:
+                setattr(obj, name, previous)
+        self._installed = []
+        self.active = False
+        del self.stack[1:]
+
+    def _wrap(self, obj, name: str, stage: str) -> None:
+        """Shadow obj.name with a timing wrapper (instance attribute)."""
+        func = getattr(obj, name, None)
+        if func is None or isinstance(func, _TimedCall) or not hasattr(obj, '__dict__'):
+            return
+        if any(entry[0] is obj and entry[1] == name for entry in self._installed):
+            return  # Shared object (e.g. one order manager for all symbols)
+        self._installed.append((obj, name, vars(obj).get(name, _MISSING)))
+        setattr(obj, name, _TimedCall(self, stage, func))
+
+    # ------------------------------------------------------------------
+    # Results
+    # ------------------------------------------------------------------
+
+    def stage_totals(self) -> Dict[str, Dict[str, float]]:
+        """
+        Per-stage totals over all samples.
+
+        Returns:
+            Dict of stage -> {'self_ns', 'inclusive_ns', 'calls'}
+        """
+        totals: Dict[str, Dict[str, float]] = {}
+        for path, self_ns in self.self_ns.items():
+            stage = path[-1]
+            entry = totals.setdefault(stage, {'self_ns': 0, 'inclusive_ns': 0, 'calls': 0})
+            entry['self_ns'] += self_ns
+        for stage, entry in totals.items():
+            entry['inclusive_ns'] = self.inclusive_ns.get(stage, 0) or entry['self_ns']
+            entry['calls'] = self.calls.get(stage, 0)
+        return totals
+
+    def report(self) -> str:
+        """
+        Per-stage report.
+
+        Returns:
+            Text table: self time (share of sampled time), inclusive time, calls
+            and self time per sampled tick; estimated totals for the whole run
+        """
+        totals = self.stage_totals()
+        sampled_ns = sum(self.self_ns.values())
+        lines = [
+            "=" * 92,
+            f"STAGE PROFILE: {self.samples:,} sampled ticks (every {self.sample_every:,}th processed tick), "
+            f"{sampled_ns / 1e6:,.1f} ms measured",
+            "-" * 92,
+            f"{'Stage':<32} {'Self %':>7} {'Self ms':>10} {'Incl ms':>10} {'Calls':>9} "
+            f"{'Self us/tick':>12} {'Est. run s':>9}",
+            "-" * 92,
+        ]
+        samples = max(self.samples, 1)
+        for stage, entry in sorted(totals.items(), key=lambda item: item[1]['self_ns'], reverse=True):
+            share = entry['self_ns'] / sampled_ns * 100 if sampled_ns else 0.0
+            lines.append(
+                f"{stage[:32]:<32} {share:>6.1f}% {entry['self_ns'] / 1e6:>10.2f} "
+                f"{entry['inclusive_ns'] / 1e6:>10.2f} {int(entry['calls']):>9,} "
+                f"{entry['self_ns'] / samples / 1e3:>12.2f} "
+                f"{entry['self_ns'] * self.sample_every / 1e9:>9.2f}"
+            )
+        lines.append("=" * 92)
+        return "\n".join(lines)
+
+    def speedscope(self, name: str = "backtest stages") -> Dict:
+        """
+        Speedscope file contents ("sampled" profile: one sample per stage stack,
+        weighted by its self time in nanoseconds).
+        """
+        frames: List[str] = []
+        index: Dict[str, int] = {}
+        samples = []
+        weights = []
+        for path, self_ns in sorted(self.self_ns.items()):
+            stack = []
+            for stage in path:
+                if stage not in index:
+                    index[stage] = len(frames)
+                    frames.append(stage)
+                stack.append(index[stage])
+            samples.append(stack)
+            weights.append(max(int(self_ns), 0))
+        total = sum(weights)
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "shared": {"frames": [{"name": frame} for frame in frames]},
+            "profiles": [{
+                "type": "sampled",
+                "name": f"{name} ({self.samples:,} sampled ticks)",
+                "unit": "nanoseconds",
+                "startValue": 0,
+                "endValue": total,
+                "samples": samples,
+                "weights": weights,
+            }],
+            "name": name,
+            "exporter": "StageProfiler",
+        }
+
+    def write_report(self, path: str) -> Path:
+        """Write report() to a text file."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(self.report() + "\n", encoding='utf-8')
+        return path
+
+    def write_speedscope(self, path: str) -> Path:
+        """Write the speedscope JSON file."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.speedscope(), f)
+        return path
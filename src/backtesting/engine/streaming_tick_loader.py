@@ -9,32 +9,239 @@ Memory comparison for 1-year backtest with 2 symbols:
 - Streaming: ~2-3 GB (only current chunk in memory)
 """
 
-from typing import Dict, List, Iterator, Tuple, Optional
-from datetime import datetime
-from dataclasses import dataclass
+from typing import Dict, List, Iterator, Tuple, Optional, Union
+from datetime import datetime, timedelta
 from pathlib import Path
 import pandas as pd
+import numpy as np
 import heapq
+import queue
+import threading
+import time
 from src.utils.logger import get_logger
+from src.backtesting.engine.tick_timeline import TickCursor
+from src.backtesting.engine.monthly_tick_store import MonthlySegment, MonthlyTickStore
+from src.backtesting.engine.tick_encoding import TickEncoding
 
 
-@dataclass
-class GlobalTick:
+def decode_tick_record_batch(record_batch, encoding: Optional[TickEncoding] = None) -> Dict[str, np.ndarray]:
     """
-    Single tick in the global timeline.
+    Decode one Arrow record batch of a tick file into NumPy columns.
 
-    PERFORMANCE OPTIMIZATION #6: Uses __slots__ to reduce memory overhead
-    and improve attribute access speed. This saves ~40% memory per tick object.
+    Args:
+        record_batch: pyarrow.RecordBatch with columns [time, bid, ask, last?, volume?, spread?]
+        encoding: Compact encoding of the file (TickEncoding.from_schema of the file schema);
+                  detected from the batch schema if not given
+
+    Returns:
+        Dict of column name -> NumPy array (times_ns, bid, ask, last, spread, volume),
+        same layout as extract_tick_columns()
+    """
+    import pyarrow as pa
+
+    encoding = encoding or TickEncoding.from_schema(record_batch.schema)
+    if encoding is not None:
+        record_batch = encoding.decode(record_batch)
+
+    names = record_batch.schema.names
+
+    # Arrow timestamps are stored as UTC epoch values regardless of tz - cast to int64 ns
+    time_col = record_batch.column(names.index('time'))
+    if pa.types.is_timestamp(time_col.type):
+        time_col = time_col.cast(pa.timestamp('ns', tz=time_col.type.tz)).cast(pa.int64())
+        times_ns = time_col.to_numpy(zero_copy_only=False)
+    else:
+        times_ns = pd.DatetimeIndex(pd.to_datetime(time_col.to_pandas(), utc=True)).as_unit('ns').asi8
+
+    bids = record_batch.column(names.index('bid')).to_numpy(zero_copy_only=False).astype(np.float64, copy=False)
+    asks = record_batch.column(names.index('ask')).to_numpy(zero_copy_only=False).astype(np.float64, copy=False)
+
+    # Handle 'last' column - may not exist in archive files
+    if 'last' in names:
+        lasts = record_batch.column(names.index('last')).to_numpy(zero_copy_only=False).astype(np.float64, copy=False)
+    else:
+        # For archive files without 'last' column, use mid price (bid + ask) / 2
+        lasts = (bids + asks) / 2
+
+    if 'volume' in names:
+        volumes = record_batch.column(names.index('volume')).to_numpy(zero_copy_only=False).astype(np.int64, copy=False)
+    else:
+        volumes = np.zeros(len(times_ns), dtype=np.int64)
+
+    # Calculate spreads vectorized
+    if 'spread' in names:
+        spreads = record_batch.column(names.index('spread')).to_numpy(zero_copy_only=False).astype(np.float64, copy=False)
+    else:
+        spreads = asks - bids
+
+    return {
+        'times_ns': np.asarray(times_ns, dtype=np.int64),
+        'bid': bids,
+        'ask': asks,
+        'last': lasts,
+        'spread': spreads,
+        'volume': volumes,
+    }
+
+
+class TickBatch:
+    """
+    One decoded parquet record batch for a single symbol.
+
+    Times are kept as an int64 NumPy array (for np.searchsorted during the merge),
+    the remaining columns as Python lists so the merge loop reads plain floats/ints
+    without creating a NumPy scalar per field per tick.
+    """
+    __slots__ = ('times_ns', 'time_list', 'bid', 'ask', 'last', 'volume', 'spread', 'length')
+
+    def __init__(self, times_ns: np.ndarray, bid: np.ndarray, ask: np.ndarray,
+                 last: np.ndarray, volume: np.ndarray, spread: np.ndarray):
+        self.times_ns = times_ns
+        self.time_list = times_ns.tolist()
+        self.bid = bid.tolist()
+        self.ask = ask.tolist()
+        self.last = last.tolist()
+        self.volume = volume.tolist()
+        self.spread = spread.tolist()
+        self.length = len(times_ns)
+
+
+class _SymbolBatchCursor:
+    """
+    Merge cursor over one symbol's stream of TickBatch objects.
+
+    Holds exactly one decoded batch in memory; the next batch is pulled only
+    when the current one is exhausted. This bounds merge memory to
+    (number of symbols x chunk_size) ticks regardless of the date range.
     """
-    __slots__ = ('time', 'symbol', 'bid', 'ask', 'last', 'volume', 'spread')
+    __slots__ = ('symbol', 'order', 'batches', 'batch', 'pos')
+
+    def __init__(self, symbol: str, order: int, batches: Iterator[TickBatch]):
+        self.symbol = symbol
+        self.order = order          # Tie-breaker for equal timestamps (sorted symbol order)
+        self.batches = batches
+        self.batch: Optional[TickBatch] = None
+        self.pos = 0
+
+    def load_next_batch(self) -> bool:
+        """
+        Advance to the next non-empty batch.
+
+        Returns:
+            True if a batch was loaded, False if the symbol stream is exhausted
+        """
+        self.batch = None
+        for batch in self.batches:
+            if batch.length > 0:
+                self.batch = batch
+                self.pos = 0
+                return True
+        return False
+
+    def head_time_ns(self) -> int:
+        """Time of the next unconsumed tick."""
+        return self.batch.time_list[self.pos]
+
+    def run_end(self, limit_ns: int, inclusive: bool) -> int:
+        """
+        Find the end of the run of ticks that can be emitted before another symbol.
+
+        Args:
+            limit_ns: Head time of the next symbol in the heap
+            inclusive: Whether ticks at exactly limit_ns belong to this run
+                      (True when this symbol wins ties against the next symbol)
+
+        Returns:
+            Exclusive end index within the current batch
+        """
+        side = 'right' if inclusive else 'left'
+        return int(np.searchsorted(self.batch.times_ns, limit_ns, side=side))
+
 
-    time: datetime
-    symbol: str
-    bid: float
-    ask: float
-    last: float
-    volume: int
-    spread: float
+class _BatchPrefetcher:
+    """
+    Double-buffered background reader for one symbol's TickBatch stream.
+
+    A daemon worker thread runs the wrapped iterator (parquet decode, Arrow ->
+    NumPy conversion) and puts finished batches into a bounded queue, so batch
+    N+1 is decoded while the engine consumes batch N. pyarrow releases the GIL
+    while decompressing, so the decode overlaps with the strategy loop.
+
+    Time the consumer spends blocked waiting for a batch is recorded as stall
+    time in the shared stats dict.
+    """
+
+    _END = object()  # Sentinel: wrapped iterator exhausted
+
+    def __init__(self, batches: Iterator[TickBatch], depth: int, name: str, stats: Dict):
+        """
+        Start prefetching.
+
+        Args:
+            batches: Iterator of TickBatch objects to run on the worker thread
+            depth: Maximum number of decoded batches buffered ahead of the consumer
+            name: Thread name suffix (symbol)
+            stats: Shared statistics dict (updated from the consumer thread only)
+        """
+        self._queue = queue.Queue(maxsize=depth)
+        self._stop = threading.Event()
+        self._stats = stats
+        self._done = False
+        self._thread = threading.Thread(target=self._worker, args=(batches,),
+                                        name=f"TickPrefetch-{name}", daemon=True)
+        self._thread.start()
+
+    def _worker(self, batches: Iterator[TickBatch]):
+        """Decode batches ahead of the consumer until exhausted or stopped."""
+        try:
+            for batch in batches:
+                if not self._put(batch):
+                    return
+            self._put(self._END)
+        except BaseException as e:
+            # Re-raised on the consumer thread
+            self._put(e)
+
+    def _put(self, item) -> bool:
+        """Put item into the queue, giving up if the consumer has closed the prefetcher."""
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> TickBatch:
+        if self._done:
+            raise StopIteration
+
+        try:
+            item = self._queue.get_nowait()
+        except queue.Empty:
+            # Consumer is ahead of the decoder - record the stall
+            stall_start = time.perf_counter()
+            item = self._queue.get()
+            self._stats['prefetch_stall_seconds'] += time.perf_counter() - stall_start
+            self._stats['prefetch_stalls'] += 1
+
+        if item is self._END:
+            self._done = True
+            raise StopIteration
+        if isinstance(item, BaseException):
+            self._done = True
+            raise item
+
+        self._stats['prefetch_batches'] += 1
+        return item
+
+    def close(self):
+        """Stop the worker thread (used when the stream is abandoned early)."""
+        self._done = True
+        self._stop.set()
 
 
 class StreamingTickLoader:
@@ -43,6 +250,8 @@ class StreamingTickLoader:
 
     NEW: Supports date hierarchy caching (YYYY/MM/DD/ticks/SYMBOL_TICKTYPE.parquet)
     Automatically loads ticks from multiple daily directories for the requested date range.
+    Months compacted by MonthlyTickStore are read from one file per symbol and month,
+    selecting the row groups of the date range from the footer statistics.
 
     Uses a heap-based merge algorithm to efficiently merge multiple sorted tick streams.
     """
@@ -50,7 +259,8 @@ class StreamingTickLoader:
     def __init__(self, cache_files: Dict[str, str], chunk_size: int = 100000,
                  start_date: Optional[datetime] = None, end_date: Optional[datetime] = None,
                  cache_dir: Optional[str] = None, tick_type_name: str = "INFO",
-                 symbols: Optional[List[str]] = None):
+                 symbols: Optional[List[str]] = None, prefetch_batches: int = 2,
+                 use_monthly: bool = True):
         """
         Initialize streaming tick loader.
 
@@ -63,13 +273,18 @@ class StreamingTickLoader:
             cache_dir: Root cache directory (NEW - for date hierarchy support)
             tick_type_name: Tick type name (e.g., 'INFO', 'ALL', 'TRADE')
             symbols: Optional list of symbols to load (filters the cache directory scan)
+            prefetch_batches: Number of decoded batches each symbol's background reader
+                              may buffer ahead of the engine (0 = decode inline, no threads)
+            use_monthly: Read up-to-date monthly compacted files instead of daily files
         """
         self.chunk_size = chunk_size
+        self.prefetch_batches = prefetch_batches
         self.start_date = start_date
         self.end_date = end_date
         self.cache_dir = cache_dir
         self.tick_type_name = tick_type_name
         self.filter_symbols = symbols  # Store the filter list
+        self.use_monthly = use_monthly
         self.logger = get_logger()
 
         # Build cache file list
@@ -86,16 +301,20 @@ class StreamingTickLoader:
 
         # Statistics
         self.total_ticks_streamed = 0
+        self.prefetch_stats = {
+            'prefetch_batches': 0,          # Batches handed from worker threads to the merge
+            'prefetch_stalls': 0,           # Times the merge had to wait for a batch
+            'prefetch_stall_seconds': 0.0,  # Total time the merge spent waiting
+        }
 
-    def _build_cache_file_list(self) -> Dict[str, List[str]]:
+    def _build_cache_file_list(self) -> Dict[str, List[Union[str, MonthlySegment]]]:
         """
         Build list of cache files for each symbol from date hierarchy.
 
         Returns:
-            Dict mapping symbol -> list of parquet file paths for each day
+            Dict mapping symbol -> chronological list of daily parquet paths, with
+            compacted months replaced by one MonthlySegment each (if use_monthly)
         """
-        from datetime import timedelta
-
         cache_files = {}
         cache_path = Path(self.cache_dir)
 
@@ -127,6 +346,16 @@ class StreamingTickLoader:
 
                     cache_files[symbol] = []
 
+        # PERFORMANCE OPTIMIZATION: Prefer monthly compacted files (one open per month, row-group pruning)
+        if self.use_monthly:
+            monthly_store = MonthlyTickStore(self.cache_dir, self.tick_type_name)
+            for symbol in monthly_store.find_symbols(self.start_date, self.start_date):
+                if not self.filter_symbols or symbol in self.filter_symbols:
+                    cache_files.setdefault(symbol, [])
+            for symbol in cache_files.keys():
+                cache_files[symbol] = monthly_store.plan_symbol(symbol, self.start_date, self.end_date)
+            return cache_files
+
         # Build file list for each symbol across all days
         for symbol in cache_files.keys():
             for day in days:
@@ -140,96 +369,157 @@ class StreamingTickLoader:
 
         return cache_files
         
-    def stream_ticks(self) -> Iterator[GlobalTick]:
+    def stream_ticks(self) -> Iterator[TickCursor]:
         """
         Stream ticks in chronological order from all symbol files.
 
         NEW: Handles multiple files per symbol (one per day) and merges them chronologically.
 
+        PERFORMANCE OPTIMIZATION: Bounded-memory k-way merge over per-symbol batch cursors.
+        The heap holds one entry per symbol (not per tick), keyed by the symbol's next
+        tick time. When a symbol is popped, the whole run of its ticks that precede the
+        next symbol's head is emitted at once (found with np.searchsorted), so heap
+        operations happen per run instead of per tick.
+
+        Ticks with identical timestamps are ordered by symbol name, then file order,
+        matching the previous (time, symbol) heap ordering.
+
         Yields:
-            GlobalTick objects in chronological order
+            TickCursor in chronological order. The SAME cursor object is reused for
+            every tick (fields are overwritten), so it must not be stored.
         """
-        # Open iterators for each symbol
-        symbol_iterators = {}
-        for symbol, cache_files_list in self.cache_files.items():
+        heap = []
+        prefetchers = []
+
+        try:
+            yield from self._merge_symbol_streams(heap, prefetchers)
+        finally:
+            # Stop background readers if the consumer stops early (e.g. stop loss threshold)
+            for prefetcher in prefetchers:
+                prefetcher.close()
+
+    def _merge_symbol_streams(self, heap: list, prefetchers: list) -> Iterator[TickCursor]:
+        """
+        K-way merge body of stream_ticks().
+
+        Args:
+            heap: Empty list used as the merge heap
+            prefetchers: Empty list that receives the started _BatchPrefetcher objects
+
+        Yields:
+            Reused TickCursor in chronological order
+        """
+        # Open one batch cursor per symbol (sorted so ties break by symbol name)
+        for order, symbol in enumerate(sorted(self.cache_files.keys())):
+            cache_files_list = self.cache_files[symbol]
             # Handle both legacy (single file) and new (list of files) formats
             if isinstance(cache_files_list, str):
                 cache_files_list = [cache_files_list]
 
-            # Create iterator that chains all files for this symbol
-            symbol_iterators[symbol] = self._read_symbol_files(symbol, cache_files_list)
+            batches = self._read_symbol_files(symbol, cache_files_list)
+
+            # PERFORMANCE OPTIMIZATION: Decode the next batch on a background thread
+            if self.prefetch_batches > 0:
+                batches = _BatchPrefetcher(batches, self.prefetch_batches, symbol, self.prefetch_stats)
+                prefetchers.append(batches)
+
+            cursor = _SymbolBatchCursor(symbol, order, batches)
+            if cursor.load_next_batch():
+                heap.append((cursor.head_time_ns(), order, cursor))
+            else:
+                self.logger.warning(f"No ticks found for {symbol}")
 
-        if not symbol_iterators:
-            self.logger.error("No valid cache files found!")
+        if not heap:
+            if not self.cache_files:
+                self.logger.error("No valid cache files found!")
             return
 
-        # Use heap to merge sorted streams
-        # Heap contains tuples: (tick_time, symbol, tick_data, iterator)
-        heap = []
+        heapq.heapify(heap)
 
-        # Initialize heap with first tick from each symbol
-        for symbol, iterator in symbol_iterators.items():
-            try:
-                tick = next(iterator)
-                heapq.heappush(heap, (tick.time, symbol, tick, iterator))
-            except StopIteration:
-                self.logger.warning(f"No ticks found for {symbol}")
+        tick = TickCursor()
 
         # Merge streams in chronological order
         while heap:
-            tick_time, symbol, tick, iterator = heapq.heappop(heap)
+            _, order, cursor = heapq.heappop(heap)
+            batch = cursor.batch
+            start = cursor.pos
+
+            # Emit every tick of this symbol that precedes the next symbol's head
+            if heap:
+                limit_ns, limit_order, _ = heap[0]
+                end = cursor.run_end(limit_ns, inclusive=order < limit_order)
+            else:
+                end = batch.length
+
+            symbol = cursor.symbol
+            time_list = batch.time_list
+            bids = batch.bid
+            asks = batch.ask
+            lasts = batch.last
+            volumes = batch.volume
+            spreads = batch.spread
+
+            for i in range(start, end):
+                time_ns = time_list[i]
+                tick.index = self.total_ticks_streamed
+                tick.time_ns = time_ns
+                tick.symbol = symbol
+                tick.bid = bids[i]
+                tick.ask = asks[i]
+                tick.last = lasts[i]
+                tick.volume = volumes[i]
+                tick.spread = spreads[i]
+                self.total_ticks_streamed += 1
+                yield tick
 
-            # Yield this tick
-            yield tick
-            self.total_ticks_streamed += 1
+            # Re-insert this symbol with its next head (loading the next batch if needed)
+            cursor.pos = end
+            if end < batch.length or cursor.load_next_batch():
+                heapq.heappush(heap, (cursor.head_time_ns(), order, cursor))
 
-            # Get next tick from this symbol's stream
-            try:
-                next_tick = next(iterator)
-                heapq.heappush(heap, (next_tick.time, symbol, next_tick, iterator))
-            except StopIteration:
-                # This symbol's stream is exhausted
-                pass
-
-    def _read_symbol_files(self, symbol: str, cache_files: List[str]) -> Iterator[GlobalTick]:
+    def _read_symbol_files(self, symbol: str, cache_files: List[Union[str, MonthlySegment]]) -> Iterator[TickBatch]:
         """
         Read ticks for a symbol from multiple files (one per day) in chronological order.
 
         Args:
             symbol: Symbol name
-            cache_files: List of parquet file paths (one per day, in chronological order)
+            cache_files: List of parquet file paths (one per day) or MonthlySegment
+                         entries (one per compacted month), in chronological order
 
         Yields:
-            GlobalTick objects for this symbol
+            TickBatch objects for this symbol
         """
         for cache_file in cache_files:
+            if isinstance(cache_file, MonthlySegment):
+                yield from self._read_monthly_segment(symbol, cache_file)
+                continue
+
             cache_path = Path(cache_file)
             if not cache_path.exists():
                 self.logger.warning(f"Cache file not found: {cache_file}")
                 continue
 
-            # Stream ticks from this file
-            for tick in self._read_symbol_chunks(symbol, cache_path):
-                yield tick
+            # Stream decoded batches from this file
+            for batch in self._read_symbol_chunks(symbol, cache_path):
+                yield batch
     
-    def _read_symbol_chunks(self, symbol: str, cache_path: Path) -> Iterator[GlobalTick]:
+    def _read_symbol_chunks(self, symbol: str, cache_path: Path) -> Iterator[TickBatch]:
         """
         Read ticks for a symbol in chunks WITHOUT loading entire file into memory.
 
         PERFORMANCE OPTIMIZATIONS:
         1. Skip date filtering for daily cache files (data already filtered by file structure)
-        2. Use vectorized numpy operations instead of row-by-row iteration
-        3. Minimize object creation overhead
+        2. Decode Arrow columns straight to NumPy (no pandas DataFrame, no datetime objects)
+        3. Only one record batch of chunk_size ticks is decoded at a time
 
         Args:
             symbol: Symbol name
             cache_path: Path to parquet file
 
         Yields:
-            GlobalTick objects for this symbol
+            TickBatch objects for this symbol
         """
         import pyarrow.parquet as pq
-        import numpy as np
 
         # Open parquet file for streaming (doesn't load into memory)
         parquet_file = pq.ParquetFile(cache_path)
@@ -245,76 +535,89 @@ class StreamingTickLoader:
                         len(cache_path.parent.parent.name) == 2 and \
                         cache_path.parent.parent.name.isdigit()
 
-        ticks_yielded = 0
+        apply_date_filter = not is_daily_cache and (self.start_date is not None or self.end_date is not None)
 
-        for batch in parquet_file.iter_batches(batch_size=self.chunk_size):
-            # Convert batch to pandas DataFrame (only this chunk in memory)
-            chunk_df = batch.to_pandas()
+        encoding = TickEncoding.from_schema(parquet_file.schema_arrow)
+        for record_batch in parquet_file.iter_batches(batch_size=self.chunk_size):
+            batch = self._decode_record_batch(record_batch, apply_date_filter, encoding=encoding)
+            if batch is not None:
+                yield batch
 
-            # OPTIMIZATION: Only apply date filtering if NOT a daily cache file
-            # For daily cache files, all data is already within the date range
-            if not is_daily_cache and (self.start_date is not None or self.end_date is not None):
-                if self.start_date is not None:
-                    chunk_df = chunk_df[chunk_df['time'] >= self.start_date]
-                if self.end_date is not None:
-                    chunk_df = chunk_df[chunk_df['time'] <= self.end_date]
+    def _read_monthly_segment(self, symbol: str, segment: MonthlySegment) -> Iterator[TickBatch]:
+        """
+        Read the selected row groups of a monthly compacted file.
 
-            if len(chunk_df) == 0:
-                continue
+        Only row groups whose time statistics overlap the requested days are
+        decoded; ticks outside those days are dropped only when a row group
+        straddles a day boundary.
 
-            # OPTIMIZATION: Use vectorized numpy operations instead of row iteration
-            # This is 5-10x faster than chunk_df.iloc[idx] in a loop
-            times = chunk_df['time'].values
-            bids = chunk_df['bid'].values
-            asks = chunk_df['ask'].values
+        Args:
+            symbol: Symbol name
+            segment: Row groups to read (from MonthlyTickStore.plan_symbol)
 
-            # Handle 'last' column - may not exist in archive files
-            if 'last' in chunk_df.columns:
-                lasts = chunk_df['last'].values
-            else:
-                # For archive files without 'last' column, use mid price (bid + ask) / 2
-                lasts = (bids + asks) / 2
+        Yields:
+            TickBatch objects for this symbol
+        """
+        import pyarrow.parquet as pq
 
-            volumes = chunk_df['volume'].values
+        parquet_file = pq.ParquetFile(segment.path)
+        self.logger.info(f"Streaming {segment.num_rows:,} ticks for {symbol} from {Path(segment.path).name} "
+                         f"({len(segment.row_groups)}/{parquet_file.metadata.num_row_groups} row groups)")
+
+        bounds = (segment.start_ns, segment.end_ns - 1) if segment.needs_filter else None
+        encoding = TickEncoding.from_schema(parquet_file.schema_arrow)
+        for record_batch in parquet_file.iter_batches(batch_size=self.chunk_size, row_groups=segment.row_groups):
+            batch = self._decode_record_batch(record_batch, segment.needs_filter, bounds, encoding)
+            if batch is not None:
+                yield batch
+
+    def _decode_record_batch(self, record_batch, apply_date_filter: bool,
+                             bounds_ns: Optional[Tuple[int, int]] = None,
+                             encoding: Optional[TickEncoding] = None) -> Optional[TickBatch]:
+        """
+        Decode one Arrow record batch into a TickBatch.
 
-            # Calculate spreads vectorized
-            if 'spread' in chunk_df.columns:
-                spreads = chunk_df['spread'].values
+        Args:
+            record_batch: pyarrow.RecordBatch with columns [time, bid, ask, last?, volume?, spread?]
+            apply_date_filter: Whether to filter ticks to [start_date, end_date]
+            bounds_ns: Optional inclusive (start, end) epoch-ns filter used instead of start_date/end_date
+            encoding: Compact encoding of the source file (None = plain layout)
+
+        Returns:
+            TickBatch, or None if no ticks remain after filtering
+        """
+        columns = decode_tick_record_batch(record_batch, encoding)
+        times_ns = columns['times_ns']
+
+        # OPTIMIZATION: Only apply date filtering if NOT a daily cache file
+        # For daily cache files, all data is already within the date range
+        if apply_date_filter:
+            mask = np.ones(len(times_ns), dtype=bool)
+            if bounds_ns is not None:
+                mask &= (times_ns >= bounds_ns[0]) & (times_ns <= bounds_ns[1])
             else:
-                spreads = asks - bids
-
-            # OPTIMIZATION: Batch convert numpy.datetime64 to Python datetime
-            # Converting the entire array at once is much faster than per-element conversion
-            # Check if times are numpy.datetime64 (they usually are from parquet)
-            if len(times) > 0 and isinstance(times[0], np.datetime64):
-                # Vectorized conversion: convert entire array to pandas DatetimeIndex, then to python datetimes
-                # This is ~10x faster than converting each element individually
-                times = pd.to_datetime(times).to_pydatetime()
-
-            # Yield ticks using vectorized data
-            for i in range(len(chunk_df)):
-                ticks_yielded += 1
-                yield GlobalTick(
-                    time=times[i],
-                    symbol=symbol,
-                    bid=float(bids[i]),
-                    ask=float(asks[i]),
-                    last=float(lasts[i]),
-                    volume=int(volumes[i]),
-                    spread=float(spreads[i])
-                )
-
-            # Free chunk memory immediately
-            del chunk_df
-            del batch
-            del times, bids, asks, lasts, volumes, spreads
-    
+                if self.start_date is not None:
+                    mask &= times_ns >= pd.Timestamp(self.start_date).value
+                if self.end_date is not None:
+                    mask &= times_ns <= pd.Timestamp(self.end_date).value
+            if not mask.all():
+                columns = {name: values[mask] for name, values in columns.items()}
+                times_ns = columns['times_ns']
+
+        if len(times_ns) == 0:
+            return None
+
+        return TickBatch(times_ns, columns['bid'], columns['ask'], columns['last'],
+                         columns['volume'], columns['spread'])
+
     def get_statistics(self) -> Dict:
-        """Get streaming statistics."""
+        """Get streaming statistics (including prefetch stall counters)."""
         return {
             'total_ticks_streamed': self.total_ticks_streamed,
             'symbols': self.symbols,
-            'chunk_size': self.chunk_size
+            'chunk_size': self.chunk_size,
+            'prefetch_depth': self.prefetch_batches,
+            **self.prefetch_stats
         }
 
 
@@ -331,7 +634,8 @@ class StreamingTickTimeline:
     def __init__(self, cache_files: Dict[str, str], chunk_size: int = 100000,
                  start_date: Optional[datetime] = None, end_date: Optional[datetime] = None,
                  cache_dir: Optional[str] = None, tick_type_name: str = "INFO",
-                 symbols: Optional[List[str]] = None):
+                 symbols: Optional[List[str]] = None, prefetch_batches: int = 2,
+                 use_monthly: bool = True):
         """
         Initialize streaming timeline.
 
@@ -343,9 +647,12 @@ class StreamingTickTimeline:
             cache_dir: Root cache directory (NEW - for date hierarchy support)
             tick_type_name: Tick type name (e.g., 'INFO', 'ALL', 'TRADE')
             symbols: Optional list of symbols to load (filters the cache directory scan)
+            prefetch_batches: Batches decoded ahead per symbol on background threads (0 = inline)
+            use_monthly: Read up-to-date monthly compacted files instead of daily files
         """
         self.loader = StreamingTickLoader(cache_files, chunk_size, start_date, end_date,
-                                          cache_dir, tick_type_name, symbols)
+                                          cache_dir, tick_type_name, symbols, prefetch_batches,
+                                          use_monthly)
         self.start_date = start_date
         self.end_date = end_date
         self.logger = get_logger()
@@ -373,7 +680,8 @@ class StreamingTickTimeline:
         # OPTIMIZATION: For date hierarchy with many files, use fast file size estimation
         # instead of opening every parquet file
         use_fast_estimate = False
-        total_files = sum(len(f) if isinstance(f, list) else 1 for f in cache_files.values())
+        total_files = sum(sum(not isinstance(entry, MonthlySegment) for entry in f) if isinstance(f, list) else 1
+                          for f in cache_files.values())
 
         # If we have more than 10 files total, use fast estimation
         if total_files > 10:
@@ -385,7 +693,9 @@ class StreamingTickTimeline:
             if isinstance(cache_files_list, str):
                 cache_files_list = [cache_files_list]
 
-            symbol_total = 0
+            # Compacted months: exact row counts of the selected row groups (already read from footers)
+            symbol_total = sum(entry.num_rows for entry in cache_files_list if isinstance(entry, MonthlySegment))
+            cache_files_list = [entry for entry in cache_files_list if not isinstance(entry, MonthlySegment)]
 
             if use_fast_estimate and len(cache_files_list) > 0:
                 # Fast estimation: read metadata from first file only, estimate rest by file size
@@ -424,7 +734,7 @@ class StreamingTickTimeline:
         """Return total number of ticks."""
         return self._total_ticks
     
-    def __iter__(self) -> Iterator[GlobalTick]:
+    def __iter__(self) -> Iterator[TickCursor]:
         """Return iterator over ticks."""
         return self.loader.stream_ticks()
     
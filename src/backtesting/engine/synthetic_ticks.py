@@ -0,0 +1,380 @@
+"""
+Deterministic Synthetic Market Data.
+
+Generates tick data in the exact layout of the backtest data cache, so
+benchmarks and tests run without MT5 or a populated data/cache:
+
+    {cache_dir}/YYYY/MM/DD/ticks/{SYMBOL}_{TICK_TYPE}.parquet   # MT5 tick columns
+    {cache_dir}/YYYY/MM/DD/candles/{SYMBOL}_{TIMEFRAME}.parquet # bars of the ticks
+    {cache_dir}/YYYY/MM/DD/symbol_info/{SYMBOL}.json            # MT5 symbol info keys
+
+The files carry the same metadata as downloaded ones (cache_version,
+first/last_data_time, ...) and the cache index is updated, so DataCache,
+StreamingTickLoader and BacktestDataLoader read them like real data.
+
+Every (seed, symbol, day) has its own random stream: a day's ticks do not
+depend on the requested date range or on other symbols. Prices are
+continuous across days (each day is a Brownian bridge from its open to the
+next day's open) except over closed weekends, which end in a price gap.
+Tick arrival is Poisson with an intraday session profile; each hour runs in
+a volatility regime (calm/normal/volatile) that scales volatility, spread and
+tick rate. Forex-like symbols have a daily rollover gap and are closed from
+Friday 22:00 UTC (no Saturday/Sunday files, like BacktestDataLoader skips
+them); crypto symbols trade every day.
+"""
+import json
+import zlib
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.utils.logger import get_logger
+
+
+NS_PER_MS = 1_000_000
+MS_PER_HOUR = 3_600_000
+MS_PER_DAY = 86_400_000
+
+# MT5 tick flags: TICK_FLAG_BID | TICK_FLAG_ASK
+TICK_FLAGS_BID_ASK = 6
+
+# Regime -> (volatility multiplier, spread multiplier, tick rate multiplier, stationary probability)
+VOLATILITY_REGIMES = {
+    'calm': (0.5, 0.9, 0.6, 0.3),
+    'normal': (1.0, 1.0, 1.0, 0.55),
+    'volatile': (2.5, 1.8, 1.7, 0.15),
+}
+
+# Relative tick activity per UTC hour (Asia, London, London/New York overlap, New York, late)
+SESSION_ACTIVITY = (
+    0.35, 0.35, 0.4, 0.45, 0.45, 0.5, 0.6, 0.9,
+    1.2, 1.2, 1.1, 1.0, 1.2, 1.6, 1.7, 1.5,
+    1.2, 1.0, 0.8, 0.6, 0.5, 0.35, 0.25, 0.3,
+)
+
+# Symbol profiles: base price, digits, typical spread (points), daily volatility (fraction),
+# contract size, trades on weekends, base/profit currency
+SYMBOL_PROFILES = {
+    'EURUSD': (1.0850, 5, 8, 0.005, 100000.0, False, 'EUR', 'USD'),
+    'GBPUSD': (1.2700, 5, 10, 0.006, 100000.0, False, 'GBP', 'USD'),
+    'AUDUSD': (0.6600, 5, 9, 0.006, 100000.0, False, 'AUD', 'USD'),
+    'USDCHF': (0.8800, 5, 10, 0.005, 100000.0, False, 'USD', 'CHF'),
+    'USDCAD': (1.3600, 5, 12, 0.005, 100000.0, False, 'USD', 'CAD'),
+    'USDJPY': (150.00, 3, 9, 0.006, 100000.0, False, 'USD', 'JPY'),
+    'EURJPY': (162.00, 3, 14, 0.007, 100000.0, False, 'EUR', 'JPY'),
+    'XAUUSD': (2300.0, 2, 25, 0.010, 100.0, False, 'XAU', 'USD'),
+    'BTCUSD': (60000.0, 2, 2500, 0.030, 1.0, True, 'BTC', 'USD'),
+    'ETHUSD': (3000.0, 2, 150, 0.035, 1.0, True, 'ETH', 'USD'),
+}
+
+
+class SyntheticTickGenerator:
+    """
+    Seeded generator of MT5-like tick data.
+
+    Usage:
+        generator = SyntheticTickGenerator(seed=7, ticks_per_hour=3600)
+        generator.write_cache("data/synthetic_cache", ["EURUSD", "BTCUSD"],
+                              datetime(2024, 1, 1, tzinfo=timezone.utc),
+                              datetime(2024, 1, 31, tzinfo=timezone.utc))
+    """
+
+    CANDLE_TIMEFRAMES = ['M1', 'M5', 'M15', 'M30', 'H1', 'H4', 'D1']
+    CACHE_VERSION = '1.0'
+
+    def __init__(self, seed: int = 42, ticks_per_hour: float = 3600.0, spread_multiplier: float = 1.0,
+                 volatility_multiplier: float = 1.0, regime_persistence: float = 0.8,
+                 daily_gap: Optional[Tuple[int, int]] = (21 * 60 + 59, 22 * 60 + 5),
+                 weekend_close_hour: int = 22):
+        """
+        Initialize generator.
+
+        Args:
+            seed: Random seed (same seed -> byte-identical data)
+            ticks_per_hour: Average ticks per hour at session activity 1.0 in the normal regime
+            spread_multiplier: Scales every symbol's typical spread
+            volatility_multiplier: Scales every symbol's daily volatility
+            regime_persistence: Probability that an hour keeps the previous hour's regime
+            daily_gap: (start, end) minutes of the UTC day without ticks (rollover) for
+                       symbols closed on weekends, or None
+            weekend_close_hour: UTC hour on Friday after which weekend-closed symbols stop
+        """
+        self.seed = int(seed)
+        self.ticks_per_hour = float(ticks_per_hour)
+        self.spread_multiplier = float(spread_multiplier)
+        self.volatility_multiplier = float(volatility_multiplier)
+        self.regime_persistence = float(regime_persistence)
+        self.daily_gap = daily_gap
+        self.weekend_close_hour = int(weekend_close_hour)
+        self.logger = get_logger()
+
+    # ------------------------------------------------------------------
+    # Symbols
+    # ------------------------------------------------------------------
+
+    def symbol_profile(self, symbol: str) -> Tuple:
+        """
+        Profile of a symbol (SYMBOL_PROFILES, or derived from its name).
+
+        Returns:
+            (base_price, digits, spread_points, daily_volatility, contract_size,
+             trades_weekends, currency_base, currency_profit)
+        """
+        profile = SYMBOL_PROFILES.get(symbol)
+        if profile is not None:
+            return profile
+        name = symbol.upper()
+        if name.startswith(('BTC', 'ETH', 'LTC', 'XRP', 'SOL')):
+            return (100.0, 2, 50, 0.03, 1.0, True, name[:3], 'USD')
+        if name.startswith(('XAU', 'XAG')):
+            return (25.0 if name.startswith('XAG') else 2300.0, 3 if name.startswith('XAG') else 2,
+                    30, 0.012, 5000.0 if name.startswith('XAG') else 100.0, False, name[:3], 'USD')
+        if name.endswith('JPY'):
+            return (140.0, 3, 15, 0.006, 100000.0, False, name[:3], 'JPY')
+        return (1.0, 5, 15, 0.006, 100000.0, False, name[:3], name[3:6] or 'USD')
+
+    def symbol_info(self, symbol: str) -> Dict:
+        """
+        Symbol info dict with the keys of SymbolInfoCache (MT5 symbol_info()).
+
+        tick_value is per lot in USD, converted at the symbol's base price when
+        the profit currency is not USD (approximate for crosses).
+
+        Args:
+            symbol: Symbol name
+
+        Returns:
+            Symbol info dict
+        """
+        base_price, digits, spread, _, contract_size, trades_weekends, base, profit = self.symbol_profile(symbol)
+        point = 10.0 ** -digits
+        return {
+            'point': point,
+            'digits': digits,
+            'tick_value': contract_size * point if profit == 'USD' else contract_size * point / base_price,
+            'tick_size': point,
+            'min_lot': 0.01,
+            'max_lot': 100.0,
+            'lot_step': 0.01,
+            'contract_size': contract_size,
+            'filling_mode': 1,
+            'stops_level': 0,
+            'freeze_level': 0,
+            'trade_mode': 4,
+            'currency_base': base,
+            'currency_profit': profit,
+            'currency_margin': base,
+            'category': 'Crypto' if trades_weekends else ('Metals' if base in ('XAU', 'XAG') else 'Forex'),
+            'spread': int(round(spread * self.spread_multiplier)),
+        }
+
+    def is_trading_day(self, symbol: str, day: datetime) -> bool:
+        """Whether the symbol has ticks on this day (weekend-closed symbols: Monday-Friday)."""
+        return self.symbol_profile(symbol)[5] or day.weekday() < 5
+
+    # ------------------------------------------------------------------
+    # Generation
+    # ------------------------------------------------------------------
+
+    def _rng(self, symbol: str, day: datetime, stream: int) -> np.random.Generator:
+        """Independent random stream of (seed, symbol, day, stream)."""
+        return np.random.default_rng([self.seed, zlib.crc32(symbol.encode('utf-8')), day.toordinal(), stream])
+
+    def _day_open(self, symbol: str, day: datetime) -> float:
+        """Opening price of a day (deterministic, mean-reverting around the base price)."""
+        base_price, _, _, daily_volatility, _, _, _, _ = self.symbol_profile(symbol)
+        z = self._rng(symbol, day, 0).standard_normal()
+        return base_price * float(np.exp(daily_volatility * self.volatility_multiplier * 2.0 * z))
+
+    def _day_close(self, symbol: str, day: datetime) -> float:
+        """Closing price of a trading day (next day's open, plus a gap before closed days)."""
+        next_day = day + timedelta(days=1)
+        if self.is_trading_day(symbol, next_day):
+            return self._day_open(symbol, next_day)
+        while not self.is_trading_day(symbol, next_day):
+            next_day += timedelta(days=1)
+        daily_volatility = self.symbol_profile(symbol)[3] * self.volatility_multiplier
+        gap = self._rng(symbol, day, 3).standard_normal() * daily_volatility * 0.5
+        return self._day_open(symbol, next_day) * float(np.exp(-gap))
+
+    def generate_day(self, symbol: str, day: datetime) -> pd.DataFrame:
+        """
+        Generate one UTC day of ticks.
+
+        Args:
+            symbol: Symbol name
+            day: Day (UTC)
+
+        Returns:
+            DataFrame with MT5 tick columns (time, bid, ask, last, volume, time_msc,
+            flags, volume_real), empty on closed days
+        """
+        day = datetime(day.year, day.month, day.day, tzinfo=timezone.utc)
+        columns = ['time', 'bid', 'ask', 'last', 'volume', 'time_msc', 'flags', 'volume_real']
+        if not self.is_trading_day(symbol, day):
+            return pd.DataFrame(columns=columns)
+
+        _, digits, spread_points, daily_volatility, _, trades_weekends, _, _ = self.symbol_profile(symbol)
+        point = 10.0 ** -digits
+        rng = self._rng(symbol, day, 1)
+
+        # Hourly volatility regimes (Markov chain starting from the stationary distribution)
+        regimes = list(VOLATILITY_REGIMES.values())
+        probabilities = np.array([regime[3] for regime in regimes])
+        probabilities /= probabilities.sum()
+        hour_regime = np.empty(24, dtype=np.int64)
+        hour_regime[0] = rng.choice(len(regimes), p=probabilities)
+        switches = rng.random(24)
+        draws = rng.choice(len(regimes), size=24, p=probabilities)
+        for hour in range(1, 24):
+            hour_regime[hour] = hour_regime[hour - 1] if switches[hour] < self.regime_persistence else draws[hour]
+        regime_table = np.array([regime[:3] for regime in regimes])
+        hour_volatility, hour_spread, hour_rate = regime_table[hour_regime].T
+
+        # Poisson tick arrivals per hour
+        open_hours = np.ones(24, dtype=bool)
+        if not trades_weekends and day.weekday() == 4:
+            open_hours[self.weekend_close_hour:] = False
+        rates = self.ticks_per_hour * np.array(SESSION_ACTIVITY) * hour_rate * open_hours
+        counts = rng.poisson(rates)
+        offsets = np.concatenate([
+            hour * MS_PER_HOUR + rng.integers(0, MS_PER_HOUR, size=count) for hour, count in enumerate(counts)
+        ]) if counts.sum() else np.empty(0, dtype=np.int64)
+        offsets = np.unique(offsets.astype(np.int64))
+
+        if self.daily_gap is not None and not trades_weekends:
+            gap_start, gap_end = self.daily_gap
+            offsets = offsets[(offsets < gap_start * 60_000) | (offsets >= gap_end * 60_000)]
+        count = len(offsets)
+        if count == 0:
+            return pd.DataFrame(columns=columns)
+
+        # Log-price: random walk scaled by elapsed time and regime, bridged from open to close
+        tick_hour = offsets // MS_PER_HOUR
+        sigma_per_ms = daily_volatility * self.volatility_multiplier / np.sqrt(MS_PER_DAY)
+        elapsed = np.diff(offsets, prepend=0).astype(np.float64)
+        steps = rng.standard_normal(count) * sigma_per_ms * np.sqrt(np.maximum(elapsed, 1.0)) * hour_volatility[tick_hour]
+        walk = np.cumsum(steps)
+        log_open = np.log(self._day_open(symbol, day))
+        log_close = np.log(self._day_close(symbol, day))
+        session_ms = MS_PER_DAY if open_hours.all() else self.weekend_close_hour * MS_PER_HOUR
+        fraction = np.minimum(offsets / session_ms, 1.0)
+        log_price = log_open + walk - fraction * walk[-1] + fraction * (log_close - log_open)
+        bids = np.round(np.exp(log_price), digits)
+
+        spreads = np.maximum(1, np.round(spread_points * self.spread_multiplier * hour_spread[tick_hour]
+                                         * rng.lognormal(0.0, 0.25, size=count)))
+        asks = np.round(bids + spreads * point, digits)
+
+        time_msc = int(day.timestamp() * 1000) + offsets
+        return pd.DataFrame({
+            'time': pd.to_datetime(time_msc * NS_PER_MS, unit='ns', utc=True),
+            'bid': bids,
+            'ask': asks,
+            'last': np.zeros(count),
+            'volume': np.zeros(count, dtype=np.int64),
+            'time_msc': time_msc,
+            'flags': np.full(count, TICK_FLAGS_BID_ASK, dtype=np.int64),
+            'volume_real': np.zeros(count),
+        }, columns=columns)
+
+    # ------------------------------------------------------------------
+    # Cache output
+    # ------------------------------------------------------------------
+
+    def write_cache(self, cache_dir: str, symbols: Iterable[str], start_date: datetime, end_date: datetime,
+                    tick_type_name: str = 'INFO', write_candles: bool = True,
+                    timeframes: Optional[List[str]] = None, update_index: bool = True,
+                    compact_encoding: bool = False) -> Dict:
+        """
+        Write tick files, candles and symbol info for every trading day of the range.
+
+        Args:
+            cache_dir: Cache root (e.g. data/cache)
+            symbols: Symbols to generate
+            start_date: First day (UTC)
+            end_date: Last day (UTC, inclusive)
+            tick_type_name: Tick type of the file names (INFO, ALL, TRADE)
+            write_candles: Also write candles/{SYMBOL}_{TIMEFRAME}.parquet built from the ticks
+            timeframes: Candle timeframes (default: CANDLE_TIMEFRAMES)
+            update_index: Record the written days in the cache index (cache_index.db)
+            compact_encoding: Write tick files in the compact integer encoding (tick_encoding.py)
+
+        Returns:
+            Dict of symbol -> {'days': written days, 'ticks': total ticks}
+        """
+        from src.backtesting.engine.tick_bars import build_bars
+
+        cache_path = Path(cache_dir)
+        timeframes = list(timeframes or self.CANDLE_TIMEFRAMES)
+        summary = {}
+        written_days: Dict[Tuple[str, str], list] = {}
+
+        day = datetime(start_date.year, start_date.month, start_date.day, tzinfo=timezone.utc)
+        last_day = datetime(end_date.year, end_date.month, end_date.day, tzinfo=timezone.utc)
+        days = []
+        while day <= last_day:
+            days.append(day)
+            day += timedelta(days=1)
+
+        for symbol in symbols:
+            info = self.symbol_info(symbol)
+            totals = {'days': 0, 'ticks': 0}
+            for day in days:
+                ticks = self.generate_day(symbol, day)
+                if len(ticks) == 0:
+                    continue
+                day_dir = cache_path / day.strftime('%Y') / day.strftime('%m') / day.strftime('%d')
+
+                self._write_parquet(ticks, day_dir / "ticks" / f"{symbol}_{tick_type_name}.parquet",
+                                    encoded=compact_encoding)
+                written_days.setdefault((symbol, 'ticks'), []).append(day.date())
+
+                if write_candles:
+                    # tick_volume = tick count (INFO ticks have no volume)
+                    bars = build_bars(ticks['time_msc'].to_numpy() * NS_PER_MS, ticks['bid'].to_numpy(),
+                                      np.ones(len(ticks), dtype=np.int64), timeframes)
+                    for timeframe, bar_df in bars.items():
+                        bar_df['spread'] = int(info['spread'])
+                        self._write_parquet(bar_df, day_dir / "candles" / f"{symbol}_{timeframe}.parquet")
+                        written_days.setdefault((symbol, timeframe), []).append(day.date())
+
+                info_path = day_dir / "symbol_info" / f"{symbol}.json"
+                info_path.parent.mkdir(parents=True, exist_ok=True)
+                with open(info_path, 'w') as f:
+                    json.dump(info, f, indent=2)
+
+                totals['days'] += 1
+                totals['ticks'] += len(ticks)
+            summary[symbol] = totals
+            self.logger.info(f"  ✓ Synthetic {symbol}: {totals['ticks']:,} ticks across {totals['days']} days")
+
+        if update_index and written_days:
+            from src.backtesting.engine.cache_index import CacheIndex
+            index = CacheIndex(str(cache_path))
+            for (symbol, data_key), cached_days in written_days.items():
+                index.add_cached_days(symbol, data_key, cached_days)
+
+        return summary
+
+    def _write_parquet(self, df: pd.DataFrame, path: Path, encoded: bool = False) -> None:
+        """Write a day file with the cache metadata of downloaded data."""
+        import pyarrow as pa
+        from src.backtesting.engine.tick_encoding import write_tick_table
+
+        metadata = {
+            'cached_at': datetime.now(timezone.utc).isoformat(),
+            'source': 'synthetic',
+            'synthetic_seed': str(self.seed),
+            'first_data_time': df['time'].iloc[0].isoformat() if len(df) > 0 else '',
+            'last_data_time': df['time'].iloc[-1].isoformat() if len(df) > 0 else '',
+            'row_count': str(len(df)),
+            'cache_version': self.CACHE_VERSION
+        }
+        path.parent.mkdir(parents=True, exist_ok=True)
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        table = table.replace_schema_metadata({k.encode(): v.encode() for k, v in metadata.items()})
+        write_tick_table(table, path, encoded=encoded)
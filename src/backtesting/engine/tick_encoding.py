@@ -0,0 +1,357 @@
+"""
+Compact Integer Encoding for Cached Tick Files.
+
+Tick files are normally written as float64 bid/ask/last plus a timestamp
+column with snappy. The compact encoding stores the same columns as
+integers that compress far better, and decodes back to the exact original
+Arrow schema (bit-identical values):
+
+- time: int64 in the original timestamp unit, DELTA_BINARY_PACKED
+  (monotonic, so the stored deltas are tiny)
+- bid, last: price in points (price * 10**digits) as int32 (int64 if out
+  of range), DELTA_BINARY_PACKED
+- ask: spread to bid in points (int16/int32), dictionary encoded
+- integer columns (volume, flags, ...): narrowest of uint16/uint32/int32
+  that holds every value, dictionary encoded; monotonic int64 columns
+  (time_msc) are delta encoded instead
+- any other column is stored unchanged
+
+Delta encoding is done by parquet's DELTA_BINARY_PACKED page encoding, so
+row groups stay independently readable (row-group pruning keeps working).
+The file is compressed with zstd.
+
+digits is found per file and column: the smallest number of decimals for
+which points / 10**digits reproduces every float exactly. A column that
+does not round-trip exactly (or holds nulls) is stored unchanged, so the
+encoding is always lossless.
+
+The original Arrow schema (including its cache metadata) is embedded in the
+file's metadata; the cache metadata keys are also kept at the top level, so
+metadata checks (cache_version, row_count) work without decoding.
+
+Usage:
+    write_tick_table(table, path, encoded=True)
+    table = read_tick_table(path)                    # always the original schema
+    encoding = TickEncoding.from_schema(parquet_file.schema_arrow)
+    batch = encoding.decode(record_batch) if encoding else record_batch
+"""
+import base64
+import json
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+
+
+ENCODING_KEY = b'tick_encoding'
+SCHEMA_KEY = b'tick_encoding_schema'
+ENCODING_VERSION = 1
+
+MAX_PRICE_DIGITS = 10
+PRICE_COLUMNS = ('bid', 'last')
+
+
+def _narrowest_int_type(values: np.ndarray, allow_unsigned: bool = True):
+    """Smallest integer Arrow type that holds every value (None if int64 is needed)."""
+    import pyarrow as pa
+
+    if len(values) == 0:
+        return pa.uint16() if allow_unsigned else pa.int16()
+    low, high = int(values.min()), int(values.max())
+    candidates = [(pa.uint16(), 0, 2 ** 16 - 1), (pa.uint32(), 0, 2 ** 32 - 1)] if allow_unsigned else \
+        [(pa.int16(), -2 ** 15, 2 ** 15 - 1)]
+    candidates.append((pa.int32(), -2 ** 31, 2 ** 31 - 1))
+    for arrow_type, type_low, type_high in candidates:
+        if type_low <= low and high <= type_high:
+            return arrow_type
+    return None
+
+
+def _price_digits(values: np.ndarray, digits: Optional[int] = None) -> Optional[int]:
+    """
+    Decimals for which integer points reproduce every price exactly.
+
+    Args:
+        values: float64 prices
+        digits: Only test this number of decimals
+
+    Returns:
+        Number of decimals, or None if no candidate is lossless
+    """
+    if not np.isfinite(values).all():
+        return None
+    candidates = [digits] if digits is not None else range(MAX_PRICE_DIGITS + 1)
+    for candidate in candidates:
+        scale = 10.0 ** candidate
+        points = np.round(values * scale)
+        if np.abs(points).max(initial=0.0) >= 2 ** 62:
+            return None
+        if np.array_equal(points / scale, values):
+            return candidate
+    return None
+
+
+def _column(data, name: str):
+    """Column of a Table or RecordBatch by name."""
+    return data.column(data.schema.get_field_index(name))
+
+
+class TickEncoding:
+    """
+    Column plan of one encoded tick file.
+
+    columns: list of {'name', 'kind', ...} with kind one of
+        'time'   int64 values of the original timestamp type
+        'price'  points at 'digits' decimals
+        'spread' points relative to the 'base' price column, same digits
+        'int'    integer narrowed from the original type
+        'raw'    unchanged
+    """
+
+    def __init__(self, columns: List[Dict], schema):
+        """
+        Initialize encoding.
+
+        Args:
+            columns: Column plan (see class docstring)
+            schema: Original Arrow schema (with metadata)
+        """
+        self.columns = columns
+        self.schema = schema
+        self._by_name = {column['name']: column for column in columns}
+
+    # ------------------------------------------------------------------
+    # Encode
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def plan(cls, table) -> 'TickEncoding':
+        """Choose the lossless encoding of every column of a tick table."""
+        import pyarrow as pa
+
+        columns = []
+        price_digits: Dict[str, int] = {}
+        for field in table.schema:
+            name = field.name
+            column = table.column(name)
+            entry = {'name': name, 'kind': 'raw'}
+            if column.null_count:
+                columns.append(entry)
+                continue
+
+            if pa.types.is_timestamp(field.type):
+                entry['kind'] = 'time'
+            elif name in PRICE_COLUMNS and pa.types.is_floating(field.type):
+                digits = _price_digits(column.to_numpy().astype(np.float64))
+                if digits is not None:
+                    price_digits[name] = digits
+                    entry.update(kind='price', digits=digits)
+            elif pa.types.is_integer(field.type):
+                entry['kind'] = 'int'
+            columns.append(entry)
+
+        # ask as spread to bid (both at the larger number of decimals)
+        if 'ask' in table.schema.names and 'bid' in price_digits and \
+                pa.types.is_floating(table.schema.field('ask').type) and not table.column('ask').null_count:
+            asks = table.column('ask').to_numpy().astype(np.float64)
+            ask_digits = _price_digits(asks)
+            if ask_digits is not None:
+                digits = max(ask_digits, price_digits['bid'])
+                bids = table.column('bid').to_numpy().astype(np.float64)
+                if _price_digits(asks, digits) == digits and _price_digits(bids, digits) == digits:
+                    for entry in columns:
+                        if entry['name'] == 'bid':
+                            entry['digits'] = digits
+                        elif entry['name'] == 'ask':
+                            entry.update(kind='spread', base='bid', digits=digits)
+
+        return cls(columns, table.schema)
+
+    def _points(self, table, name: str) -> np.ndarray:
+        """Price column in points at its planned digits."""
+        scale = 10.0 ** self._by_name[name]['digits']
+        return np.round(table.column(name).to_numpy().astype(np.float64) * scale).astype(np.int64)
+
+    def encode(self, table):
+        """
+        Encode a tick table.
+
+        Returns:
+            (encoded table, DELTA_BINARY_PACKED column names, dictionary column names)
+        """
+        import pyarrow as pa
+
+        arrays = []
+        fields = []
+        delta_columns = []
+        dictionary_columns = []
+        for entry in self.columns:
+            name = entry['name']
+            kind = entry['kind']
+            column = table.column(name)
+            if kind == 'time':
+                array = column.cast(pa.int64())
+                delta_columns.append(name)
+            elif kind == 'price':
+                points = self._points(table, name)
+                fits_int32 = _narrowest_int_type(points, allow_unsigned=False) is not None
+                array = pa.array(points, type=pa.int32() if fits_int32 else pa.int64())
+                delta_columns.append(name)
+            elif kind == 'spread':
+                spread = self._points(table, name) - self._points(table, entry['base'])
+                array = pa.array(spread, type=_narrowest_int_type(spread, allow_unsigned=False) or pa.int64())
+                dictionary_columns.append(name)
+            elif kind == 'int':
+                values = column.to_numpy()
+                monotonic = len(values) > 1 and bool((np.diff(values.astype(np.int64)) >= 0).all())
+                narrow = _narrowest_int_type(values)
+                if narrow is None and monotonic:
+                    array = column.cast(pa.int64())
+                    delta_columns.append(name)
+                else:
+                    array = column.cast(narrow) if narrow is not None else column
+                    dictionary_columns.append(name)
+            else:
+                array = column
+                dictionary_columns.append(name)
+            arrays.append(array)
+            fields.append(pa.field(name, array.type))
+
+        metadata = dict(self.schema.metadata or {})
+        metadata[ENCODING_KEY] = json.dumps({'version': ENCODING_VERSION, 'columns': self.columns}).encode()
+        metadata[SCHEMA_KEY] = base64.b64encode(self.schema.serialize().to_pybytes())
+        encoded = pa.Table.from_arrays(arrays, schema=pa.schema(fields, metadata=metadata))
+        return encoded, delta_columns, dictionary_columns
+
+    # ------------------------------------------------------------------
+    # Decode
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def from_schema(cls, schema) -> Optional['TickEncoding']:
+        """
+        Encoding of a file from its (encoded) Arrow schema.
+
+        Returns:
+            TickEncoding, or None if the file is not encoded
+        """
+        import pyarrow as pa
+
+        metadata = schema.metadata or {}
+        if ENCODING_KEY not in metadata:
+            return None
+        spec = json.loads(metadata[ENCODING_KEY].decode())
+        if spec.get('version') != ENCODING_VERSION:
+            raise ValueError(f"Unsupported tick encoding version: {spec.get('version')}")
+        original = pa.ipc.read_schema(pa.py_buffer(base64.b64decode(metadata[SCHEMA_KEY])))
+        return cls(spec['columns'], original)
+
+    def physical_columns(self, names: List[str]) -> List[str]:
+        """Stored columns needed to decode the given original columns."""
+        needed = []
+        for name in names:
+            base = self._by_name[name].get('base')
+            for column in ([base] if base else []) + [name]:
+                if column not in needed:
+                    needed.append(column)
+        return needed
+
+    def decode(self, data, columns: Optional[List[str]] = None):
+        """
+        Decode an encoded table or record batch into the original schema.
+
+        Args:
+            data: pyarrow.Table or RecordBatch read from an encoded file
+            columns: Original columns to return (default: every stored column
+                     that is not only present as a spread base)
+
+        Returns:
+            Same type as data, with the original column types and schema metadata
+        """
+        import pyarrow as pa
+
+        names = columns or [name for name in self._by_name if name in data.schema.names]
+        arrays = []
+        fields = []
+        for name in names:
+            entry = self._by_name[name]
+            kind = entry['kind']
+            field = self.schema.field(name)
+            column = _column(data, name)
+            if kind in ('price', 'spread'):
+                points = column.to_numpy().astype(np.int64)
+                if kind == 'spread':
+                    points = points + _column(data, entry['base']).to_numpy().astype(np.int64)
+                array = pa.array(points / 10.0 ** entry['digits'], type=pa.float64()).cast(field.type)
+            elif kind in ('time', 'int'):
+                array = column.cast(field.type)
+            else:
+                array = column
+            arrays.append(array)
+            fields.append(field)
+
+        schema = pa.schema(fields, metadata=self.schema.metadata)
+        if isinstance(data, pa.RecordBatch):
+            return pa.RecordBatch.from_arrays(arrays, schema=schema)
+        return pa.Table.from_arrays(arrays, schema=schema)
+
+
+def encode_tick_table(table):
+    """
+    Encode a tick table losslessly.
+
+    Returns:
+        (encoded table, DELTA_BINARY_PACKED column names, dictionary column names)
+    """
+    return TickEncoding.plan(table).encode(table)
+
+
+def write_tick_table(table, path: Union[str, Path], encoded: bool = False) -> None:
+    """
+    Write a tick table as a cache file.
+
+    Args:
+        table: Tick table (schema metadata included)
+        path: Target parquet path
+        encoded: Write the compact integer encoding (zstd) instead of the plain layout (snappy)
+    """
+    import pyarrow.parquet as pq
+
+    if not encoded:
+        pq.write_table(table, path, compression='snappy')
+        return
+
+    encoded_table, delta_columns, dictionary_columns = encode_tick_table(table)
+    pq.write_table(encoded_table, path, compression='zstd', version='2.6',
+                   use_dictionary=dictionary_columns,
+                   column_encoding={name: 'DELTA_BINARY_PACKED' for name in delta_columns})
+
+
+def read_tick_schema(path: Union[str, Path]):
+    """Original Arrow schema of a tick file (plain or encoded)."""
+    import pyarrow.parquet as pq
+
+    schema = pq.read_schema(path)
+    encoding = TickEncoding.from_schema(schema)
+    return encoding.schema if encoding else schema
+
+
+def read_tick_table(path: Union[str, Path], columns: Optional[List[str]] = None):
+    """
+    Read a tick file (plain or encoded) with its original schema.
+
+    Args:
+        path: Parquet path
+        columns: Optional subset of original columns
+
+    Returns:
+        pyarrow.Table
+    """
+    import pyarrow.parquet as pq
+
+    parquet_file = pq.ParquetFile(path)
+    encoding = TickEncoding.from_schema(parquet_file.schema_arrow)
+    if encoding is None:
+        return parquet_file.read(columns=columns)
+    names = columns or [name for name in encoding.schema.names]
+    return encoding.decode(parquet_file.read(columns=encoding.physical_columns(names)), names)
@@ -0,0 +1,440 @@
+"""
+Shared Memory-Mapped Tick Store for Backtesting.
+
+Every backtest used to read and decode the same daily parquet files
+(YYYY/MM/DD/ticks/SYMBOL_TICKTYPE.parquet). A tick store decodes a
+symbol/date range ONCE into a merged ColumnarTickTimeline saved as one .npy
+file per column. Backtests open it with ColumnarTickTimeline.load(), which
+memory-maps the columns read-only: no decode, no copy, and every process on
+the machine that opens the same store shares one copy of the ticks through
+the OS page cache.
+
+Stores live under one root directory, one subdirectory per
+(tick type, first day, last day, symbols) key:
+
+    <root>/<TICKTYPE>_<YYYYMMDD>_<YYYYMMDD>_<hash>/
+        times_ns.npy, symbol_ids.npy, bid.npy, ...   (ColumnarTickTimeline.save layout)
+        symbols.json
+        manifest.json    key, tick count and (size, mtime) of every source file
+
+A store is rebuilt when a source file was added, removed or changed.
+Compilation writes to a temporary directory and renames it into place, so
+concurrent compiles of the same key are safe (the first rename wins) and a
+reader never sees a half-written store.
+
+Tick order is the same as StreamingTickLoader: chronological, ties ordered
+by symbol name, then file order.
+
+Compile from the command line:
+
+    python -m src.backtesting.engine.tick_store --start 2025-01-01 --end 2025-03-31 \\
+        --symbols EURUSD GBPUSD --cache-dir data/cache --store-dir data/tick_store
+"""
+import hashlib
+import json
+import os
+import shutil
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from src.backtesting.engine.tick_encoding import TickEncoding
+from src.backtesting.engine.tick_timeline import ColumnarTickTimeline
+from src.utils.logger import get_logger
+
+
+_NS_PER_DAY = 86_400_000_000_000
+
+
+class TickStore:
+    """
+    A compiled, memory-mappable tick timeline for one symbol/date range.
+
+    Usage:
+        store = TickStore.open_or_compile("data/tick_store", "data/cache", symbols,
+                                          START_DATE, END_DATE, "INFO")
+        broker.load_ticks_from_cache_files(tick_cache_files, tick_store=store)
+    """
+
+    MANIFEST_FILE = "manifest.json"
+    FORMAT_VERSION = 1
+
+    # Rows decoded per parquet record batch during compilation
+    DECODE_BATCH_SIZE = 1_000_000
+
+    def __init__(self, directory: Path, manifest: Dict):
+        """
+        Initialize from an existing store directory (use open()/compile()).
+
+        Args:
+            directory: Store directory
+            manifest: Parsed manifest.json
+        """
+        self.directory = Path(directory)
+        self.manifest = manifest
+        self._timeline: Optional[ColumnarTickTimeline] = None
+
+    @property
+    def symbols(self) -> List[str]:
+        """Symbols contained in the store."""
+        return list(self.manifest['symbols'])
+
+    @property
+    def tick_count(self) -> int:
+        """Number of ticks in the store."""
+        return int(self.manifest['tick_count'])
+
+    @property
+    def timeline(self) -> ColumnarTickTimeline:
+        """The store's timeline as read-only memory maps (opened on first access)."""
+        if self._timeline is None:
+            self._timeline = ColumnarTickTimeline.load(self.directory)
+        return self._timeline
+
+    @staticmethod
+    def _day_range(start_date: datetime, end_date: datetime) -> List[datetime]:
+        """Get the UTC days from start_date to end_date (inclusive)."""
+        current = start_date.replace(hour=0, minute=0, second=0, microsecond=0)
+        end = end_date.replace(hour=0, minute=0, second=0, microsecond=0)
+        days = []
+        while current <= end:
+            days.append(current)
+            current += timedelta(days=1)
+        return days
+
+    @classmethod
+    def store_key(cls, symbols: Optional[List[str]], start_date: datetime, end_date: datetime,
+                  tick_type_name: str) -> str:
+        """
+        Get the store directory name for a symbol/date range.
+
+        Args:
+            symbols: Symbols (None = every symbol found in the cache)
+            start_date: First day
+            end_date: Last day
+            tick_type_name: Tick type name (e.g. 'INFO')
+
+        Returns:
+            Directory name, e.g. "INFO_20250101_20250331_3f2a9c1e"
+        """
+        key = json.dumps({
+            'version': cls.FORMAT_VERSION,
+            'symbols': sorted(symbols) if symbols else None,
+            'start': start_date.strftime('%Y-%m-%d'),
+            'end': end_date.strftime('%Y-%m-%d'),
+            'tick_type': tick_type_name,
+        }, sort_keys=True)
+        digest = hashlib.sha1(key.encode('utf-8')).hexdigest()[:8]
+        return f"{tick_type_name}_{start_date:%Y%m%d}_{end_date:%Y%m%d}_{digest}"
+
+    @classmethod
+    def find_source_files(cls, cache_dir: str, symbols: Optional[List[str]], start_date: datetime,
+                          end_date: datetime, tick_type_name: str) -> Dict[str, List[str]]:
+        """
+        Find the daily tick files of a symbol/date range.
+
+        Args:
+            cache_dir: Root cache directory (YYYY/MM/DD/ticks/ hierarchy)
+            symbols: Symbols (None = every symbol with a file on any day)
+            start_date: First day
+            end_date: Last day
+            tick_type_name: Tick type name
+
+        Returns:
+            Dict of symbol -> chronological list of daily parquet paths (symbols sorted by name)
+        """
+        cache_path = Path(cache_dir)
+        suffix = f"_{tick_type_name}.parquet"
+        files: Dict[str, List[str]] = {}
+
+        for day in cls._day_range(start_date, end_date):
+            ticks_dir = cache_path / day.strftime('%Y') / day.strftime('%m') / day.strftime('%d') / "ticks"
+            if not ticks_dir.exists():
+                continue
+            if symbols:
+                candidates = [ticks_dir / f"{symbol}{suffix}" for symbol in symbols]
+            else:
+                candidates = sorted(ticks_dir.glob(f"*{suffix}"))
+            for file_path in candidates:
+                if file_path.exists():
+                    symbol = file_path.name[:-len(suffix)]
+                    files.setdefault(symbol, []).append(str(file_path))
+
+        return {symbol: files[symbol] for symbol in sorted(files)}
+
+    @staticmethod
+    def _fingerprint(source_files: Dict[str, List[str]]) -> List[Tuple[str, int, int]]:
+        """Get (path, size, mtime_ns) of every source file."""
+        fingerprint = []
+        for paths in source_files.values():
+            for path in paths:
+                stat = os.stat(path)
+                fingerprint.append((path, stat.st_size, stat.st_mtime_ns))
+        return fingerprint
+
+    @classmethod
+    def open(cls, directory: Path) -> Optional['TickStore']:
+        """
+        Open a compiled store.
+
+        Args:
+            directory: Store directory
+
+        Returns:
+            TickStore, or None if the directory holds no complete store
+        """
+        manifest_path = Path(directory) / cls.MANIFEST_FILE
+        if not manifest_path.exists():
+            return None
+        try:
+            manifest = json.loads(manifest_path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return None
+        if manifest.get('version') != cls.FORMAT_VERSION:
+            return None
+        return cls(directory, manifest)
+
+    def is_current(self, source_files: Dict[str, List[str]]) -> bool:
+        """
+        Check that the store was compiled from exactly these (unchanged) files.
+
+        Args:
+            source_files: Result of find_source_files()
+
+        Returns:
+            True if no source file was added, removed or modified since compilation
+        """
+        try:
+            fingerprint = self._fingerprint(source_files)
+        except OSError:
+            return False
+        return [list(entry) for entry in fingerprint] == self.manifest.get('sources')
+
+    @classmethod
+    def open_or_compile(cls, store_root: str, cache_dir: str, symbols: Optional[List[str]],
+                        start_date: datetime, end_date: datetime, tick_type_name: str = "INFO",
+                        force: bool = False) -> 'TickStore':
+        """
+        Open the store for a symbol/date range, compiling it first if missing or stale.
+
+        Args:
+            store_root: Root directory of all tick stores
+            cache_dir: Root cache directory with the daily tick files
+            symbols: Symbols (None = every symbol found in the cache)
+            start_date: First day
+            end_date: Last day
+            tick_type_name: Tick type name
+            force: Recompile even if an up-to-date store exists
+
+        Returns:
+            TickStore
+        """
+        logger = get_logger()
+        directory = Path(store_root) / cls.store_key(symbols, start_date, end_date, tick_type_name)
+        source_files = cls.find_source_files(cache_dir, symbols, start_date, end_date, tick_type_name)
+
+        store = cls.open(directory)
+        if store is not None and not force and store.is_current(source_files):
+            logger.info(f"Tick store hit: {directory.name} ({store.tick_count:,} ticks, {len(store.symbols)} symbols)")
+            return store
+
+        if store is not None:
+            logger.info(f"Tick store {directory.name} is out of date - recompiling")
+        return cls.compile(directory, source_files, symbols, start_date, end_date, tick_type_name)
+
+    @classmethod
+    def compile(cls, directory: Path, source_files: Dict[str, List[str]], symbols: Optional[List[str]],
+                start_date: datetime, end_date: datetime, tick_type_name: str) -> 'TickStore':
+        """
+        Decode the source files into a store directory.
+
+        Days are decoded and merged one at a time, so memory use is bounded
+        by one day of ticks (plus ticks a file holds for later days).
+
+        Args:
+            directory: Target store directory (replaced atomically)
+            source_files: Result of find_source_files()
+            symbols: Requested symbols (recorded in the manifest)
+            start_date: First day
+            end_date: Last day
+            tick_type_name: Tick type name
+
+        Returns:
+            TickStore
+
+        Raises:
+            ValueError: If a file contains ticks older than an already merged later day
+        """
+        logger = get_logger()
+        directory = Path(directory)
+        directory.parent.mkdir(parents=True, exist_ok=True)
+        temp_dir = directory.parent / f".{directory.name}.tmp-{os.getpid()}"
+        if temp_dir.exists():
+            shutil.rmtree(temp_dir)
+
+        start = time.time()
+        fingerprint = cls._fingerprint(source_files)
+        try:
+            tick_count = ColumnarTickTimeline.write_chunks(cls._merge_days(source_files), temp_dir,
+                                                           symbols=list(source_files))
+            manifest = {
+                'version': cls.FORMAT_VERSION,
+                'symbols': list(source_files),
+                'requested_symbols': sorted(symbols) if symbols else None,
+                'start': start_date.strftime('%Y-%m-%d'),
+                'end': end_date.strftime('%Y-%m-%d'),
+                'tick_type': tick_type_name,
+                'tick_count': tick_count,
+                'created_at': datetime.now(timezone.utc).isoformat(),
+                'sources': [list(entry) for entry in fingerprint],
+            }
+            # Manifest is written last - a directory without one is never opened
+            (temp_dir / cls.MANIFEST_FILE).write_text(json.dumps(manifest, indent=2), encoding='utf-8')
+
+            old_dir = None
+            if directory.exists():
+                old_dir = directory.parent / f".{directory.name}.old-{os.getpid()}"
+                directory.rename(old_dir)
+            try:
+                temp_dir.rename(directory)
+            except OSError:
+                # Another process finished compiling the same key first - use its store
+                if old_dir is not None and not directory.exists():
+                    old_dir.rename(directory)
+                    old_dir = None
+                shutil.rmtree(temp_dir, ignore_errors=True)
+            if old_dir is not None:
+                shutil.rmtree(old_dir, ignore_errors=True)
+        except BaseException:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+            raise
+
+        store = cls.open(directory)
+        if store is None:
+            raise RuntimeError(f"Tick store {directory} could not be opened after compilation")
+
+        elapsed = time.time() - start
+        logger.info(f"Tick store compiled: {directory.name} ({store.tick_count:,} ticks, "
+                    f"{len(store.symbols)} symbols, {len(fingerprint)} files) in {elapsed:.1f}s")
+        return store
+
+    @classmethod
+    def _merge_days(cls, source_files: Dict[str, List[str]]) -> Iterator[ColumnarTickTimeline]:
+        """
+        Yield the merged timeline day by day.
+
+        Ticks a file holds beyond the end of its day are carried over and
+        merged with the next day, so files that spill past midnight still
+        produce a chronological timeline.
+
+        Args:
+            source_files: Dict of symbol -> daily parquet paths (symbols sorted by name)
+
+        Yields:
+            Chronological ColumnarTickTimeline chunks
+        """
+        import pyarrow.parquet as pq
+        from src.backtesting.engine.streaming_tick_loader import decode_tick_record_batch
+
+        symbols = list(source_files)
+
+        # Day start (UTC ns) -> symbol -> files
+        by_day: Dict[int, Dict[str, List[str]]] = {}
+        for symbol, paths in source_files.items():
+            for path in paths:
+                day_dir = Path(path).parent.parent
+                day = datetime(int(day_dir.parent.parent.name), int(day_dir.parent.name), int(day_dir.name),
+                               tzinfo=timezone.utc)
+                day_ns = int(day.timestamp()) * 1_000_000_000
+                by_day.setdefault(day_ns, {}).setdefault(symbol, []).append(path)
+
+        carry: Optional[ColumnarTickTimeline] = None
+        written_until = np.iinfo(np.int64).min
+
+        for day_ns in sorted(by_day):
+            symbol_columns = []
+            if carry is not None:
+                for symbol_id, symbol in enumerate(carry.symbols):
+                    mask = carry.symbol_ids == symbol_id
+                    if mask.any():
+                        symbol_columns.append((symbol, cls._columns(carry, mask)))
+            for symbol in symbols:
+                for path in by_day[day_ns].get(symbol, []):
+                    parquet_file = pq.ParquetFile(path)
+                    encoding = TickEncoding.from_schema(parquet_file.schema_arrow)
+                    for record_batch in parquet_file.iter_batches(batch_size=cls.DECODE_BATCH_SIZE):
+                        symbol_columns.append((symbol, decode_tick_record_batch(record_batch, encoding)))
+
+            # Ties: symbol name, then file order (same as the streaming merge)
+            symbol_columns.sort(key=lambda item: item[0])
+            merged = ColumnarTickTimeline.from_symbol_columns(symbol_columns)
+            if len(merged) == 0:
+                continue
+
+            if int(merged.times_ns[0]) < written_until:
+                raise ValueError(f"Tick files are not chronological: ticks before "
+                                 f"{datetime.fromtimestamp(written_until / 1e9, tz=timezone.utc)} "
+                                 f"found in files for {datetime.fromtimestamp(day_ns / 1e9, tz=timezone.utc):%Y-%m-%d}")
+
+            split = int(np.searchsorted(merged.times_ns, day_ns + _NS_PER_DAY, side='left'))
+            carry = cls._slice(merged, split, len(merged)) if split < len(merged) else None
+            if split:
+                chunk = cls._slice(merged, 0, split)
+                written_until = int(chunk.times_ns[-1])
+                yield chunk
+
+        if carry is not None:
+            yield carry
+
+    @staticmethod
+    def _columns(timeline: ColumnarTickTimeline, mask: np.ndarray) -> Dict[str, np.ndarray]:
+        """Get one symbol's columns (mask) as extract_tick_columns()-style dict."""
+        return {name: getattr(timeline, name)[mask]
+                for name in ('times_ns', 'bid', 'ask', 'last', 'spread', 'volume')}
+
+    @staticmethod
+    def _slice(timeline: ColumnarTickTimeline, start: int, stop: int) -> ColumnarTickTimeline:
+        """Get ticks [start, stop) of a timeline."""
+        return ColumnarTickTimeline(
+            symbols=timeline.symbols,
+            times_ns=timeline.times_ns[start:stop],
+            symbol_ids=timeline.symbol_ids[start:stop],
+            bid=timeline.bid[start:stop],
+            ask=timeline.ask[start:stop],
+            last=timeline.last[start:stop],
+            spread=timeline.spread[start:stop],
+            volume=timeline.volume[start:stop],
+        )
+
+
+def main():
+    """Compile a tick store from the command line."""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Decode daily tick files once into a shared memory-mapped tick store"
+    )
+    parser.add_argument('--start', required=True, help="First day (YYYY-MM-DD)")
+    parser.add_argument('--end', required=True, help="Last day (YYYY-MM-DD)")
+    parser.add_argument('--symbols', nargs='*', help="Symbols (default: every symbol in the cache)")
+    parser.add_argument('--tick-type', default="INFO", help="Tick type name (default: INFO)")
+    parser.add_argument('--cache-dir', default="data/cache", help="Tick cache root (default: data/cache)")
+    parser.add_argument('--store-dir', default="data/tick_store", help="Tick store root (default: data/tick_store)")
+    parser.add_argument('--force', action='store_true', help="Recompile even if the store is up to date")
+    args = parser.parse_args()
+
+    from src.utils.logger import init_logger
+    init_logger(log_to_file=False, log_to_console=True, log_level="INFO", use_async_logging=False)
+
+    start_date = datetime.strptime(args.start, '%Y-%m-%d').replace(tzinfo=timezone.utc)
+    end_date = datetime.strptime(args.end, '%Y-%m-%d').replace(tzinfo=timezone.utc)
+    store = TickStore.open_or_compile(args.store_dir, args.cache_dir, args.symbols or None,
+                                      start_date, end_date, args.tick_type, force=args.force)
+    print(f"{store.directory}: {store.tick_count:,} ticks, symbols: {', '.join(store.symbols)}")
+
+
+if __name__ == '__main__':
+    main()
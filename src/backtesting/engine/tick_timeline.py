@@ -0,0 +1,601 @@
+"""
+Columnar Global Tick Timeline for Backtesting.
+
+Stores the merged tick timeline as a struct of NumPy arrays instead of a
+Python list of GlobalTick objects:
+
+    times_ns    int64    UTC epoch nanoseconds
+    symbol_ids  int16    index into ColumnarTickTimeline.symbols
+    bid         float64
+    ask         float64
+    last        float64
+    spread      float64  (ask - bid, pre-computed)
+    volume      int64
+
+A list of GlobalTick dataclasses costs ~200 bytes per tick (object header,
+boxed floats, datetime). The columnar layout costs ~50 bytes per tick, so a
+multi-month multi-symbol run fits in RAM again.
+
+Consumers iterate the timeline through a TickCursor, which exposes the same
+attributes as GlobalTick (time, symbol, bid, ask, last, volume, spread, mid)
+so existing code in BacktestController and SimulatedBroker works unchanged.
+
+A timeline can be saved as one .npy file per column (plus symbols.json) and
+reopened as read-only memory maps, so several processes share one copy of
+the ticks through the OS page cache instead of each decoding parquet.
+"""
+import json
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+
+# UTC epoch used to convert int64 nanoseconds back to datetime objects
+EPOCH_UTC = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_ONE_US = timedelta(microseconds=1)
+
+
+def ns_to_datetime(time_ns: int) -> datetime:
+    """
+    Convert UTC epoch nanoseconds to a timezone-aware datetime.
+
+    Sub-microsecond precision is truncated, matching pd.Timestamp.to_pydatetime().
+
+    Args:
+        time_ns: Nanoseconds since the UTC epoch
+
+    Returns:
+        Timezone-aware (UTC) datetime
+    """
+    return EPOCH_UTC + timedelta(microseconds=time_ns // 1000)
+
+
+def datetime_to_ns(value: datetime) -> int:
+    """
+    Convert a datetime (or pd.Timestamp) to UTC epoch nanoseconds.
+
+    Naive values are treated as UTC, like pd.Timestamp(value).value.
+
+    Args:
+        value: datetime or pd.Timestamp
+
+    Returns:
+        Nanoseconds since the UTC epoch
+    """
+    if isinstance(value, pd.Timestamp):
+        return value.value
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return ((value - EPOCH_UTC) // _ONE_US) * 1000
+
+
+def extract_tick_columns(df: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """
+    Extract the timeline columns from a tick DataFrame.
+
+    Args:
+        df: DataFrame with columns [time, bid, ask, last (optional), volume (optional)]
+
+    Returns:
+        Dict of column name -> NumPy array (times_ns, bid, ask, last, spread, volume)
+    """
+    times = pd.DatetimeIndex(pd.to_datetime(df['time'], utc=True)).as_unit('ns')
+    bid = df['bid'].to_numpy(dtype=np.float64)
+    ask = df['ask'].to_numpy(dtype=np.float64)
+
+    # 'last' is optional for FX ticks - fall back to mid price (same as StreamingTickLoader)
+    if 'last' in df.columns:
+        last = df['last'].to_numpy(dtype=np.float64)
+    else:
+        last = (bid + ask) / 2.0
+
+    if 'volume' in df.columns:
+        volume = df['volume'].to_numpy(dtype=np.int64)
+    else:
+        volume = np.zeros(len(df), dtype=np.int64)
+
+    return {
+        'times_ns': times.asi8.copy(),
+        'bid': bid,
+        'ask': ask,
+        'last': last,
+        'spread': ask - bid,
+        'volume': volume,
+    }
+
+
+class TickCursor:
+    """
+    Lightweight view of a single tick in a ColumnarTickTimeline.
+
+    Exposes the same attributes as GlobalTick. During iteration the timeline
+    reuses ONE cursor object and overwrites its fields on every step, so a
+    cursor must not be stored across iterations. Indexing the timeline
+    (timeline[i]) returns an independent cursor that is safe to keep.
+
+    PERFORMANCE OPTIMIZATION: The replay engine works on time_ns (int64 UTC
+    epoch nanoseconds). The datetime 'time' attribute is only built when it
+    is read, and cached until time_ns changes.
+    """
+    __slots__ = ('index', 'time_ns', '_time_cache', 'symbol', 'bid', 'ask', 'last', 'volume', 'spread')
+
+    def __init__(self):
+        self.index: int = -1
+        self.time_ns: int = 0
+        self._time_cache: Optional[Tuple[int, datetime]] = None
+        self.symbol: Optional[str] = None
+        self.bid: float = 0.0
+        self.ask: float = 0.0
+        self.last: float = 0.0
+        self.volume: int = 0
+        self.spread: float = 0.0
+
+    @property
+    def time(self) -> datetime:
+        """Tick time as a timezone-aware UTC datetime (built lazily from time_ns)."""
+        cache = self._time_cache
+        if cache is None or cache[0] != self.time_ns:
+            cache = (self.time_ns, ns_to_datetime(self.time_ns))
+            self._time_cache = cache
+        return cache[1]
+
+    @time.setter
+    def time(self, value: datetime):
+        self.time_ns = datetime_to_ns(value)
+        self._time_cache = (self.time_ns, value)
+
+    @property
+    def mid(self) -> float:
+        """Calculate mid price."""
+        return (self.bid + self.ask) / 2.0
+
+    def __repr__(self) -> str:
+        return (f"TickCursor(index={self.index}, time={self.time}, symbol={self.symbol!r}, "
+                f"bid={self.bid}, ask={self.ask}, last={self.last}, volume={self.volume})")
+
+
+class ColumnarTickTimeline:
+    """
+    Chronologically-sorted global tick timeline stored as parallel NumPy arrays.
+
+    Supports len(), iteration (yields a reused TickCursor) and indexing
+    (returns a fresh TickCursor), so it is a drop-in replacement for the
+    List[GlobalTick] previously stored in SimulatedBroker.global_tick_timeline.
+    """
+
+    # Number of ticks converted to Python scalars at once during iteration.
+    # Converting in chunks with .tolist() avoids creating a NumPy scalar per field per tick.
+    ITER_CHUNK_SIZE = 65536
+
+    # On-disk layout written by save()/write_ticks(): column name -> dtype (one .npy per column)
+    COLUMN_DTYPES = {
+        'times_ns': np.int64,
+        'symbol_ids': np.int16,
+        'bid': np.float64,
+        'ask': np.float64,
+        'last': np.float64,
+        'spread': np.float64,
+        'volume': np.int64,
+    }
+    SYMBOLS_FILE = "symbols.json"
+
+    def __init__(self, symbols: List[str], times_ns: np.ndarray, symbol_ids: np.ndarray,
+                 bid: np.ndarray, ask: np.ndarray, last: np.ndarray,
+                 spread: np.ndarray, volume: np.ndarray):
+        """
+        Initialize timeline from already-sorted column arrays.
+
+        Use from_symbol_columns() to build a timeline from unsorted per-symbol data.
+
+        Args:
+            symbols: Symbol names (symbol_ids index into this list)
+            times_ns: int64 UTC epoch nanoseconds
+            symbol_ids: int16 symbol ids
+            bid: float64 bid prices
+            ask: float64 ask prices
+            last: float64 last prices
+            spread: float64 spreads (ask - bid)
+            volume: int64 volumes
+        """
+        self.symbols = list(symbols)
+        self.times_ns = times_ns
+        self.symbol_ids = symbol_ids
+        self.bid = bid
+        self.ask = ask
+        self.last = last
+        self.spread = spread
+        self.volume = volume
+
+    @classmethod
+    def from_symbol_columns(cls, symbol_columns: Iterable[Tuple[str, Dict[str, np.ndarray]]]) -> 'ColumnarTickTimeline':
+        """
+        Merge per-symbol column arrays into one chronologically-sorted timeline.
+
+        Uses a stable NumPy argsort on the int64 times, so ticks with identical
+        timestamps keep their per-symbol order and symbol insertion order -
+        the same order the previous list.sort(key=lambda t: t.time) produced.
+
+        Args:
+            symbol_columns: Iterable of (symbol, columns) where columns comes from extract_tick_columns()
+
+        Returns:
+            ColumnarTickTimeline
+        """
+        symbols: List[str] = []
+        parts: Dict[str, List[np.ndarray]] = {
+            'times_ns': [], 'bid': [], 'ask': [], 'last': [], 'spread': [], 'volume': []
+        }
+        id_parts: List[np.ndarray] = []
+
+        for symbol, columns in symbol_columns:
+            if symbol in symbols:
+                symbol_id = symbols.index(symbol)
+            else:
+                symbol_id = len(symbols)
+                symbols.append(symbol)
+
+            count = len(columns['times_ns'])
+            for name in parts:
+                parts[name].append(columns[name])
+            id_parts.append(np.full(count, symbol_id, dtype=np.int16))
+
+        if not id_parts:
+            return cls.empty()
+
+        times_ns = np.concatenate(parts['times_ns']).astype(np.int64, copy=False)
+        order = np.argsort(times_ns, kind='stable')
+
+        return cls(
+            symbols=symbols,
+            times_ns=times_ns[order],
+            symbol_ids=np.concatenate(id_parts)[order],
+            bid=np.concatenate(parts['bid']).astype(np.float64, copy=False)[order],
+            ask=np.concatenate(parts['ask']).astype(np.float64, copy=False)[order],
+            last=np.concatenate(parts['last']).astype(np.float64, copy=False)[order],
+            spread=np.concatenate(parts['spread']).astype(np.float64, copy=False)[order],
+            volume=np.concatenate(parts['volume']).astype(np.int64, copy=False)[order],
+        )
+
+    @classmethod
+    def empty(cls) -> 'ColumnarTickTimeline':
+        """Create an empty timeline."""
+        return cls(
+            symbols=[],
+            times_ns=np.empty(0, dtype=np.int64),
+            symbol_ids=np.empty(0, dtype=np.int16),
+            bid=np.empty(0, dtype=np.float64),
+            ask=np.empty(0, dtype=np.float64),
+            last=np.empty(0, dtype=np.float64),
+            spread=np.empty(0, dtype=np.float64),
+            volume=np.empty(0, dtype=np.int64),
+        )
+
+    def save(self, directory: Union[str, Path]) -> Path:
+        """
+        Write the timeline as one .npy file per column plus symbols.json.
+
+        Args:
+            directory: Target directory (created if missing)
+
+        Returns:
+            Path of the directory
+        """
+        path = Path(directory)
+        path.mkdir(parents=True, exist_ok=True)
+
+        for name, dtype in self.COLUMN_DTYPES.items():
+            np.save(path / f"{name}.npy", np.asarray(getattr(self, name), dtype=dtype))
+        (path / self.SYMBOLS_FILE).write_text(json.dumps(self.symbols), encoding='utf-8')
+
+        return path
+
+    @classmethod
+    def load(cls, directory: Union[str, Path], mmap_mode: Optional[str] = 'r') -> 'ColumnarTickTimeline':
+        """
+        Open a timeline written by save() or write_ticks().
+
+        MEMORY OPTIMIZATION: With mmap_mode='r' the columns are read-only
+        memory maps. Pages are loaded on first access and shared between all
+        processes that open the same directory.
+
+        Args:
+            directory: Directory containing the column .npy files
+            mmap_mode: np.load mmap mode ('r' = shared read-only, None = load into memory)
+
+        Returns:
+            ColumnarTickTimeline backed by the files
+        """
+        path = Path(directory)
+        symbols = json.loads((path / cls.SYMBOLS_FILE).read_text(encoding='utf-8'))
+        columns = {name: np.load(path / f"{name}.npy", mmap_mode=mmap_mode) for name in cls.COLUMN_DTYPES}
+        return cls(symbols=symbols, **columns)
+
+    @classmethod
+    def write_ticks(cls, ticks: Iterable, directory: Union[str, Path],
+                    symbols: Optional[List[str]] = None) -> int:
+        """
+        Write a stream of ticks to disk in the save() layout without holding them in memory.
+
+        Used to materialize a StreamingTickTimeline (or any iterable of
+        TickCursor/GlobalTick-like objects in chronological order) once, so it
+        can be memory-mapped by load(). Ticks are collected in ITER_CHUNK_SIZE
+        chunks and passed to write_chunks().
+
+        Args:
+            ticks: Iterable of ticks with time_ns (or time), symbol, bid, ask, last, volume, spread
+            directory: Target directory (created if missing)
+            symbols: Optional initial symbol list (fixes the symbol id order)
+
+        Returns:
+            Number of ticks written
+        """
+        symbols = list(symbols or [])
+        symbol_index = {symbol: i for i, symbol in enumerate(symbols)}
+
+        def chunks() -> Iterator['ColumnarTickTimeline']:
+            buffers: Dict[str, list] = {name: [] for name in cls.COLUMN_DTYPES}
+
+            def build() -> 'ColumnarTickTimeline':
+                chunk = cls(symbols=symbols, **{
+                    name: np.asarray(values, dtype=cls.COLUMN_DTYPES[name]) for name, values in buffers.items()
+                })
+                for values in buffers.values():
+                    values.clear()
+                return chunk
+
+            for tick in ticks:
+                symbol_id = symbol_index.get(tick.symbol)
+                if symbol_id is None:
+                    symbol_id = symbol_index[tick.symbol] = len(symbols)
+                    symbols.append(tick.symbol)
+
+                time_ns = getattr(tick, 'time_ns', None)
+                if time_ns is None:
+                    time_ns = pd.Timestamp(tick.time).value
+
+                buffers['times_ns'].append(time_ns)
+                buffers['symbol_ids'].append(symbol_id)
+                buffers['bid'].append(tick.bid)
+                buffers['ask'].append(tick.ask)
+                buffers['last'].append(tick.last)
+                buffers['spread'].append(tick.spread)
+                buffers['volume'].append(tick.volume)
+
+                if len(buffers['times_ns']) >= cls.ITER_CHUNK_SIZE:
+                    yield build()
+            yield build()
+
+        return cls.write_chunks(chunks(), directory, symbols=list(symbols))
+
+    @classmethod
+    def write_chunks(cls, chunks: Iterable['ColumnarTickTimeline'], directory: Union[str, Path],
+                     symbols: Optional[List[str]] = None) -> int:
+        """
+        Append chronologically consecutive timeline chunks to disk in the save() layout.
+
+        Each chunk may use its own symbol list; symbol ids are renumbered to
+        one combined list (first appearance order after the given symbols).
+        Columns are appended to raw files and converted to .npy at the end,
+        so only one chunk is held in memory at a time.
+
+        Args:
+            chunks: Iterable of ColumnarTickTimeline chunks in chronological order
+            directory: Target directory (created if missing)
+            symbols: Optional initial symbol list (fixes the symbol id order)
+
+        Returns:
+            Number of ticks written
+        """
+        path = Path(directory)
+        path.mkdir(parents=True, exist_ok=True)
+
+        symbols = list(symbols or [])
+        symbol_index = {symbol: i for i, symbol in enumerate(symbols)}
+        names = list(cls.COLUMN_DTYPES)
+        raw_paths = {name: path / f"{name}.raw" for name in names}
+        raw_files = {name: open(raw_paths[name], 'wb') for name in names}
+        count = 0
+
+        try:
+            for chunk in chunks:
+                if len(chunk) == 0:
+                    continue
+                for symbol in chunk.symbols:
+                    if symbol not in symbol_index:
+                        symbol_index[symbol] = len(symbols)
+                        symbols.append(symbol)
+                remap = np.array([symbol_index[symbol] for symbol in chunk.symbols], dtype=np.int16)
+
+                for name in names:
+                    values = remap[chunk.symbol_ids] if name == 'symbol_ids' else getattr(chunk, name)
+                    np.asarray(values, dtype=cls.COLUMN_DTYPES[name]).tofile(raw_files[name])
+                count += len(chunk)
+        finally:
+            for raw_file in raw_files.values():
+                raw_file.close()
+
+        # Convert raw column files to .npy (header + data) in chunks
+        for name in names:
+            dtype = cls.COLUMN_DTYPES[name]
+            target = np.lib.format.open_memmap(path / f"{name}.npy", mode='w+', dtype=dtype, shape=(count,))
+            if count:
+                source = np.memmap(raw_paths[name], dtype=dtype, mode='r', shape=(count,))
+                for start in range(0, count, cls.ITER_CHUNK_SIZE * 16):
+                    stop = min(start + cls.ITER_CHUNK_SIZE * 16, count)
+                    target[start:stop] = source[start:stop]
+                del source
+            target.flush()
+            del target
+            raw_paths[name].unlink()
+
+        (path / cls.SYMBOLS_FILE).write_text(json.dumps(symbols), encoding='utf-8')
+        return count
+
+    def __len__(self) -> int:
+        return len(self.times_ns)
+
+    def __getitem__(self, index: int) -> TickCursor:
+        """
+        Get an independent cursor positioned at index.
+
+        Args:
+            index: Tick index (negative indices count from the end)
+
+        Returns:
+            TickCursor for the tick
+        """
+        n = len(self.times_ns)
+        if index < 0:
+            index += n
+        if index < 0 or index >= n:
+            raise IndexError("tick index out of range")
+
+        cursor = TickCursor()
+        self._fill_cursor(cursor, index)
+        return cursor
+
+    def __iter__(self) -> Iterator[TickCursor]:
+        """
+        Iterate over all ticks in chronological order.
+
+        PERFORMANCE OPTIMIZATION: Yields the SAME TickCursor object on every
+        step (fields are overwritten), and converts columns to Python scalars
+        in chunks. No per-tick object is allocated (the datetime is built
+        only if cursor.time is read).
+        """
+        return self.iter_from(0)
+
+    def iter_from(self, start_index: int) -> Iterator[TickCursor]:
+        """
+        Iterate over the ticks from start_index on (resumed backtests).
+
+        Args:
+            start_index: Index of the first tick to yield
+
+        Returns:
+            Iterator yielding one reused TickCursor (see __iter__)
+        """
+        cursor = TickCursor()
+        symbols = self.symbols
+        n = len(self.times_ns)
+        chunk_size = self.ITER_CHUNK_SIZE
+
+        for start in range(max(0, start_index), n, chunk_size):
+            stop = min(start + chunk_size, n)
+            rows = zip(
+                range(start, stop),
+                self.times_ns[start:stop].tolist(),
+                self.symbol_ids[start:stop].tolist(),
+                self.bid[start:stop].tolist(),
+                self.ask[start:stop].tolist(),
+                self.last[start:stop].tolist(),
+                self.volume[start:stop].tolist(),
+                self.spread[start:stop].tolist(),
+            )
+            for index, time_ns, symbol_id, bid, ask, last, volume, spread in rows:
+                cursor.index = index
+                cursor.time_ns = time_ns
+                cursor.symbol = symbols[symbol_id]
+                cursor.bid = bid
+                cursor.ask = ask
+                cursor.last = last
+                cursor.volume = volume
+                cursor.spread = spread
+                yield cursor
+
+    def read_into(self, index: int, cursor: TickCursor) -> TickCursor:
+        """
+        Position an existing cursor at index (no per-tick allocation).
+
+        Used by SimulatedBroker.advance_global_time_tick_by_tick() which reads
+        the timeline by index from a single reused cursor.
+
+        Args:
+            index: Tick index (0 <= index < len(self))
+            cursor: Cursor to overwrite
+
+        Returns:
+            The same cursor
+        """
+        self._fill_cursor(cursor, index)
+        return cursor
+
+    def _fill_cursor(self, cursor: TickCursor, index: int):
+        """Populate cursor fields from the tick at index."""
+        time_ns = int(self.times_ns[index])
+        cursor.index = index
+        cursor.time_ns = time_ns
+        cursor.symbol = self.symbols[int(self.symbol_ids[index])]
+        cursor.bid = float(self.bid[index])
+        cursor.ask = float(self.ask[index])
+        cursor.last = float(self.last[index])
+        cursor.volume = int(self.volume[index])
+        cursor.spread = float(self.spread[index])
+
+    def time_at(self, index: int) -> datetime:
+        """Get the datetime of the tick at index."""
+        return ns_to_datetime(int(self.times_ns[index]))
+
+    def first_index_by_symbol(self) -> Dict[str, int]:
+        """
+        Get the index of the first tick of each symbol.
+
+        Returns:
+            Dict of symbol -> index of its first tick in the timeline
+        """
+        unique_ids, first_indices = np.unique(self.symbol_ids, return_index=True)
+        return {self.symbols[int(sid)]: int(idx) for sid, idx in zip(unique_ids, first_indices)}
+
+    def symbol_counts(self) -> Dict[str, int]:
+        """
+        Get the number of ticks per symbol.
+
+        Returns:
+            Dict of symbol -> tick count
+        """
+        counts = np.bincount(self.symbol_ids, minlength=len(self.symbols))
+        return {symbol: int(counts[i]) for i, symbol in enumerate(self.symbols) if counts[i] > 0}
+
+    def select_symbols(self, symbols: Iterable[str]) -> 'ColumnarTickTimeline':
+        """
+        Get a timeline containing only the ticks of the given symbols.
+
+        Tick order is preserved, so replaying the subset gives every symbol
+        exactly the ticks (and tie order) it sees in the full timeline.
+        Symbols not present in this timeline are ignored.
+
+        Args:
+            symbols: Symbols to keep
+
+        Returns:
+            New in-memory ColumnarTickTimeline (symbol ids renumbered)
+        """
+        wanted = set(symbols)
+        keep = [symbol for symbol in self.symbols if symbol in wanted]
+        if not keep:
+            return self.empty()
+
+        old_ids = np.array([self.symbols.index(symbol) for symbol in keep], dtype=np.int16)
+        remap = np.full(max(len(self.symbols), 1), -1, dtype=np.int16)
+        remap[old_ids] = np.arange(len(keep), dtype=np.int16)
+
+        indices = np.flatnonzero(np.isin(self.symbol_ids, old_ids))
+        return ColumnarTickTimeline(
+            symbols=keep,
+            times_ns=self.times_ns[indices],
+            symbol_ids=remap[self.symbol_ids[indices]],
+            bid=self.bid[indices],
+            ask=self.ask[indices],
+            last=self.last[indices],
+            spread=self.spread[indices],
+            volume=self.volume[indices],
+        )
+
+    @property
+    def nbytes(self) -> int:
+        """Total memory used by the column arrays in bytes."""
+        return sum(arr.nbytes for arr in (self.times_ns, self.symbol_ids, self.bid, self.ask,
+                                          self.last, self.spread, self.volume))
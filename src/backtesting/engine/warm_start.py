@@ -0,0 +1,237 @@
+"""
+Warm-Start Snapshots for Backtesting.
+
+Every run repeats the same warmup before its first simulated tick:
+set_start_time() over the historical buffer, strategy initialize()
+(reference candle discovery) and seeding the candle builders from the
+buffer's OHLC data. None of it depends on risk or exit settings, so runs over
+the same data window and strategy configuration can share it:
+
+- WarmStartSnapshot.save(): pickles the broker's warmup state
+  (SimulatedBroker.get_warm_state()) together with the initialized strategies,
+  right before replay starts.
+- WarmStartSnapshot.load(): returns them for a freshly wired run, which then
+  skips set_start_time(), strategy initialization and candle seeding.
+
+Strategies keep references to the run's components (broker, order/risk/trade
+managers, indicators, persistence, logger, configuration sections). Those are
+not copied into the snapshot: they are pickled as persistent references and
+bound to the NEW run's components on load, so a restored run uses its own
+risk manager and the current RiskConfig.
+
+Snapshots are keyed by snapshot_key(): data identity, symbols, start time,
+every configuration section except the replay-only ones (REPLAY_SECTIONS)
+and the strategy parameter overrides of the run. Anything a strategy can read
+in initialize() therefore produces a different snapshot.
+"""
+import dataclasses
+import hashlib
+import os
+import pickle
+import re
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+from src.utils.logger import get_logger
+
+
+class WarmStartSnapshot:
+    """
+    One warm-start snapshot file.
+
+    Usage:
+        snapshot = WarmStartSnapshot(directory, WarmStartSnapshot.snapshot_key(...))
+        state = snapshot.load(components)
+        if state is None:
+            ...cold warmup...
+            snapshot.save(broker.get_warm_state(), strategies, components)
+    """
+
+    FORMAT_VERSION = 1
+
+    # Configuration sections only read during replay (risk, exits, logging) -
+    # changing them does not invalidate a snapshot
+    REPLAY_SECTIONS = ('risk', 'trailing_stop', 'advanced', 'logging', 'tick_archive', 'mt5')
+
+    def __init__(self, directory: str, key: str):
+        """
+        Initialize snapshot.
+
+        Args:
+            directory: Snapshot directory
+            key: Snapshot key from snapshot_key()
+        """
+        self.directory = Path(directory)
+        self.key = key
+        self.path = self.directory / f"{key}.pkl"
+        self.logger = get_logger()
+
+    @classmethod
+    def snapshot_key(cls, data_id: str, symbols: Iterable[str], start_time: datetime,
+                     strategy_overrides: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Build the snapshot key for a data window and strategy configuration.
+
+        Args:
+            data_id: Identity of the loaded data (e.g. dataset file size/mtime)
+            symbols: Symbols the run trades (order does not matter)
+            start_time: Backtest start time (end of the warmup buffer)
+            strategy_overrides: Strategy parameter overrides applied to the run
+                                ("<section>.<field>" -> value)
+
+        Returns:
+            Hex digest
+        """
+        digest = hashlib.sha1()
+        for part in (cls.FORMAT_VERSION, data_id, sorted(symbols), start_time.isoformat(),
+                     sorted((strategy_overrides or {}).items()), cls.config_fingerprint()):
+            digest.update(repr(part).encode('utf-8'))
+            digest.update(b'\0')
+        return digest.hexdigest()[:20]
+
+    @classmethod
+    def config_fingerprint(cls) -> str:
+        """
+        Get a stable text form of every configuration section strategies can read.
+
+        Returns:
+            Text that changes when any non-replay section changes
+        """
+        from src.config import config
+
+        parts = []
+        for name, section in sorted(vars(config).items()):
+            if name.startswith('_') or name in cls.REPLAY_SECTIONS:
+                continue
+            parts.append(f"{name}={stable_repr(section)}")
+        return ';'.join(parts)
+
+    @staticmethod
+    def run_components(**components) -> Dict[str, Any]:
+        """
+        Collect the objects strategies may reference that belong to a run.
+
+        The global configuration object and its sections are added, as well as
+        the shared logger.
+
+        Args:
+            **components: Name -> run component (broker=..., risk_manager=..., ...)
+
+        Returns:
+            Name -> object mapping for save()/load()
+        """
+        from src.config import config
+
+        result = {'config': config, 'logger': get_logger()}
+        for name, section in vars(config).items():
+            if not name.startswith('_') and not isinstance(section, (str, int, float, bool, type(None))):
+                result[f"config.{name}"] = section
+        result.update({name: obj for name, obj in components.items() if obj is not None})
+        return result
+
+    def exists(self) -> bool:
+        """Check whether the snapshot file exists."""
+        return self.path.exists()
+
+    def save(self, broker_state: Dict[str, Any], strategies: Dict[str, Any],
+             components: Dict[str, Any]) -> bool:
+        """
+        Write the snapshot (atomically - concurrent writers of the same key are safe).
+
+        Args:
+            broker_state: SimulatedBroker.get_warm_state()
+            strategies: Initialized strategies (symbol -> strategy)
+            components: Run components from run_components()
+
+        Returns:
+            True if written, False if the state could not be pickled (logged)
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        by_id = {id(obj): name for name, obj in components.items()}
+
+        fd, temp_path = tempfile.mkstemp(prefix=f".{self.key}.", dir=str(self.directory))
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickler = ComponentPickler(f, by_id, components)
+                pickler.dump({
+                    'format_version': self.FORMAT_VERSION,
+                    'broker': broker_state,
+                    'strategies': strategies,
+                })
+            os.replace(temp_path, self.path)
+        except Exception as e:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            self.logger.warning(f"Warm-start snapshot not saved ({type(e).__name__}: {e})")
+            return False
+
+        self.logger.info(f"Warm-start snapshot saved: {self.path} ({self.path.stat().st_size / 1024 / 1024:.1f} MB)")
+        return True
+
+    def load(self, components: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Read the snapshot, binding component references to this run's components.
+
+        Args:
+            components: Run components from run_components() (same names as on save)
+
+        Returns:
+            Dict with 'broker' (for SimulatedBroker.restore_warm_state()) and
+            'strategies', or None if there is no usable snapshot
+        """
+        if not self.path.exists():
+            return None
+
+        try:
+            with open(self.path, 'rb') as f:
+                state = ComponentUnpickler(f, components).load()
+        except Exception as e:
+            self.logger.warning(f"Warm-start snapshot {self.path.name} unusable ({type(e).__name__}: {e}) - "
+                                f"running full warmup")
+            return None
+
+        if state.get('format_version') != self.FORMAT_VERSION:
+            return None
+
+        self.logger.info(f"Warm-start snapshot restored: {self.path.name} "
+                         f"({len(state['strategies'])} strategies)")
+        return state
+
+
+class ComponentPickler(pickle.Pickler):
+    """Pickler that stores run components as persistent references."""
+
+    def __init__(self, file, by_id: Dict[int, str], components: Dict[str, Any]):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self._by_id = by_id
+        self._components = components
+
+    def persistent_id(self, obj):
+        name = self._by_id.get(id(obj))
+        if name is not None and self._components[name] is obj:
+            return name
+        return None
+
+
+class ComponentUnpickler(pickle.Unpickler):
+    """Unpickler that resolves persistent references to the current run's components."""
+
+    def __init__(self, file, components: Dict[str, Any]):
+        super().__init__(file)
+        self._components = components
+
+    def persistent_load(self, pid):
+        if pid not in self._components:
+            raise pickle.UnpicklingError(f"run component '{pid}' is missing")
+        return self._components[pid]
+
+
+def stable_repr(value: Any) -> str:
+    """repr() of configuration values without memory addresses."""
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        value = dataclasses.asdict(value)
+    elif hasattr(value, '__dict__') and not isinstance(value, type):
+        value = {k: v for k, v in vars(value).items() if not k.startswith('_')}
+    return re.sub(r' at 0x[0-9a-fA-F]+', '', repr(value))
@@ -12,6 +12,7 @@ class RiskConfig:
     min_lot_size: float = 0.01
     max_positions: int = 10
     max_portfolio_risk_percent: float = 20.0  # Maximum total portfolio risk across all positions
+    enable_portfolio_risk: bool = True  # Cross-symbol portfolio/group risk limits (TIER 2 validation)
 
 
 @dataclass
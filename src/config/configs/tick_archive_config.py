@@ -38,6 +38,10 @@ class TickArchiveConfig:
     download_timeout_seconds: int = 300  # 5 minutes timeout for downloads
     max_retries: int = 3  # Maximum number of download retry attempts
     retry_delay_seconds: int = 5  # Delay between retry attempts
+    download_chunk_bytes: int = 1024 * 1024  # Archives are streamed to disk in chunks of this size
+
+    # === Streaming Conversion ===
+    csv_batch_rows: int = 250_000  # CSV rows parsed per batch (bounds peak memory of archive conversion)
     
     # === Data Validation ===
     validate_tick_format: bool = True  # Validate downloaded data format before merging
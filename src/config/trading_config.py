@@ -70,7 +70,8 @@ class TradingConfig:
             max_lot_size=max_lot_value,
             min_lot_size=min_lot_value,
             max_positions=int(os.getenv('MAX_POSITIONS', '1000')),
-            max_portfolio_risk_percent=float(os.getenv('MAX_PORTFOLIO_RISK_PERCENT', '20.0'))
+            max_portfolio_risk_percent=float(os.getenv('MAX_PORTFOLIO_RISK_PERCENT', '20.0')),
+            enable_portfolio_risk=os.getenv('ENABLE_PORTFOLIO_RISK', 'true').lower() == 'true'
         )
         
         # Trailing stop
@@ -227,6 +228,7 @@ class TradingConfig:
             use_granular_downloads=os.getenv('TICK_ARCHIVE_USE_GRANULAR', 'true').lower() == 'true',
             download_timeout_seconds=int(os.getenv('TICK_ARCHIVE_TIMEOUT', '300')),
             max_retries=int(os.getenv('TICK_ARCHIVE_MAX_RETRIES', '3')),
+            csv_batch_rows=int(os.getenv('TICK_ARCHIVE_CSV_BATCH_ROWS', '250000')),
             save_downloaded_archives=os.getenv('TICK_ARCHIVE_SAVE', 'true').lower() == 'true',
             archive_cache_dir=os.getenv('TICK_ARCHIVE_CACHE_DIR', 'data/archives')
         )
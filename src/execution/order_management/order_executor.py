@@ -190,7 +190,9 @@ class OrderExecutor:
                 return None
 
         # PORTFOLIO RISK VALIDATION (TIER 2): Reject trade if total portfolio risk exceeds limit
-        if self.risk_manager is not None and volume > 0:
+        # (cross-symbol check - can be disabled so symbols are independent)
+        if (self.risk_manager is not None and volume > 0
+                and getattr(self.risk_manager.risk_config, 'enable_portfolio_risk', True)):
             # Validate total portfolio risk including this new trade
             portfolio_risk_valid = self._validate_portfolio_risk(symbol, volume, price, sl)
             if not portfolio_risk_valid:
@@ -20,6 +20,7 @@ from src.models.models import (
 
     # Candle Models
     CandleData,
+    CandleArrays,
     ReferenceCandle,
 
     # Range Models
@@ -44,6 +45,7 @@ __all__ = [
     'SymbolStats',
     'PositionInfo',
     'CandleData',
+    'CandleArrays',
     'ReferenceCandle',
     'RangeConfig',
     'UnifiedBreakoutState',
@@ -11,7 +11,7 @@ Ported from MQL5 structures in FMS_Config.mqh and FMS_GlobalVars.mqh
 from src.models.models.enums import SymbolCategory, PositionType
 from src.models.models.symbol_models import SymbolParameters, SymbolStats
 from src.models.models.position_models import PositionInfo
-from src.models.models.candle_models import CandleData, ReferenceCandle
+from src.models.models.candle_models import CandleData, CandleArrays, ReferenceCandle
 from src.models.models.range_models import RangeConfig
 from src.models.models.breakout_models import UnifiedBreakoutState, MultiRangeBreakoutState
 from src.models.models.filter_models import AdaptiveFilterState
@@ -31,6 +31,7 @@ __all__ = [
     
     # Candle Models
     'CandleData',
+    'CandleArrays',
     'ReferenceCandle',
     
     # Range Models
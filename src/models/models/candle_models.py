@@ -2,7 +2,10 @@
 Candle-related data models.
 """
 from dataclasses import dataclass, field
-from datetime import datetime
+from datetime import datetime, timezone
+from typing import Any, Dict
+
+import numpy as np
 
 
 @dataclass
@@ -68,3 +71,106 @@ class ReferenceCandle:
     def is_bullish(self) -> bool:
         return self.close > self.open
 
+
+class CandleArrays:
+    """
+    Lightweight column view of the last N closed candles.
+
+    Alternative to the DataFrame returned by get_candles() for hot paths that
+    only read a couple of rows. Columns are NumPy arrays (zero-copy views into
+    the backtest candle store) with the same names as the DataFrame columns:
+    time (datetime objects), open, high, low, close, tick_volume.
+
+    PERFORMANCE OPTIMIZATION: Avoids pandas DataFrame construction and
+    df.iloc[] Series creation when a strategy only needs the last candle.
+    Views must be used immediately - they are not guaranteed to stay valid
+    after more candles are appended.
+    """
+    __slots__ = ('time', 'open', 'high', 'low', 'close', 'tick_volume')
+
+    def __init__(self, time: np.ndarray, open: np.ndarray, high: np.ndarray,
+                 low: np.ndarray, close: np.ndarray, tick_volume: np.ndarray):
+        self.time = time
+        self.open = open
+        self.high = high
+        self.low = low
+        self.close = close
+        self.tick_volume = tick_volume
+
+    @classmethod
+    def from_dataframe(cls, df) -> 'CandleArrays':
+        """
+        Build a CandleArrays view from a get_candles() DataFrame.
+
+        Used for connectors that only provide DataFrames (e.g. live MT5).
+        Times are converted to timezone-aware (UTC) datetime objects.
+
+        Args:
+            df: DataFrame with columns time, open, high, low, close, tick_volume
+
+        Returns:
+            CandleArrays
+        """
+        import pandas as pd
+
+        times = pd.DatetimeIndex(pd.to_datetime(df['time'], utc=True)).to_pydatetime()
+        if 'tick_volume' in df.columns:
+            volumes = df['tick_volume'].to_numpy(dtype=np.int64)
+        else:
+            volumes = np.zeros(len(df), dtype=np.int64)
+
+        return cls(
+            time=times,
+            open=df['open'].to_numpy(dtype=np.float64),
+            high=df['high'].to_numpy(dtype=np.float64),
+            low=df['low'].to_numpy(dtype=np.float64),
+            close=df['close'].to_numpy(dtype=np.float64),
+            tick_volume=volumes,
+        )
+
+    def __len__(self) -> int:
+        return len(self.open)
+
+    def __getitem__(self, column: str) -> np.ndarray:
+        """Get a column by name (same names as the DataFrame columns)."""
+        if column not in self.__slots__:
+            raise KeyError(column)
+        return getattr(self, column)
+
+    def row(self, index: int) -> Dict[str, Any]:
+        """
+        Get one candle as a dict of Python scalars.
+
+        Supports the same row['open'] / row['time'] access as df.iloc[index].
+
+        Args:
+            index: Row index (negative indices count from the end)
+
+        Returns:
+            Dict with keys time, open, high, low, close, tick_volume
+        """
+        time = self.time[index]
+        if time.tzinfo is None:
+            time = time.replace(tzinfo=timezone.utc)
+        return {
+            'time': time,
+            'open': float(self.open[index]),
+            'high': float(self.high[index]),
+            'low': float(self.low[index]),
+            'close': float(self.close[index]),
+            'tick_volume': int(self.tick_volume[index]),
+        }
+
+    def candle(self, index: int) -> CandleData:
+        """
+        Get one candle as CandleData.
+
+        Args:
+            index: Row index (negative indices count from the end)
+
+        Returns:
+            CandleData
+        """
+        row = self.row(index)
+        return CandleData(time=row['time'], open=row['open'], high=row['high'],
+                          low=row['low'], close=row['close'], volume=row['tick_volume'])
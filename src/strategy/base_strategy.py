@@ -11,7 +11,7 @@ from datetime import datetime
 from dataclasses import dataclass
 import pandas as pd
 
-from src.models.data_models import TradeSignal, SymbolCategory, SymbolParameters
+from src.models.data_models import TradeSignal, SymbolCategory, SymbolParameters, CandleArrays
 from src.core.mt5_connector import MT5Connector
 from src.execution.order_manager import OrderManager
 from src.execution.trade_manager import TradeManager
@@ -227,6 +227,20 @@ class BaseStrategy(ABC):
         # Subclasses should override this
         return []
 
+    def requires_every_tick(self) -> bool:
+        """
+        Check if this strategy must see every tick of its symbol.
+
+        Event-skipping backtest replay fast-forwards over ticks on which no
+        required timeframe forms a new bar and no SL/TP can be hit. Strategies
+        that react to individual ticks override this to return True, so
+        on_tick() is called on every tick of their symbol.
+
+        Returns:
+            True to opt out of event skipping (default: tick-only strategies)
+        """
+        return not self.get_required_timeframes()
+
     def is_ready(self) -> bool:
         """
         Check if strategy is ready to trade.
@@ -655,3 +669,32 @@ class BaseStrategy(ABC):
         # Simply delegate to connector - it already has caching (Optimization #9)
         return self.connector.get_candles(self.symbol, timeframe, count)
 
+    def get_candle_arrays_cached(self, timeframe: str, count: int = 100) -> Optional[CandleArrays]:
+        """
+        Get candles as NumPy column views (no DataFrame construction).
+
+        PERFORMANCE OPTIMIZATION: In backtests the broker returns zero-copy views
+        of its candle store, so reading the last closed candle skips pandas
+        entirely. Connectors without get_candle_arrays() (live MT5) fall back
+        to wrapping the get_candles() DataFrame.
+
+        Args:
+            timeframe: Timeframe to get candles for (e.g., 'M5', 'H1', 'H4')
+            count: Number of candles to retrieve (default: 100)
+
+        Returns:
+            CandleArrays with columns time, open, high, low, close, tick_volume, or None
+
+        Example:
+            candles = self.get_candle_arrays_cached('H4', count=2)
+            last_closed = candles.row(-2)
+        """
+        # Look up on the class so dynamic attribute objects (e.g. mocks) use the DataFrame path
+        if getattr(type(self.connector), 'get_candle_arrays', None) is not None:
+            return self.connector.get_candle_arrays(self.symbol, timeframe, count)
+
+        df = self.connector.get_candles(self.symbol, timeframe, count)
+        if df is None:
+            return None
+        return CandleArrays.from_dataframe(df)
+
@@ -153,6 +153,15 @@ class HFTMomentumStrategy(BaseStrategy):
         """
         return []  # Tick-only strategy, no candles needed
 
+    def requires_every_tick(self) -> bool:
+        """
+        HFT momentum is computed from every tick - never skip ticks.
+
+        Returns:
+            True (opts out of event-skipping replay)
+        """
+        return True
+
     def initialize(self) -> bool:
         """
         Initialize the strategy.
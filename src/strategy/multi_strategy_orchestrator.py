@@ -353,6 +353,18 @@ class MultiStrategyOrchestrator:
 
         return sorted(list(required_timeframes))
 
+    def requires_every_tick(self) -> bool:
+        """
+        Check if any sub-strategy must see every tick.
+
+        Returns:
+            True if at least one sub-strategy opts out of event skipping
+        """
+        for strategy in self.strategies.values():
+            if hasattr(strategy, 'requires_every_tick') and strategy.requires_every_tick():
+                return True
+        return False
+
     def get_status(self) -> Dict:
         """
         Get status of all strategies.
@@ -316,24 +316,21 @@ class TrueBreakoutStrategy(BaseStrategy):
         """
         try:
             # Get reference candles
-            # PERFORMANCE OPTIMIZATION #21: Use cached candles
-            df = self.get_candles_cached(
+            # PERFORMANCE OPTIMIZATION: Read NumPy candle views (no DataFrame construction)
+            candles = self.get_candle_arrays_cached(
                 self.config.range_config.reference_timeframe,
                 count=2
             )
 
-            if df is None or len(df) < 2:
+            if candles is None or len(candles) < 2:
                 # If no current reference candle exists, try fallback
                 if self.current_reference_candle is None:
                     return self._get_reference_candle_with_fallback()
                 return None
 
-            # Get last closed candle
-            last_candle = df.iloc[-2]
-            candle_time = pd.Timestamp(last_candle['time']).to_pydatetime()
-            # BUGFIX: Ensure timezone-aware datetime to avoid comparison errors
-            if candle_time.tzinfo is None:
-                candle_time = candle_time.replace(tzinfo=timezone.utc)
+            # Get last closed candle (row() returns a timezone-aware datetime)
+            last_candle = candles.row(-2)
+            candle_time = last_candle['time']
 
             # Check if this is a new candle
             if self.last_reference_candle_time is None or candle_time > self.last_reference_candle_time:
@@ -528,7 +525,7 @@ class TrueBreakoutStrategy(BaseStrategy):
         OPTIMIZATION #5 (Phase 2): Resets volume cache when reference changes.
 
         Args:
-            candle_data: Pandas Series containing candle data
+            candle_data: Candle row (dict from CandleArrays.row() or pandas Series)
             candle_time: Candle timestamp
 
         Returns:
@@ -566,20 +563,17 @@ class TrueBreakoutStrategy(BaseStrategy):
         OPTIMIZATION #5 (Phase 2): Updates volume cache when new candle detected.
         """
         try:
-            # PERFORMANCE OPTIMIZATION #21: Use cached candles
-            df = self.get_candles_cached(
+            # PERFORMANCE OPTIMIZATION: Read NumPy candle views (no DataFrame construction)
+            candles = self.get_candle_arrays_cached(
                 self.config.range_config.breakout_timeframe,
                 count=2
             )
 
-            if df is None or len(df) < 2:
+            if candles is None or len(candles) < 2:
                 return False
 
-            last_candle = df.iloc[-2]
-            candle_time = pd.Timestamp(last_candle['time']).to_pydatetime()
-            # BUGFIX: Ensure timezone-aware datetime to avoid comparison errors
-            if candle_time.tzinfo is None:
-                candle_time = candle_time.replace(tzinfo=timezone.utc)
+            last_candle = candles.row(-2)
+            candle_time = last_candle['time']
 
             if self.last_confirmation_candle_time is None or candle_time > self.last_confirmation_candle_time:
                 self.last_confirmation_candle_time = candle_time
@@ -613,24 +607,16 @@ class TrueBreakoutStrategy(BaseStrategy):
 
         try:
             # Get current confirmation candle
-            # PERFORMANCE OPTIMIZATION #21: Use cached candles
-            df = self.get_candles_cached(
+            # PERFORMANCE OPTIMIZATION: Read NumPy candle views (no DataFrame construction)
+            candles = self.get_candle_arrays_cached(
                 self.config.range_config.breakout_timeframe,
                 count=2
             )
 
-            if df is None or len(df) < 2:
+            if candles is None or len(candles) < 2:
                 return None
 
-            candle = df.iloc[-2]
-            candle_data = CandleData(
-                open=float(candle['open']),
-                high=float(candle['high']),
-                low=float(candle['low']),
-                close=float(candle['close']),
-                volume=int(candle['tick_volume']),
-                time=pd.Timestamp(candle['time']).to_pydatetime()
-            )
+            candle_data = candles.candle(-2)
 
             # === STAGE 1: UNIFIED BREAKOUT DETECTION ===
             # Check for timeout FIRST (before detecting new breakouts)
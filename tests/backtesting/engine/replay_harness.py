@@ -0,0 +1,208 @@
+"""
+Shared scaffolding for tests that replay synthetic ticks through BacktestController.
+
+Synthetic market data, brokers, simple strategies and a controller built
+through its real constructor. Test modules keep only their own checks.
+"""
+
+import numpy as np
+import pandas as pd
+from datetime import datetime, timezone
+from pathlib import Path
+
+# Add project root to path
+import sys
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.backtesting.engine.backtest_controller import BacktestController
+from src.backtesting.engine.simulated_broker import SimulatedBroker
+from src.backtesting.engine.time_controller import TimeController, TimeMode
+from src.indicators.technical_indicators import TechnicalIndicators
+from src.models.data_models import PositionType
+from src.strategy.symbol_performance_persistence import SymbolPerformancePersistence
+
+
+START = datetime(2025, 1, 6, tzinfo=timezone.utc)
+
+SYMBOL_INFO = {'point': 0.00001, 'digits': 5, 'tick_value': 1.0, 'tick_size': 0.00001,
+               'contract_size': 100000, 'volume_min': 0.01, 'volume_max': 100, 'volume_step': 0.01}
+
+
+# ----------------------------------------------------------------------
+# Market data
+# ----------------------------------------------------------------------
+
+def random_walk_ticks(rng, count, mean_gap_ms=1_500):
+    """Random-walk ticks from START with exponential gaps and unit volume."""
+    times = pd.Timestamp(START) + pd.to_timedelta(
+        np.cumsum(rng.exponential(mean_gap_ms, size=count)).astype(np.int64), unit='ms')
+    bids = 1.1 + np.cumsum(rng.normal(0, 0.00004, size=count))
+    return pd.DataFrame({'time': times, 'bid': bids, 'ask': bids + 0.00008,
+                         'last': np.zeros(count), 'volume': np.ones(count, dtype=np.int64)})
+
+
+def create_ticks(seed, count):
+    """Random-walk ticks from START with bursts, gaps and random volume."""
+    rng = np.random.default_rng(seed)
+    gaps_ms = rng.exponential(1500, size=count).astype(np.int64)
+    times = pd.Timestamp(START) + pd.to_timedelta(np.cumsum(gaps_ms), unit='ms')
+    bids = 1.1 + np.cumsum(rng.normal(0, 0.00003, size=count))
+    return pd.DataFrame({
+        'time': times,
+        'bid': bids,
+        'ask': bids + 0.00008,
+        'last': np.zeros(count),
+        'volume': rng.integers(1, 5, size=count).astype(np.int64),
+    })
+
+
+def market_data(seed):
+    """M1-M5 warmup bars before START and random-walk ticks after it."""
+    rng = np.random.default_rng(seed)
+    bars = pd.DataFrame({
+        'time': pd.Timestamp(START) + pd.to_timedelta(np.arange(-600, 0), unit='min'),
+        'open': 1.1, 'high': 1.1 + rng.random(600) * 0.001, 'low': 1.1 - rng.random(600) * 0.001,
+        'close': 1.1, 'tick_volume': 1,
+    })
+    return bars, random_walk_ticks(rng, 4_000, mean_gap_ms=2_000)
+
+
+# ----------------------------------------------------------------------
+# Brokers and controller
+# ----------------------------------------------------------------------
+
+def new_broker(symbols):
+    """Broker with M1/M5 warmup bars and ticks of market_data() loaded for each symbol."""
+    broker = SimulatedBroker(initial_balance=10000.0, enable_slippage=False)
+    for i, symbol in enumerate(symbols):
+        bars, ticks = market_data(i)
+        for timeframe in ('M1', 'M5'):
+            broker.load_symbol_data(symbol, bars, SYMBOL_INFO, timeframe)
+        broker.load_tick_data(symbol, ticks, SYMBOL_INFO)
+    broker.merge_global_tick_timeline()
+    return broker
+
+
+def single_symbol_broker(seed, count, symbol='EURUSD'):
+    """Broker replaying random_walk_ticks() of one symbol (timeline loaded, no bars)."""
+    broker = SimulatedBroker(initial_balance=10000.0, enable_slippage=False)
+    broker.load_tick_data(symbol, random_walk_ticks(np.random.default_rng(seed), count), SYMBOL_INFO)
+    broker.merge_global_tick_timeline()
+    broker.load_tick_timeline(broker.global_tick_timeline)
+    return broker
+
+
+def build_controller(broker, run_dir, risk_manager=None, equity_recorder=None, profiler=None, **attributes):
+    """
+    BacktestController over a loaded broker, built through its constructor.
+
+    The sequential tick loops do not use the order and trade managers, so
+    none are passed. Keyword attributes (event_skipping, show_progress,
+    checkpoint, resume_tick_index, ...) are set after construction.
+
+    Args:
+        broker: SimulatedBroker with the global tick timeline loaded
+        run_dir: Directory for the run's symbol performance persistence
+        risk_manager: Risk manager (or stub) referenced by the strategies
+        equity_recorder: Optional EquityRecorder (default: controller's in-memory recorder)
+        profiler: Optional StageProfiler
+    """
+    symbols = list(broker.global_tick_timeline.symbols)
+    controller = BacktestController(
+        simulated_broker=broker,
+        time_controller=TimeController(symbols, mode=TimeMode.MAX_SPEED, broker=broker),
+        order_manager=None,
+        risk_manager=risk_manager,
+        trade_manager=None,
+        indicators=TechnicalIndicators(),
+        symbol_persistence=SymbolPerformancePersistence(data_dir=str(run_dir)),
+        equity_recorder=equity_recorder,
+        profiler=profiler
+    )
+    for name, value in attributes.items():
+        setattr(controller, name, value)
+    return controller
+
+
+def closed_trades(controller):
+    """Comparable closed trades of the controller's broker."""
+    return [(t['ticket'], t['open_price'], t['close_price'], t['close_time']) for t in controller.broker.closed_trades]
+
+
+# ----------------------------------------------------------------------
+# Strategies
+# ----------------------------------------------------------------------
+
+class SymbolStrategy:
+    """Opens alternating SL/TP positions on its own symbol while it has fewer than max_positions."""
+
+    def __init__(self, broker, symbol, timeframes=(), max_positions=1):
+        self.broker = broker
+        self.symbol = symbol
+        self.timeframes = list(timeframes)
+        self.max_positions = max_positions
+        self.count = 0
+
+    def get_required_timeframes(self):
+        return self.timeframes
+
+    def on_tick(self):
+        self.count += 1
+        if len(self.broker.get_positions(self.symbol)) >= self.max_positions:
+            return
+        buy = self.count % 2 == 0
+        price = self.broker.get_current_price(self.symbol, 'ask' if buy else 'bid')
+        distance = 0.0004 + 0.0001 * (self.count % 3)
+        sl = price - distance if buy else price + distance
+        tp = price + distance if buy else price - distance
+        self.broker.place_market_order(self.symbol, PositionType.BUY if buy else PositionType.SELL,
+                                       0.01, round(sl, 5), round(tp, 5), 1)
+
+
+class ReferenceStrategy:
+    """
+    Trades breaks of a reference range found in initialize() from the warmup candles.
+
+    With pause_every, every pause_every-th call is skipped, so the per-run
+    call counter is part of the strategy state.
+    """
+
+    def __init__(self, broker, risk_manager, symbol, pause_every=0):
+        self.broker = broker
+        self.risk_manager = risk_manager
+        self.symbol = symbol
+        self.pause_every = pause_every
+        self.reference = None
+        self.calls = 0
+
+    def initialize(self):
+        candles = self.broker.get_candles(self.symbol, 'M5', 50)
+        self.reference = (float(candles['high'].max()), float(candles['low'].min()))
+        return True
+
+    def get_required_timeframes(self):
+        return ['M1']
+
+    def on_tick(self):
+        self.calls += 1
+        if self.broker.get_positions(self.symbol):
+            return
+        if self.pause_every and self.calls % self.pause_every == 0:
+            return
+        high, low = self.reference
+        bid = self.broker.get_current_price(self.symbol, 'bid')
+        buy = bid > (high + low) / 2
+        price = self.broker.get_current_price(self.symbol, 'ask' if buy else 'bid')
+        distance = 0.0005
+        sl = price - distance if buy else price + distance
+        tp = price + distance if buy else price - distance
+        self.broker.place_market_order(self.symbol, PositionType.BUY if buy else PositionType.SELL,
+                                       self.risk_manager.lot_size, round(sl, 5), round(tp, 5), 1)
+
+
+class RiskManagerStub:
+    """Run component referenced by the strategies (replay reads only lot_size)."""
+
+    def __init__(self, lot_size):
+        self.lot_size = lot_size
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Tests for the streaming broker archive pipeline.
+
+Archives are served by a local HTTP server stand-in. Downloads must be
+streamed to disk, CSV batches must respect the batch size, and ticks must be
+split into the correct UTC days.
+"""
+
+import io
+import threading
+import zipfile
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+import MetaTrader5 as mt5
+from datetime import datetime, timezone, timedelta
+from pathlib import Path
+from unittest.mock import patch
+
+# Add project root to path
+import sys
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.backtesting.engine.broker_archive_downloader import BrokerArchiveDownloader
+from src.config.configs.tick_archive_config import TickArchiveConfig
+
+
+DAY = datetime(2025, 1, 6, tzinfo=timezone.utc)
+
+
+def archive_csv(start, hours, ticks_per_hour=500, seed=5):
+    """Time-ordered archive CSV text starting at start."""
+    rng = np.random.default_rng(seed)
+    count = hours * ticks_per_hour
+    offsets = np.sort(rng.integers(0, hours * 3_600_000, size=count))
+    times = pd.to_datetime(pd.Timestamp(start).value + offsets * 1_000_000, utc=True)
+    bids = np.round(1.1 + rng.normal(0, 0.001, size=count), 5)
+    df = pd.DataFrame({
+        'Timestamp': times.strftime('%Y-%m-%d %H:%M:%S.%f'),
+        'Bid': bids,
+        'Ask': np.round(bids + 0.0002, 5),
+        'Volume': rng.integers(1, 10, size=count),
+    })
+    return df.to_csv(index=False)
+
+
+def write_zip(path, csv_text, member="ticks.csv"):
+    """Write a ZIP archive with one CSV member."""
+    with zipfile.ZipFile(path, 'w', compression=zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr(member, csv_text)
+
+
+class TestArchiveStreaming:
+    """Tests for download_archive_to_file, iter_archive_days and fetch_tick_data_for_day."""
+
+    @pytest.fixture
+    def server(self, tmp_path):
+        """Local HTTP server serving tmp_path/served."""
+        served = tmp_path / "served"
+        served.mkdir()
+        httpd = ThreadingHTTPServer(('127.0.0.1', 0), partial(SimpleHTTPRequestHandler, directory=str(served)))
+        thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+        thread.start()
+        yield served, f"127.0.0.1:{httpd.server_address[1]}"
+        httpd.shutdown()
+        httpd.server_close()
+
+    def make_downloader(self, tmp_path, host, save_archives=True):
+        """Downloader whose URL pattern points at the local server."""
+        config = TickArchiveConfig(
+            enabled=True,
+            archive_url_pattern_day=f"http://{host}/{{BROKER}}_{{SYMBOL}}_{{YEAR}}_{{MONTH}}_{{DAY}}.zip",
+            trusted_sources=[host],
+            max_retries=1,
+            retry_delay_seconds=0,
+            download_chunk_bytes=4096,
+            csv_batch_rows=700,
+            save_downloaded_archives=save_archives,
+            archive_cache_dir=str(tmp_path / "archives"),
+        )
+        return BrokerArchiveDownloader(config)
+
+    def test_download_streams_to_file(self, tmp_path, server):
+        """The archive lands on disk byte-identical; a 404 leaves no file behind."""
+        served, host = server
+        write_zip(served / "archive.zip", archive_csv(DAY, hours=2))
+        downloader = self.make_downloader(tmp_path, host)
+        target = tmp_path / "download" / "archive.zip"
+
+        assert downloader.download_archive_to_file(f"http://{host}/archive.zip", 'EURUSD', 2025, target)
+        assert target.read_bytes() == (served / "archive.zip").read_bytes()
+        assert not list(target.parent.glob("*.part"))
+
+        missing = tmp_path / "download" / "missing.zip"
+        assert not downloader.download_archive_to_file(f"http://{host}/missing.zip", 'EURUSD', 2025, missing)
+        assert not list(missing.parent.glob("missing*"))
+
+    def test_batches_split_by_utc_day(self, tmp_path):
+        """Batches stay within batch_rows and every day holds exactly its own ticks."""
+        csv_text = archive_csv(DAY - timedelta(hours=3), hours=54)   # spans 4 UTC days
+        archive = tmp_path / "multi.zip"
+        write_zip(archive, csv_text)
+        downloader = self.make_downloader(tmp_path, "127.0.0.1")
+
+        batch_sizes = []
+        original = downloader.iter_archive_batches
+
+        def spy(*args, **kwargs):
+            for batch in original(*args, **kwargs):
+                batch_sizes.append(len(batch))
+                yield batch
+
+        with patch.object(downloader, 'iter_archive_batches', side_effect=spy):
+            days = list(downloader.iter_archive_days(archive, 'EURUSD'))
+
+        expected = pd.read_csv(io.StringIO(csv_text))
+        expected_days = pd.to_datetime(expected['Timestamp'], utc=True).dt.floor('D').value_counts()
+
+        assert max(batch_sizes) <= 700
+        assert sum(batch_sizes) == len(expected)
+        assert [pd.Timestamp(day) for day, _ in days] == sorted(expected_days.index)
+        for day, df in days:
+            assert len(df) == expected_days[pd.Timestamp(day)]
+            assert df['time'].is_monotonic_increasing
+            assert (df['time'].dt.floor('D') == pd.Timestamp(day)).all()
+
+    def test_fetch_day_from_server(self, tmp_path, server):
+        """fetch_tick_data_for_day streams the served day archive and caches only the requested day."""
+        served, host = server
+        # Day archive with a few ticks of the previous and next UTC day
+        csv_text = archive_csv(DAY - timedelta(hours=1), hours=26)
+        write_zip(served / "Exness_EURUSD_2025_01_06.zip", csv_text)
+        cache_dir = tmp_path / "cache"
+
+        for save_archives in (True, False):
+            downloader = self.make_downloader(tmp_path, host, save_archives=save_archives)
+            df = downloader.fetch_tick_data_for_day('EURUSD', DAY, 'Exness-MT5Real', cache_dir=str(cache_dir))
+
+            expected = pd.read_csv(io.StringIO(csv_text))
+            expected_times = pd.to_datetime(expected['Timestamp'], utc=True)
+            assert len(df) == ((expected_times >= DAY) & (expected_times < DAY + timedelta(days=1))).sum()
+            assert df['time'].min() >= DAY
+            assert df['time'].max() < DAY + timedelta(days=1)
+
+        cached = downloader._get_tick_cache_path('EURUSD', DAY, mt5.COPY_TICKS_INFO, str(cache_dir))
+        assert pq.read_metadata(cached).num_rows == len(df)
+        assert not downloader._get_tick_cache_path('EURUSD', DAY - timedelta(days=1), mt5.COPY_TICKS_INFO,
+                                                   str(cache_dir)).exists()
+        assert (tmp_path / "archives" / "EURUSD_2025_01_06.zip").exists()
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
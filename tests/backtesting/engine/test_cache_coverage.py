@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Tests for parallel cache coverage validation.
+
+The coverage matrix must classify every (symbol, day, timeframe) as
+ok/stale/missing, and footers must be read once per (path, mtime, size).
+"""
+
+import os
+
+import pytest
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from datetime import datetime, timezone, timedelta
+from pathlib import Path
+from unittest.mock import patch
+
+# Add project root to path
+import sys
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.backtesting.engine.cache_coverage import (
+    CacheCoverageValidator, MISSING, OK, STALE, summarize_coverage
+)
+from src.backtesting.engine.data_cache import DataCache
+
+
+START = datetime(2025, 4, 7, tzinfo=timezone.utc)
+
+
+def write_day(validator, symbol, timeframe, day, cached_at=None, with_metadata=True):
+    """Write one daily candle file, optionally without cache metadata."""
+    data = pd.DataFrame({
+        'time': pd.date_range(day, periods=10, freq='1min'),
+        'open': [1.1] * 10, 'high': [1.1] * 10, 'low': [1.1] * 10, 'close': [1.1] * 10,
+        'tick_volume': [1] * 10, 'spread': [2] * 10, 'real_volume': [0] * 10
+    })
+    path = validator.file_path(day.date(), symbol, timeframe)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    table = pa.Table.from_pandas(data, preserve_index=False)
+    if with_metadata:
+        table = table.replace_schema_metadata({
+            b'cache_version': b'1.0',
+            b'cached_at': (cached_at or datetime.now(timezone.utc)).isoformat().encode(),
+            b'first_data_time': data['time'].iloc[0].isoformat().encode(),
+        })
+    pq.write_table(table, path)
+    return path
+
+
+class TestCacheCoverage:
+    """Tests for CacheCoverageValidator and its DataCache integration."""
+
+    def test_coverage_matrix_statuses(self, tmp_path):
+        """Fresh, expired, metadata-less and absent files map to ok/stale/missing."""
+        validator = CacheCoverageValidator(str(tmp_path), cache_ttl_days=7, max_workers=4)
+        old = datetime.now(timezone.utc) - timedelta(days=30)
+        for d in range(3):
+            write_day(validator, 'EURUSD', 'M1', START + timedelta(days=d))
+        write_day(validator, 'EURUSD', 'H4', START, cached_at=old)
+        write_day(validator, 'EURUSD', 'H4', START + timedelta(days=1), with_metadata=False)
+
+        matrix = validator.coverage_matrix(['EURUSD', 'GBPUSD'], ['M1', 'H4'], START, START + timedelta(days=2))
+
+        day0, day1, day2 = (START.date() + timedelta(days=d) for d in range(3))
+        assert matrix['EURUSD'][day0] == {'M1': OK, 'H4': STALE}
+        assert matrix['EURUSD'][day1] == {'M1': OK, 'H4': MISSING}
+        assert matrix['EURUSD'][day2] == {'M1': OK, 'H4': MISSING}
+        assert all(status == MISSING for statuses in matrix['GBPUSD'].values() for status in statuses.values())
+
+        counts = summarize_coverage(matrix)
+        assert counts[('EURUSD', 'M1')] == {OK: 3, STALE: 0, MISSING: 0}
+        assert counts[('EURUSD', 'H4')] == {OK: 0, STALE: 1, MISSING: 2}
+
+    def test_footers_memoized_by_mtime_and_size(self, tmp_path):
+        """Unchanged files are not read again; a rewritten file is."""
+        validator = CacheCoverageValidator(str(tmp_path), max_workers=4)
+        paths = [write_day(validator, 'EURUSD', 'M1', START + timedelta(days=d)) for d in range(5)]
+
+        with patch('pyarrow.parquet.read_schema', wraps=pq.read_schema) as reads:
+            first = validator.read_footers(paths)
+            assert reads.call_count == 5
+
+            validator.read_footers(paths)
+            assert reads.call_count == 5
+
+            old = datetime.now(timezone.utc) - timedelta(days=30)
+            write_day(validator, 'EURUSD', 'M1', START, cached_at=old)
+            os.utime(paths[0], ns=(1, 1))
+            second = validator.read_footers(paths)
+            assert reads.call_count == 6
+
+        assert first[paths[0]]['cached_at'] != second[paths[0]]['cached_at']
+        assert validator.classify(second[paths[0]]) == STALE
+
+    def test_partial_load_reuses_coverage_pass(self, tmp_path):
+        """load_from_cache_partial after get_coverage_matrix reads no footer again."""
+        cache = DataCache(str(tmp_path), use_index=False)
+        for d in range(4):
+            write_day(cache.coverage, 'EURUSD', 'M5', START + timedelta(days=d))
+        end = START + timedelta(days=5, hours=23)
+
+        matrix = cache.get_coverage_matrix(['EURUSD'], ['M5'], START, end)
+        assert summarize_coverage(matrix)[('EURUSD', 'M5')] == {OK: 4, STALE: 0, MISSING: 2}
+
+        with patch.object(CacheCoverageValidator, '_read', side_effect=AssertionError("footer read")):
+            cached_df, missing_days, _ = cache.load_from_cache_partial('EURUSD', 'M5', START, end)
+
+        assert len(cached_df) == 4 * 10
+        assert [day.date() for day in missing_days] == [(START + timedelta(days=d)).date() for d in (4, 5)]
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Tests for the SQLite cache index.
+
+The index must keep per-day file metadata, answer coverage validation
+without reading cache files, rebuild incrementally and import the previous
+JSON index.
+"""
+
+import json
+import os
+
+import pytest
+import pandas as pd
+from datetime import datetime, date, timezone, timedelta
+from pathlib import Path
+from unittest.mock import patch
+
+# Add project root to path
+import sys
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.backtesting.engine.cache_index import CacheIndex
+from src.backtesting.engine.data_cache import DataCache
+
+
+START = datetime(2025, 3, 3, tzinfo=timezone.utc)
+
+
+def create_bars(day, num_bars=60):
+    """Create M1 bars for one day."""
+    return pd.DataFrame({
+        'time': pd.date_range(day, periods=num_bars, freq='1min'),
+        'open': [1.1000] * num_bars,
+        'high': [1.1010] * num_bars,
+        'low': [1.0990] * num_bars,
+        'close': [1.1005] * num_bars,
+        'tick_volume': [100] * num_bars,
+        'spread': [2] * num_bars,
+        'real_volume': [0] * num_bars
+    })
+
+
+def populate(cache, days=5, symbol='EURUSD'):
+    """Save one file per day through DataCache."""
+    for offset in range(days):
+        day = START + timedelta(days=offset)
+        cache.save_to_cache(symbol, 'M1', day, day.replace(hour=23, minute=59), create_bars(day),
+                            {'name': symbol, 'digits': 5, 'point': 0.00001})
+
+
+class TestCacheIndex:
+    """Tests for CacheIndex and the index-backed DataCache validation."""
+
+    def test_saved_days_carry_metadata(self, tmp_path):
+        """save_to_cache records row count, data times, cached_at and file size per day."""
+        cache = DataCache(str(tmp_path), use_index=True)
+        populate(cache)
+
+        records = cache.index.get_day_records('EURUSD', 'M1', START.date(), (START + timedelta(days=2)).date())
+
+        assert sorted(records) == [(START + timedelta(days=d)).date() for d in range(3)]
+        record = records[START.date()]
+        assert record['row_count'] == 60
+        assert datetime.fromisoformat(record['first_data_time']) == START
+        assert datetime.fromisoformat(record['last_data_time']) == START + timedelta(minutes=59)
+        assert record['cached_at'] is not None
+        assert record['file_size'] == cache._get_day_cache_path(START, 'EURUSD', 'M1').stat().st_size
+        assert (tmp_path / CacheIndex.INDEX_FILE).exists()
+
+    def test_validation_does_not_read_files(self, tmp_path):
+        """Indexed days validate without touching cache files; TTL still applies."""
+        cache = DataCache(str(tmp_path), use_index=True, cache_ttl_days=7)
+        populate(cache)
+        end = START + timedelta(days=4, hours=23)
+
+        with patch.object(DataCache, '_read_cache_metadata', side_effect=AssertionError("file read")), \
+                patch.object(DataCache, '_get_day_cache_path', side_effect=AssertionError("file path")):
+            assert cache.validate_cache_coverage('EURUSD', 'M1', START, end) == (True, None)
+
+        expired = (datetime.now(timezone.utc) - timedelta(days=10)).isoformat()
+        cache.index.record_days('EURUSD', 'M1', [(START.date(), {'cached_at': expired}, None)])
+        is_valid, reason = cache.validate_cache_coverage('EURUSD', 'M1', START, end)
+        assert not is_valid
+        assert 'expired' in reason
+
+    def test_unindexed_days_are_backfilled(self, tmp_path):
+        """Days known only on disk are validated from the file and then recorded."""
+        populate(DataCache(str(tmp_path), use_index=False))
+        cache = DataCache(str(tmp_path), use_index=True)
+        end = START + timedelta(days=4, hours=23)
+
+        assert cache.index.get_day_records('EURUSD', 'M1', START.date(), end.date()) == {}
+        assert cache.validate_cache_coverage('EURUSD', 'M1', START, end) == (True, None)
+        assert len(cache.index.get_day_records('EURUSD', 'M1', START.date(), end.date())) == 5
+
+    def test_rebuild_is_incremental(self, tmp_path):
+        """Rebuild reads footers of new/changed files only and drops deleted files."""
+        cache = DataCache(str(tmp_path), use_index=True)
+        populate(cache)
+        index = cache.index
+        index.clear_all()
+        index.rebuild_index()
+        assert len(index.get_cached_days('EURUSD', 'M1')) == 5
+
+        changed = cache._get_day_cache_path(START, 'EURUSD', 'M1')
+        create_bars(START, num_bars=30).to_parquet(changed, index=False)
+        os.utime(changed, ns=(1, 1))
+        cache._get_day_cache_path(START + timedelta(days=4), 'EURUSD', 'M1').unlink()
+
+        with patch.object(CacheIndex, '_read_file_metadata', wraps=CacheIndex._read_file_metadata) as reads:
+            index.rebuild_index()
+
+        assert [call.args[0] for call in reads.call_args_list] == [changed]
+        assert index.get_cached_days('EURUSD', 'M1') == {(START + timedelta(days=d)).date() for d in range(4)}
+        # The rewritten file has no cache metadata
+        assert index.get_day_records('EURUSD', 'M1', START.date(), START.date())[START.date()]['cached_at'] is None
+
+    def test_imports_legacy_json_index(self, tmp_path):
+        """Days of an existing cache_index.json are imported when the database is created."""
+        legacy = {'GBPUSD': {'ticks': {'cached_days': ['2025-01-02', '2025-01-03'],
+                                       'last_updated': '2025-01-04T00:00:00+00:00'}}}
+        (tmp_path / CacheIndex.LEGACY_INDEX_FILE).write_text(json.dumps(legacy))
+
+        index = CacheIndex(str(tmp_path))
+
+        assert index.get_cached_days('GBPUSD', 'ticks') == {date(2025, 1, 2), date(2025, 1, 3)}
+        assert index.get_stats() == {'total_symbols': 1, 'total_days': 2, 'symbols': {'GBPUSD': 2}}
+
+    def test_shared_between_instances(self, tmp_path):
+        """Writes of one index instance are visible to another (WAL database)."""
+        writer = CacheIndex(str(tmp_path))
+        reader = CacheIndex(str(tmp_path))
+
+        writer.add_cached_days('EURUSD', 'ticks', [date(2025, 1, 2)])
+
+        assert reader.get_cached_days('EURUSD', 'ticks') == {date(2025, 1, 2)}
+        assert writer._conn.execute("PRAGMA journal_mode").fetchone()[0] == 'wal'
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
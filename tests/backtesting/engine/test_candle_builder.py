@@ -0,0 +1,350 @@
+#!/usr/bin/env python3
+"""
+Tests for MultiTimeframeCandleBuilder.
+
+Lazy mode must produce bit-identical candles to eager mode, no matter when
+candles are read (every fold boundary is a potential divergence point).
+The NumPy candle store must return the same DataFrames as the previous
+list-of-CandleData implementation.
+"""
+
+import pytest
+import numpy as np
+import pandas as pd
+from datetime import datetime, timezone, timedelta
+from pathlib import Path
+
+# Add project root to path
+import sys
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.backtesting.engine.candle_builder import CandleRingBuffer, MultiTimeframeCandleBuilder
+from src.models.models.candle_models import CandleArrays, CandleData
+
+
+TIMEFRAMES = ['M1', 'M5', 'M15', 'H1', 'H4']
+
+
+def generate_ticks(seed, count, start=datetime(2025, 1, 6, 21, 0, tzinfo=timezone.utc)):
+    """Generate chronologically-sorted random ticks spanning several days (with gaps)."""
+    rng = np.random.default_rng(seed)
+    # Mostly sub-second spacing with occasional multi-hour gaps (weekend/session gaps)
+    gaps_us = rng.exponential(400_000, size=count).astype(np.int64)
+    gaps_us[rng.random(count) < 0.0005] += 6 * 3600 * 1_000_000
+    times_us = np.cumsum(gaps_us)
+    prices = 1.1 + np.cumsum(rng.normal(0, 0.00005, size=count))
+    volumes = rng.integers(0, 20, size=count)
+    return [
+        (float(p), int(v), start + timedelta(microseconds=int(t)))
+        for t, p, v in zip(times_us, prices, volumes)
+    ]
+
+
+def snapshot(builder):
+    """Capture everything a strategy can read from a builder."""
+    state = {}
+    for tf in TIMEFRAMES:
+        df = builder.get_candles(tf, count=10_000)
+        latest = builder.get_latest_candle(tf)
+        current = builder.get_current_candle(tf)
+        state[tf] = (
+            None if df is None else df.copy(),
+            None if latest is None else (latest.time, latest.open, latest.high, latest.low, latest.close, latest.volume),
+            None if current is None else (current.time, current.open, current.high, current.low, current.close, current.volume),
+        )
+    return state
+
+
+def assert_same_state(eager_state, lazy_state):
+    """Assert two snapshots are identical (values, dtypes and tzinfo)."""
+    for tf in TIMEFRAMES:
+        eager_df, eager_latest, eager_current = eager_state[tf]
+        lazy_df, lazy_latest, lazy_current = lazy_state[tf]
+        if eager_df is None:
+            assert lazy_df is None
+        else:
+            pd.testing.assert_frame_equal(eager_df, lazy_df, check_exact=True)
+            assert [t.tzinfo for t in eager_df['time']] == [t.tzinfo for t in lazy_df['time']]
+        assert eager_latest == lazy_latest
+        assert eager_current == lazy_current
+
+
+class TestLazyCandleBuilder:
+    """Lazy mode equivalence tests."""
+
+    @pytest.mark.parametrize("seed", [1, 2, 3])
+    def test_lazy_matches_eager_read_at_end(self, seed):
+        """Reading only once at the end gives identical candles."""
+        ticks = generate_ticks(seed, 20_000)
+        eager = MultiTimeframeCandleBuilder('EURUSD', TIMEFRAMES)
+        lazy = MultiTimeframeCandleBuilder('EURUSD', TIMEFRAMES, lazy=True)
+
+        for price, volume, tick_time in ticks:
+            eager.add_tick(price, volume, tick_time)
+            lazy.add_tick(price, volume, tick_time)
+
+        assert_same_state(snapshot(eager), snapshot(lazy))
+
+    def test_lazy_matches_eager_with_interleaved_reads(self):
+        """Reading at random points (mid-candle folds) gives identical candles."""
+        ticks = generate_ticks(7, 15_000)
+        rng = np.random.default_rng(7)
+        read_points = set(rng.integers(0, len(ticks), size=200).tolist())
+
+        eager = MultiTimeframeCandleBuilder('EURUSD', TIMEFRAMES)
+        lazy = MultiTimeframeCandleBuilder('EURUSD', TIMEFRAMES, lazy=True)
+
+        for i, (price, volume, tick_time) in enumerate(ticks):
+            eager.add_tick(price, volume, tick_time)
+            lazy.add_tick(price, volume, tick_time)
+            if i in read_points:
+                assert_same_state(snapshot(eager), snapshot(lazy))
+
+        assert_same_state(snapshot(eager), snapshot(lazy))
+
+    def test_ring_capacity_auto_fold(self, monkeypatch):
+        """Automatic folds when the ring is full do not change results."""
+        monkeypatch.setattr(MultiTimeframeCandleBuilder, 'LAZY_RING_CAPACITY', 97)
+        ticks = generate_ticks(11, 5_000)
+
+        eager = MultiTimeframeCandleBuilder('EURUSD', TIMEFRAMES)
+        lazy = MultiTimeframeCandleBuilder('EURUSD', TIMEFRAMES, lazy=True)
+
+        for price, volume, tick_time in ticks:
+            eager.add_tick(price, volume, tick_time)
+            lazy.add_tick(price, volume, tick_time)
+
+        assert len(lazy._ring_price) < 97
+        assert_same_state(snapshot(eager), snapshot(lazy))
+
+    def test_new_candle_events_match_for_subscribed_timeframes(self):
+        """add_tick() reports the same boundary crossings for subscribed timeframes."""
+        ticks = generate_ticks(5, 10_000)
+
+        eager = MultiTimeframeCandleBuilder('EURUSD', TIMEFRAMES)
+        lazy = MultiTimeframeCandleBuilder('EURUSD', TIMEFRAMES, lazy=True)
+        lazy.set_subscribed_timeframes(['M5', 'H1'])
+
+        for price, volume, tick_time in ticks:
+            eager_new = set(eager.add_tick(price, volume, tick_time))
+            lazy_new = set(lazy.add_tick(price, volume, tick_time))
+            assert lazy_new == eager_new & {'M5', 'H1'}
+
+    def test_all_timeframes_subscribed_by_default(self):
+        """Without explicit subscription lazy mode reports every boundary like eager mode."""
+        ticks = generate_ticks(9, 5_000)
+
+        eager = MultiTimeframeCandleBuilder('EURUSD', TIMEFRAMES)
+        lazy = MultiTimeframeCandleBuilder('EURUSD', TIMEFRAMES, lazy=True)
+
+        for price, volume, tick_time in ticks:
+            assert set(lazy.add_tick(price, volume, tick_time)) == set(eager.add_tick(price, volume, tick_time))
+
+    def test_no_subscription_reports_nothing_but_builds_candles(self):
+        """Tick-only subscriptions skip boundary detection but candles are still built."""
+        ticks = generate_ticks(4, 3_000)
+
+        eager = MultiTimeframeCandleBuilder('EURUSD', TIMEFRAMES)
+        lazy = MultiTimeframeCandleBuilder('EURUSD', TIMEFRAMES, lazy=True)
+        lazy.set_subscribed_timeframes(None)
+
+        for price, volume, tick_time in ticks:
+            eager.add_tick(price, volume, tick_time)
+            assert not lazy.add_tick(price, volume, tick_time)
+
+        assert_same_state(snapshot(eager), snapshot(lazy))
+
+    def test_seeded_history_is_preserved(self):
+        """Seeded historical candles come before tick-built candles in lazy mode."""
+        start = datetime(2025, 1, 6, 10, 0, tzinfo=timezone.utc)
+        history = pd.DataFrame({
+            'time': [start - timedelta(minutes=5 * i) for i in range(3, 0, -1)],
+            'open': [1.1, 1.2, 1.3],
+            'high': [1.15, 1.25, 1.35],
+            'low': [1.05, 1.15, 1.25],
+            'close': [1.12, 1.22, 1.32],
+            'tick_volume': [10, 20, 30],
+        })
+        ticks = generate_ticks(3, 2_000, start=start)
+
+        eager = MultiTimeframeCandleBuilder('EURUSD', ['M5'])
+        lazy = MultiTimeframeCandleBuilder('EURUSD', ['M5'], lazy=True)
+        eager.seed_historical_candles('M5', history)
+        lazy.seed_historical_candles('M5', history)
+
+        for price, volume, tick_time in ticks:
+            eager.add_tick(price, volume, tick_time)
+            lazy.add_tick(price, volume, tick_time)
+
+        pd.testing.assert_frame_equal(eager.get_candles('M5', 500), lazy.get_candles('M5', 500), check_exact=True)
+        assert lazy.get_candles('M5', 500)['open'].iloc[0] == 1.1
+
+    def test_non_intraday_timeframe_falls_back_to_eager(self):
+        """Timeframes that do not divide a day keep eager mode."""
+        builder = MultiTimeframeCandleBuilder('EURUSD', ['M1', 'W1'], lazy=True)
+        assert builder.lazy is False
+
+
+class TestIntegerTime:
+    """add_tick_ns() equivalence with datetime add_tick()."""
+
+    @staticmethod
+    def to_ns(tick_time):
+        return int(pd.Timestamp(tick_time).value)
+
+    @pytest.mark.parametrize("lazy", [False, True])
+    def test_add_tick_ns_matches_add_tick(self, lazy):
+        """Epoch-ns ticks give the same candles and new-candle events as datetimes."""
+        ticks = generate_ticks(13, 10_000)
+        reference = MultiTimeframeCandleBuilder('EURUSD', TIMEFRAMES)
+        builder = MultiTimeframeCandleBuilder('EURUSD', TIMEFRAMES, lazy=lazy)
+
+        for price, volume, tick_time in ticks:
+            expected = set(reference.add_tick(price, volume, tick_time))
+            assert set(builder.add_tick_ns(price, volume, self.to_ns(tick_time))) == expected
+
+        assert_same_state(snapshot(reference), snapshot(builder))
+
+    def test_mixed_calls_and_daily_timeframes(self):
+        """Alternating add_tick()/add_tick_ns() keeps one consistent open candle, D1/W1 included."""
+        timeframes = ['M1', 'M7', 'D1', 'W1']
+        ticks = generate_ticks(17, 8_000)
+        reference = MultiTimeframeCandleBuilder('EURUSD', timeframes)
+        builder = MultiTimeframeCandleBuilder('EURUSD', timeframes)
+
+        for i, (price, volume, tick_time) in enumerate(ticks):
+            expected = set(reference.add_tick(price, volume, tick_time))
+            if i % 3 == 0:
+                actual = set(builder.add_tick(price, volume, tick_time))
+            else:
+                actual = set(builder.add_tick_ns(price, volume, self.to_ns(tick_time)))
+            assert actual == expected
+
+        assert builder.get_candles('W1', 10_000) is None  # Still in the first week
+        for tf in ['M1', 'M7', 'D1']:
+            pd.testing.assert_frame_equal(reference.get_candles(tf, 10_000), builder.get_candles(tf, 10_000),
+                                          check_exact=True)
+        for tf in timeframes:
+            assert reference.get_current_candle(tf) == builder.get_current_candle(tf)
+
+
+def make_candles(count, start=datetime(2025, 1, 6, tzinfo=timezone.utc)):
+    """Create count consecutive M5 CandleData objects."""
+    rng = np.random.default_rng(count)
+    opens = 1.1 + rng.normal(0, 0.001, size=count)
+    return [
+        CandleData(time=start + timedelta(minutes=5 * i), open=float(o), high=float(o) + 0.001,
+                   low=float(o) - 0.001, close=float(o) + 0.0005, volume=int(i))
+        for i, o in enumerate(opens)
+    ]
+
+
+def list_dataframe(candles):
+    """Build a get_candles() DataFrame the way the list-based store did."""
+    return pd.DataFrame({
+        'time': np.array([c.time for c in candles], dtype=object),
+        'open': np.array([c.open for c in candles], dtype=np.float64),
+        'high': np.array([c.high for c in candles], dtype=np.float64),
+        'low': np.array([c.low for c in candles], dtype=np.float64),
+        'close': np.array([c.close for c in candles], dtype=np.float64),
+        'tick_volume': np.array([c.volume for c in candles], dtype=np.int64),
+    })
+
+
+class TestCandleRingBuffer:
+    """Tests for the structured NumPy candle store."""
+
+    def test_tail_dataframe_matches_list_implementation(self, monkeypatch):
+        """Tail slices equal the list-based DataFrame across storage growth."""
+        monkeypatch.setattr(CandleRingBuffer, 'INITIAL_CAPACITY', 8)
+        candles = make_candles(100)
+        ring = CandleRingBuffer()
+
+        for i, candle in enumerate(candles, start=1):
+            ring.append(candle)
+            for count in (1, 2, 7, 50, 1000):
+                expected = list_dataframe(candles[:i][-count:])
+                pd.testing.assert_frame_equal(ring.tail_dataframe(count), expected, check_exact=True)
+
+        assert len(ring) == 100
+        assert ring.appended == 100
+        assert ring[-1] == candles[-1]
+        assert ring[0] == candles[0]
+        with pytest.raises(IndexError):
+            ring[100]
+
+    def test_max_length_drops_oldest(self):
+        """A bounded store keeps only the newest max_length candles."""
+        candles = make_candles(250)
+        ring = CandleRingBuffer(max_length=40)
+
+        for i, candle in enumerate(candles, start=1):
+            ring.append(candle)
+            assert len(ring) == min(i, 40)
+            pd.testing.assert_frame_equal(ring.tail_dataframe(1000), list_dataframe(candles[:i][-40:]),
+                                          check_exact=True)
+
+        assert ring.appended == 250
+        assert len(ring._data) <= 80
+
+    def test_tail_arrays_are_views(self):
+        """tail_arrays() returns zero-copy views with the DataFrame's values."""
+        candles = make_candles(30)
+        ring = CandleRingBuffer()
+        for candle in candles:
+            ring.append(candle)
+
+        arrays = ring.tail_arrays(5)
+        df = ring.tail_dataframe(5)
+
+        assert len(arrays) == 5
+        assert np.shares_memory(arrays.open, ring._data)
+        assert list(arrays['close']) == list(df['close'])
+        assert list(arrays.tick_volume) == list(df['tick_volume'])
+        assert arrays.row(-2)['time'] == candles[-2].time
+        assert arrays.candle(-1) == candles[-1]
+
+
+class TestCandleArrays:
+    """Tests for the array view returned by get_candle_arrays()."""
+
+    def test_builder_arrays_match_dataframe(self):
+        """get_candle_arrays() returns the same candles as get_candles()."""
+        ticks = generate_ticks(21, 5_000)
+        builder = MultiTimeframeCandleBuilder('EURUSD', TIMEFRAMES, lazy=True)
+        for price, volume, tick_time in ticks:
+            builder.add_tick(price, volume, tick_time)
+
+        for tf in TIMEFRAMES:
+            df = builder.get_candles(tf, count=2)
+            arrays = builder.get_candle_arrays(tf, count=2)
+            assert len(arrays) == len(df)
+            for i in range(len(df)):
+                row = arrays.row(i)
+                expected = df.iloc[i]
+                assert row['time'] == expected['time'].to_pydatetime()
+                assert row['open'] == expected['open']
+                assert row['high'] == expected['high']
+                assert row['low'] == expected['low']
+                assert row['close'] == expected['close']
+                assert row['tick_volume'] == expected['tick_volume']
+
+        assert builder.get_candle_arrays('D1', count=2) is None
+
+    def test_from_dataframe(self):
+        """DataFrame fallback converts times to timezone-aware datetimes."""
+        candles = make_candles(3)
+        df = list_dataframe(candles)
+        df['time'] = pd.to_datetime(df['time'], utc=True).dt.tz_localize(None)
+
+        arrays = CandleArrays.from_dataframe(df)
+
+        assert len(arrays) == 3
+        assert arrays.candle(-1) == candles[-1]
+        with pytest.raises(KeyError):
+            arrays['spread']
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Tests for mid-run checkpoints.
+
+A run resumed from a checkpoint must produce exactly the trades of an
+uninterrupted run (same approach as tests/test_backtest_reproducibility.py:
+identical inputs, compare the trade lists), and a checkpoint must only be
+applied to the run it was written for.
+"""
+
+import threading
+
+import pytest
+from pathlib import Path
+
+# Add project root to path
+import sys
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+import src.backtesting.engine.backtest_controller as backtest_controller
+import src.backtesting.engine.checkpoint as checkpoint_module
+from src.backtesting.engine.checkpoint import BacktestCheckpoint
+from tests.backtesting.engine.replay_harness import (
+    START, ReferenceStrategy, RiskManagerStub, build_controller, new_broker
+)
+
+
+SYMBOLS = ['EURUSD', 'GBPUSD']
+
+
+class TradingControllerStub:
+    """Holds the strategies like TradingController.strategies."""
+
+    def __init__(self, strategies):
+        self.strategies = strategies
+        self.lock = threading.Lock()
+
+
+def new_run():
+    """Freshly wired run: data loaded, strategies initialized, candles seeded."""
+    broker = new_broker(SYMBOLS)
+    risk_manager = RiskManagerStub(lot_size=0.01)
+    broker.set_start_time(START)
+    strategies = {symbol: ReferenceStrategy(broker, risk_manager, symbol, pause_every=3) for symbol in SYMBOLS}
+    for strategy in strategies.values():
+        assert strategy.initialize()
+    broker.load_tick_timeline(broker.global_tick_timeline, ['M1', 'M5'])
+    return broker, risk_manager, TradingControllerStub(strategies)
+
+
+def replay(broker, trading_controller, run_dir, event_skipping=False, checkpoint=None, resume_tick_index=0):
+    """Run the sequential loop and return the closed trades."""
+    controller = build_controller(broker, run_dir, event_skipping=event_skipping, show_progress=False,
+                                  checkpoint=checkpoint, resume_tick_index=resume_tick_index)
+    controller._process_ticks_sequential(broker.global_tick_timeline, trading_controller.strategies)
+    return [(t['symbol'], t['type'], t['open_price'], t['close_price'], t['close_time'], t['volume'])
+            for t in broker.closed_trades]
+
+
+def attach(checkpoint, broker, risk_manager, trading_controller):
+    """Register the run's components with the checkpoint."""
+    checkpoint.attach(broker=broker, risk_manager=risk_manager, trading_controller=trading_controller)
+    return checkpoint
+
+
+class TestBacktestCheckpoint:
+    """Tests for BacktestCheckpoint."""
+
+    @pytest.mark.parametrize('event_skipping', [False, True])
+    def test_resumed_run_matches_uninterrupted_run(self, tmp_path, monkeypatch, event_skipping):
+        """Resuming from the last checkpoint gives the trades of a run without interruption."""
+        monkeypatch.setattr(backtest_controller, 'RICH_AVAILABLE', False)
+        path = tmp_path / 'run.ckpt'
+
+        broker, risk_manager, trading_controller = new_run()
+        checkpoint = attach(BacktestCheckpoint(path, 'key', every_ticks=1_500),
+                            broker, risk_manager, trading_controller)
+        full_trades = replay(broker, trading_controller, tmp_path / 'full', event_skipping, checkpoint)
+        assert checkpoint.saved_count >= 2
+        assert len(full_trades) > 10
+
+        # "Interrupted" run: a fresh process wires the same run and resumes
+        broker, risk_manager, trading_controller = new_run()
+        resumed = attach(BacktestCheckpoint(path, 'key'), broker, risk_manager, trading_controller)
+        resume_index = resumed.restore()
+        assert 0 < resume_index < len(broker.global_tick_timeline)
+        assert broker.closed_trades  # Trades before the checkpoint are restored
+
+        strategy = trading_controller.strategies['EURUSD']
+        assert strategy.broker is broker
+        assert strategy.risk_manager is risk_manager
+        assert broker.global_tick_timeline is resumed.references['timeline']
+
+        assert replay(broker, trading_controller, tmp_path / 'resumed', event_skipping,
+                      resume_tick_index=resume_index) == full_trades
+
+    def test_other_run_is_not_resumed(self, tmp_path):
+        """A checkpoint written under another run key leaves the components untouched."""
+        broker, risk_manager, trading_controller = new_run()
+        checkpoint = attach(BacktestCheckpoint(tmp_path / 'run.ckpt', 'key'), broker, risk_manager, trading_controller)
+        broker.balance += 100.0
+        assert checkpoint.save(123)
+
+        broker, risk_manager, trading_controller = new_run()
+        other = attach(BacktestCheckpoint(tmp_path / 'run.ckpt', 'other'), broker, risk_manager, trading_controller)
+        assert other.restore() == 0
+        assert broker.balance == broker.initial_balance
+
+        assert BacktestCheckpoint(tmp_path / 'missing.ckpt', 'key').restore() == 0
+
+    def test_locks_and_static_data(self, tmp_path):
+        """Locks become new locks; loaded market data is not written to the checkpoint."""
+        broker, risk_manager, trading_controller = new_run()
+        checkpoint = attach(BacktestCheckpoint(tmp_path / 'run.ckpt', 'key'), broker, risk_manager, trading_controller)
+
+        state = checkpoint._component_state('broker', broker)
+        assert 'symbol_data' not in state and 'global_tick_timeline' not in state
+
+        trading_controller.lock.acquire()
+        assert checkpoint.save(1)
+        trading_controller.lock.release()
+
+        lock = trading_controller.lock
+        assert checkpoint.restore() == 1
+        assert trading_controller.lock is not lock
+        assert trading_controller.lock.acquire(blocking=False)
+        assert broker.symbol_data  # Kept from the live broker
+
+    def test_due(self, monkeypatch):
+        """Tick and wall-time intervals."""
+        checkpoint = BacktestCheckpoint('unused', 'key', every_ticks=100)
+        assert not checkpoint.due(99)
+        assert checkpoint.due(100)
+
+        clock = [0.0]
+        monkeypatch.setattr(checkpoint_module.time, 'monotonic', lambda: clock[0])
+        checkpoint = BacktestCheckpoint('unused', 'key', every_minutes=1)
+        clock[0] = 61.0
+        assert not any(checkpoint.due(i) for i in range(1, 1024))
+        assert checkpoint.due(1024)  # Wall clock read every 1024 calls
+
+    def test_run_key(self):
+        """Keys depend on symbols (not their order), range, tick count and settings."""
+        end = START.replace(day=7)
+        key = BacktestCheckpoint.run_key(SYMBOLS, START, end, 1_000, initial_balance=1000.0)
+
+        assert key == BacktestCheckpoint.run_key(SYMBOLS[::-1], START, end, 1_000, initial_balance=1000.0)
+        assert key != BacktestCheckpoint.run_key(SYMBOLS, START, end, 1_001, initial_balance=1000.0)
+        assert key != BacktestCheckpoint.run_key(SYMBOLS, START, end, 1_000, initial_balance=2000.0)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
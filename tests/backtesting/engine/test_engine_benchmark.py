@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Tests for the engine throughput benchmark.
+
+Results must round-trip through BenchmarkStore keyed by commit, comparisons
+must flag only metrics that got worse beyond the threshold, and a tiny
+in-process run must produce every metric.
+"""
+
+import pytest
+from datetime import datetime, timezone
+from pathlib import Path
+
+# Add project root to path
+import sys
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.backtesting.engine.engine_benchmark import (
+    BenchmarkSettings, BenchmarkStore, EngineBenchmark, METRIC_DIRECTIONS,
+    compare_results, format_comparison, tps_targets
+)
+
+
+def make_results(commit, tps, rss=500.0, p50=20.0):
+    """Results dictionary with one combined in-memory case."""
+    return {
+        'commit': commit,
+        'dirty': False,
+        'recorded_at': datetime.now(timezone.utc).isoformat(),
+        'cases': {
+            'in_memory/combined/1sym': {
+                'ticks_per_sec': tps,
+                'peak_rss_mb': rss,
+                'time_to_first_tick_sec': 1.0,
+                'get_candles_p50_us': p50,
+                'get_candles_p99_us': 2 * p50,
+            },
+        },
+    }
+
+
+class TestEngineBenchmark:
+    """Tests for EngineBenchmark, BenchmarkStore and compare_results."""
+
+    def test_store_keyed_by_commit(self, tmp_path):
+        """Entries are stored per commit, looked up by prefix and re-runs replace their entry."""
+        store = BenchmarkStore(str(tmp_path / "bench.json"))
+        store.save(make_results('aaaa1111', 10_000))
+        store.save(make_results('bbbb2222', 12_000))
+        store.save(make_results('aaaa1111', 11_000))
+
+        assert list(store.load()) == ['aaaa1111', 'bbbb2222']
+        assert store.get('aaaa')['cases']['in_memory/combined/1sym']['ticks_per_sec'] == 11_000
+        assert store.previous('bbbb')['commit'] == 'aaaa1111'
+        assert store.previous('aaaa') is None
+        with pytest.raises(KeyError):
+            store.get('cccc')
+
+    def test_compare_flags_regressions(self):
+        """Lower tps and higher RSS/latency beyond the threshold are regressions; improvements are not."""
+        baseline = make_results('aaaa', 20_000, rss=500.0, p50=20.0)
+        current = make_results('bbbb', 17_000, rss=520.0, p50=10.0)
+
+        rows = {row['metric']: row for row in compare_results(baseline, current, threshold=0.10)}
+
+        assert set(rows) == set(METRIC_DIRECTIONS)
+        assert rows['ticks_per_sec']['regression']            # -15%
+        assert not rows['peak_rss_mb']['regression']          # +4%, within threshold
+        assert not rows['get_candles_p50_us']['regression']   # faster
+        assert rows['ticks_per_sec']['change'] == pytest.approx(-0.15)
+        assert "1 regression(s) beyond 10%" in format_comparison(list(rows.values()), 0.10)
+
+    def test_tps_targets(self):
+        """Roadmap phases whose ticks/sec target the combined run reaches."""
+        reached = tps_targets(make_results('aaaa', 25_000))
+
+        assert reached['in_memory/combined/1sym']['reached'] == ['Phase 4', 'Phase 5A']
+
+    def test_cases(self, tmp_path):
+        """Every strategy set at every symbol count, plus streamed combined runs."""
+        settings = BenchmarkSettings(symbol_counts=(1, 10), strategies=('fakeout', 'combined'))
+        names = [case.name for case in EngineBenchmark(str(tmp_path), settings).cases()]
+
+        assert names == ['in_memory/fakeout/1sym', 'in_memory/fakeout/10sym',
+                         'in_memory/combined/1sym', 'in_memory/combined/10sym',
+                         'streaming/combined/1sym', 'streaming/combined/10sym']
+        with pytest.raises(ValueError):
+            EngineBenchmark(str(tmp_path), BenchmarkSettings(strategies=('unknown',)))
+
+    def test_small_run(self, tmp_path):
+        """A one-symbol, one-day run in this process reports every metric for both loading modes."""
+        settings = BenchmarkSettings(days=1, history_days=3, ticks_per_hour=300, symbol_counts=(1,),
+                                     strategies=('combined',), candle_calls=20)
+        benchmark = EngineBenchmark(str(tmp_path), settings, isolate=False)
+
+        results = benchmark.run()
+
+        assert set(results['cases']) == {'in_memory/combined/1sym', 'streaming/combined/1sym'}
+        in_memory = results['cases']['in_memory/combined/1sym']
+        streaming = results['cases']['streaming/combined/1sym']
+        assert in_memory['ticks'] > 0
+        assert in_memory['ticks'] == streaming['ticks']
+        for metrics in (in_memory, streaming):
+            assert metrics['ticks_per_sec'] > 0
+            assert metrics['peak_rss_mb'] > 0
+            assert 0 < metrics['time_to_first_tick_sec'] <= metrics['load_sec'] + metrics['run_sec']
+            assert 0 < metrics['get_candles_p50_us'] <= metrics['get_candles_p99_us']
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Tests for the streaming equity-curve and trade-log recorder.
+
+Spilled files must hold every snapshot and trade in fixed-size row groups,
+the in-memory per-minute curve must equal a resample of the snapshots, and
+ResultsAnalyzer must compute the same metrics from the spilled file as from
+the full in-memory curve.
+"""
+
+import pytest
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+from datetime import datetime, timezone
+from pathlib import Path
+
+# Add project root to path
+import sys
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+import src.backtesting.engine.backtest_controller as backtest_controller
+from src.backtesting.engine.equity_recorder import EquityRecorder
+from src.backtesting.engine.results_analyzer import ResultsAnalyzer
+from tests.backtesting.engine.replay_harness import (
+    START, SymbolStrategy, build_controller, single_symbol_broker
+)
+
+
+START_NS = int(pd.Timestamp(START).value)
+
+
+def random_snapshots(seed, count):
+    """Random-walk equity sampled at irregular times (several per minute)."""
+    rng = np.random.default_rng(seed)
+    times = START_NS + np.cumsum(rng.integers(1, 40, size=count)) * 1_000_000_000
+    equity = 10_000.0 + np.cumsum(rng.normal(0, 5.0, size=count))
+    balance = np.round(equity, -1)
+    return pd.DataFrame({
+        'time_ns': times,
+        'balance': balance,
+        'equity': equity,
+        'profit': balance - 10_000.0,
+        'open_positions': rng.integers(0, 3, size=count),
+    })
+
+
+def record_all(recorder, snapshots):
+    """Feed snapshots to the recorder."""
+    for row in snapshots.itertuples(index=False):
+        recorder.record(int(row.time_ns), row.balance, row.equity, row.profit, int(row.open_positions))
+
+
+def trade_record(ticket, profit, comment='strategy|EURUSD'):
+    """Trade record as written by SimulatedBroker._close_position()."""
+    open_time = START.replace(hour=1, minute=ticket % 60)
+    return {
+        'ticket': ticket, 'symbol': 'EURUSD', 'type': 'BUY', 'volume': 0.01,
+        'open_price': 1.1, 'close_price': 1.1 + profit / 1000.0, 'open_time': open_time,
+        'close_time': open_time.replace(hour=2), 'profit': profit, 'sl': 1.09, 'tp': 1.11,
+        'magic': 1, 'comment': comment,
+    }
+
+
+def run_backtest(recorder, run_dir):
+    """Sequential replay of one synthetic symbol with the recorder attached."""
+    broker = single_symbol_broker(seed=7, count=3_000)
+    controller = build_controller(broker, run_dir, equity_recorder=recorder, show_progress=False)
+    controller._process_ticks_sequential(broker.global_tick_timeline, {'EURUSD': SymbolStrategy(broker, 'EURUSD')})
+    controller._record_equity_snapshot()
+    return controller
+
+
+class TestEquityRecorder:
+    """Tests for EquityRecorder."""
+
+    def test_spills_fixed_size_row_groups(self, tmp_path):
+        """Every snapshot is written; full buffers become row groups of row_group_size."""
+        snapshots = random_snapshots(1, 1_050)
+        recorder = EquityRecorder(tmp_path, row_group_size=200)
+        record_all(recorder, snapshots)
+        assert recorder._buffered == 50  # Only the last partial row group is in memory
+        recorder.close()
+
+        parquet_file = pq.ParquetFile(str(recorder.equity_path))
+        assert [parquet_file.metadata.row_group(i).num_rows for i in range(parquet_file.num_row_groups)] == \
+            [200] * 5 + [50]
+
+        spilled = pd.read_parquet(recorder.equity_path)
+        assert list(pd.DatetimeIndex(spilled['time']).as_unit('ns').asi8) == list(snapshots['time_ns'])
+        for column in ('balance', 'equity', 'profit', 'open_positions'):
+            np.testing.assert_array_equal(spilled[column].to_numpy(), snapshots[column].to_numpy())
+
+    def test_minute_curve_matches_resample(self):
+        """The in-memory curve is the per-minute OHLC of equity with the last balance of each minute."""
+        snapshots = random_snapshots(2, 3_000)
+        recorder = EquityRecorder()
+        record_all(recorder, snapshots)
+
+        frame = snapshots.assign(time=pd.to_datetime(snapshots['time_ns'], unit='ns', utc=True)).set_index('time')
+        expected = frame['equity'].resample('1min').agg(['first', 'max', 'min', 'last']).dropna()
+        minutes = recorder.minute_frame()
+
+        assert list(minutes['time']) == list(expected.index)
+        np.testing.assert_array_equal(minutes['open'].to_numpy(), expected['first'].to_numpy())
+        np.testing.assert_array_equal(minutes['high'].to_numpy(), expected['max'].to_numpy())
+        np.testing.assert_array_equal(minutes['low'].to_numpy(), expected['min'].to_numpy())
+        np.testing.assert_array_equal(recorder.minute_equity(), expected['last'].to_numpy())
+        np.testing.assert_array_equal(minutes['balance'].to_numpy(),
+                                      frame['balance'].resample('1min').last().dropna().to_numpy())
+
+        curve = recorder.curve()
+        assert curve[-1]['equity'] == snapshots['equity'].iloc[-1]
+        assert curve[-1]['time'] == datetime.fromtimestamp(snapshots['time_ns'].iloc[-1] // 60_000_000_000 * 60,
+                                                           tz=timezone.utc)
+
+    def test_in_memory_recorder_spills_nothing(self, tmp_path):
+        """Without a directory only the per-minute curve is kept."""
+        recorder = EquityRecorder(row_group_size=10)
+        record_all(recorder, random_snapshots(3, 100))
+        recorder.record_trade(trade_record(1, 5.0))
+        recorder.close()
+
+        assert recorder.equity_path is None and recorder.trades_path is None
+        assert recorder.snapshot_count == 100 and recorder.trade_count == 0
+        assert len(recorder.curve()) > 0
+
+    def test_trades_spilled(self, tmp_path):
+        """Trade records round-trip through trades.parquet, including missing comments."""
+        trades = [trade_record(i, float(i % 7) - 3.0, comment=None if i % 5 == 0 else f"s{i}")
+                  for i in range(1, 10_001)]
+        recorder = EquityRecorder(tmp_path)
+        for trade in trades:
+            recorder.record_trade(trade)
+        assert len(recorder._trades) < EquityRecorder.TRADE_ROW_GROUP_SIZE
+        recorder.close()
+
+        spilled = pd.read_parquet(recorder.trades_path)
+        assert pq.ParquetFile(str(recorder.trades_path)).num_row_groups == 3
+        assert list(spilled['ticket']) == [t['ticket'] for t in trades]
+        assert list(spilled['profit']) == [t['profit'] for t in trades]
+        assert spilled['comment'].isna().sum() == 2_000
+        assert spilled['close_time'].iloc[0] == pd.Timestamp(trades[0]['close_time'])
+
+    def test_next_due(self):
+        """Snapshots are aligned to the interval of simulated time."""
+        recorder = EquityRecorder(interval_seconds=10)
+        assert recorder.next_due_ns(START_NS) == START_NS + 10_000_000_000
+        assert recorder.next_due_ns(START_NS + 3_000_000_000) == START_NS + 10_000_000_000
+
+
+class TestSpilledResults:
+    """Tests for recording during replay and analyzing spilled results."""
+
+    def test_analyzer_reads_spilled_curve(self, tmp_path):
+        """Metrics streamed from equity.parquet equal the in-memory calculation."""
+        snapshots = random_snapshots(4, 5_000)
+        recorder = EquityRecorder(tmp_path, row_group_size=333)
+        record_all(recorder, snapshots)
+        recorder.close()
+
+        curve = [{'time': t, 'equity': e} for t, e in zip(snapshots['time_ns'], snapshots['equity'])]
+        analyzer = ResultsAnalyzer()
+        in_memory = analyzer.analyze({'equity_curve': curve})
+        spilled = analyzer.analyze({'equity_curve': recorder.curve(), 'equity_curve_path': str(recorder.equity_path)})
+
+        for key in ('total_return', 'max_drawdown', 'sharpe_ratio'):
+            assert spilled[key] == pytest.approx(in_memory[key], rel=1e-9)
+
+    def test_sequential_replay_records_curve_and_trades(self, tmp_path, monkeypatch):
+        """Snapshots at the recorder interval; every closed trade is spilled."""
+        monkeypatch.setattr(backtest_controller, 'RICH_AVAILABLE', False)
+        recorder = EquityRecorder(tmp_path, interval_seconds=30, row_group_size=16)
+        controller = run_backtest(recorder, tmp_path / 'run')
+        broker = controller.broker
+        assert len(broker.closed_trades) > 5
+
+        results = controller.get_results()
+        assert results['equity_curve_path'] == str(tmp_path / EquityRecorder.EQUITY_FILE)
+        assert results['trade_log_path'] == str(tmp_path / EquityRecorder.TRADES_FILE)
+
+        spilled = pd.read_parquet(results['equity_curve_path'])
+        times = pd.DatetimeIndex(spilled['time']).as_unit('ns').asi8
+        buckets = times[:-1] // 30_000_000_000
+        assert (np.diff(buckets) > 0).all()  # At most one snapshot per 30s (plus the final one)
+        assert spilled['equity'].iloc[-1] == results['final_equity']
+        assert results['equity_curve'][-1]['balance'] == results['final_balance']
+
+        trades = pd.read_parquet(results['trade_log_path'])
+        assert list(trades['ticket']) == [t['ticket'] for t in results['trade_log']]
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Reproducibility tests for event-skipping replay.
+
+Runs the same synthetic backtest through the full sequential tick loop and
+through BacktestController's event-skipping loop and verifies that strategy
+calls, trades, balances, equity snapshots and candles are identical.
+"""
+
+import pytest
+import pandas as pd
+from pathlib import Path
+
+# Add project root to path
+import sys
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+import src.backtesting.engine.backtest_controller as backtest_controller
+from src.backtesting.engine.equity_recorder import EquityRecorder
+from src.backtesting.engine.event_skipping import EventSkipIndex
+from src.backtesting.engine.simulated_broker import SimulatedBroker
+from src.models.data_models import PositionType
+from tests.backtesting.engine.replay_harness import build_controller, create_ticks
+
+
+SYMBOLS = ['EURUSD', 'GBPUSD', 'USDCHF']
+
+
+class BarStrategy:
+    """Opens alternating positions with SL/TP on every new bar of one timeframe."""
+
+    def __init__(self, broker, symbol, timeframe, other_symbol, calls):
+        self.broker = broker
+        self.symbol = symbol
+        self.timeframe = timeframe
+        self.other_symbol = other_symbol
+        self.calls = calls
+        self.count = 0
+
+    def get_required_timeframes(self):
+        return [self.timeframe]
+
+    def requires_every_tick(self):
+        return False
+
+    def on_tick(self):
+        df = self.broker.get_candles(self.symbol, self.timeframe, 3)
+        last_bar = None if df is None else tuple(df.iloc[-1][['open', 'high', 'low', 'close', 'tick_volume']])
+        self.calls.append((self.symbol, self.broker.current_time, last_bar,
+                           self.broker.get_current_price(self.other_symbol, 'bid'),
+                           round(self.broker.get_account_equity(), 8)))
+
+        self.count += 1
+        if len(self.broker.get_positions(self.symbol)) < 3:
+            buy = self.count % 2 == 0
+            price = self.broker.get_current_price(self.symbol, 'ask' if buy else 'bid')
+            distance = 0.0004 + 0.0001 * (self.count % 5)
+            sl = price - distance if buy else price + distance
+            tp = price + distance if buy else price - distance
+            if self.count % 7 == 0:
+                tp = 0.0
+            self.broker.place_market_order(self.symbol, PositionType.BUY if buy else PositionType.SELL,
+                                           0.01, round(sl, 5), round(tp, 5), 1)
+
+
+class TickStrategy:
+    """Tick-only strategy (like HFT) that must see every tick."""
+
+    def __init__(self, broker, symbol, calls):
+        self.broker = broker
+        self.symbol = symbol
+        self.calls = calls
+
+    def get_required_timeframes(self):
+        return []
+
+    def requires_every_tick(self):
+        return True
+
+    def on_tick(self):
+        tick = self.broker.current_ticks[self.symbol]
+        self.calls.append((self.symbol, tick.time, tick.bid))
+        if len(self.calls) % 997 == 0 and not self.broker.get_positions(self.symbol):
+            self.broker.place_market_order(self.symbol, PositionType.SELL, 0.01,
+                                           round(tick.ask + 0.0003, 5), round(tick.ask - 0.0003, 5), 2)
+
+
+def run_backtest(run_dir, event_skipping, lazy_candles, with_tick_strategy):
+    """Run one synthetic sequential backtest and capture everything observable."""
+    broker = SimulatedBroker(initial_balance=10000.0, enable_slippage=False, lazy_candles=lazy_candles)
+    for i, symbol in enumerate(SYMBOLS):
+        broker.load_tick_data(symbol, create_ticks(seed=i, count=20_000), {})
+    broker.merge_global_tick_timeline()
+
+    calls = []
+    strategies = {
+        'EURUSD': BarStrategy(broker, 'EURUSD', 'M5', 'GBPUSD', calls),
+        'GBPUSD': BarStrategy(broker, 'GBPUSD', 'M1', 'USDCHF', calls),
+    }
+    if with_tick_strategy:
+        strategies['USDCHF'] = TickStrategy(broker, 'USDCHF', calls)
+
+    controller = build_controller(broker, run_dir, equity_recorder=EquityRecorder(interval_seconds=60),
+                                  event_skipping=event_skipping)
+    controller._process_ticks_sequential(broker.global_tick_timeline, strategies)
+
+    candles = {
+        symbol: broker.candle_builders[symbol].get_candles(tf, 10_000)
+        for symbol in SYMBOLS for tf in ['M1', 'H1']
+    }
+    trades = [
+        (t['ticket'], t['symbol'], t['type'], t['open_price'], t['close_price'],
+         t['open_time'], t['close_time'], t['profit'])
+        for t in broker.closed_trades
+    ]
+    final_ticks = {s: (t.time, t.bid, t.ask, t.last, t.volume) for s, t in broker.current_ticks.items()}
+    return {
+        'calls': calls,
+        'trades': trades,
+        'balance': broker.balance,
+        'open': sorted(broker.positions),
+        'sl_tp_hits': (broker.tick_sl_hits, broker.tick_tp_hits),
+        'final_ticks': final_ticks,
+        'final_time': broker.current_time,
+        'candles': candles,
+        'equity': (controller.equity_recorder.snapshot_count, controller.equity_recorder.curve()),
+    }
+
+
+class TestEventSkippingReplay:
+    """Event-skipping replay must reproduce the full tick loop exactly."""
+
+    @pytest.mark.parametrize("lazy_candles", [True, False])
+    @pytest.mark.parametrize("with_tick_strategy", [False, True])
+    def test_matches_full_tick_loop(self, lazy_candles, with_tick_strategy, monkeypatch, tmp_path):
+        """Same strategy calls, trades, balance, equity curve and candles as processing every tick."""
+        # Exercise the no-Rich path of the full loop as the reference
+        monkeypatch.setattr(backtest_controller, 'RICH_AVAILABLE', False)
+
+        skipped_ticks = []
+        fast_forward = EventSkipIndex.fast_forward
+
+        def counting_fast_forward(index, start, stop):
+            skipped_ticks.append(stop - start)
+            fast_forward(index, start, stop)
+
+        monkeypatch.setattr(EventSkipIndex, 'fast_forward', counting_fast_forward)
+
+        full = run_backtest(tmp_path / 'full', False, lazy_candles, with_tick_strategy)
+        skipped = run_backtest(tmp_path / 'skipped', True, lazy_candles, with_tick_strategy)
+
+        # Most ticks must actually be skipped (USDCHF alone is a third of them)
+        assert sum(skipped_ticks) > 10_000
+
+        assert len(full['trades']) > 10
+        assert full['sl_tp_hits'][0] > 0 and full['sl_tp_hits'][1] > 0
+        assert full['equity'][0] > 100
+        for key in ('calls', 'trades', 'balance', 'open', 'sl_tp_hits', 'final_ticks', 'final_time', 'equity'):
+            assert skipped[key] == full[key], key
+        for key, df in full['candles'].items():
+            pd.testing.assert_frame_equal(skipped['candles'][key], df, check_exact=True)
+
+    def test_static_events(self):
+        """Static events are new bars of required timeframes plus every-tick symbols."""
+        broker = SimulatedBroker(enable_slippage=False)
+        for i, symbol in enumerate(SYMBOLS):
+            broker.load_tick_data(symbol, create_ticks(seed=i, count=3_000), {})
+        broker.merge_global_tick_timeline()
+        timeline = broker.global_tick_timeline
+
+        index = EventSkipIndex(broker, timeline, ['USDCHF'], {'EURUSD': {'H1'}})
+        events = set(index.static_events.tolist())
+
+        expected = set()
+        last_hour = {}
+        for tick in timeline:
+            if tick.symbol == 'USDCHF':
+                expected.add(tick.index)
+            elif tick.symbol == 'EURUSD':
+                hour = tick.time.replace(minute=0, second=0, microsecond=0)
+                if tick.symbol in last_hour and last_hour[tick.symbol] != hour:
+                    expected.add(tick.index)
+                last_hour[tick.symbol] = hour
+
+        assert events == expected
+        assert index.next_trigger_event(0) == len(timeline)  # No open positions
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -94,7 +94,7 @@ class TestIncrementalLoading:
         
         # Mock download for missing days
         download_count = 0
-        def mock_download(symbol, timeframe, start_date, end_date, preloaded_ticks=None):
+        def mock_download(symbol, timeframe, start_date, end_date, preloaded_ticks=None, tick_type=None):
             nonlocal download_count
             download_count += 1
             data = self.create_test_data(start_date)
@@ -144,7 +144,7 @@ class TestIncrementalLoading:
         
         # Mock download for missing even days
         downloaded_days = []
-        def mock_download(symbol, timeframe, start_date, end_date, preloaded_ticks=None):
+        def mock_download(symbol, timeframe, start_date, end_date, preloaded_ticks=None, tick_type=None):
             downloaded_days.append(start_date.day)
             data = self.create_test_data(start_date)
             return data, {'name': symbol, 'digits': 5, 'point': 0.00001}
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Tests for monthly compacted tick files.
+
+Streaming from compacted months must give exactly the ticks of the daily
+files, read only the row groups of the requested days, and fall back to the
+daily files when a day was downloaded after compaction.
+"""
+
+import os
+
+import pytest
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+from datetime import datetime, timezone, timedelta
+from pathlib import Path
+
+# Add project root to path
+import sys
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.backtesting.engine.monthly_tick_store import MonthlySegment, MonthlyTickStore
+from src.backtesting.engine.streaming_tick_loader import StreamingTickLoader
+
+
+START = datetime(2025, 1, 29, tzinfo=timezone.utc)   # 29 Jan - 3 Feb spans two months
+DAYS = 6
+
+
+def create_ticks(day, seed, count=2000):
+    """Create sorted random ticks for one day."""
+    rng = np.random.default_rng(seed)
+    offsets = np.sort(rng.integers(0, 86_400_000, size=count)) * 1_000_000
+    bids = 1.1 + rng.normal(0, 0.001, size=count)
+    return pd.DataFrame({
+        'time': pd.to_datetime(pd.Timestamp(day).value + offsets, utc=True),
+        'bid': bids,
+        'ask': bids + 0.0002,
+        'last': np.zeros(count),
+        'volume': rng.integers(0, 10, size=count).astype(np.int64),
+    })
+
+
+def stream(cache_dir, start, end, use_monthly=True, **kwargs):
+    """Stream (time_ns, symbol, bid, volume) tuples."""
+    loader = StreamingTickLoader({}, chunk_size=500, start_date=start, end_date=end, cache_dir=str(cache_dir),
+                                 prefetch_batches=0, use_monthly=use_monthly, **kwargs)
+    return loader, [(t.time_ns, t.symbol, t.bid, t.volume) for t in loader.stream_ticks()]
+
+
+class TestMonthlyTickStore:
+    """Tests for MonthlyTickStore and the StreamingTickLoader monthly read path."""
+
+    @pytest.fixture
+    def cache(self, tmp_path):
+        """Daily files for two symbols over a month boundary."""
+        store = MonthlyTickStore(str(tmp_path))
+        for s_idx, symbol in enumerate(['EURUSD', 'GBPUSD']):
+            for d in range(DAYS):
+                day = START + timedelta(days=d)
+                path = store.daily_path(symbol, day)
+                path.parent.mkdir(parents=True, exist_ok=True)
+                create_ticks(day, seed=s_idx * 100 + d).to_parquet(path, index=False)
+        return tmp_path, store
+
+    def test_compacted_stream_matches_daily(self, cache):
+        """Full and partial ranges stream the same ticks from monthly and daily files."""
+        cache_dir, store = cache
+        end = START + timedelta(days=DAYS - 1)
+        summary = store.compact(None, START, end)
+
+        assert set(summary) == {'EURUSD', 'GBPUSD'}
+        assert summary['EURUSD'] == {'2025-01': 3 * 2000, '2025-02': 3 * 2000}
+
+        for start, stop in [(START, end), (START + timedelta(days=1), START + timedelta(days=3))]:
+            loader, monthly = stream(cache_dir, start, stop)
+            _, daily = stream(cache_dir, start, stop, use_monthly=False)
+            assert monthly == daily
+            assert all(isinstance(entry, MonthlySegment) for entries in loader.cache_files.values()
+                       for entry in entries)
+
+    def test_hourly_row_groups_are_pruned(self, cache):
+        """Row groups cover one hour each and only the requested day's groups are selected."""
+        _, store = cache
+        store.compact(['EURUSD'], START, START)
+        path = store.monthly_path('EURUSD', 2025, 1)
+        parquet_file = pq.ParquetFile(path)
+        bounds = store.row_group_bounds(parquet_file)
+
+        hour_ns = 3600 * 1_000_000_000
+        assert all(min_ns // hour_ns == max_ns // hour_ns for min_ns, max_ns, _ in bounds)
+        assert parquet_file.metadata.num_rows == 3 * 2000
+
+        day = START + timedelta(days=1)
+        segment = store.plan_symbol('EURUSD', day, day)[0]
+        day_ns = pd.Timestamp(day).value
+        assert 0 < len(segment.row_groups) <= 24
+        assert segment.num_rows == 2000
+        assert not segment.needs_filter
+        assert all(day_ns <= bounds[i][0] and bounds[i][1] < day_ns + 24 * hour_ns for i in segment.row_groups)
+
+    def test_fresh_download_falls_back_to_daily(self, cache):
+        """A day rewritten after compaction makes its month read daily files until recompacted."""
+        cache_dir, store = cache
+        end = START + timedelta(days=DAYS - 1)
+        store.compact(['EURUSD'], START, end)
+
+        rewritten = store.daily_path('EURUSD', START)
+        create_ticks(START, seed=999, count=1500).to_parquet(rewritten, index=False)
+        os.utime(rewritten, ns=(1, 1))
+
+        loader, ticks = stream(cache_dir, START, end, symbols=['EURUSD'])
+        entries = loader.cache_files['EURUSD']
+        assert all(isinstance(entry, str) for entry in entries[:3])
+        assert isinstance(entries[3], MonthlySegment)
+        assert len(ticks) == 1500 + 5 * 2000
+        assert not store.is_current('EURUSD', 2025, 1)
+
+        assert store.compact(['EURUSD'], START, end)['EURUSD'] == {'2025-01': 1500 + 2 * 2000, '2025-02': 0}
+
+    def test_daily_files_removed_after_compaction(self, cache):
+        """Compacted months keep streaming after their daily files are deleted."""
+        cache_dir, store = cache
+        end = START + timedelta(days=DAYS - 1)
+        _, expected = stream(cache_dir, START, end)
+        store.compact(None, START, end)
+
+        for symbol in ['EURUSD', 'GBPUSD']:
+            for d in range(DAYS):
+                store.daily_path(symbol, START + timedelta(days=d)).unlink()
+
+        loader, ticks = stream(cache_dir, START, end)
+        assert sorted(loader.symbols) == ['EURUSD', 'GBPUSD']
+        assert ticks == expected
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
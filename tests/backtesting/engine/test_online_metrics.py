@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Tests for incremental performance metrics.
+
+OnlineMetrics must give the values of ResultsAnalyzer's batch calculations
+over the same trades and equity samples, whether the samples are added one
+at a time or in batches, and the broker/controller must keep it up to date.
+"""
+
+import pytest
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+# Add project root to path
+import sys
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+import src.backtesting.engine.backtest_controller as backtest_controller
+from src.backtesting.engine.equity_recorder import EquityRecorder
+from src.backtesting.engine.online_metrics import OnlineMetrics
+from src.backtesting.engine.results_analyzer import ResultsAnalyzer
+from tests.backtesting.engine.replay_harness import SymbolStrategy, build_controller, single_symbol_broker
+
+
+def random_profits(seed, count=500):
+    """Trade profits with wins, losses, streaks and a few break-even trades."""
+    rng = np.random.default_rng(seed)
+    profits = np.round(rng.normal(0.5, 10.0, size=count), 2)
+    profits[rng.choice(count, size=10, replace=False)] = 0.0
+    return [float(p) for p in profits]
+
+
+def random_equity(seed, count=5_000):
+    """Random-walk equity with drawdowns."""
+    rng = np.random.default_rng(seed)
+    return 10_000.0 + np.cumsum(rng.normal(0, 8.0, size=count))
+
+
+def assert_same(actual, expected):
+    """Same keys and (approximately) equal values."""
+    assert set(actual) == set(expected)
+    for key, value in expected.items():
+        assert actual[key] == pytest.approx(value, rel=1e-9), key
+
+
+def run_backtest(run_dir):
+    """Sequential replay of one synthetic symbol."""
+    broker = single_symbol_broker(seed=11, count=3_000)
+    controller = build_controller(broker, run_dir, equity_recorder=EquityRecorder(interval_seconds=5),
+                                  show_progress=False)
+    controller._process_ticks_sequential(broker.global_tick_timeline, {'EURUSD': SymbolStrategy(broker, 'EURUSD')})
+    controller._record_equity_snapshot()
+    return controller
+
+
+class TestOnlineMetrics:
+    """Tests for OnlineMetrics."""
+
+    def test_trade_metrics_match_batch_analysis(self):
+        """Win/loss statistics equal ResultsAnalyzer._analyze_trades()."""
+        profits = random_profits(1)
+        metrics = OnlineMetrics()
+        for profit in profits:
+            metrics.add_trade(profit)
+
+        expected = ResultsAnalyzer()._analyze_trades([{'profit': p} for p in profits])
+        assert_same(metrics.trade_metrics(), expected)
+        assert metrics.max_consecutive_wins >= 2 and metrics.max_consecutive_losses >= 2
+
+    def test_curve_metrics_match_batch_analysis(self):
+        """Total return, drawdown and Sharpe equal the DataFrame calculations."""
+        equity = random_equity(2)
+        metrics = OnlineMetrics()
+        for value in equity:
+            metrics.add_equity(float(value))
+
+        analyzer = ResultsAnalyzer()
+        equity_df = pd.DataFrame({'equity': equity})
+        assert_same(metrics.curve_metrics(), {
+            'total_return': analyzer._calculate_total_return(equity_df),
+            'max_drawdown': analyzer._calculate_max_drawdown(equity_df),
+            'sharpe_ratio': analyzer._calculate_sharpe_ratio(equity_df),
+        })
+        assert metrics.max_drawdown > 0
+
+    @pytest.mark.parametrize('chunk', [1, 7, 1_000, 10_000])
+    def test_batches_equal_single_samples(self, chunk):
+        """add_equity_batch() in any chunking equals add_equity() per sample."""
+        equity = random_equity(3)
+        single = OnlineMetrics()
+        for value in equity:
+            single.add_equity(float(value))
+
+        batched = OnlineMetrics()
+        for start in range(0, len(equity), chunk):
+            batched.add_equity_batch(equity[start:start + chunk])
+
+        assert batched.equity_count == single.equity_count
+        assert_same(batched.curve_metrics(), single.curve_metrics())
+
+    def test_empty(self):
+        """No trades and no samples give neutral values."""
+        metrics = OnlineMetrics()
+        assert metrics.trade_metrics() == {}
+        assert metrics.curve_metrics() == {'total_return': 0.0, 'max_drawdown': 0.0, 'sharpe_ratio': 0.0}
+        assert metrics.live_metrics()['profit_factor'] == 0.0
+
+        metrics.add_trade(5.0)
+        assert metrics.profit_factor == float('inf')
+
+
+class TestRunMetrics:
+    """Tests for the metrics kept during a run."""
+
+    def test_broker_and_controller_keep_metrics(self, monkeypatch, tmp_path):
+        """Live, cached-broker and final statistics equal recomputation from the run's trades."""
+        monkeypatch.setattr(backtest_controller, 'RICH_AVAILABLE', False)
+        controller = run_backtest(tmp_path)
+        broker = controller.broker
+        profits = [t['profit'] for t in broker.closed_trades]
+        assert len(profits) > 10
+
+        stats = broker._get_cached_statistics()
+        assert stats['wins'] == sum(1 for p in profits if p > 0)
+        assert stats['losses'] == sum(1 for p in profits if p < 0)
+
+        live = controller._calculate_live_metrics()
+        expected = ResultsAnalyzer()._analyze_trades(broker.closed_trades)
+        assert live['win_rate'] == pytest.approx(expected['win_rate'])
+        assert live['profit_factor'] == pytest.approx(expected['profit_factor'])
+
+        results = controller.get_results()
+        analyzer = ResultsAnalyzer()
+        final = analyzer.analyze(results)
+        recomputed = analyzer.analyze({key: value for key, value in results.items() if key != 'metrics'})
+        assert broker.performance_metrics.equity_count == controller.equity_recorder.snapshot_count
+        for key in ('win_rate', 'profit_factor', 'avg_win', 'avg_loss', 'largest_loss',
+                    'max_consecutive_losses', 'total_trades'):
+            assert final[key] == pytest.approx(recomputed[key], rel=1e-9), key
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Tests for the multi-process parameter sweep.
+
+Covers the parameter space (grid, random sampling, validation), temporary
+configuration overrides and the ResultsAnalyzer leaderboard.
+"""
+
+import pytest
+import numpy as np
+from pathlib import Path
+
+# Add project root to path
+import sys
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.backtesting.engine.parameter_sweep import ParameterSpace, apply_config_overrides
+from src.backtesting.engine.results_analyzer import ResultsAnalyzer
+from src.config import config
+from src.config.configs import HFTMomentumConfig
+from src.config.strategies import FakeoutConfig, TrueBreakoutConfig
+
+
+class TestParameterSpace:
+    """Tests for ParameterSpace."""
+
+    def test_grid_is_every_combination(self):
+        """The grid is the cartesian product in key order."""
+        space = ParameterSpace({
+            'fakeout.risk_reward_ratio': [1.5, 2.0],
+            'risk.max_positions': [1, 2, 3],
+            'hft_momentum.enabled': True,
+        })
+
+        grid = space.grid()
+
+        assert len(grid) == 6
+        assert grid[0] == {'fakeout.risk_reward_ratio': 1.5, 'risk.max_positions': 1, 'hft_momentum.enabled': True}
+        assert grid[-1] == {'fakeout.risk_reward_ratio': 2.0, 'risk.max_positions': 3, 'hft_momentum.enabled': True}
+
+    def test_sample_is_reproducible_and_in_range(self):
+        """Random samples respect choices and ranges and depend only on the seed."""
+        space = ParameterSpace({
+            'true_breakout.risk_reward_ratio': (1.0, 3.0),
+            'fakeout.breakout_timeout_candles': (10, 20),
+            'risk.risk_percent_per_trade': [0.5, 1.0],
+        })
+
+        samples = space.sample(50, seed=7)
+
+        assert samples == space.sample(50, seed=7)
+        for sample in samples:
+            assert 1.0 <= sample['true_breakout.risk_reward_ratio'] <= 3.0
+            assert isinstance(sample['fakeout.breakout_timeout_candles'], int)
+            assert 10 <= sample['fakeout.breakout_timeout_candles'] <= 20
+            assert sample['risk.risk_percent_per_trade'] in (0.5, 1.0)
+
+    def test_ranges_cannot_be_gridded(self):
+        """A (low, high) range has no finite grid."""
+        with pytest.raises(ValueError, match="range"):
+            ParameterSpace({'fakeout.risk_reward_ratio': (1.0, 3.0)}).grid()
+
+    @pytest.mark.parametrize("key", ['fakeout', 'unknown.risk_reward_ratio', 'risk.no_such_field'])
+    def test_invalid_keys(self, key):
+        """Keys must name a known section and dataclass field."""
+        with pytest.raises(ValueError):
+            ParameterSpace({key: [1]})
+
+
+class TestConfigOverrides:
+    """Tests for apply_config_overrides()."""
+
+    def test_overrides_apply_and_restore(self):
+        """Strategy from_env() results and global config fields are overridden, then restored."""
+        default_fakeout = FakeoutConfig.from_env('4H_5M')
+        default_breakout = TrueBreakoutConfig.from_env('15M_1M')
+        default_risk = config.risk.risk_percent_per_trade
+        default_multiplier = config.hft_momentum.martingale_multiplier
+
+        overrides = {
+            'fakeout.risk_reward_ratio': 7.5,
+            'risk.risk_percent_per_trade': 0.123,
+            'hft_momentum.martingale_multiplier': 9.0,
+        }
+        with apply_config_overrides(overrides):
+            fakeout = FakeoutConfig.from_env('4H_5M')
+            assert fakeout.risk_reward_ratio == 7.5
+            assert fakeout.range_config == default_fakeout.range_config
+            assert TrueBreakoutConfig.from_env('15M_1M') == default_breakout
+            assert config.risk.risk_percent_per_trade == 0.123
+            assert config.hft_momentum.martingale_multiplier == 9.0
+            assert HFTMomentumConfig.from_env().martingale_multiplier == 9.0
+
+        assert FakeoutConfig.from_env('4H_5M') == default_fakeout
+        assert config.risk.risk_percent_per_trade == default_risk
+        assert config.hft_momentum.martingale_multiplier == default_multiplier
+
+    def test_restored_after_error(self):
+        """Overrides are removed even if the run raises."""
+        default_risk = config.risk.max_positions
+
+        with pytest.raises(RuntimeError):
+            with apply_config_overrides({'risk.max_positions': 1}):
+                raise RuntimeError("run failed")
+
+        assert config.risk.max_positions == default_risk
+
+
+class TestLeaderboard:
+    """Tests for ResultsAnalyzer leaderboard helpers."""
+
+    def test_summarize_keeps_scalars(self):
+        """Nested breakdowns are dropped and NumPy scalars converted."""
+        row = ResultsAnalyzer().summarize({
+            'total_profit': np.float64(12.5),
+            'total_trades': 3,
+            'per_symbol': {'EURUSD': {}},
+        })
+
+        assert row == {'total_profit': 12.5, 'total_trades': 3}
+        assert type(row['total_profit']) is float
+
+    def test_build_leaderboard_ranks_best_first(self):
+        """Runs are ranked by the metric; failed runs without metrics go last."""
+        leaderboard = ResultsAnalyzer().build_leaderboard([
+            {'run_id': 'run_0', 'status': 'ok', 'total_profit': 5.0},
+            {'run_id': 'run_1', 'status': 'error'},
+            {'run_id': 'run_2', 'status': 'ok', 'total_profit': 50.0},
+        ])
+
+        assert list(leaderboard['run_id']) == ['run_2', 'run_0', 'run_1']
+        assert list(leaderboard['rank']) == [1, 2, 3]
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
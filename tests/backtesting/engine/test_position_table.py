@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Tests for SymbolPositionTable.
+
+The vectorized SL/TP check must report exactly the same hits (ticket, close
+price, reason, order) as the per-position loop it replaces.
+"""
+
+import pytest
+import numpy as np
+from pathlib import Path
+
+# Add project root to path
+import sys
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.backtesting.engine.position_table import SymbolPositionTable
+
+
+def reference_check(positions, bid, ask):
+    """Per-position SL/TP loop (same rules as SimulatedBroker)."""
+    hits = []
+    for ticket, is_buy, sl, tp in positions:
+        if is_buy:
+            if sl > 0 and bid <= sl:
+                hits.append((ticket, bid, 'SL'))
+            elif tp > 0 and bid >= tp:
+                hits.append((ticket, bid, 'TP'))
+        else:
+            if sl > 0 and ask >= sl:
+                hits.append((ticket, ask, 'SL'))
+            elif tp > 0 and ask <= tp:
+                hits.append((ticket, ask, 'TP'))
+    return hits
+
+
+class TestSymbolPositionTable:
+    """Tests for SymbolPositionTable."""
+
+    def random_position(self, rng, ticket, price):
+        """Create a random BUY/SELL position around price (some without SL/TP)."""
+        is_buy = bool(rng.random() < 0.5)
+        sl_dist, tp_dist = rng.uniform(0.0005, 0.005, size=2)
+        if is_buy:
+            sl, tp = price - sl_dist, price + tp_dist
+        else:
+            sl, tp = price + sl_dist, price - tp_dist
+        if rng.random() < 0.1:
+            sl = 0.0
+        if rng.random() < 0.2:
+            tp = 0.0
+        return ticket, is_buy, float(sl), float(tp)
+
+    def test_matches_reference_loop(self, monkeypatch):
+        """Random opens, modifies, closes and ticks give identical hits."""
+        monkeypatch.setattr(SymbolPositionTable, 'INITIAL_CAPACITY', 2)
+        rng = np.random.default_rng(42)
+        table = SymbolPositionTable()
+        positions = []
+        next_ticket = 1
+        price = 1.1
+
+        for _ in range(20_000):
+            price += rng.normal(0, 0.0002)
+            bid, ask = price, price + 0.0001
+            action = rng.random()
+
+            if action < 0.05:
+                position = self.random_position(rng, next_ticket, price)
+                next_ticket += 1
+                positions.append(position)
+                table.add(*position, volume=0.01)
+            elif action < 0.07 and positions:
+                i = int(rng.integers(len(positions)))
+                ticket, is_buy, _, _ = positions[i]
+                _, _, sl, tp = self.random_position(rng, ticket, price)
+                positions[i] = (ticket, is_buy, sl, tp)
+                assert table.update_stops(ticket, sl, tp)
+
+            expected = reference_check(positions, bid, ask)
+            assert table.check(bid, ask) == expected
+
+            # Close hit positions (like SimulatedBroker does)
+            for ticket, _, _ in expected:
+                assert table.remove(ticket)
+            closed = {ticket for ticket, _, _ in expected}
+            positions = [p for p in positions if p[0] not in closed]
+
+            assert table.get_tickets() == [p[0] for p in positions]
+
+    def test_nearest_trigger_levels(self):
+        """Trigger levels are the closest SL/TP on each side."""
+        table = SymbolPositionTable()
+        table.add(1, True, 1.0950, 1.1100, 0.1)
+        table.add(2, True, 1.0980, 0.0, 0.1)
+        table.add(3, False, 1.1050, 1.0900, 0.1)
+
+        assert table.buy_sl_max == 1.0980
+        assert table.buy_tp_min == 1.1100
+        assert table.sell_sl_min == 1.1050
+        assert table.sell_tp_max == 1.0900
+
+        assert not table.may_trigger(1.1000, 1.1002)
+        assert table.check(1.1000, 1.1002) == []
+        assert table.may_trigger(1.0980, 1.0982)
+
+        table.remove(2)
+        assert table.buy_sl_max == 1.0950
+
+    def test_empty_table_never_triggers(self):
+        """An empty table rejects every tick."""
+        table = SymbolPositionTable()
+        table.add(1, True, 1.0, 2.0, 0.1)
+        table.remove(1)
+
+        assert len(table) == 0
+        assert not table.may_trigger(0.5, 0.5)
+        assert not table.may_trigger(3.0, 3.0)
+
+    def test_unknown_ticket(self):
+        """Removing or modifying an unknown ticket is reported."""
+        table = SymbolPositionTable()
+        table.add(1, False, 1.2, 1.0, 0.1)
+
+        assert 1 in table
+        assert 2 not in table
+        assert not table.remove(2)
+        assert not table.update_stops(2, 1.3, 0.9)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
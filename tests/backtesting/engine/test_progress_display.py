@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Tests for the decoupled progress display.
+
+The Rich tick loop must only publish snapshots (same trades as the plain
+loop), the renderer thread must draw the latest snapshot, and headless runs
+must not create a renderer.
+"""
+
+import io
+import time
+
+import pytest
+import pandas as pd
+from pathlib import Path
+
+# Add project root to path
+import sys
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+import src.backtesting.engine.backtest_controller as backtest_controller
+import src.backtesting.engine.progress_display as progress_display
+from src.backtesting.engine.backtest_controller import BacktestController
+from src.backtesting.engine.progress_display import PositionRow, ProgressRenderer, ProgressSnapshot
+from tests.backtesting.engine.replay_harness import (
+    START, SymbolStrategy, build_controller, closed_trades, single_symbol_broker
+)
+
+rich_console = pytest.importorskip('rich.console')
+
+
+START_NS = int(pd.Timestamp(START).value)
+
+
+def new_controller(run_dir, show_progress=True):
+    """Controller over one synthetic symbol (not yet run)."""
+    broker = single_symbol_broker(seed=5, count=5_000)
+    return build_controller(broker, run_dir, show_progress=show_progress)
+
+
+class Terminal(io.StringIO):
+    """Captured stdout that reports being a terminal."""
+
+    def isatty(self):
+        return True
+
+
+class RecordingRenderer:
+    """ProgressRenderer stand-in that keeps every published snapshot."""
+
+    instances = []
+
+    def __init__(self, total_ticks, start_index=0, fps=4.0, console=None):
+        self.published = []
+        self.started = self.stopped = False
+        RecordingRenderer.instances.append(self)
+
+    @property
+    def snapshot(self):
+        return self.published[-1] if self.published else None
+
+    @snapshot.setter
+    def snapshot(self, value):
+        self.published.append(value)
+
+    def start(self):
+        self.started = True
+
+    def stop(self):
+        self.stopped = True
+
+
+class TestProgressDisplay:
+    """Tests for ProgressRenderer and the sequential dashboard loop."""
+
+    def test_rich_loop_only_publishes_snapshots(self, monkeypatch, tmp_path):
+        """The dashboard loop gives the plain loop's trades and publishes plain snapshots."""
+        monkeypatch.setattr(backtest_controller, 'RICH_AVAILABLE', False)
+        plain = new_controller(tmp_path / 'plain', show_progress=False)
+        plain._process_ticks_sequential(plain.broker.global_tick_timeline,
+                                        {'EURUSD': SymbolStrategy(plain.broker, 'EURUSD')})
+
+        monkeypatch.setattr(backtest_controller, 'RICH_AVAILABLE', True)
+        monkeypatch.setattr(sys, 'stdout', Terminal())
+        RecordingRenderer.instances = []
+        monkeypatch.setattr(progress_display, 'ProgressRenderer', RecordingRenderer)
+        controller = new_controller(tmp_path / 'rich')
+        timeline = controller.broker.global_tick_timeline
+        controller._process_ticks_sequential(timeline, {'EURUSD': SymbolStrategy(controller.broker, 'EURUSD')})
+
+        assert closed_trades(controller) == closed_trades(plain)
+        renderer, = RecordingRenderer.instances
+        assert renderer.started and renderer.stopped
+
+        indices = [snapshot.tick_index for snapshot in renderer.published]
+        interval = BacktestController.PROGRESS_PUBLISH_INTERVAL
+        assert indices[0] == 0 and indices[-1] == len(timeline)
+        assert indices[1:-1] == list(range(1, len(timeline), interval))
+        final = renderer.published[-1]
+        assert final.closed_trades == len(controller.broker.closed_trades)
+        assert final.balance == controller.broker.balance
+        assert all(isinstance(row, PositionRow) for row in final.positions)
+
+    def test_headless_run_has_no_renderer(self, monkeypatch, tmp_path):
+        """Without a terminal the plain loop runs and no renderer is created."""
+        monkeypatch.setattr(backtest_controller, 'RICH_AVAILABLE', True)
+        monkeypatch.setattr(sys, 'stdout', io.StringIO())
+        RecordingRenderer.instances = []
+        monkeypatch.setattr(progress_display, 'ProgressRenderer', RecordingRenderer)
+
+        controller = new_controller(tmp_path)
+        controller._process_ticks_sequential(controller.broker.global_tick_timeline,
+                                             {'EURUSD': SymbolStrategy(controller.broker, 'EURUSD')})
+
+        assert RecordingRenderer.instances == []
+        assert controller.broker.closed_trades
+
+    def test_renderer_draws_latest_snapshot(self):
+        """The renderer thread draws published snapshots; stop() draws the last one."""
+        output = io.StringIO()
+        console = rich_console.Console(file=output, force_terminal=True, width=160)
+        renderer = ProgressRenderer(total_ticks=10_000, fps=50, console=console)
+        renderer.start()
+
+        row = PositionRow(42, 'EURUSD', 'BUY', 1.1, 1.1012, 12.0, 1.09, 1.12, START)
+        renderer.snapshot = ProgressSnapshot(5_000, START_NS + 3_600_000_000_000, 10_000.0, 10_012.0,
+                                             3, 2, 1, (row,))
+        deadline = time.time() + 5
+        while renderer.frames == 0 and time.time() < deadline:
+            time.sleep(0.01)
+        assert renderer.frames == 1
+
+        renderer.snapshot = renderer.snapshot._replace(tick_index=10_000, balance=10_050.0, positions=())
+        renderer.stop()
+
+        text = output.getvalue()
+        assert 'EURUSD' in text and '+$12.00' in text and '1h0m' in text
+        assert 'Balance: $10,050.00' in text
+        assert 'Open Positions (0)' in text
+        assert renderer.frames == 2
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
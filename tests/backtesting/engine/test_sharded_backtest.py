@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Tests for per-symbol process sharding.
+
+Covers shard planning, merging of shard results into one portfolio equity
+curve, and that replaying a symbol subset of the timeline reproduces the
+trades of the full run.
+"""
+
+import pytest
+from datetime import timedelta
+from pathlib import Path
+
+# Add project root to path
+import sys
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+import src.backtesting.engine.backtest_controller as backtest_controller
+from src.backtesting.engine.sharded_backtest import (
+    merge_shard_results,
+    plan_shards,
+    reconstruct_portfolio_equity,
+)
+from src.backtesting.engine.simulated_broker import SimulatedBroker
+from tests.backtesting.engine.replay_harness import START, SymbolStrategy, build_controller, create_ticks
+
+
+SYMBOLS = ['EURUSD', 'GBPUSD', 'USDCHF', 'AUDUSD']
+
+
+def run_backtest(timeline_symbols, run_dir):
+    """Run the synthetic sequential backtest over a symbol subset of the full timeline."""
+    broker = SimulatedBroker(initial_balance=10000.0, enable_slippage=False)
+    for i, symbol in enumerate(SYMBOLS):
+        broker.load_tick_data(symbol, create_ticks(seed=i, count=5_000), {})
+    broker.merge_global_tick_timeline()
+    broker.load_tick_timeline(broker.global_tick_timeline.select_symbols(timeline_symbols))
+
+    controller = build_controller(broker, run_dir, show_progress=False)
+    strategies = {symbol: SymbolStrategy(broker, symbol, ['M1'], max_positions=2) for symbol in timeline_symbols}
+    controller._process_ticks_sequential(broker.global_tick_timeline, strategies)
+
+    return [
+        (t['symbol'], t['type'], t['open_price'], t['close_price'], t['open_time'], t['close_time'], t['profit'])
+        for t in broker.closed_trades
+    ]
+
+
+class TestPlanShards:
+    """Tests for plan_shards()."""
+
+    def test_balanced_by_ticks(self):
+        """Largest symbols are spread over shards first."""
+        ticks = {'A': 100, 'B': 90, 'C': 50, 'D': 40, 'E': 10}
+        shards = plan_shards(ticks, 2)
+
+        assert sorted(s for shard in shards for s in shard) == sorted(ticks)
+        loads = sorted(sum(ticks[s] for s in shard) for shard in shards)
+        assert loads == [140, 150]
+
+    def test_one_symbol_per_shard(self):
+        """More shards than symbols gives one shard per symbol (input order kept)."""
+        shards = plan_shards({'A': 1, 'B': 0, 'C': 5}, 32)
+        assert sorted(shards) == [['A'], ['B'], ['C']]
+
+    def test_single_shard(self):
+        """shard_count <= 1 puts everything in one shard."""
+        assert plan_shards({'A': 3, 'B': 1}, 0) == [['A', 'B']]
+
+
+class TestMergeShardResults:
+    """Tests for merge_shard_results() and reconstruct_portfolio_equity()."""
+
+    def shard(self, profits, start_minute, final_floating=0.0):
+        """Shard results with one closed trade per profit, 10 minutes apart."""
+        balance = 1000.0
+        curve = [{'time': START, 'balance': balance, 'equity': balance}]
+        trades = []
+        for i, profit in enumerate(profits):
+            close_time = START + timedelta(minutes=start_minute + 10 * i)
+            balance += profit
+            curve.append({'time': close_time, 'balance': balance, 'equity': balance})
+            trades.append({'close_time': close_time, 'profit': profit})
+        return {
+            'final_balance': balance,
+            'final_equity': balance + final_floating,
+            'total_profit': balance - 1000.0,
+            'profit_percent': (balance - 1000.0) / 10.0,
+            'open_positions': 1 if final_floating else 0,
+            'equity_curve': curve,
+            'trade_log': trades,
+        }
+
+    def test_portfolio_equity_is_time_ordered_sum(self):
+        """Portfolio equity = initial balance + every shard's profit up to that time."""
+        a = self.shard([10.0, -5.0], start_minute=1)    # t=1, t=11
+        b = self.shard([20.0, 30.0], start_minute=5)    # t=5, t=15
+
+        curve = reconstruct_portfolio_equity([a['equity_curve'], b['equity_curve']], 1000.0)
+
+        assert [p['time'] for p in curve] == [START + timedelta(minutes=m) for m in (0, 1, 5, 11, 15)]
+        assert [p['equity'] for p in curve] == [1000.0, 1010.0, 1030.0, 1025.0, 1055.0]
+
+    def test_merge_totals_and_trades(self):
+        """Profit is summed, trades are ordered by close time."""
+        a = self.shard([10.0, -5.0], start_minute=1, final_floating=-2.0)
+        b = self.shard([20.0], start_minute=5)
+
+        merged = merge_shard_results([a, b], 1000.0)
+
+        assert merged['total_profit'] == 25.0
+        assert merged['final_balance'] == 1025.0
+        assert merged['final_equity'] == 1023.0
+        assert merged['profit_percent'] == 2.5
+        assert merged['open_positions'] == 1
+        assert [t['profit'] for t in merged['trade_log']] == [10.0, 20.0, -5.0]
+        assert merged['equity_curve'][-1]['balance'] == 1025.0
+
+    def test_empty(self):
+        """No curves gives an empty curve."""
+        assert reconstruct_portfolio_equity([[], []], 1000.0) == []
+
+
+class TestShardEquivalence:
+    """Independent symbols give the same trades whether run together or sharded."""
+
+    def test_symbol_subsets_reproduce_full_run(self, monkeypatch, tmp_path):
+        """Trades of each shard equal the full run's trades of its symbols."""
+        monkeypatch.setattr(backtest_controller, 'RICH_AVAILABLE', False)
+
+        full = run_backtest(SYMBOLS, tmp_path / 'full')
+        assert len(full) > 20
+
+        sharded = []
+        for i, shard in enumerate(plan_shards({symbol: 1 for symbol in SYMBOLS}, 2)):
+            sharded.extend(run_backtest(shard, tmp_path / f'shard_{i}'))
+
+        key = lambda t: (t[5], t[0], t[4])
+        assert sorted(sharded, key=key) == sorted(full, key=key)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
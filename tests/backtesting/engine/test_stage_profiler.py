@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Tests for the sampled per-stage profiler.
+
+A profiled run must give the trades of an unprofiled run, attribute time to
+every engine stage (including each sub-strategy key), remove its wrappers
+afterwards and write a valid speedscope file.
+"""
+
+import json
+import pickle
+
+import pytest
+from pathlib import Path
+
+# Add project root to path
+import sys
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+import src.backtesting.engine.backtest_controller as backtest_controller
+from src.backtesting.engine.stage_profiler import StageProfiler
+from src.models.data_models import PositionType
+from tests.backtesting.engine.replay_harness import build_controller, closed_trades, single_symbol_broker
+
+
+class SubStrategy:
+    """Opens a position with a close SL/TP whenever the symbol has none."""
+
+    def __init__(self, broker, symbol, buy):
+        self.broker = broker
+        self.symbol = symbol
+        self.buy = buy
+
+    def on_tick(self):
+        if self.broker.get_positions(self.symbol):
+            return
+        price = self.broker.get_current_price(self.symbol, 'ask' if self.buy else 'bid')
+        sign = 1 if self.buy else -1
+        self.broker.logger.debug(f"{self.symbol}: opening {'BUY' if self.buy else 'SELL'}")
+        self.broker.place_market_order(self.symbol, PositionType.BUY if self.buy else PositionType.SELL, 0.01,
+                                       round(price - sign * 0.0004, 5), round(price + sign * 0.0004, 5), 1)
+
+
+class Orchestrator:
+    """Tick-only strategy calling its sub-strategies (like MultiStrategyOrchestrator)."""
+
+    def __init__(self, broker, symbol):
+        self.strategies = {'fakeout': SubStrategy(broker, symbol, True),
+                           'breakout': SubStrategy(broker, symbol, False)}
+
+    def get_required_timeframes(self):
+        return []
+
+    def on_tick(self):
+        for strategy in self.strategies.values():
+            strategy.on_tick()
+
+
+def new_controller(run_dir, profiler=None, event_skipping=False):
+    """Controller over one synthetic symbol (not yet run)."""
+    broker = single_symbol_broker(seed=9, count=6_000)
+    return build_controller(broker, run_dir, profiler=profiler, event_skipping=event_skipping, show_progress=False)
+
+
+def run(controller):
+    """Replay the timeline; returns the strategy."""
+    strategy = Orchestrator(controller.broker, 'EURUSD')
+    controller._process_ticks_sequential(controller.broker.global_tick_timeline, {'EURUSD': strategy})
+    return strategy
+
+
+class TestStageProfiler:
+    """Tests for StageProfiler and its use in the sequential loops."""
+
+    @pytest.mark.parametrize('event_skipping', [False, True])
+    def test_profiled_run_matches_and_covers_stages(self, monkeypatch, event_skipping, tmp_path):
+        """Same trades as without profiling; every stage measured; wrappers removed."""
+        monkeypatch.setattr(backtest_controller, 'RICH_AVAILABLE', False)
+        plain = new_controller(tmp_path / 'plain', event_skipping=event_skipping)
+        run(plain)
+
+        profiler = StageProfiler(sample_every=7)
+        controller = new_controller(tmp_path / 'profiled', profiler, event_skipping=event_skipping)
+        strategy = run(controller)
+
+        assert closed_trades(controller) == closed_trades(plain)
+        assert len(closed_trades(controller)) > 10
+        assert profiler.samples == (len(controller.broker.global_tick_timeline) - 1) // 7
+
+        totals = profiler.stage_totals()
+        for stage in ('tick decode', 'tick', 'advance tick', 'candle building', 'SL/TP check',
+                      'strategy EURUSD', 'on_tick fakeout', 'on_tick breakout', 'order execution', 'logging'):
+            assert stage in totals, stage
+            assert totals[stage]['calls'] > 0, stage
+        assert ('tick', 'strategy EURUSD', 'on_tick fakeout', 'order execution') in profiler.self_ns
+        assert totals['strategy EURUSD']['inclusive_ns'] >= totals['on_tick fakeout']['inclusive_ns']
+
+        # Wrappers are gone after the run
+        assert 'on_tick' not in vars(strategy) and 'on_tick' not in vars(strategy.strategies['fakeout'])
+        assert 'place_market_order' not in vars(controller.broker)
+        assert '_advance_tick_sequential' not in vars(controller)
+        assert 'STAGE PROFILE' in profiler.report()
+
+    def test_wrappers_pickle_to_plain_methods(self):
+        """Objects pickled while wrapped (checkpoints) get the plain method back."""
+        profiler = StageProfiler()
+        sub = SubStrategy(None, 'EURUSD', True)
+        profiler._wrap(sub, 'on_tick', 'on_tick fakeout')
+        assert 'on_tick' in vars(sub)
+
+        restored = pickle.loads(pickle.dumps(sub))
+        assert restored.on_tick.__func__ is SubStrategy.on_tick
+        profiler.uninstall()
+        assert 'on_tick' not in vars(sub)
+
+    def test_speedscope_file(self, tmp_path):
+        """The speedscope file holds one weighted sample per stage stack."""
+        profiler = StageProfiler(sample_every=1)
+        profiler.first_sample(0)
+        for counter in range(3):
+            profiler.tick_end(counter)  # Starts the decode timer
+            profiler.begin_sample()
+            profiler.enter('strategy EURUSD')
+            profiler.enter('order execution')
+            profiler.exit()
+            profiler.exit()
+            profiler.tick_end(counter)
+
+        path = profiler.write_speedscope(str(tmp_path / 'stages.speedscope.json'))
+        data = json.loads(path.read_text(encoding='utf-8'))
+
+        assert data['$schema'] == 'https://www.speedscope.app/file-format-schema.json'
+        frames = [frame['name'] for frame in data['shared']['frames']]
+        profile, = data['profiles']
+        assert profile['type'] == 'sampled' and profile['unit'] == 'nanoseconds'
+        stacks = {tuple(frames[i] for i in sample) for sample in profile['samples']}
+        assert stacks == {('tick decode',), ('tick',), ('tick', 'strategy EURUSD'),
+                          ('tick', 'strategy EURUSD', 'order execution')}
+        assert len(profile['weights']) == len(profile['samples'])
+        assert profile['endValue'] == sum(profile['weights'])
+        assert profiler.samples == 3
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
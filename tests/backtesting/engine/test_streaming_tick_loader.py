@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Tests for StreamingTickLoader k-way merge.
+
+Verifies that the bounded-memory batch merge streams ticks from the
+date-hierarchy cache in exactly the same order as an in-memory sort.
+"""
+
+import pytest
+import numpy as np
+import pandas as pd
+from datetime import datetime, timezone, timedelta
+from pathlib import Path
+
+# Add project root to path
+import sys
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.backtesting.engine.streaming_tick_loader import StreamingTickLoader
+from src.backtesting.engine.tick_timeline import ColumnarTickTimeline, extract_tick_columns
+
+
+class TestStreamingTickLoader:
+    """Tests for StreamingTickLoader.stream_ticks()."""
+
+    START = datetime(2025, 1, 6, tzinfo=timezone.utc)
+
+    def create_ticks(self, day, seed, count):
+        """Create random ticks for one day, with times on a coarse grid to force ties."""
+        rng = np.random.default_rng(seed)
+        offsets = np.sort(rng.integers(0, 86400, size=count)) * 1_000_000_000
+        times = pd.to_datetime(pd.Timestamp(day).value + offsets, utc=True)
+        bids = 1.1 + rng.normal(0, 0.001, size=count)
+        return pd.DataFrame({
+            'time': times,
+            'bid': bids,
+            'ask': bids + 0.0002,
+            'last': np.zeros(count),
+            'volume': rng.integers(0, 10, size=count).astype(np.int64),
+        })
+
+    def write_day(self, cache_dir, day, symbol, df):
+        """Write ticks in the date hierarchy layout."""
+        ticks_dir = cache_dir / day.strftime('%Y') / day.strftime('%m') / day.strftime('%d') / "ticks"
+        ticks_dir.mkdir(parents=True, exist_ok=True)
+        df.to_parquet(ticks_dir / f"{symbol}_INFO.parquet", index=False)
+
+    @pytest.fixture
+    def cache(self, tmp_path):
+        """Create a 2-day, 3-symbol tick cache and return (cache_dir, frames by symbol)."""
+        frames = {}
+        for s_idx, symbol in enumerate(['GBPUSD', 'EURUSD', 'USDJPY']):
+            day_frames = []
+            for d in range(2):
+                day = self.START + timedelta(days=d)
+                df = self.create_ticks(day, seed=s_idx * 10 + d, count=3000 + 500 * s_idx)
+                self.write_day(tmp_path, day, symbol, df)
+                day_frames.append(df)
+            frames[symbol] = pd.concat(day_frames, ignore_index=True)
+        return tmp_path, frames
+
+    def test_merge_matches_in_memory_sort(self, cache):
+        """Streamed order and values equal a stable in-memory sort (ties by symbol name)."""
+        cache_dir, frames = cache
+        loader = StreamingTickLoader({}, chunk_size=700, start_date=self.START,
+                                     end_date=self.START + timedelta(days=1),
+                                     cache_dir=str(cache_dir))
+
+        streamed = [(t.time_ns, t.symbol, t.bid, t.ask, t.volume) for t in loader.stream_ticks()]
+
+        expected_timeline = ColumnarTickTimeline.from_symbol_columns(
+            (symbol, extract_tick_columns(frames[symbol])) for symbol in sorted(frames)
+        )
+        expected = [(t.time_ns, t.symbol, t.bid, t.ask, t.volume) for t in expected_timeline]
+
+        assert len(streamed) == sum(len(df) for df in frames.values())
+        assert streamed == expected
+        assert loader.get_statistics()['total_ticks_streamed'] == len(expected)
+
+    def test_times_are_utc_datetimes(self, cache):
+        """Streamed ticks carry timezone-aware UTC datetimes."""
+        cache_dir, _ = cache
+        loader = StreamingTickLoader({}, chunk_size=1000, start_date=self.START,
+                                     end_date=self.START, cache_dir=str(cache_dir))
+
+        first = next(iter(loader.stream_ticks()))
+
+        assert first.time.tzinfo is not None
+        assert first.time.date() == self.START.date()
+
+    def test_symbol_filter(self, cache):
+        """Only requested symbols are streamed."""
+        cache_dir, frames = cache
+        loader = StreamingTickLoader({}, chunk_size=1000, start_date=self.START,
+                                     end_date=self.START + timedelta(days=1),
+                                     cache_dir=str(cache_dir), symbols=['EURUSD'])
+
+        symbols = {t.symbol for t in loader.stream_ticks()}
+
+        assert symbols == {'EURUSD'}
+        assert loader.total_ticks_streamed == len(frames['EURUSD'])
+
+    def test_prefetch_matches_inline_decode(self, cache):
+        """Background prefetching streams the same ticks as inline decoding."""
+        cache_dir, _ = cache
+        end = self.START + timedelta(days=1)
+
+        inline = StreamingTickLoader({}, chunk_size=500, start_date=self.START, end_date=end,
+                                     cache_dir=str(cache_dir), prefetch_batches=0)
+        prefetched = StreamingTickLoader({}, chunk_size=500, start_date=self.START, end_date=end,
+                                         cache_dir=str(cache_dir), prefetch_batches=2)
+
+        inline_ticks = [(t.time_ns, t.symbol, t.bid) for t in inline.stream_ticks()]
+        prefetched_ticks = [(t.time_ns, t.symbol, t.bid) for t in prefetched.stream_ticks()]
+
+        assert prefetched_ticks == inline_ticks
+
+        stats = prefetched.get_statistics()
+        assert stats['prefetch_depth'] == 2
+        assert stats['prefetch_batches'] > 0
+        assert stats['prefetch_stalls'] >= 0
+        assert stats['prefetch_stall_seconds'] >= 0.0
+        assert inline.get_statistics()['prefetch_batches'] == 0
+
+    def test_prefetch_threads_stop_on_early_exit(self, cache):
+        """Closing the stream early stops the background readers."""
+        import threading
+        import time
+
+        cache_dir, _ = cache
+        loader = StreamingTickLoader({}, chunk_size=100, start_date=self.START,
+                                     end_date=self.START + timedelta(days=1),
+                                     cache_dir=str(cache_dir), prefetch_batches=1)
+
+        stream = loader.stream_ticks()
+        for _ in range(10):
+            next(stream)
+        stream.close()
+
+        deadline = time.time() + 5
+        while time.time() < deadline:
+            if not any(t.name.startswith('TickPrefetch-') for t in threading.enumerate()):
+                break
+            time.sleep(0.05)
+
+        assert not any(t.name.startswith('TickPrefetch-') for t in threading.enumerate())
+
+    def test_legacy_file_is_date_filtered(self, tmp_path):
+        """Non-daily cache files are filtered to [start_date, end_date]."""
+        df = self.create_ticks(self.START, seed=1, count=1000)
+        legacy_file = tmp_path / "EURUSD_20250106_20250106_INFO.parquet"
+        df.to_parquet(legacy_file, index=False)
+
+        start = self.START + timedelta(hours=6)
+        end = self.START + timedelta(hours=12)
+        loader = StreamingTickLoader({'EURUSD': str(legacy_file)}, chunk_size=128,
+                                     start_date=start, end_date=end)
+
+        times = [t.time for t in loader.stream_ticks()]
+        expected = df[(df['time'] >= start) & (df['time'] <= end)]
+
+        assert len(times) == len(expected)
+        assert all(start <= t <= end for t in times)
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Tests for the synthetic tick generator.
+
+Generated data must be deterministic per seed, follow the market schedule
+(weekends, rollover gap) and be readable by DataCache, StreamingTickLoader
+and BacktestDataLoader exactly like downloaded cache files.
+"""
+
+import json
+from unittest.mock import Mock
+
+import pytest
+import numpy as np
+import pandas as pd
+from datetime import datetime, timezone
+from pathlib import Path
+
+# Add project root to path
+import sys
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.backtesting.engine.synthetic_ticks import SyntheticTickGenerator
+
+
+FRIDAY = datetime(2024, 1, 5, tzinfo=timezone.utc)
+SATURDAY = datetime(2024, 1, 6, tzinfo=timezone.utc)
+MONDAY = datetime(2024, 1, 8, tzinfo=timezone.utc)
+
+
+class TestSyntheticTicks:
+    """Tests for SyntheticTickGenerator."""
+
+    def test_deterministic_per_seed(self):
+        """Same seed gives identical ticks; another seed does not; days are independent of the range."""
+        day = datetime(2024, 1, 3, tzinfo=timezone.utc)
+        first = SyntheticTickGenerator(seed=5).generate_day('EURUSD', day)
+        second = SyntheticTickGenerator(seed=5).generate_day('EURUSD', day)
+        other = SyntheticTickGenerator(seed=6).generate_day('EURUSD', day)
+
+        pd.testing.assert_frame_equal(first, second)
+        assert len(first) > 10_000
+        assert not first['bid'].equals(other['bid'])
+
+    def test_market_schedule_and_prices(self):
+        """Weekend-closed symbols stop Friday 22:00 and skip the weekend (with a price gap); crypto trades daily."""
+        generator = SyntheticTickGenerator(seed=1, ticks_per_hour=2_000)
+        friday = generator.generate_day('EURUSD', FRIDAY)
+        monday = generator.generate_day('EURUSD', MONDAY)
+
+        assert generator.generate_day('EURUSD', SATURDAY).empty
+        assert friday['time'].max() < FRIDAY.replace(hour=22)
+        assert len(generator.generate_day('BTCUSD', SATURDAY)) > 1_000
+
+        # Rollover gap: no ticks between 21:59 and 22:05
+        minutes = monday['time'].dt.hour * 60 + monday['time'].dt.minute
+        assert not ((minutes >= 21 * 60 + 59) & (minutes < 22 * 60 + 5)).any()
+
+        # Ticks are ordered, priced on the symbol's grid and ask > bid
+        assert monday['time_msc'].is_monotonic_increasing
+        assert (monday['ask'] > monday['bid']).all()
+        assert np.allclose(monday['bid'] * 1e5, np.round(monday['bid'] * 1e5))
+        assert (monday['bid'] - generator._day_open('EURUSD', MONDAY)).abs().iloc[0] < 0.001
+
+        # Consecutive trading days are continuous (bridge to the next open)
+        tuesday = generator.generate_day('EURUSD', datetime(2024, 1, 9, tzinfo=timezone.utc))
+        assert abs(tuesday['bid'].iloc[0] - monday['bid'].iloc[-1]) < 0.001
+
+    def test_cache_readable_by_loaders(self, tmp_path):
+        """DataCache, StreamingTickLoader and BacktestDataLoader read the generated cache."""
+        import MetaTrader5 as mt5
+        from src.backtesting.engine.data_cache import DataCache
+        from src.backtesting.engine.data_loader import BacktestDataLoader
+        from src.backtesting.engine.streaming_tick_loader import StreamingTickLoader
+
+        generator = SyntheticTickGenerator(seed=3, ticks_per_hour=500)
+        end = datetime(2024, 1, 9, 23, 59, 59, tzinfo=timezone.utc)
+        summary = generator.write_cache(str(tmp_path), ['EURUSD', 'BTCUSD'], FRIDAY, end)
+        assert summary['EURUSD']['days'] == 3 and summary['BTCUSD']['days'] == 5
+
+        tick_file = tmp_path / '2024' / '01' / '05' / 'ticks' / 'EURUSD_INFO.parquet'
+        assert tick_file.exists()
+        assert not (tmp_path / '2024' / '01' / '06' / 'ticks' / 'EURUSD_INFO.parquet').exists()
+        info = json.loads((tmp_path / '2024' / '01' / '05' / 'symbol_info' / 'EURUSD.json').read_text())
+        assert info['digits'] == 5 and info['point'] == pytest.approx(1e-5)
+
+        cache = DataCache(str(tmp_path))
+        candles, symbol_info = cache.load_from_cache('EURUSD', 'M15', FRIDAY, FRIDAY.replace(hour=23))
+        assert len(candles) > 50 and symbol_info == info
+        assert cache.index.get_cached_days('EURUSD', 'ticks') == {FRIDAY.date(), MONDAY.date(),
+                                                                  datetime(2024, 1, 9).date()}
+
+        loader = StreamingTickLoader(cache_files=None, cache_dir=str(tmp_path), start_date=FRIDAY,
+                                     end_date=end, symbols=['EURUSD', 'BTCUSD'])
+        streamed = [(cursor.symbol, cursor.time_ns) for cursor in loader.stream_ticks()]
+        assert len(streamed) == summary['EURUSD']['ticks'] + summary['BTCUSD']['ticks']
+        assert [t for _, t in streamed] == sorted(t for _, t in streamed)
+
+        data_loader = BacktestDataLoader(connector=Mock(), use_cache=True, cache_dir=str(tmp_path))
+        ticks = data_loader.load_ticks_from_mt5('EURUSD', FRIDAY, end, mt5.COPY_TICKS_INFO, cache_dir=str(tmp_path))
+        assert len(ticks) == summary['EURUSD']['ticks']
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
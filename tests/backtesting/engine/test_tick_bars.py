@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Tests for bars precompiled from cached tick files.
+
+The vectorized multi-timeframe build must equal pandas resample() of the
+ticks (the BacktestDataLoader fallback), and DataCache must rebuild a day's
+bars only when its tick file changes. BacktestDataLoader may use the cached
+bars only when every trading day of the range has a tick file or is recorded
+as having no ticks.
+"""
+
+import pytest
+import numpy as np
+import pandas as pd
+import MetaTrader5 as mt5
+from datetime import datetime, timezone
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+# Add project root to path
+import sys
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.backtesting.engine.data_cache import DataCache
+from src.backtesting.engine.data_loader import BacktestDataLoader
+from src.backtesting.engine.tick_bars import build_bars
+
+
+START = datetime(2025, 1, 6, tzinfo=timezone.utc)
+RESAMPLE = {'M1': '1min', 'M5': '5min', 'M15': '15min', 'M30': '30min', 'H1': '1h', 'H4': '4h', 'D1': '1D'}
+
+
+def random_ticks(seed, seconds=2 * 86_400, count=20_000):
+    """Random-walk bid ticks with gaps (empty buckets) over two days."""
+    rng = np.random.default_rng(seed)
+    offsets = np.sort(rng.choice(seconds * 10, size=count, replace=False)) * 100  # 0.1s steps, in ms
+    offsets = offsets[(offsets < 30_000_000) | (offsets > 40_000_000)]  # Gap of ~3 hours
+    bids = 1.1 + np.cumsum(rng.normal(0, 0.00003, size=len(offsets)))
+    return pd.DataFrame({
+        'time': pd.Timestamp(START) + pd.to_timedelta(offsets, unit='ms'),
+        'bid': bids,
+        'ask': bids + 0.0001,
+        'last': np.zeros(len(offsets)),
+        'volume': rng.integers(1, 5, size=len(offsets)),
+    })
+
+
+def resampled(ticks, timeframe):
+    """Reference: the pandas resample used by _build_candles_from_ticks()."""
+    df = ticks.set_index('time')
+    candles = df['bid'].resample(RESAMPLE[timeframe]).agg(['first', 'max', 'min', 'last'])
+    candles.columns = ['open', 'high', 'low', 'close']
+    candles['tick_volume'] = df['volume'].resample(RESAMPLE[timeframe]).sum()
+    return candles.dropna().reset_index()
+
+
+def write_ticks(cache_dir, day, symbol, ticks):
+    """Write a daily tick file in the cache layout."""
+    ticks_dir = cache_dir / f"{day:%Y}" / f"{day:%m}" / f"{day:%d}" / "ticks"
+    ticks_dir.mkdir(parents=True, exist_ok=True)
+    path = ticks_dir / f"{symbol}_INFO.parquet"
+    ticks.to_parquet(path, index=False)
+    return path
+
+
+def assert_same_bars(actual, expected):
+    """OHLC values, volumes and bar times are identical."""
+    assert list(pd.DatetimeIndex(actual['time']).as_unit('us').asi8) == \
+        list(pd.DatetimeIndex(expected['time']).as_unit('us').asi8)
+    for column in ('open', 'high', 'low', 'close', 'tick_volume'):
+        np.testing.assert_array_equal(actual[column].to_numpy(), expected[column].to_numpy())
+
+
+class TestBuildBars:
+    """Tests for build_bars()."""
+
+    @pytest.mark.parametrize('timeframe', list(RESAMPLE))
+    def test_matches_resample(self, timeframe):
+        """Every timeframe equals pandas resample of the ticks."""
+        ticks = random_ticks(1)
+        columns = pd.DatetimeIndex(ticks['time']).as_unit('ns').asi8
+
+        bars = build_bars(columns, ticks['bid'].to_numpy(), ticks['volume'].to_numpy(), [timeframe, 'M1'])
+
+        assert_same_bars(bars[timeframe], resampled(ticks, timeframe))
+        assert list(bars[timeframe].columns) == ['time', 'open', 'high', 'low', 'close', 'tick_volume',
+                                                 'spread', 'real_volume']
+
+    def test_unsorted_and_empty_input(self):
+        """Unsorted ticks are ordered stably; no ticks give empty frames."""
+        ticks = random_ticks(2, count=2_000)
+        shuffled = ticks.sample(frac=1.0, random_state=0)
+        times = pd.DatetimeIndex(shuffled['time']).as_unit('ns').asi8
+
+        bars = build_bars(times, shuffled['bid'].to_numpy(), shuffled['volume'].to_numpy(), ['M5'])
+        assert_same_bars(bars['M5'], resampled(ticks, 'M5'))
+
+        empty = build_bars(np.empty(0, dtype=np.int64), np.empty(0), np.empty(0, dtype=np.int64), ['M1', 'H4'])
+        assert len(empty['M1']) == 0 and len(empty['H4']) == 0
+
+    def test_rejects_timeframes_not_dividing_a_day(self):
+        """Bars are bucketed within UTC days."""
+        with pytest.raises(ValueError):
+            build_bars(np.zeros(1, dtype=np.int64), np.ones(1), np.ones(1, dtype=np.int64), ['W1'])
+
+
+class TestDataCacheTickBars:
+    """Tests for DataCache.load_tick_bars()."""
+
+    def test_builds_all_timeframes_once(self, tmp_path, monkeypatch):
+        """The first load writes every timeframe; later loads read them."""
+        cache = DataCache(str(tmp_path), use_index=False)
+        ticks = random_ticks(3)
+        for day in (0, 1):
+            day_start = pd.Timestamp(START) + pd.Timedelta(days=day)
+            day_ticks = ticks[(ticks['time'] >= day_start) & (ticks['time'] < day_start + pd.Timedelta(days=1))]
+            write_ticks(tmp_path, day_start.to_pydatetime(), 'EURUSD', day_ticks)
+        end = datetime(2025, 1, 7, 23, 59, tzinfo=timezone.utc)
+
+        bars = cache.load_tick_bars('EURUSD', 'M15', START, end)
+        assert_same_bars(bars, resampled(ticks, 'M15'))
+        assert len(list(tmp_path.rglob('tick_bars/EURUSD_INFO_*.parquet'))) == 2 * len(DataCache.TICK_BAR_TIMEFRAMES)
+
+        builds = []
+        original = DataCache.build_tick_bars
+        monkeypatch.setattr(DataCache, 'build_tick_bars',
+                            lambda self, *args, **kwargs: builds.append(args) or original(self, *args, **kwargs))
+        for timeframe in DataCache.TICK_BAR_TIMEFRAMES:
+            assert_same_bars(cache.load_tick_bars('EURUSD', timeframe, START, end), resampled(ticks, timeframe))
+        assert builds == []
+
+        # A timeframe outside the default set is built on demand
+        assert_same_bars(cache.load_tick_bars('EURUSD', 'M30', START, end), resampled(ticks, 'M30'))
+        assert len(builds) == 2
+
+    def test_rebuilt_when_ticks_change(self, tmp_path):
+        """Bars follow the tick file contents (content hash), not its age."""
+        cache = DataCache(str(tmp_path), use_index=False)
+        ticks = random_ticks(4, seconds=86_400, count=5_000)
+        write_ticks(tmp_path, START, 'EURUSD', ticks)
+        end = datetime(2025, 1, 6, 23, 59, tzinfo=timezone.utc)
+        first = cache.load_tick_bars('EURUSD', 'H1', START, end)
+
+        changed = ticks.iloc[: len(ticks) // 2]
+        write_ticks(tmp_path, START, 'EURUSD', changed)
+
+        second = DataCache(str(tmp_path), use_index=False).load_tick_bars('EURUSD', 'H1', START, end)
+        assert len(second) < len(first)
+        assert_same_bars(second, resampled(changed, 'H1'))
+
+    def test_tick_file_past_midnight(self, tmp_path):
+        """A bar split across two daily tick files is merged."""
+        cache = DataCache(str(tmp_path), use_index=False)
+        ticks = random_ticks(5, count=4_000)
+        midnight = pd.Timestamp(START) + pd.Timedelta(days=1)
+        split = midnight + pd.Timedelta(seconds=90)  # First day's file holds 90s of the next day
+        write_ticks(tmp_path, START, 'EURUSD', ticks[ticks['time'] < split])
+        write_ticks(tmp_path, midnight.to_pydatetime(), 'EURUSD', ticks[ticks['time'] >= split])
+
+        bars = cache.load_tick_bars('EURUSD', 'M5', START, datetime(2025, 1, 7, 23, 59, tzinfo=timezone.utc))
+        assert_same_bars(bars, resampled(ticks, 'M5'))
+
+    def test_no_ticks(self, tmp_path):
+        """Without tick files there are no tick bars."""
+        cache = DataCache(str(tmp_path), use_index=False)
+        assert cache.load_tick_bars('EURUSD', 'M1', START, START) is None
+
+
+class TestLoaderTickBars:
+    """Tests for the tick bar source of BacktestDataLoader._build_candles_from_ticks()."""
+
+    END = datetime(2025, 1, 7, 23, 59, tzinfo=timezone.utc)
+
+    def make_loader(self, tmp_path, cached_days):
+        """Loader over tmp_path with tick files for the given days of random_ticks(6)."""
+        ticks = random_ticks(6)
+        for day in cached_days:
+            day_start = pd.Timestamp(START) + pd.Timedelta(days=day)
+            day_ticks = ticks[(ticks['time'] >= day_start) & (ticks['time'] < day_start + pd.Timedelta(days=1))]
+            write_ticks(tmp_path, day_start.to_pydatetime(), 'EURUSD', day_ticks)
+        return BacktestDataLoader(connector=Mock(), cache_dir=str(tmp_path)), ticks
+
+    def test_partial_coverage_loads_from_mt5(self, tmp_path):
+        """With a trading day missing from the tick cache, the whole range comes from MT5."""
+        loader, ticks = self.make_loader(tmp_path, cached_days=[0])
+        mt5_ticks = ticks.assign(time=ticks['time'].dt.floor('s'))
+        records = mt5_ticks.assign(time=mt5_ticks['time'].dt.as_unit('s').astype('int64')).to_records(index=False)
+
+        with patch('src.backtesting.engine.data_loader.mt5.copy_ticks_range', return_value=records) as copy:
+            bars = loader._build_candles_from_ticks('EURUSD', 'M15', START, self.END,
+                                                    tick_type=mt5.COPY_TICKS_ALL)
+
+        copy.assert_called_once_with('EURUSD', START, self.END, mt5.COPY_TICKS_ALL)
+        assert_same_bars(bars, resampled(mt5_ticks, 'M15'))
+
+    def test_full_coverage_uses_cached_bars(self, tmp_path):
+        """With every day cached, bars come from the cache and MT5 is not asked."""
+        loader, ticks = self.make_loader(tmp_path, cached_days=[0, 1])
+
+        with patch('src.backtesting.engine.data_loader.mt5.copy_ticks_range') as copy:
+            bars = loader._build_candles_from_ticks('EURUSD', 'M15', START, self.END)
+
+        copy.assert_not_called()
+        assert_same_bars(bars, resampled(ticks, 'M15'))
+
+    def test_preloaded_ticks_take_precedence(self, tmp_path):
+        """Preloaded ticks are resampled even when the cache covers the range."""
+        loader, ticks = self.make_loader(tmp_path, cached_days=[0, 1])
+        preloaded = ticks.iloc[: len(ticks) // 2]
+
+        bars = loader._build_candles_from_ticks('EURUSD', 'M15', START, self.END, preloaded_ticks=preloaded)
+
+        assert_same_bars(bars, resampled(preloaded, 'M15'))
+
+    def test_holiday_recorded_as_covered(self, tmp_path):
+        """A weekday MT5 has no ticks for is recorded once; cached bars then span it."""
+        holiday = pd.Timestamp(START) + pd.Timedelta(days=1)
+        ticks = random_ticks(7, seconds=3 * 86_400, count=30_000)
+        ticks = ticks[(ticks['time'] < holiday) | (ticks['time'] >= holiday + pd.Timedelta(days=1))]
+        for day in (0, 2):
+            day_start = pd.Timestamp(START) + pd.Timedelta(days=day)
+            day_ticks = ticks[(ticks['time'] >= day_start) & (ticks['time'] < day_start + pd.Timedelta(days=1))]
+            write_ticks(tmp_path, day_start.to_pydatetime(), 'EURUSD', day_ticks)
+        loader = BacktestDataLoader(connector=Mock(), cache_dir=str(tmp_path))
+        loader.archive_downloader = Mock(**{'fetch_tick_data_for_day.return_value': None})
+        end = datetime(2025, 1, 8, 23, 59, tzinfo=timezone.utc)
+
+        # Never downloaded: the holiday is missing
+        assert loader._load_cached_tick_bars('EURUSD', 'M15', START, end, mt5.COPY_TICKS_INFO) is None
+
+        day_start = holiday.to_pydatetime()
+        tick_path = loader._get_tick_cache_path(str(tmp_path), day_start, 'EURUSD', 'INFO')
+        with patch.multiple('src.backtesting.engine.data_loader.mt5', symbol_select=Mock(return_value=True),
+                            copy_ticks_range=Mock(return_value=np.array([])), account_info=Mock()):
+            assert loader._download_day_ticks('EURUSD', day_start, day_start.replace(hour=23, minute=59, second=59),
+                                              mt5.COPY_TICKS_INFO, 'INFO', tick_path, str(tmp_path)) is None
+
+        assert not tick_path.exists()
+        assert loader.cache.get_missing_tick_days('EURUSD', START, end) == []
+
+        with patch('src.backtesting.engine.data_loader.mt5.copy_ticks_range') as copy:
+            bars = loader._build_candles_from_ticks('EURUSD', 'M15', START, end)
+
+        copy.assert_not_called()
+        assert_same_bars(bars, resampled(ticks, 'M15'))
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
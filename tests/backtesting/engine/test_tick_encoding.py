@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Tests for the compact integer tick encoding.
+
+Encoded files must decode to exactly the original table (schema, metadata
+and values), stay readable by every tick reader, and be smaller than the
+plain layout.
+"""
+
+import pytest
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from datetime import datetime, timezone, timedelta
+from pathlib import Path
+
+# Add project root to path
+import sys
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.backtesting.engine.tick_encoding import (
+    TickEncoding, read_tick_schema, read_tick_table, write_tick_table
+)
+from src.backtesting.engine.streaming_tick_loader import StreamingTickLoader
+from src.backtesting.engine.synthetic_ticks import SyntheticTickGenerator
+
+
+DAY = datetime(2025, 1, 6, tzinfo=timezone.utc)
+
+
+def mt5_ticks(count=5000, seed=3, digits=5):
+    """MT5 copy_ticks_range-like frame (time in seconds plus time_msc, uint flags)."""
+    rng = np.random.default_rng(seed)
+    time_msc = pd.Timestamp(DAY).value // 1_000_000 + np.sort(rng.integers(0, 86_400_000, size=count))
+    bid_points = 108_000 + np.cumsum(rng.integers(-3, 4, size=count))
+    bids = bid_points / 10.0 ** digits
+    return pd.DataFrame({
+        'time': pd.to_datetime(time_msc // 1000, unit='s', utc=True),
+        'bid': bids,
+        'ask': (bid_points + rng.integers(5, 12, size=count)) / 10.0 ** digits,
+        'last': np.zeros(count),
+        'volume': np.zeros(count, dtype=np.uint64),
+        'time_msc': time_msc.astype(np.int64),
+        'flags': rng.choice([2, 4, 6], size=count).astype(np.uint32),
+        'volume_real': np.zeros(count),
+    })
+
+
+def to_table(df):
+    """Arrow table with cache metadata, as written by the cache writers."""
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    metadata = dict(table.schema.metadata)
+    metadata.update({b'cache_version': b'1.0', b'row_count': str(len(df)).encode()})
+    return table.replace_schema_metadata(metadata)
+
+
+class TestTickEncoding:
+    """Tests for encode/decode and the readers of encoded files."""
+
+    def test_round_trip_is_lossless(self, tmp_path):
+        """Schema, metadata and every value decode exactly; cache metadata stays readable."""
+        table = to_table(mt5_ticks())
+        path = tmp_path / "EURUSD_INFO.parquet"
+        write_tick_table(table, path, encoded=True)
+
+        decoded = read_tick_table(path)
+
+        assert decoded.equals(table, check_metadata=True)
+        assert read_tick_schema(path).equals(table.schema, check_metadata=True)
+        assert pq.read_schema(path).metadata[b'cache_version'] == b'1.0'
+        pd.testing.assert_frame_equal(decoded.to_pandas(), table.to_pandas())
+
+        encoding = TickEncoding.from_schema(pq.read_schema(path))
+        kinds = {column['name']: column['kind'] for column in encoding.columns}
+        assert kinds == {'time': 'time', 'bid': 'price', 'ask': 'spread', 'last': 'price', 'volume': 'int',
+                         'time_msc': 'int', 'flags': 'int', 'volume_real': 'raw'}
+
+    def test_off_grid_prices_are_stored_raw(self, tmp_path):
+        """Prices that do not round-trip through integer points stay float64, still lossless."""
+        df = mt5_ticks(count=1000)
+        df['bid'] = df['bid'] + np.random.default_rng(1).random(len(df)) * 1e-9
+        table = to_table(df)
+        path = tmp_path / "EURUSD_INFO.parquet"
+        write_tick_table(table, path, encoded=True)
+
+        kinds = {column['name']: column['kind']
+                 for column in TickEncoding.from_schema(pq.read_schema(path)).columns}
+
+        assert kinds['bid'] == 'raw'
+        assert kinds['ask'] == 'raw'
+        assert read_tick_table(path).equals(table)
+
+    def test_column_subset(self, tmp_path):
+        """Reading only 'ask' decodes it from the spread and its bid base."""
+        table = to_table(mt5_ticks())
+        path = tmp_path / "EURUSD_INFO.parquet"
+        write_tick_table(table, path, encoded=True)
+
+        subset = read_tick_table(path, columns=['time', 'ask'])
+
+        assert subset.schema.names == ['time', 'ask']
+        assert subset.column('ask').equals(table.column('ask'))
+
+    def test_smaller_than_plain(self, tmp_path):
+        """The compact encoding is smaller than snappy float64 for realistic ticks."""
+        table = to_table(mt5_ticks(count=50_000))
+        plain = tmp_path / "plain.parquet"
+        compact = tmp_path / "compact.parquet"
+        write_tick_table(table, plain)
+        write_tick_table(table, compact, encoded=True)
+
+        assert compact.stat().st_size < plain.stat().st_size
+
+    def test_streaming_reads_encoded_cache(self, tmp_path):
+        """Streaming a compact-encoded synthetic cache gives the same ticks as a plain one."""
+        end = DAY + timedelta(days=1)
+        generator = SyntheticTickGenerator(seed=4, ticks_per_hour=500)
+        generator.write_cache(str(tmp_path / "plain"), ['EURUSD', 'USDJPY'], DAY, end,
+                              write_candles=False, update_index=False)
+        generator.write_cache(str(tmp_path / "compact"), ['EURUSD', 'USDJPY'], DAY, end,
+                              write_candles=False, update_index=False, compact_encoding=True)
+
+        def stream(cache_dir):
+            loader = StreamingTickLoader({}, chunk_size=300, start_date=DAY, end_date=end,
+                                         cache_dir=str(cache_dir), prefetch_batches=0)
+            return [(t.time_ns, t.symbol, t.bid, t.ask, t.last, t.volume) for t in loader.stream_ticks()]
+
+        plain = stream(tmp_path / "plain")
+        assert len(plain) > 0
+        assert stream(tmp_path / "compact") == plain
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared memory-mapped tick store.
+
+The compiled store must replay exactly the ticks (and tie order) of the
+streaming loader over the same daily cache files, be reused while the files
+are unchanged, and attach to the broker without copying.
+"""
+
+import pytest
+import numpy as np
+import pandas as pd
+from datetime import datetime, timezone
+from pathlib import Path
+
+# Add project root to path
+import sys
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.backtesting.engine.simulated_broker import SimulatedBroker
+from src.backtesting.engine.streaming_tick_loader import StreamingTickTimeline
+from src.backtesting.engine.tick_store import TickStore
+
+
+START = datetime(2025, 1, 6, tzinfo=timezone.utc)
+END = datetime(2025, 1, 8, tzinfo=timezone.utc)
+SYMBOLS = ['GBPUSD', 'EURUSD', 'USDJPY']
+
+
+def write_day(cache_dir, day, symbol, seconds, bid_start, tick_type='INFO'):
+    """Write one daily tick file with ticks at the given second offsets from midnight."""
+    ticks_dir = cache_dir / f"{day:%Y}" / f"{day:%m}" / f"{day:%d}" / "ticks"
+    ticks_dir.mkdir(parents=True, exist_ok=True)
+    bids = bid_start + np.arange(len(seconds)) * 0.0001
+    df = pd.DataFrame({
+        'time': pd.Timestamp(day) + pd.to_timedelta(seconds, unit='s'),
+        'bid': bids,
+        'ask': bids + 0.0002,
+        'last': np.zeros(len(seconds)),
+        'volume': np.arange(1, len(seconds) + 1, dtype=np.int64),
+    })
+    path = ticks_dir / f"{symbol}_{tick_type}.parquet"
+    df.to_parquet(path, index=False)
+    return path
+
+
+def create_cache(cache_dir):
+    """Three days of ticks with shared timestamps and a gap day for one symbol."""
+    rng = np.random.default_rng(7)
+    for d in range(3):
+        day = START + pd.Timedelta(days=d).to_pytimedelta()
+        for i, symbol in enumerate(SYMBOLS):
+            if symbol == 'USDJPY' and d == 1:
+                continue
+            seconds = np.sort(rng.choice(np.arange(0, 86_400, 5), size=400, replace=False))
+            seconds[:3] = [0, 10, 20]  # Identical timestamps across symbols
+            write_day(cache_dir, day, symbol, seconds, 1.1 + i)
+
+
+def stream(cache_dir, symbols=SYMBOLS):
+    """Ticks as streamed by StreamingTickTimeline."""
+    timeline = StreamingTickTimeline({}, 100, START, END, str(cache_dir), 'INFO', symbols)
+    return [(t.time_ns, t.symbol, t.bid, t.ask, t.last, t.volume, t.spread) for t in timeline]
+
+
+def store_ticks(timeline):
+    """Ticks of a columnar timeline in the same tuple format."""
+    return [(t.time_ns, t.symbol, t.bid, t.ask, t.last, t.volume, t.spread) for t in timeline]
+
+
+class TestTickStore:
+    """Tests for TickStore."""
+
+    def test_matches_streaming_order(self, tmp_path, monkeypatch):
+        """Compiled ticks equal the streaming merge, including ties."""
+        monkeypatch.setattr(TickStore, 'DECODE_BATCH_SIZE', 64)
+        create_cache(tmp_path / 'cache')
+
+        store = TickStore.open_or_compile(str(tmp_path / 'store'), str(tmp_path / 'cache'),
+                                          SYMBOLS, START, END, 'INFO')
+
+        assert store.symbols == sorted(SYMBOLS)
+        assert store.tick_count == 400 * 8
+        assert isinstance(store.timeline.bid, np.memmap)
+        assert store_ticks(store.timeline) == stream(tmp_path / 'cache')
+
+    def test_file_spilling_past_midnight(self, tmp_path):
+        """Ticks a daily file holds for the next day are merged in order."""
+        cache = tmp_path / 'cache'
+        write_day(cache, START, 'EURUSD', [100, 86_390, 86_410, 86_420], 1.1)
+        write_day(cache, START + pd.Timedelta(days=1).to_pytimedelta(), 'GBPUSD', [5, 15, 420], 1.2)
+
+        store = TickStore.open_or_compile(str(tmp_path / 'store'), str(cache), None, START, END, 'INFO')
+
+        times = store.timeline.times_ns
+        assert len(times) == 7
+        assert (np.diff(times) >= 0).all()
+        assert store.symbols == ['EURUSD', 'GBPUSD']
+
+    def test_reused_until_source_changes(self, tmp_path):
+        """An unchanged store is reopened; a modified file triggers recompilation."""
+        create_cache(tmp_path / 'cache')
+        args = (str(tmp_path / 'store'), str(tmp_path / 'cache'), SYMBOLS, START, END, 'INFO')
+
+        first = TickStore.open_or_compile(*args)
+        second = TickStore.open_or_compile(*args)
+        assert second.directory == first.directory
+        assert second.manifest['created_at'] == first.manifest['created_at']
+
+        write_day(tmp_path / 'cache', START, 'EURUSD', [1, 2, 3], 1.5)
+        third = TickStore.open_or_compile(*args)
+        assert third.manifest['created_at'] != first.manifest['created_at']
+        assert third.tick_count == 400 * 8 - 400 + 3
+        assert not list((tmp_path / 'store').glob('.*'))  # Temporary directories cleaned up
+
+    def test_store_key_depends_on_symbols_and_range(self):
+        """Different symbol sets or days get different stores; symbol order does not matter."""
+        key = TickStore.store_key(['EURUSD', 'GBPUSD'], START, END, 'INFO')
+
+        assert key == TickStore.store_key(['GBPUSD', 'EURUSD'], START, END, 'INFO')
+        assert key != TickStore.store_key(['EURUSD'], START, END, 'INFO')
+        assert key != TickStore.store_key(['EURUSD', 'GBPUSD'], START, START, 'INFO')
+        assert key.startswith('INFO_20250106_20250108_')
+
+
+class TestBrokerAttach:
+    """Tests for SimulatedBroker.load_ticks_from_cache_files(tick_store=...)."""
+
+    def test_attach_without_copy(self, tmp_path):
+        """All store symbols requested: the broker uses the memory maps directly."""
+        create_cache(tmp_path / 'cache')
+        store = TickStore.open_or_compile(str(tmp_path / 'store'), str(tmp_path / 'cache'),
+                                          SYMBOLS, START, END, 'INFO')
+
+        broker = SimulatedBroker(enable_slippage=False)
+        broker.load_ticks_from_cache_files({symbol: None for symbol in SYMBOLS}, required_timeframes=[],
+                                           tick_store=store)
+
+        assert isinstance(broker.global_tick_timeline.bid, np.memmap)
+        assert len(broker.global_tick_timeline) == store.tick_count
+        assert set(broker.current_ticks) == set(SYMBOLS)
+
+    def test_attach_symbol_subset(self, tmp_path):
+        """Requesting fewer symbols selects their ticks in store order."""
+        create_cache(tmp_path / 'cache')
+        store = TickStore.open_or_compile(str(tmp_path / 'store'), str(tmp_path / 'cache'),
+                                          SYMBOLS, START, END, 'INFO')
+
+        broker = SimulatedBroker(enable_slippage=False)
+        broker.load_ticks_from_cache_files({'EURUSD': None, 'USDJPY': None}, required_timeframes=[],
+                                           tick_store=store)
+
+        assert store_ticks(broker.global_tick_timeline) == stream(tmp_path / 'cache', ['EURUSD', 'USDJPY'])
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
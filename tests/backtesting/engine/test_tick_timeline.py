@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+Tests for the columnar global tick timeline.
+
+Verifies that ColumnarTickTimeline produces the same chronological order and
+tick values as the previous List[GlobalTick] + list.sort() implementation.
+"""
+
+import pytest
+import numpy as np
+import pandas as pd
+from datetime import datetime, timezone
+from pathlib import Path
+
+# Add project root to path
+import sys
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.backtesting.engine.tick_timeline import (
+    ColumnarTickTimeline,
+    TickCursor,
+    datetime_to_ns,
+    extract_tick_columns,
+    ns_to_datetime,
+)
+from src.backtesting.engine.simulated_broker import SimulatedBroker, TickData
+
+
+class TestColumnarTickTimeline:
+    """Tests for ColumnarTickTimeline."""
+
+    def create_ticks(self, start, seconds, bid_start):
+        """Create a tick DataFrame with ticks at the given second offsets."""
+        times = [pd.Timestamp(start) + pd.Timedelta(seconds=s) for s in seconds]
+        bids = [bid_start + i * 0.0001 for i in range(len(seconds))]
+        return pd.DataFrame({
+            'time': times,
+            'bid': bids,
+            'ask': [b + 0.0002 for b in bids],
+            'last': [0.0] * len(seconds),
+            'volume': list(range(1, len(seconds) + 1)),
+        })
+
+    def build_timeline(self):
+        """Build a two-symbol timeline with one shared timestamp."""
+        start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        eurusd = self.create_ticks(start, [0, 2, 4], 1.1000)
+        gbpusd = self.create_ticks(start, [1, 2, 3], 1.2500)
+        timeline = ColumnarTickTimeline.from_symbol_columns([
+            ('EURUSD', extract_tick_columns(eurusd)),
+            ('GBPUSD', extract_tick_columns(gbpusd)),
+        ])
+        return timeline, eurusd, gbpusd
+
+    def test_merge_is_chronological_and_stable(self):
+        """Ticks are sorted by time; equal timestamps keep symbol load order."""
+        timeline, _, _ = self.build_timeline()
+
+        assert len(timeline) == 6
+        assert list(np.diff(timeline.times_ns) >= 0) == [True] * 5
+
+        symbols = [tick.symbol for tick in timeline]
+        assert symbols == ['EURUSD', 'GBPUSD', 'EURUSD', 'GBPUSD', 'GBPUSD', 'EURUSD']
+
+    def test_values_match_source_dataframe(self):
+        """Iterated ticks carry the exact source values and UTC datetimes."""
+        timeline, eurusd, _ = self.build_timeline()
+
+        eur_ticks = [(t.time, t.bid, t.ask, t.last, t.volume, t.spread)
+                     for t in timeline if t.symbol == 'EURUSD']
+
+        for (time, bid, ask, last, volume, spread), (_, row) in zip(eur_ticks, eurusd.iterrows()):
+            assert time == row['time'].to_pydatetime()
+            assert time.tzinfo is not None
+            assert bid == row['bid']
+            assert ask == row['ask']
+            assert last == row['last']
+            assert volume == row['volume']
+            assert spread == row['ask'] - row['bid']
+
+    def test_iteration_reuses_cursor_and_indexing_does_not(self):
+        """Iteration yields one reused cursor; indexing returns independent cursors."""
+        timeline, _, _ = self.build_timeline()
+
+        cursors = list(timeline)
+        assert all(c is cursors[0] for c in cursors)
+        assert cursors[0].index == len(timeline) - 1
+
+        first = timeline[0]
+        last = timeline[-1]
+        assert isinstance(first, TickCursor)
+        assert first is not last
+        assert first.index == 0
+        assert last.index == len(timeline) - 1
+
+        with pytest.raises(IndexError):
+            timeline[len(timeline)]
+
+    def test_read_into_reuses_given_cursor(self):
+        """read_into() overwrites the given cursor in place."""
+        timeline, _, _ = self.build_timeline()
+        cursor = TickCursor()
+
+        result = timeline.read_into(1, cursor)
+
+        assert result is cursor
+        assert cursor.symbol == 'GBPUSD'
+        assert cursor.time == timeline.time_at(1)
+
+    def test_iteration_across_chunks(self, monkeypatch):
+        """Chunked iteration visits every tick exactly once in order."""
+        timeline, _, _ = self.build_timeline()
+        monkeypatch.setattr(ColumnarTickTimeline, 'ITER_CHUNK_SIZE', 4)
+
+        indices = [tick.index for tick in timeline]
+        assert indices == list(range(len(timeline)))
+
+    def test_symbol_helpers(self):
+        """first_index_by_symbol() and symbol_counts() summarize the timeline."""
+        timeline, _, _ = self.build_timeline()
+
+        assert timeline.first_index_by_symbol() == {'EURUSD': 0, 'GBPUSD': 1}
+        assert timeline.symbol_counts() == {'EURUSD': 3, 'GBPUSD': 3}
+
+    def test_missing_last_falls_back_to_mid(self):
+        """Without a 'last' column the mid price is used."""
+        df = pd.DataFrame({
+            'time': [datetime(2025, 1, 1, tzinfo=timezone.utc)],
+            'bid': [1.1000],
+            'ask': [1.1002],
+            'volume': [5],
+        })
+        columns = extract_tick_columns(df)
+        assert columns['last'][0] == (1.1000 + 1.1002) / 2.0
+
+    def test_empty_timeline(self):
+        """An empty merge produces an empty, iterable timeline."""
+        timeline = ColumnarTickTimeline.from_symbol_columns([])
+
+        assert len(timeline) == 0
+        assert list(timeline) == []
+        assert timeline.first_index_by_symbol() == {}
+
+    def assert_same_timeline(self, actual, expected):
+        """Symbols and all columns are identical."""
+        assert actual.symbols == expected.symbols
+        for name in ColumnarTickTimeline.COLUMN_DTYPES:
+            np.testing.assert_array_equal(getattr(actual, name), getattr(expected, name))
+
+    def test_save_and_memory_mapped_load(self, tmp_path):
+        """A saved timeline reopens as read-only memory maps with identical ticks."""
+        timeline, _, _ = self.build_timeline()
+        timeline.save(tmp_path / 'timeline')
+
+        loaded = ColumnarTickTimeline.load(tmp_path / 'timeline')
+
+        self.assert_same_timeline(loaded, timeline)
+        assert isinstance(loaded.bid, np.memmap)
+        assert not loaded.bid.flags.writeable
+        assert [(t.symbol, t.time, t.bid) for t in loaded] == [(t.symbol, t.time, t.bid) for t in timeline]
+
+    def test_write_ticks_streams_to_disk(self, tmp_path, monkeypatch):
+        """write_ticks() produces the same files as save() (across flush chunks)."""
+        monkeypatch.setattr(ColumnarTickTimeline, 'ITER_CHUNK_SIZE', 4)
+        timeline, _, _ = self.build_timeline()
+
+        count = ColumnarTickTimeline.write_ticks(iter(timeline), tmp_path / 'streamed')
+
+        assert count == len(timeline)
+        self.assert_same_timeline(ColumnarTickTimeline.load(tmp_path / 'streamed'), timeline)
+
+    def test_write_ticks_empty(self, tmp_path):
+        """An empty tick stream writes an empty, loadable timeline."""
+        assert ColumnarTickTimeline.write_ticks([], tmp_path / 'empty') == 0
+
+        loaded = ColumnarTickTimeline.load(tmp_path / 'empty')
+        assert len(loaded) == 0
+        assert loaded.symbols == []
+
+    def test_select_symbols(self):
+        """A symbol subset keeps tick order and renumbers symbol ids."""
+        timeline, _, gbpusd = self.build_timeline()
+
+        subset = timeline.select_symbols(['GBPUSD', 'USDJPY'])
+
+        assert subset.symbols == ['GBPUSD']
+        assert subset.symbol_counts() == {'GBPUSD': 3}
+        assert [t.bid for t in subset] == list(gbpusd['bid'])
+        assert len(timeline.select_symbols([])) == 0
+
+    def test_ns_to_datetime_truncates_to_microseconds(self):
+        """Nanosecond times are truncated like pd.Timestamp.to_pydatetime()."""
+        ts = pd.Timestamp('2025-01-01 12:00:00.123456789', tz='UTC')
+        assert ns_to_datetime(ts.value) == datetime(2025, 1, 1, 12, 0, 0, 123456, tzinfo=timezone.utc)
+
+
+
+class TestLazyTime:
+    """Datetimes are derived from int64 epoch-ns on demand."""
+
+    def test_datetime_to_ns_round_trip(self):
+        """datetime_to_ns() is the inverse of ns_to_datetime() (microsecond precision)."""
+        dt = datetime(2025, 3, 30, 1, 59, 59, 999999, tzinfo=timezone.utc)
+        ts = pd.Timestamp('2025-01-01 12:00:00.123456789', tz='UTC')
+
+        assert ns_to_datetime(datetime_to_ns(dt)) == dt
+        assert datetime_to_ns(ts) == ts.value
+        assert datetime_to_ns(dt.replace(tzinfo=None)) == datetime_to_ns(dt)
+
+    def test_cursor_time_follows_time_ns(self):
+        """The cached cursor datetime is rebuilt when time_ns changes."""
+        cursor = TickCursor()
+        cursor.time_ns = pd.Timestamp('2025-01-01 00:00:01', tz='UTC').value
+        first = cursor.time
+        assert cursor.time is first
+
+        cursor.time_ns += 1_000_000_000
+        assert cursor.time == datetime(2025, 1, 1, 0, 0, 2, tzinfo=timezone.utc)
+
+        cursor.time = datetime(2025, 1, 2, tzinfo=timezone.utc)
+        assert cursor.time_ns == pd.Timestamp('2025-01-02', tz='UTC').value
+
+    def test_tick_data_from_ns_or_datetime(self):
+        """TickData built from time_ns or from a datetime is the same tick."""
+        dt = datetime(2025, 1, 1, 8, 30, tzinfo=timezone.utc)
+        from_ns = TickData(time_ns=datetime_to_ns(dt), bid=1.1, ask=1.1002, last=0.0, volume=1, spread=0.0002)
+        from_dt = TickData(time=dt, bid=1.1, ask=1.1002, last=0.0, volume=1, spread=0.0002)
+
+        assert from_ns == from_dt
+        assert from_ns.time == dt
+
+    def test_broker_current_time(self):
+        """broker.current_time is a lazy view of current_time_ns; assigned datetimes are kept."""
+        broker = SimulatedBroker(enable_slippage=False)
+        assert broker.get_current_time() is None
+
+        broker.current_time_ns = pd.Timestamp('2025-01-01 09:00', tz='UTC').value
+        assert broker.get_current_time() == datetime(2025, 1, 1, 9, 0, tzinfo=timezone.utc)
+        assert broker.get_current_time_nonblocking() == broker.get_current_time()
+
+        naive = datetime(2025, 1, 1, 10, 0)
+        broker.current_time = naive
+        assert broker.current_time is naive
+        assert broker.current_time_ns == pd.Timestamp('2025-01-01 10:00').value
+
+        broker.current_time = None
+        assert broker.current_time_ns is None
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
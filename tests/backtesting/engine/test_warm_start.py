@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Tests for warm-start snapshots.
+
+A restored snapshot must replay exactly like a cold run, bind strategy
+references to the new run's components, and only be shared between runs
+whose strategy-relevant configuration is identical.
+"""
+
+import threading
+
+import pytest
+from pathlib import Path
+
+# Add project root to path
+import sys
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+import src.backtesting.engine.backtest_controller as backtest_controller
+from src.backtesting.engine.warm_start import WarmStartSnapshot
+from src.config import config
+from tests.backtesting.engine.replay_harness import (
+    START, ReferenceStrategy, RiskManagerStub, build_controller, new_broker
+)
+
+
+SYMBOLS = ['EURUSD', 'GBPUSD']
+
+
+def replay(broker, strategies, run_dir):
+    """Run the sequential loop and return the closed trades."""
+    controller = build_controller(broker, run_dir, show_progress=False)
+    controller._process_ticks_sequential(broker.global_tick_timeline, strategies)
+    return [(t['symbol'], t['type'], t['open_price'], t['close_price'], t['close_time'], t['volume'])
+            for t in broker.closed_trades]
+
+
+def warm_up(broker, risk_manager):
+    """Cold warmup: set_start_time(), strategy initialize(), candle seeding."""
+    broker.set_start_time(START)
+    strategies = {symbol: ReferenceStrategy(broker, risk_manager, symbol) for symbol in SYMBOLS}
+    for strategy in strategies.values():
+        assert strategy.initialize()
+    timeline = broker.global_tick_timeline
+    broker.load_tick_timeline(timeline, ['M1', 'M5'])
+    return strategies
+
+
+class TestWarmStartSnapshot:
+    """Tests for WarmStartSnapshot."""
+
+    def test_restored_run_replays_like_cold_run(self, tmp_path, monkeypatch):
+        """Snapshot taken before replay gives the same trades as a cold run with new risk settings."""
+        monkeypatch.setattr(backtest_controller, 'RICH_AVAILABLE', False)
+        snapshot = WarmStartSnapshot(tmp_path, 'key')
+
+        cold_broker = new_broker(SYMBOLS)
+        cold_risk = RiskManagerStub(lot_size=0.01)
+        strategies = warm_up(cold_broker, cold_risk)
+        components = WarmStartSnapshot.run_components(broker=cold_broker, risk_manager=cold_risk)
+        assert snapshot.save(cold_broker.get_warm_state(), strategies, components)
+        cold_trades = replay(cold_broker, strategies, tmp_path / 'cold')
+        assert len(cold_trades) > 10
+
+        # A second cold run with a different lot size (replay-only parameter)
+        reference_broker = new_broker(SYMBOLS)
+        reference_trades = replay(reference_broker, warm_up(reference_broker, RiskManagerStub(lot_size=0.02)),
+                                  tmp_path / 'reference')
+
+        broker = new_broker(SYMBOLS)
+        risk_manager = RiskManagerStub(lot_size=0.02)
+        state = snapshot.load(WarmStartSnapshot.run_components(broker=broker, risk_manager=risk_manager))
+        broker.restore_warm_state(state['broker'], broker.global_tick_timeline)
+        restored = state['strategies']
+
+        assert restored['EURUSD'].broker is broker
+        assert restored['EURUSD'].risk_manager is risk_manager
+        assert restored['EURUSD'].reference == strategies['EURUSD'].reference
+        assert replay(broker, restored, tmp_path / 'restored') == reference_trades
+        assert [t[:5] for t in reference_trades] == [t[:5] for t in cold_trades]
+
+    def test_component_references_rebound(self, tmp_path):
+        """Configuration sections and the logger are references, not copies."""
+        snapshot = WarmStartSnapshot(tmp_path, 'key')
+        holder = {'risk': config.risk, 'logger': snapshot.logger, 'value': [1, 2, 3]}
+
+        assert snapshot.save({}, {'EURUSD': holder}, WarmStartSnapshot.run_components())
+        loaded = snapshot.load(WarmStartSnapshot.run_components())['strategies']['EURUSD']
+
+        assert loaded['risk'] is config.risk
+        assert loaded['logger'] is snapshot.logger
+        assert loaded['value'] == [1, 2, 3]
+
+    def test_missing_component_falls_back_to_cold_run(self, tmp_path):
+        """A snapshot referencing a component the run does not have is not used."""
+        snapshot = WarmStartSnapshot(tmp_path, 'key')
+        broker = object()
+        snapshot.save({}, {'EURUSD': {'broker': broker}}, WarmStartSnapshot.run_components(broker=broker))
+
+        assert snapshot.load(WarmStartSnapshot.run_components()) is None
+
+    def test_unpicklable_state_is_not_saved(self, tmp_path):
+        """Strategies holding locks cannot be snapshotted; nothing is left behind."""
+        snapshot = WarmStartSnapshot(tmp_path, 'key')
+
+        assert not snapshot.save({}, {'EURUSD': {'lock': threading.Lock()}}, WarmStartSnapshot.run_components())
+        assert not snapshot.exists()
+        assert list(tmp_path.iterdir()) == []
+
+    def test_key_ignores_risk_but_not_strategy_settings(self, monkeypatch):
+        """Risk settings share a snapshot; strategy settings, symbols and overrides do not."""
+        key = WarmStartSnapshot.snapshot_key('data', SYMBOLS, START, {'fakeout.risk_reward_ratio': 2.0})
+
+        monkeypatch.setattr(config.risk, 'max_positions', config.risk.max_positions + 1)
+        assert WarmStartSnapshot.snapshot_key('data', SYMBOLS[::-1], START, {'fakeout.risk_reward_ratio': 2.0}) == key
+
+        assert WarmStartSnapshot.snapshot_key('data', SYMBOLS, START, {'fakeout.risk_reward_ratio': 3.0}) != key
+        assert WarmStartSnapshot.snapshot_key('data', SYMBOLS[:1], START, {'fakeout.risk_reward_ratio': 2.0}) != key
+        assert WarmStartSnapshot.snapshot_key('other', SYMBOLS, START, {'fakeout.risk_reward_ratio': 2.0}) != key
+
+        monkeypatch.setattr(config.strategy_enable, 'fakeout_enabled', not config.strategy_enable.fakeout_enabled)
+        assert WarmStartSnapshot.snapshot_key('data', SYMBOLS, START, {'fakeout.risk_reward_ratio': 2.0}) != key
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -12,6 +12,11 @@ Options:
     --output FILE       : Save profiling results to file (default: profile_results.txt)
     --top N             : Show top N functions by time (default: 50)
     --sort METRIC       : Sort by metric (time, cumtime, calls) (default: cumtime)
+
+cProfile instruments every call and inflates the tick loop's cost. For a per-stage
+breakdown of the sequential engine at normal speed, set PROFILE_STAGES = True in
+backtest.py instead (sampled StageProfiler, report and speedscope JSON in the log
+directory).
 """
 
 import cProfile